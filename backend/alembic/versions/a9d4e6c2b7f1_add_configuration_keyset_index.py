@@ -0,0 +1,32 @@
+"""add_configuration_keyset_index
+
+Revision ID: a9d4e6c2b7f1
+Revises: f2c8a4e1b9d3
+Create Date: 2026-10-16 16:21:05.481927
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d4e6c2b7f1"
+down_revision: str | None = "f2c8a4e1b9d3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_index(
+        "idx_configurations_mfg_type_updated",
+        "configurations",
+        ["manufacturing_type_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index("idx_configurations_mfg_type_updated", table_name="configurations")
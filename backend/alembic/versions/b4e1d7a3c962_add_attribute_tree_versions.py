@@ -0,0 +1,53 @@
+"""add_attribute_tree_versions
+
+Revision ID: b4e1d7a3c962
+Revises: a9d4e6c2b7f1
+Create Date: 2026-10-17 09:12:36.504118
+
+"""
+
+from collections.abc import Sequence
+from pathlib import Path
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e1d7a3c962"
+down_revision: str | None = "a9d4e6c2b7f1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_SCRIPT = (
+    Path(__file__).resolve().parents[2] / "app" / "database" / "sql" / "04_tree_versions.sql"
+)
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table(
+        "attribute_tree_versions",
+        sa.Column("manufacturing_type_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("manufacturing_type_id"),
+    )
+
+    # Trees without a row read as version 0 until their next change
+    op.execute(TRIGGER_SCRIPT.read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    for event in ("insert", "update", "delete"):
+        op.execute(
+            f"DROP TRIGGER IF EXISTS trigger_bump_attribute_tree_version_{event} ON attribute_nodes"
+        )
+    op.execute("DROP FUNCTION IF EXISTS bump_attribute_tree_version()")
+    op.drop_table("attribute_tree_versions")
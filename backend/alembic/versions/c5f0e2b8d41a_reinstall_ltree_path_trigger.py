@@ -0,0 +1,92 @@
+"""reinstall_ltree_path_trigger
+
+Revision ID: c5f0e2b8d41a
+Revises: b4e1d7a3c962
+Create Date: 2026-10-17 14:02:11.318204
+
+"""
+
+from collections.abc import Sequence
+from pathlib import Path
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5f0e2b8d41a"
+down_revision: str | None = "b4e1d7a3c962"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_SCRIPT = (
+    Path(__file__).resolve().parents[2]
+    / "app"
+    / "database"
+    / "sql"
+    / "01_ltree_path_maintenance.sql"
+)
+
+# update_attribute_node_ltree_path() before windx.ltree_rewrite was honored
+PREVIOUS_FUNCTION = """
+CREATE OR REPLACE FUNCTION update_attribute_node_ltree_path()
+RETURNS TRIGGER AS $$
+DECLARE
+    parent_path LTREE;
+    old_path LTREE;
+    new_path LTREE;
+BEGIN
+    -- Handle INSERT or UPDATE
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND (NEW.parent_node_id IS DISTINCT FROM OLD.parent_node_id OR NEW.name IS DISTINCT FROM OLD.name)) THEN
+
+        -- If node has no parent, it's a root node
+        IF NEW.parent_node_id IS NULL THEN
+            -- Root node: path is just the node's name (sanitized)
+            NEW.ltree_path = text2ltree(regexp_replace(lower(NEW.name), '[^a-z0-9_]', '_', 'g'));
+        ELSE
+            -- Get parent's path
+            SELECT ltree_path INTO parent_path
+            FROM attribute_nodes
+            WHERE id = NEW.parent_node_id;
+
+            IF parent_path IS NULL THEN
+                RAISE EXCEPTION 'Parent node % does not exist or has no ltree_path', NEW.parent_node_id;
+            END IF;
+
+            -- Child node: parent_path + sanitized node name
+            NEW.ltree_path = parent_path || text2ltree(regexp_replace(lower(NEW.name), '[^a-z0-9_]', '_', 'g'));
+        END IF;
+
+        -- If this is an UPDATE and the path changed, update all descendants
+        IF TG_OP = 'UPDATE' AND OLD.ltree_path IS DISTINCT FROM NEW.ltree_path THEN
+            old_path := OLD.ltree_path;
+            new_path := NEW.ltree_path;
+
+            -- Update all descendant paths
+            UPDATE attribute_nodes
+            SET ltree_path = new_path || subltree(ltree_path, nlevel(old_path), nlevel(ltree_path))
+            WHERE ltree_path <@ old_path AND id != NEW.id;
+        END IF;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_COMMENT = """
+COMMENT ON FUNCTION update_attribute_node_ltree_path() IS
+'Automatically maintains ltree_path field based on parent_node_id and name.
+When a node is moved (parent_node_id changes), all descendant paths are updated recursively.';
+"""
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # Subtree moves set windx.ltree_rewrite; the previous function cascades
+    # into the rows the move statement rewrites and PostgreSQL rejects it
+    op.execute(TRIGGER_SCRIPT.read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.execute(PREVIOUS_FUNCTION)
+    op.execute(PREVIOUS_COMMENT)
@@ -0,0 +1,90 @@
+"""reinstall_price_history_trigger
+
+Revision ID: d8a3f6c1e257
+Revises: c5f0e2b8d41a
+Create Date: 2026-10-17 14:09:47.902615
+
+"""
+
+from collections.abc import Sequence
+from pathlib import Path
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d8a3f6c1e257"
+down_revision: str | None = "c5f0e2b8d41a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_SCRIPT = (
+    Path(__file__).resolve().parents[2] / "app" / "database" / "sql" / "03_price_history.sql"
+)
+
+# log_configuration_price_change() before windx.price_change_reason was read
+PREVIOUS_FUNCTION = """
+CREATE OR REPLACE FUNCTION log_configuration_price_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Only log if price or weight actually changed
+    IF (OLD.total_price IS DISTINCT FROM NEW.total_price) OR
+       (OLD.base_price IS DISTINCT FROM NEW.base_price) OR
+       (OLD.calculated_weight IS DISTINCT FROM NEW.calculated_weight) THEN
+
+        -- Insert into audit/history table (if it exists)
+        -- Note: This assumes a configuration_price_history table exists
+        -- If not, this will fail gracefully and can be created later
+        BEGIN
+            INSERT INTO configuration_price_history (
+                configuration_id,
+                old_base_price,
+                new_base_price,
+                old_total_price,
+                new_total_price,
+                old_calculated_weight,
+                new_calculated_weight,
+                change_reason,
+                changed_at,
+                changed_by
+            ) VALUES (
+                NEW.id,
+                OLD.base_price,
+                NEW.base_price,
+                OLD.total_price,
+                NEW.total_price,
+                OLD.calculated_weight,
+                NEW.calculated_weight,
+                'Automatic update from configuration change',
+                NOW(),
+                CURRENT_USER
+            );
+        EXCEPTION
+            WHEN undefined_table THEN
+                -- Table doesn't exist yet, skip logging
+                -- This allows the trigger to be created before the history table
+                NULL;
+        END;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_COMMENT = """
+COMMENT ON FUNCTION log_configuration_price_change() IS
+'Automatically logs price and weight changes for configurations.
+Records old and new values in configuration_price_history table for audit trail.';
+"""
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # Bulk repricing records its change reason through windx.price_change_reason
+    op.execute(TRIGGER_SCRIPT.read_text(encoding="utf-8"))
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.execute(PREVIOUS_FUNCTION)
+    op.execute(PREVIOUS_COMMENT)
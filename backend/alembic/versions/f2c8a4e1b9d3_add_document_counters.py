@@ -0,0 +1,61 @@
+"""add_document_counters
+
+Revision ID: f2c8a4e1b9d3
+Revises: d3e80a73ebc5
+Create Date: 2026-10-16 14:03:47.210358
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8a4e1b9d3"
+down_revision: str | None = "d3e80a73ebc5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Prefix, table and number column of every counter-numbered document
+NUMBERED_DOCUMENTS = (
+    ("Q", "quotes", "quote_number"),
+    ("O", "orders", "order_number"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table(
+        "document_counters",
+        sa.Column("prefix", sa.String(length=10), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("prefix", "day"),
+    )
+
+    # Continue every day's numbering after the highest number already issued
+    for prefix, table, column in NUMBERED_DOCUMENTS:
+        op.execute(
+            f"""
+            INSERT INTO document_counters (prefix, day, value)
+            SELECT '{prefix}',
+                   to_date(split_part({column}, '-', 2), 'YYYYMMDD'),
+                   max(split_part({column}, '-', 3)::bigint)
+            FROM {table}
+            WHERE {column} ~ '^{prefix}-[0-9]{{8}}-[0-9]+$'
+            GROUP BY 2
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_table("document_counters")
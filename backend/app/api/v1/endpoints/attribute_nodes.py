@@ -10,16 +10,17 @@ Features:
     - List attribute nodes with filters
     - Get attribute node by ID
     - Get direct children of a node
-    - Get full subtree of descendants
+    - Get full subtree of descendants, precomputed JSON served compressed
     - Create new attribute node (superuser only)
     - Update attribute node (superuser only)
+    - Price and weight formulas validated and normalized before storage
     - Delete attribute node (superuser only)
     - OpenAPI documentation with examples
 """
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from pydantic import PositiveInt
 
 from app.api.types import CurrentSuperuser, CurrentUser, DBSession
@@ -34,6 +35,7 @@ from app.schemas.attribute_node import (
     AttributeNodeUpdate,
 )
 from app.schemas.responses import get_common_responses
+from app.services.formula_analysis import FORMULA_FIELDS, prepare_node_formulas
 
 __all__ = ["router"]
 
@@ -282,6 +284,9 @@ async def get_attribute_node_children(
                 }
             },
         },
+        304: {
+            "description": "Subtree unchanged since the ETag sent in If-None-Match",
+        },
         404: {
             "description": "Attribute node not found",
         },
@@ -290,27 +295,33 @@ async def get_attribute_node_children(
 )
 async def get_attribute_node_tree(
     node_id: PositiveInt,
+    request: Request,
     current_user: CurrentUser,
     db: DBSession,
-) -> list[AttributeNodeTree]:
+) -> Response:
     """Get full subtree of descendants using LTREE.
 
     Returns a hierarchical tree structure with all descendants
-    organized by parent-child relationships.
+    organized by parent-child relationships. The JSON is serialized
+    once per tree version and served in the smallest encoding the
+    client accepts.
 
     Args:
         node_id (PositiveInt): Root node ID
+        request (Request): Request, for content negotiation
         current_user (User): Current authenticated user
         db (AsyncSession): Database session
 
     Returns:
-        list[AttributeNodeTree]: Hierarchical tree structure
+        Response: Hierarchical tree structure (list[AttributeNodeTree] JSON),
+            or 304 Not Modified if the client's copy is current
 
     Raises:
         NotFoundException: If node not found
     """
     from app.core.exceptions import NotFoundException
     from app.repositories.attribute_node import AttributeNodeRepository
+    from app.services.tree_export import get_tree_export
 
     attr_node_repo = AttributeNodeRepository(db)
 
@@ -319,12 +330,17 @@ async def get_attribute_node_tree(
     if not node:
         raise NotFoundException("Attribute node not found")
 
-    # Get all descendants using LTREE
-    descendants = await attr_node_repo.get_descendants(node_id)
+    # Serialized subtree, shared until the tree changes
+    export = await get_tree_export(db, node)
+
+    headers = {"ETag": export.etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == export.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    # Build tree structure
-    tree = attr_node_repo.build_tree([node] + descendants)
-    return tree
+    body, encoding = export.encode(request.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post(
@@ -339,6 +355,9 @@ async def get_attribute_node_tree(
         201: {
             "description": "Attribute node successfully created",
         },
+        400: {
+            "description": "Invalid price or weight formula",
+        },
         404: {
             "description": "Parent node or manufacturing type not found",
         },
@@ -364,6 +383,7 @@ async def create_attribute_node(
         AttributeNode: Created attribute node
 
     Raises:
+        InvalidFormulaException: If the price or weight formula is invalid
         NotFoundException: If parent or manufacturing type not found
         AuthorizationException: If user is not superuser
 
@@ -397,6 +417,11 @@ async def create_attribute_node(
         if not parent:
             raise NotFoundException("Parent node not found")
 
+    # Store formulas in their validated, normalized form
+    node_in = node_in.model_copy(
+        update=prepare_node_formulas(node_in.model_dump(include=set(FORMULA_FIELDS)))
+    )
+
     # Create attribute node (LTREE path calculated automatically)
     node = await attr_node_repo.create(node_in)
     await db.commit()
@@ -416,6 +441,9 @@ async def create_attribute_node(
         200: {
             "description": "Attribute node successfully updated",
         },
+        400: {
+            "description": "Invalid price or weight formula",
+        },
         404: {
             "description": "Attribute node not found",
         },
@@ -443,6 +471,7 @@ async def update_attribute_node(
         AttributeNode: Updated attribute node
 
     Raises:
+        InvalidFormulaException: If the price or weight formula is invalid
         NotFoundException: If node not found
         AuthorizationException: If user is not superuser
 
@@ -463,6 +492,13 @@ async def update_attribute_node(
     if not node:
         raise NotFoundException("Attribute node not found")
 
+    # Store formulas in their validated, normalized form
+    node_update = node_update.model_copy(
+        update=prepare_node_formulas(
+            node_update.model_dump(include=set(FORMULA_FIELDS), exclude_unset=True)
+        )
+    )
+
     # Update node
     updated_node = await attr_node_repo.update(node, node_update)
     await db.commit()
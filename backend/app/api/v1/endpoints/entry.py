@@ -7,10 +7,13 @@ Public Variables:
     router: FastAPI router for entry page endpoints
 
 Features:
-    - Profile form schema generation
+    - Profile form schema generation with ETag revalidation
     - Profile data saving and loading
     - Real-time preview generation
-    - Conditional field visibility evaluation
+    - Streaming keyset-paginated previews (NDJSON or chunked JSON)
+    - Streaming CSV and XLSX profile sheet exports
+    - Bulk profile sheet CSV imports with per-row errors
+    - Conditional field visibility evaluation, single or batched
     - HTML page rendering for entry pages
     - Authentication and authorization
     - Comprehensive error handling
@@ -18,8 +21,22 @@ Features:
 
 from __future__ import annotations
 
-from typing import Annotated, Any
-from fastapi import APIRouter, File as FastAPIFile, HTTPException, UploadFile, status
+import json
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, Literal
+
+from fastapi import (
+    APIRouter,
+    Body,
+    File as FastAPIFile,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import PositiveInt
 
 from app.api.types import CurrentUser, DBSession
@@ -29,6 +46,7 @@ from app.schemas.entry import (
     InlineEditRequest,
     PreviewTable,
     ProfileEntryData,
+    ProfileImportResult,
     ProfilePreviewData,
     ProfileSchema,
 )
@@ -79,6 +97,9 @@ router = APIRouter(
                 }
             },
         },
+        304: {
+            "description": "Schema unchanged since the ETag sent in If-None-Match",
+        },
         404: {
             "description": "Manufacturing type not found",
         },
@@ -90,30 +111,42 @@ async def get_profile_schema(
     current_user: CurrentUser,
     db: DBSession,
     page_type: str = "profile",
-) -> ProfileSchema:
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     """Get profile form schema for a manufacturing type.
 
     Generates dynamic form schema based on the attribute hierarchy
-    defined for the specified manufacturing type.
+    defined for the specified manufacturing type. The schema is compiled
+    once per attribute tree version and returned with an ETag; clients
+    sending it back in If-None-Match get 304 Not Modified until the tree
+    changes.
 
     Args:
         manufacturing_type_id (PositiveInt): Manufacturing type ID
         current_user (User): Current authenticated user
         db (AsyncSession): Database session
+        page_type (str): Requested page type (profile, accessories, glazing)
+        if_none_match (str | None): ETag of the client's cached schema
 
     Returns:
-        ProfileSchema: Generated form schema with sections and conditional logic
+        Response: Form schema JSON with sections and conditional logic,
+            or 304 if the client's copy is current
 
     Raises:
         NotFoundException: If manufacturing type not found
 
     Example:
         GET /api/v1/entry/profile/schema/1
+        If-None-Match: "3f1c9a..."
     """
     from app.services.entry import EntryService
 
     entry_service = EntryService(db)
-    return await entry_service.get_profile_schema(manufacturing_type_id, page_type)
+    compiled = await entry_service.get_compiled_profile_schema(manufacturing_type_id, page_type)
+    headers = {"ETag": compiled.etag, "Cache-Control": "private, no-cache"}
+    if compiled.matches(if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=compiled.body, media_type="application/json", headers=headers)
 
 
 @router.post(
@@ -333,11 +366,14 @@ async def evaluate_display_conditions(
     current_user: CurrentUser,
     db: DBSession,
     page_type: str = "profile",
+    changed_fields: Annotated[list[str] | None, Query()] = None,
 ):
     """Evaluate display conditions for conditional field visibility.
 
     Evaluates all conditional display rules against the current form data
-    to determine which fields should be visible.
+    to determine which fields should be visible. When the changed fields
+    are given, only fields that depend on them are re-evaluated and
+    returned, for the client to merge into its previous map.
 
     Args:
         manufacturing_type_id (PositiveInt): Manufacturing type ID
@@ -345,9 +381,12 @@ async def evaluate_display_conditions(
         current_user (User): Current authenticated user
         db (AsyncSession): Database session
         page_type (str): Requested page type (profile, accessories, glazing)
+        changed_fields (list[str] | None): Fields changed since the last
+            evaluation; omit to evaluate every field
 
     Returns:
-        dict[str, bool]: Field visibility map
+        dict[str, bool]: Field visibility map, or the visibility of the
+            fields affected by changed_fields
 
     Example:
         POST /api/v1/entry/profile/evaluate-conditions?page_type=glazing
@@ -357,12 +396,64 @@ async def evaluate_display_conditions(
                 "glass_layers": 2
             }
         }
+
+        POST /api/v1/entry/profile/evaluate-conditions?changed_fields=type
+        {"type": "Sash", "opening_system": "Casement"}
+    """
+    from app.services.entry import EntryService
+
+    entry_service = EntryService(db)
+    schema = await entry_service.get_compiled_profile_schema(manufacturing_type_id, page_type)
+    return await entry_service.evaluate_display_conditions(form_data, schema, changed_fields)
+
+
+@router.post(
+    "/profile/evaluate-conditions/batch",
+    summary="Evaluate Display Conditions in Batch",
+    description="Evaluate conditional field visibility for many form states at once",
+    response_description="Field visibility map per form state",
+    operation_id="evaluateDisplayConditionsBatch",
+    responses={
+        200: {
+            "description": "Successfully evaluated conditions",
+        },
+        **get_common_responses(401, 422, 500),
+    },
+)
+async def evaluate_display_conditions_batch(
+    manufacturing_type_id: PositiveInt,
+    form_states: Annotated[list[dict[str, Any]], Body(min_length=1, max_length=1000)],
+    current_user: CurrentUser,
+    db: DBSession,
+    page_type: str = "profile",
+) -> list[dict[str, bool]]:
+    """Evaluate display conditions for many form states.
+
+    The schema and its compiled conditions are loaded once and applied to
+    every posted form state.
+
+    Args:
+        manufacturing_type_id (PositiveInt): Manufacturing type ID
+        form_states (list[dict]): Form data per state (at most 1000)
+        current_user (User): Current authenticated user
+        db (AsyncSession): Database session
+        page_type (str): Requested page type (profile, accessories, glazing)
+
+    Returns:
+        list[dict[str, bool]]: Field visibility map per form state, in order
+
+    Example:
+        POST /api/v1/entry/profile/evaluate-conditions/batch?manufacturing_type_id=1
+        [
+            {"type": "Frame", "opening_system": "Sliding"},
+            {"type": "Sash"}
+        ]
     """
     from app.services.entry import EntryService
 
     entry_service = EntryService(db)
-    schema = await entry_service.get_profile_schema(manufacturing_type_id, page_type)
-    return await entry_service.evaluate_display_conditions(form_data, schema)
+    schema = await entry_service.get_compiled_profile_schema(manufacturing_type_id, page_type)
+    return await entry_service.evaluate_display_conditions_batch(form_states, schema)
 
 
 @router.get(
@@ -426,6 +517,251 @@ async def list_profile_previews(
 
 
 
+@router.get(
+    "/profile/previews/{manufacturing_type_id}/stream",
+    response_class=StreamingResponse,
+    summary="Stream Profile Previews",
+    description=(
+        "Stream profile configuration previews page by page, filtered and sorted "
+        "by header columns on the server"
+    ),
+    operation_id="streamProfilePreviews",
+    responses={
+        200: {
+            "description": "Preview rows streamed as they are built",
+            "content": {
+                "application/x-ndjson": {
+                    "example": (
+                        '{"headers": ["id", "Name", "Material"]}\n'
+                        '{"row": {"id": 7, "Name": "Frame A", "Material": "Aluminum"}}\n'
+                        '{"next_cursor": "WyJ1cGRhdGVkX2F0Ii...", "count": 1}\n'
+                    )
+                },
+                "application/json": {
+                    "example": {
+                        "headers": ["id", "Name", "Material"],
+                        "rows": [{"id": 7, "Name": "Frame A", "Material": "Aluminum"}],
+                        "next_cursor": None,
+                        "count": 1,
+                    }
+                },
+            },
+        },
+        422: {
+            "description": "Unknown filter or sort column, or invalid cursor",
+        },
+    },
+)
+async def stream_profile_previews(
+    manufacturing_type_id: PositiveInt,
+    current_user: CurrentUser,
+    db: DBSession,
+    page_type: str = "profile",
+    format: Annotated[
+        Literal["ndjson", "json"],
+        Query(description="ndjson: one JSON object per line; json: one chunked document"),
+    ] = "ndjson",
+    sort: Annotated[
+        str | None, Query(description="Header to sort by (default: last update time)")
+    ] = None,
+    order: Annotated[Literal["asc", "desc"], Query(description="Sort direction")] = "desc",
+    filter: Annotated[
+        list[str] | None,
+        Query(description="Header filters as 'Header:text' (case-insensitive contains)"),
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor of a previous response to continue")
+    ] = None,
+    limit: Annotated[
+        int | None, Query(ge=1, description="Maximum rows to stream (default: all)")
+    ] = None,
+) -> StreamingResponse:
+    """Stream profile configuration previews.
+
+    Rows are read from the database one page at a time by (sort value, id)
+    keyset and written to the response as soon as they are built, so the
+    grid can render the first rows immediately and worker memory stays flat
+    however large the table is. When ``limit`` cuts the stream short, the
+    last object carries the cursor to request the following rows.
+
+    Args:
+        manufacturing_type_id (PositiveInt): Manufacturing type ID
+        current_user (User): Current authenticated user
+        db (AsyncSession): Database session
+        page_type (str): Requested page type (profile, accessories, glazing)
+        format (str): Output format (ndjson, json)
+        sort (str | None): Header to sort by
+        order (str): Sort direction (asc, desc)
+        filter (list[str] | None): Header filters as "Header:text"
+        cursor (str | None): Cursor to continue after
+        limit (int | None): Maximum rows to stream
+
+    Returns:
+        StreamingResponse: NDJSON lines (headers, one per row, then
+            next_cursor) or a chunked JSON document
+
+    Raises:
+        ValidationException: If a filter or sort header is unknown or the
+            cursor is invalid
+
+    Example:
+        GET /api/v1/entry/profile/previews/1/stream?sort=Width&order=asc&filter=Material:alu&limit=200
+    """
+    from app.services.entry import EntryService
+
+    filters: dict[str, str] = {}
+    for item in filter or []:
+        header, separator, value = item.partition(":")
+        if not separator:
+            raise ValidationException(f"Invalid filter '{item}', expected 'Header:text'")
+        filters[header] = value
+
+    entry_service = EntryService(db)
+    stream = await entry_service.stream_previews(
+        manufacturing_type_id,
+        current_user,
+        page_type,
+        filters=filters,
+        sort=sort,
+        descending=order == "desc",
+        cursor=cursor,
+        limit=limit,
+    )
+
+    def dumps(value: Any) -> str:
+        return json.dumps(value, default=str, separators=(",", ":"))
+
+    async def ndjson() -> AsyncIterator[str]:
+        yield dumps({"headers": stream.headers}) + "\n"
+        async for row in stream:
+            yield dumps({"row": row}) + "\n"
+        yield dumps({"next_cursor": stream.next_cursor, "count": stream.count}) + "\n"
+
+    async def chunked_json() -> AsyncIterator[str]:
+        yield '{"headers":' + dumps(stream.headers) + ',"rows":['
+        separator = ""
+        async for row in stream:
+            yield separator + dumps(row)
+            separator = ","
+        yield '],"next_cursor":' + dumps(stream.next_cursor)
+        yield ',"count":' + dumps(stream.count) + "}"
+
+    if format == "json":
+        return StreamingResponse(chunked_json(), media_type="application/json")
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/profile/export/{manufacturing_type_id}",
+    response_class=StreamingResponse,
+    summary="Export Profile Sheet",
+    description="Download every profile configuration as a CSV or XLSX sheet",
+    operation_id="exportProfileSheet",
+    responses={
+        200: {
+            "description": "Profile sheet streamed as it is read",
+            "content": {
+                "text/csv": {"example": "id,Name,Material\n7,Frame A,Aluminum\n"},
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {},
+            },
+        },
+    },
+)
+async def export_profile_sheet(
+    manufacturing_type_id: PositiveInt,
+    current_user: CurrentUser,
+    db: DBSession,
+    page_type: str = "profile",
+    format: Annotated[Literal["csv", "xlsx"], Query(description="File format")] = "csv",
+) -> StreamingResponse:
+    """Export the profile sheet of a manufacturing type.
+
+    The sheet has the preview table's columns and is streamed straight from
+    a server-side database cursor, so downloads start immediately and
+    worker memory stays flat however many configurations there are. Rows,
+    bytes and throughput are logged when the download finishes.
+
+    Args:
+        manufacturing_type_id (PositiveInt): Manufacturing type ID
+        current_user (User): Current authenticated user
+        db (AsyncSession): Database session
+        page_type (str): Requested page type (profile, accessories, glazing)
+        format (str): File format (csv, xlsx)
+
+    Returns:
+        StreamingResponse: CSV or XLSX file download
+
+    Example:
+        GET /api/v1/entry/profile/export/1?format=xlsx
+    """
+    from app.services.entry import EntryService
+
+    entry_service = EntryService(db)
+    export = await entry_service.export_previews(
+        manufacturing_type_id, current_user, page_type, format=format
+    )
+    return StreamingResponse(
+        export,
+        media_type=export.media_type,
+        headers={"Content-Disposition": f"attachment; filename={export.filename}"},
+    )
+
+
+@router.post(
+    "/profile/import/{manufacturing_type_id}",
+    response_model=ProfileImportResult,
+    summary="Import Profile Sheet",
+    description=(
+        "Create profile configurations from a CSV in the profile sheet format; "
+        "invalid rows are reported without aborting the import"
+    ),
+    operation_id="importProfileSheet",
+    responses={
+        200: {"description": "Import finished; rejected rows are listed in errors"},
+        404: {"description": "Manufacturing type not found"},
+        422: {"description": "Missing header row or unknown columns"},
+    },
+)
+async def import_profile_sheet(
+    manufacturing_type_id: PositiveInt,
+    current_user: CurrentUser,
+    db: DBSession,
+    file: UploadFile = FastAPIFile(..., description="CSV with the profile sheet header row"),
+    page_type: str = "profile",
+) -> ProfileImportResult:
+    """Import a profile sheet CSV.
+
+    Accepts the format of the profile sheet export. The ``id`` column is
+    ignored and "N/A" cells are read as empty. Rows are validated with the
+    same rules as the entry form and written in batches.
+
+    Args:
+        manufacturing_type_id (PositiveInt): Manufacturing type to import into
+        current_user (User): Current authenticated user
+        db (AsyncSession): Database session
+        file (UploadFile): CSV file
+        page_type (str): Requested page type (profile, accessories, glazing)
+
+    Returns:
+        ProfileImportResult: Counts, row errors and throughput of the import
+
+    Raises:
+        NotFoundException: If manufacturing type not found
+        ValidationException: If the CSV has no header row or unknown columns
+
+    Example:
+        curl -F file=@profiles.csv /api/v1/entry/profile/import/1
+    """
+    import io
+
+    from app.services.profile_import import ProfileImportService
+
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    return await ProfileImportService(db).import_csv(
+        manufacturing_type_id, current_user, lines, page_type
+    )
+
+
 @router.patch(
     "/profile/preview/{configuration_id}/update-cell",
     response_model=Configuration,
@@ -13,8 +13,7 @@ Features:
     - Permission-based access control
 """
 
-import csv
-import io
+from collections.abc import Iterator
 from datetime import datetime
 
 from fastapi import APIRouter
@@ -22,6 +21,7 @@ from fastapi.responses import StreamingResponse
 
 from app.api.types import CurrentSuperuser, CurrentUser, DBSession
 from app.schemas.responses import get_common_responses
+from app.services.profile_export import CsvSheetWriter
 from app.services.user import UserService
 
 __all__ = ["router"]
@@ -189,47 +189,40 @@ async def export_users_csv(
     user_service = UserService(db)
     users = await user_service.list_users()
 
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow(
-        [
-            "id",
-            "email",
-            "username",
-            "full_name",
-            "is_active",
-            "is_superuser",
-            "created_at",
-            "updated_at",
-        ]
-    )
+    columns = [
+        "id",
+        "email",
+        "username",
+        "full_name",
+        "is_active",
+        "is_superuser",
+        "created_at",
+        "updated_at",
+    ]
+
+    def rows() -> Iterator[bytes]:
+        # Encode row by row instead of building the whole file in memory
+        writer = CsvSheetWriter()
+        yield writer.write_rows([columns])
+        for user in users:
+            yield writer.write_rows(
+                [
+                    [
+                        user.id,
+                        user.email,
+                        user.username,
+                        user.full_name or "",
+                        user.is_active,
+                        user.is_superuser,
+                        user.created_at.isoformat(),
+                        user.updated_at.isoformat(),
+                    ]
+                ]
+            )
 
-    # Write data
-    for user in users:
-        writer.writerow(
-            [
-                user.id,
-                user.email,
-                user.username,
-                user.full_name or "",
-                user.is_active,
-                user.is_superuser,
-                user.created_at.isoformat(),
-                user.updated_at.isoformat(),
-            ]
-        )
-
-    # Get CSV content
-    output.seek(0)
-    csv_content = output.getvalue()
-
-    # Create streaming response
     return StreamingResponse(
-        iter([csv_content]),
-        media_type="text/csv",
+        rows(),
+        media_type=CsvSheetWriter.media_type,
         headers={
             "Content-Disposition": f"attachment; filename=users_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
         },
@@ -12,6 +12,7 @@ Features:
     - Create new manufacturing type (superuser only)
     - Update manufacturing type (superuser only)
     - Delete/deactivate manufacturing type (superuser only)
+    - Bulk reprice all configurations of a type (superuser only)
     - OpenAPI documentation with examples
 """
 
@@ -28,7 +29,11 @@ from app.models.manufacturing_type import ManufacturingType
 from app.schemas.manufacturing_type import (
     ManufacturingType as ManufacturingTypeSchema,
 )
-from app.schemas.manufacturing_type import ManufacturingTypeCreate, ManufacturingTypeUpdate
+from app.schemas.manufacturing_type import (
+    ManufacturingTypeCreate,
+    ManufacturingTypeUpdate,
+    RepricingResult,
+)
 from app.schemas.responses import get_common_responses
 
 __all__ = ["router"]
@@ -456,3 +461,72 @@ async def delete_manufacturing_type(
     # Soft delete by deactivating
     mfg_type.is_active = False
     await db.commit()
+
+
+@router.post(
+    "/{type_id}/reprice",
+    response_model=RepricingResult,
+    summary="Reprice Manufacturing Type",
+    description="Recalculate total price and weight of every configuration of a manufacturing type (superuser only). Use after changing attribute node pricing.",
+    response_description="Repricing summary with throughput",
+    operation_id="repriceManufacturingType",
+    responses={
+        200: {
+            "description": "Configurations successfully repriced",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "manufacturing_type_id": 1,
+                        "configurations": 12000,
+                        "selections": 96000,
+                        "updated": 11873,
+                        "unchanged": 127,
+                        "failed": 0,
+                        "errors": [],
+                        "dry_run": False,
+                        "duration_seconds": 1.84,
+                        "configs_per_second": 6521.7,
+                    }
+                }
+            },
+        },
+        404: {
+            "description": "Manufacturing type not found",
+            "content": {
+                "application/json": {"example": {"message": "ManufacturingType not found"}}
+            },
+        },
+        **get_common_responses(401, 403, 500),
+    },
+)
+async def reprice_manufacturing_type(
+    type_id: PositiveInt,
+    current_superuser: CurrentSuperuser,
+    db: DBSession,
+    dry_run: Annotated[
+        bool,
+        Query(description="Calculate new totals without writing them"),
+    ] = False,
+) -> RepricingResult:
+    """Reprice all configurations of a manufacturing type (superuser only).
+
+    Args:
+        type_id (PositiveInt): Manufacturing type ID
+        current_superuser (User): Current authenticated superuser
+        db (AsyncSession): Database session
+        dry_run (bool): Calculate new totals without writing them
+
+    Returns:
+        RepricingResult: Repricing summary
+
+    Raises:
+        NotFoundException: If manufacturing type not found
+        AuthorizationException: If user is not superuser
+
+    Example:
+        POST /api/v1/manufacturing-types/1/reprice?dry_run=true
+    """
+    from app.services.repricing import BulkRepricingService
+
+    repricing_service = BulkRepricingService(db)
+    return await repricing_service.reprice_manufacturing_type(type_id, dry_run=dry_run)
@@ -5,9 +5,14 @@ database connection pool statistics and other performance indicators.
 
 Public Functions:
     database_metrics: Get database connection pool metrics
+    pricing_metrics: Get formula, pricing plan and price quote cache metrics
+    entry_metrics: Get form schema, header, tree snapshot and tree version metrics
 
 Features:
     - Database connection pool monitoring
+    - Pricing cache hit/miss counters
+    - Entry page schema, header, tree snapshot and tree export cache hit/miss counters
+    - Attribute tree version listener state
     - Superuser-only access for security
     - Real-time metrics (no caching)
     - Comprehensive OpenAPI documentation
@@ -21,8 +26,16 @@ from sqlalchemy.pool import QueuePool
 from app.api.types import CurrentSuperuser
 from app.database.connection import get_engine
 from app.schemas.responses import get_common_responses
+from app.services.formula_engine import get_formula_cache
+from app.services.header_registry import get_header_registry
+from app.services.price_cache import get_price_quote_cache
+from app.services.pricing_plan import get_pricing_plan_cache
+from app.services.schema_cache import get_profile_schema_cache
+from app.services.tree_export import get_tree_export_cache
+from app.services.tree_snapshot import get_tree_snapshot_cache
+from app.services.tree_versions import get_tree_versions
 
-__all__ = ["router", "database_metrics"]
+__all__ = ["router", "database_metrics", "pricing_metrics", "entry_metrics"]
 
 router = APIRouter(
     tags=["Metrics"],
@@ -97,3 +110,160 @@ async def database_metrics(
         "overflow": overflow,
         "total_connections": pool_size + overflow,
     }
+
+
+@router.get(
+    "/pricing",
+    status_code=status.HTTP_200_OK,
+    summary="Get Pricing Cache Metrics",
+    description=(
+        "Retrieve hit/miss counters of this worker's compiled formula cache, "
+        "pricing plan cache and price quote cache. This endpoint is restricted "
+        "to superusers only."
+    ),
+    response_description="Pricing cache metrics",
+    operation_id="getPricingMetrics",
+    responses={
+        200: {
+            "description": "Pricing metrics retrieved successfully",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "formula_cache": {"size": 42, "maxsize": 1024, "hits": 900, "misses": 42},
+                        "plan_cache": {"size": 3, "maxsize": 64, "hits": 410, "misses": 5},
+                        "price_cache": {
+                            "size": 120,
+                            "maxsize": 10000,
+                            "hits": 310,
+                            "redis_hits": 25,
+                            "misses": 120,
+                            "hit_rate": 0.7363,
+                            "invalidations": 2,
+                            "redis": True,
+                        },
+                    }
+                }
+            },
+        },
+        **get_common_responses(401, 403, 500),
+    },
+)
+async def pricing_metrics(
+    current_superuser: CurrentSuperuser,
+) -> dict[str, dict]:
+    """Get pricing cache metrics.
+
+    Args:
+        current_superuser (User): Current authenticated superuser
+
+    Returns:
+        dict[str, dict]: Dictionary containing:
+            - formula_cache: Compiled formula cache statistics
+            - plan_cache: Pricing plan cache statistics
+            - price_cache: Price quote cache statistics
+    """
+    return {
+        "formula_cache": get_formula_cache().get_stats(),
+        "plan_cache": get_pricing_plan_cache().get_stats(),
+        "price_cache": get_price_quote_cache().get_stats(),
+    }
+
+
+@router.get(
+    "/entry",
+    status_code=status.HTTP_200_OK,
+    summary="Get Entry Page Cache Metrics",
+    description=(
+        "Retrieve hit/miss counters of this worker's compiled form schema cache, "
+        "preview header registry and attribute tree snapshot cache, and the state "
+        "of its attribute tree version listener. This endpoint is restricted to "
+        "superusers only."
+    ),
+    response_description="Entry page cache metrics",
+    operation_id="getEntryMetrics",
+    responses={
+        200: {
+            "description": "Entry metrics retrieved successfully",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "schema_cache": {
+                            "size": 4,
+                            "maxsize": 256,
+                            "hits": 120,
+                            "redis_hits": 3,
+                            "misses": 4,
+                            "hit_rate": 0.9685,
+                            "invalidations": 1,
+                            "redis": True,
+                        },
+                        "header_registry": {
+                            "size": 4,
+                            "maxsize": 512,
+                            "ttl": 300,
+                            "hits": 480,
+                            "misses": 6,
+                            "hit_rate": 0.9877,
+                            "expired": 1,
+                            "stale": 1,
+                            "evictions": 0,
+                        },
+                        "tree_snapshots": {
+                            "size": 3,
+                            "maxsize": 32,
+                            "nodes": 5120,
+                            "hits": 640,
+                            "misses": 5,
+                            "hit_rate": 0.9922,
+                            "stale": 2,
+                            "evictions": 0,
+                        },
+                        "tree_exports": {
+                            "size": 12,
+                            "maxsize": 128,
+                            "bytes": 2457600,
+                            "hits": 310,
+                            "misses": 14,
+                            "hit_rate": 0.9568,
+                            "stale": 2,
+                            "evictions": 0,
+                        },
+                        "tree_versions": {
+                            "listening": True,
+                            "known": 3,
+                            "hits": 1290,
+                            "misses": 4,
+                            "hit_rate": 0.9969,
+                            "notifications": 7,
+                            "resets": 1,
+                        },
+                    }
+                }
+            },
+        },
+        **get_common_responses(401, 403, 500),
+    },
+)
+async def entry_metrics(
+    current_superuser: CurrentSuperuser,
+) -> dict[str, dict]:
+    """Get entry page cache metrics.
+
+    Args:
+        current_superuser (User): Current authenticated superuser
+
+    Returns:
+        dict[str, dict]: Dictionary containing:
+            - schema_cache: Compiled form schema cache statistics
+            - header_registry: Preview header registry statistics
+            - tree_snapshots: Attribute tree snapshot cache statistics
+            - tree_exports: Serialized attribute subtree cache statistics
+            - tree_versions: Attribute tree version registry statistics
+    """
+    return {
+        "schema_cache": get_profile_schema_cache().get_stats(),
+        "header_registry": get_header_registry().get_stats(),
+        "tree_snapshots": get_tree_snapshot_cache().get_stats(),
+        "tree_exports": get_tree_export_cache().get_stats(),
+        "tree_versions": get_tree_versions().get_stats(),
+    }
@@ -9,6 +9,7 @@ Features:
     - List user's quotes with pagination
     - Get quote by ID
     - Generate quote from configuration
+    - Generate quotes for many configurations in one request
     - Authorization checks (users see only their own)
     - OpenAPI documentation with examples
 """
@@ -24,7 +25,7 @@ from app.api.types import CurrentUser, DBSession
 from app.core.pagination import Page, PaginationParams, create_pagination_params
 from app.models.quote import Quote
 from app.schemas.quote import Quote as QuoteSchema
-from app.schemas.quote import QuoteCreateRequest
+from app.schemas.quote import QuoteBatchCreateRequest, QuoteCreateRequest
 from app.schemas.responses import get_common_responses
 
 __all__ = ["router"]
@@ -260,3 +261,63 @@ async def create_quote(
 
     quote_service = QuoteService(db)
     return await quote_service.create_quote_with_auth(quote_in, current_user)
+
+
+@router.post(
+    "/batch",
+    response_model=list[QuoteSchema],
+    status_code=status.HTTP_201_CREATED,
+    summary="Generate Quotes in Batch",
+    description="Generate quotes for many configurations with bulk price calculation",
+    response_description="Created quotes in configuration ID order",
+    operation_id="createQuotesBatch",
+    responses={
+        201: {
+            "description": "Quotes successfully created",
+        },
+        403: {
+            "description": "Not authorized to create quotes for one or more configurations",
+        },
+        404: {
+            "description": "One or more configurations not found",
+        },
+        **get_common_responses(401, 422, 500),
+    },
+)
+async def create_quotes_batch(
+    batch_in: QuoteBatchCreateRequest,
+    current_user: CurrentUser,
+    db: DBSession,
+) -> list[Quote]:
+    """Generate quotes for many configurations.
+
+    Prices all configurations in one batch, allocates all quote numbers in a
+    single counter update and inserts every quote in one statement. The same
+    tax rate, discount and validity apply to each quote. Either all quotes
+    are created or none is.
+
+    Args:
+        batch_in (QuoteBatchCreateRequest): Batch quote creation data
+        current_user (User): Current authenticated user
+        db (AsyncSession): Database session
+
+    Returns:
+        list[Quote]: Created quotes with calculated pricing
+
+    Raises:
+        NotFoundException: If any configuration is not found
+        AuthorizationException: If user lacks permission for any configuration
+        ValidationException: If tax rate or discount amount is invalid
+
+    Example:
+        POST /api/v1/quotes/batch
+        {
+            "configuration_ids": [123, 124, 125],
+            "tax_rate": "8.50",
+            "discount_amount": "0.00"
+        }
+    """
+    from app.services.quote import QuoteService
+
+    quote_service = QuoteService(db)
+    return await quote_service.create_quotes_with_auth(batch_in, current_user)
@@ -719,6 +719,23 @@ class WindxSettings(BaseSettings):
         formula_timeout_seconds: Maximum execution time for formula evaluation
         formula_allowed_functions: Comma-separated list of allowed formula functions
         formula_max_variables: Maximum number of variables in a formula
+        formula_cache_size: Maximum number of compiled formulas kept per worker
+        repricing_batch_size: Rows written per UPDATE statement during bulk repricing
+        incremental_pricing: Apply single-selection edits as deltas to stored totals
+        price_cache_enabled: Memoize configuration prices by selection fingerprint
+        price_cache_size: Maximum number of memoized prices kept per worker
+        price_cache_ttl: Seconds memoized prices are kept in Redis
+        pricing_plan_cache_size: Maximum number of pricing plans kept per worker
+        number_block_size: Quote/order numbers each worker reserves per counter update
+        schema_cache_size: Maximum number of compiled entry form schemas kept per worker
+        schema_cache_ttl: Seconds compiled entry form schemas are kept in Redis
+        header_registry_size: Maximum number of entry page header sets kept per worker
+        header_registry_ttl: Seconds a worker keeps header sets before reloading them
+        tree_snapshot_cache_size: Maximum number of attribute tree snapshots kept per worker
+        tree_export_cache_size: Maximum number of serialized attribute subtrees kept per worker
+        tree_version_notifications: Listen for attribute tree version notifications
+        import_batch_size: Profile rows validated and inserted per batch during bulk import
+        import_workers: Worker processes validating bulk import rows (0 validates inline)
         snapshot_retention_days: Days to retain configuration snapshots
         snapshot_auto_cleanup: Enable automatic cleanup of old snapshots
         template_track_usage: Enable template usage tracking
@@ -766,6 +783,173 @@ class WindxSettings(BaseSettings):
         ),
     ] = 20
 
+    formula_cache_size: Annotated[
+        int,
+        Field(
+            default=1024,
+            ge=16,
+            le=100000,
+            description="Maximum number of compiled formulas kept in the per-worker LRU cache",
+        ),
+    ] = 1024
+
+    repricing_batch_size: Annotated[
+        int,
+        Field(
+            default=2000,
+            ge=100,
+            le=10000,
+            description="Configurations written per UPDATE statement during bulk repricing",
+        ),
+    ] = 2000
+
+    incremental_pricing: Annotated[
+        bool,
+        Field(
+            default=True,
+            description="Apply single-selection edits as price deltas instead of full recalculation",
+        ),
+    ] = True
+
+    price_cache_enabled: Annotated[
+        bool,
+        Field(
+            default=True,
+            description="Memoize configuration prices keyed by selection fingerprint",
+        ),
+    ] = True
+
+    price_cache_size: Annotated[
+        int,
+        Field(
+            default=10000,
+            ge=0,
+            le=1000000,
+            description="Maximum number of memoized prices kept in the per-worker LRU cache",
+        ),
+    ] = 10000
+
+    price_cache_ttl: Annotated[
+        int,
+        Field(
+            default=3600,
+            ge=60,
+            le=604800,
+            description="Seconds memoized prices are kept in Redis",
+        ),
+    ] = 3600
+
+    pricing_plan_cache_size: Annotated[
+        int,
+        Field(
+            default=64,
+            ge=1,
+            le=10000,
+            description="Maximum number of per-manufacturing-type pricing plans kept per worker",
+        ),
+    ] = 64
+
+    number_block_size: Annotated[
+        int,
+        Field(
+            default=1,
+            ge=1,
+            le=10000,
+            description="Quote and order numbers each worker reserves per counter update",
+        ),
+    ] = 1
+
+    schema_cache_size: Annotated[
+        int,
+        Field(
+            default=256,
+            ge=0,
+            le=100000,
+            description="Maximum number of compiled entry form schemas kept per worker",
+        ),
+    ] = 256
+
+    schema_cache_ttl: Annotated[
+        int,
+        Field(
+            default=3600,
+            ge=60,
+            le=604800,
+            description="Seconds compiled entry form schemas are kept in Redis",
+        ),
+    ] = 3600
+
+    header_registry_size: Annotated[
+        int,
+        Field(
+            default=512,
+            ge=0,
+            le=100000,
+            description="Maximum number of entry page header sets kept per worker",
+        ),
+    ] = 512
+
+    header_registry_ttl: Annotated[
+        int,
+        Field(
+            default=300,
+            ge=1,
+            le=86400,
+            description="Seconds a worker keeps header sets before reloading them",
+        ),
+    ] = 300
+
+    tree_snapshot_cache_size: Annotated[
+        int,
+        Field(
+            default=32,
+            ge=0,
+            le=10000,
+            description="Maximum number of per-manufacturing-type attribute tree snapshots kept per worker",
+        ),
+    ] = 32
+
+    tree_export_cache_size: Annotated[
+        int,
+        Field(
+            default=128,
+            ge=0,
+            le=10000,
+            description="Maximum number of serialized attribute subtrees (JSON and compressed) kept per worker",
+        ),
+    ] = 128
+
+    tree_version_notifications: Annotated[
+        bool,
+        Field(
+            default=True,
+            description=(
+                "Keep attribute tree versions current from PostgreSQL notifications "
+                "(ignored with the transaction pooler, which does not support LISTEN)"
+            ),
+        ),
+    ] = True
+
+    import_batch_size: Annotated[
+        int,
+        Field(
+            default=1000,
+            ge=10,
+            le=10000,
+            description="Profile rows validated and inserted per batch during bulk import",
+        ),
+    ] = 1000
+
+    import_workers: Annotated[
+        int,
+        Field(
+            default=2,
+            ge=0,
+            le=32,
+            description="Worker processes validating bulk import rows (0 validates inline)",
+        ),
+    ] = 2
+
     snapshot_retention_days: Annotated[
         int,
         Field(
@@ -1,6 +1,8 @@
 -- LTREE Path Maintenance Trigger
 -- Automatically updates ltree_path when parent_node_id changes
 -- Also updates all descendant paths when a node is moved
+-- The single-statement subtree move sets windx.ltree_rewrite to 'on' for its
+-- UPDATE; the paths it writes are trusted and not cascaded
 
 CREATE OR REPLACE FUNCTION update_attribute_node_ltree_path()
 RETURNS TRIGGER AS $$
@@ -10,6 +12,11 @@ DECLARE
     new_path LTREE;
 BEGIN
     -- Handle INSERT or UPDATE
+    -- A subtree move rewrote the paths itself, descendants included
+    IF TG_OP = 'UPDATE' AND current_setting('windx.ltree_rewrite', true) = 'on' THEN
+        RETURN NEW;
+    END IF;
+
     IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND (NEW.parent_node_id IS DISTINCT FROM OLD.parent_node_id OR NEW.name IS DISTINCT FROM OLD.name)) THEN
         
         -- If node has no parent, it's a root node
@@ -56,4 +63,5 @@ CREATE TRIGGER trigger_update_attribute_node_ltree_path
 -- Add comment for documentation
 COMMENT ON FUNCTION update_attribute_node_ltree_path() IS 
 'Automatically maintains ltree_path field based on parent_node_id and name. 
-When a node is moved (parent_node_id changes), all descendant paths are updated recursively.';
+When a node is moved (parent_node_id changes), all descendant paths are updated recursively,
+unless windx.ltree_rewrite is on because a subtree move already rewrites the paths.';
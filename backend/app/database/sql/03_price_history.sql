@@ -1,6 +1,8 @@
 -- Price History Trigger
 -- Automatically logs price changes for configurations
 -- Tracks changes to total_price, base_price, and calculated_weight
+-- Callers can record why prices changed by setting windx.price_change_reason
+-- for the transaction, e.g. SELECT set_config('windx.price_change_reason', 'Bulk repricing', true);
 
 CREATE OR REPLACE FUNCTION log_configuration_price_change()
 RETURNS TRIGGER AS $$
@@ -33,7 +35,10 @@ BEGIN
                 NEW.total_price,
                 OLD.calculated_weight,
                 NEW.calculated_weight,
-                'Automatic update from configuration change',
+                COALESCE(
+                    NULLIF(current_setting('windx.price_change_reason', true), ''),
+                    'Automatic update from configuration change'
+                ),
                 NOW(),
                 CURRENT_USER
             );
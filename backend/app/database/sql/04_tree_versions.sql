@@ -0,0 +1,87 @@
+-- Attribute Tree Versions Trigger
+-- Bumps the version of every manufacturing type whose attribute nodes a
+-- statement inserted, updated or deleted, and announces the new versions
+-- on the attribute_tree_versions channel when the transaction commits
+-- Statement-level: a statement bumps each affected type once, however many
+-- rows it wrote (the cascading descendant UPDATE of the LTREE trigger is a
+-- statement of its own and bumps again, which is harmless)
+-- Nodes without a manufacturing type (product definitions) are counted as type 0
+-- Notification payload: '<schema>:<manufacturing_type_id>:<version>'
+
+CREATE OR REPLACE FUNCTION bump_attribute_tree_version()
+RETURNS TRIGGER AS $$
+DECLARE
+    type_ids INTEGER[];
+    bumped RECORD;
+BEGIN
+    -- Transition tables only exist for the operations that have them
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT COALESCE(manufacturing_type_id, 0))
+        INTO type_ids
+        FROM new_nodes;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT COALESCE(manufacturing_type_id, 0))
+        INTO type_ids
+        FROM old_nodes;
+    ELSE
+        -- Nodes moved to another type change both trees
+        SELECT array_agg(DISTINCT COALESCE(manufacturing_type_id, 0))
+        INTO type_ids
+        FROM (
+            SELECT manufacturing_type_id FROM new_nodes
+            UNION ALL
+            SELECT manufacturing_type_id FROM old_nodes
+        ) AS changed;
+    END IF;
+
+    IF type_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Types are bumped in ID order so concurrent writers cannot deadlock
+    FOR bumped IN
+        INSERT INTO attribute_tree_versions AS versions (manufacturing_type_id, version, updated_at)
+        SELECT type_id, 1, NOW()
+        FROM unnest(type_ids) AS type_id
+        ORDER BY type_id
+        ON CONFLICT (manufacturing_type_id) DO UPDATE
+        SET version = versions.version + 1, updated_at = NOW()
+        RETURNING versions.manufacturing_type_id, versions.version
+    LOOP
+        PERFORM pg_notify(
+            'attribute_tree_versions',
+            TG_TABLE_SCHEMA || ':' || bumped.manufacturing_type_id || ':' || bumped.version
+        );
+    END LOOP;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables allow one event per trigger
+DROP TRIGGER IF EXISTS trigger_bump_attribute_tree_version_insert ON attribute_nodes;
+CREATE TRIGGER trigger_bump_attribute_tree_version_insert
+    AFTER INSERT ON attribute_nodes
+    REFERENCING NEW TABLE AS new_nodes
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_attribute_tree_version();
+
+DROP TRIGGER IF EXISTS trigger_bump_attribute_tree_version_update ON attribute_nodes;
+CREATE TRIGGER trigger_bump_attribute_tree_version_update
+    AFTER UPDATE ON attribute_nodes
+    REFERENCING OLD TABLE AS old_nodes NEW TABLE AS new_nodes
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_attribute_tree_version();
+
+DROP TRIGGER IF EXISTS trigger_bump_attribute_tree_version_delete ON attribute_nodes;
+CREATE TRIGGER trigger_bump_attribute_tree_version_delete
+    AFTER DELETE ON attribute_nodes
+    REFERENCING OLD TABLE AS old_nodes
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_attribute_tree_version();
+
+-- Add comment for documentation
+COMMENT ON FUNCTION bump_attribute_tree_version() IS
+'Bumps attribute_tree_versions.version of every manufacturing type whose attribute nodes
+a statement changed (0 for nodes without a type), and notifies the attribute_tree_versions channel with
+<schema>:<manufacturing_type_id>:<version> for each bumped type.';
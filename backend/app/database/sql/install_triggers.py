@@ -3,7 +3,7 @@ Database Trigger Installation Script
 
 This script installs PostgreSQL triggers and functions for the Windx configurator system.
 Run this after creating the database schema to enable automatic LTREE path maintenance,
-depth calculation, and price history tracking.
+depth calculation, price history tracking, and attribute tree versions.
 
 Usage:
     python -m app.database.sql.install_triggers
@@ -32,6 +32,7 @@ async def install_triggers(session: AsyncSession) -> None:
         "01_ltree_path_maintenance.sql",
         "02_depth_calculation.sql",
         "03_price_history.sql",
+        "04_tree_versions.sql",
     ]
 
     print("Installing database triggers and functions...")
@@ -75,6 +76,7 @@ async def verify_installation(session: AsyncSession) -> None:
         "update_attribute_node_ltree_path",
         "calculate_attribute_node_depth",
         "log_configuration_price_change",
+        "bump_attribute_tree_version",
     ]
 
     for func_name in functions:
@@ -98,6 +100,9 @@ async def verify_installation(session: AsyncSession) -> None:
         ("trigger_update_attribute_node_ltree_path", "attribute_nodes"),
         ("trigger_calculate_attribute_node_depth", "attribute_nodes"),
         ("trigger_log_configuration_price_change", "configurations"),
+        ("trigger_bump_attribute_tree_version_insert", "attribute_nodes"),
+        ("trigger_bump_attribute_tree_version_update", "attribute_nodes"),
+        ("trigger_bump_attribute_tree_version_delete", "attribute_nodes"),
     ]
 
     for trigger_name, table_name in triggers:
@@ -134,6 +139,9 @@ async def uninstall_triggers(session: AsyncSession) -> None:
         ("trigger_update_attribute_node_ltree_path", "attribute_nodes"),
         ("trigger_calculate_attribute_node_depth", "attribute_nodes"),
         ("trigger_log_configuration_price_change", "configurations"),
+        ("trigger_bump_attribute_tree_version_insert", "attribute_nodes"),
+        ("trigger_bump_attribute_tree_version_update", "attribute_nodes"),
+        ("trigger_bump_attribute_tree_version_delete", "attribute_nodes"),
     ]
 
     for trigger_name, table_name in triggers:
@@ -148,6 +156,7 @@ async def uninstall_triggers(session: AsyncSession) -> None:
         "update_attribute_node_ltree_path",
         "calculate_attribute_node_depth",
         "log_configuration_price_change",
+        "bump_attribute_tree_version",
     ]
 
     for func_name in functions:
@@ -317,6 +317,7 @@ class ltree_subpath(expression.FunctionElement):
 
     type = LTREE()
     name = "subpath"
+    inherit_cache = True
 
 
 @compiles(ltree_subpath)
@@ -348,6 +349,7 @@ class ltree_nlevel(expression.FunctionElement):
 
     type = Text()
     name = "nlevel"
+    inherit_cache = True
 
 
 @compiles(ltree_nlevel)
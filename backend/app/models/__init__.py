@@ -8,9 +8,11 @@ Public Classes:
     Session: Session model for tracking user sessions
     ManufacturingType: Product category model for Windx configurator
     AttributeNode: Hierarchical attribute tree node for product configuration
+    AttributeTreeVersion: Per-manufacturing-type attribute tree version counter
     Configuration: Customer product design model
     ConfigurationSelection: Individual attribute selection model
     Customer: Customer management model
+    DocumentCounter: Per-prefix, per-day quote and order number counter
     Quote: Quotation system model
     Order: Order management model
     OrderItem: Order line item model
@@ -25,10 +27,12 @@ Features:
 """
 
 from app.models.attribute_node import AttributeNode
+from app.models.attribute_tree_version import AttributeTreeVersion
 from app.models.configuration import Configuration
 from app.models.configuration_selection import ConfigurationSelection
 from app.models.configuration_template import ConfigurationTemplate
 from app.models.customer import Customer
+from app.models.document_counter import DocumentCounter
 from app.models.manufacturing_type import ManufacturingType
 from app.models.order import Order
 from app.models.order_item import OrderItem
@@ -42,9 +46,11 @@ __all__ = [
     "Session",
     "ManufacturingType",
     "AttributeNode",
+    "AttributeTreeVersion",
     "Configuration",
     "ConfigurationSelection",
     "Customer",
+    "DocumentCounter",
     "Quote",
     "Order",
     "OrderItem",
@@ -0,0 +1,76 @@
+"""Attribute tree version model for change detection.
+
+This module defines the AttributeTreeVersion ORM model holding a
+monotonic version counter per manufacturing type. The counter is bumped
+by a database trigger (``app/database/sql/04_tree_versions.sql``) whenever
+attribute nodes of the type are inserted, updated or deleted.
+
+Public Classes:
+    AttributeTreeVersion: Per-manufacturing-type attribute tree version
+
+Features:
+    - One row per manufacturing type whose tree was ever written
+    - Maintained by a statement-level trigger, whatever the writer
+    - Nodes without a manufacturing type counted under ID 0
+    - Missing rows mean version 0
+    - Automatic timestamp management
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import TIMESTAMP, BigInteger, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+__all__ = ["AttributeTreeVersion"]
+
+
+class AttributeTreeVersion(Base):
+    """Version counter of a manufacturing type's attribute tree.
+
+    No foreign key to manufacturing_types: versions are bumped while the
+    nodes of a deleted type are cascade-deleted, and nodes without a
+    manufacturing type (product definitions) are counted under ID 0.
+
+    Attributes:
+        manufacturing_type_id: Manufacturing type the tree belongs to, 0 for none
+        version: Number of statements that changed the tree
+        updated_at: Last change timestamp
+    """
+
+    __tablename__ = "attribute_tree_versions"
+
+    manufacturing_type_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=False,
+        doc="Manufacturing type the tree belongs to, 0 for nodes without one",
+    )
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        nullable=False,
+        doc="Number of statements that changed the tree",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        nullable=False,
+        doc="Last change timestamp (UTC)",
+    )
+
+    def __repr__(self) -> str:
+        """String representation of AttributeTreeVersion.
+
+        Returns:
+            str: Version representation with manufacturing type and version
+        """
+        return (
+            f"<AttributeTreeVersion(manufacturing_type_id={self.manufacturing_type_id}, "
+            f"version={self.version})>"
+        )
@@ -206,6 +206,13 @@ class Configuration(Base):
             "manufacturing_type_id",
             "status",
         ),
+        # Keyset index for paging a manufacturing type's previews by update time
+        Index(
+            "idx_configurations_mfg_type_updated",
+            "manufacturing_type_id",
+            "updated_at",
+            "id",
+        ),
         # Composite index for filtering by customer and status
         Index(
             "idx_configurations_customer_status",
@@ -0,0 +1,71 @@
+"""Document counter model for business number allocation.
+
+This module defines the DocumentCounter ORM model holding the last number
+issued per document prefix and day, from which quote and order numbers
+(``Q-YYYYMMDD-NNN``, ``O-YYYYMMDD-NNN``) are allocated.
+
+Public Classes:
+    DocumentCounter: Per-prefix, per-day number counter
+
+Features:
+    - One row per prefix and day, so numbering restarts daily
+    - Atomic block reservation with ``UPDATE ... RETURNING``
+    - Automatic timestamp management
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy import TIMESTAMP, BigInteger, Date, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+__all__ = ["DocumentCounter"]
+
+
+class DocumentCounter(Base):
+    """Last number issued for a document prefix on a day.
+
+    Attributes:
+        prefix: Document prefix (Q for quotes, O for orders)
+        day: Day the numbers belong to
+        value: Last number reserved for the prefix and day
+        updated_at: Last reservation timestamp
+    """
+
+    __tablename__ = "document_counters"
+
+    prefix: Mapped[str] = mapped_column(
+        String(10),
+        primary_key=True,
+        doc="Document prefix (Q for quotes, O for orders)",
+    )
+    day: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        doc="Day the numbers belong to",
+    )
+    value: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        nullable=False,
+        doc="Last number reserved for the prefix and day",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        nullable=False,
+        doc="Last reservation timestamp (UTC)",
+    )
+
+    def __repr__(self) -> str:
+        """String representation of DocumentCounter.
+
+        Returns:
+            str: Counter representation with prefix, day, and value
+        """
+        return f"<DocumentCounter(prefix='{self.prefix}', day={self.day}, value={self.value})>"
@@ -7,7 +7,7 @@ Public Classes:
     Quote: Quotation system model
 
 Features:
-    - Unique quote number generation
+    - Unique quote numbers allocated from per-day document counters
     - Pricing breakdown (subtotal, tax, discounts)
     - Quote validity period tracking
     - Status tracking (draft, sent, accepted, expired)
@@ -11,6 +11,7 @@ Public Classes:
     ConfigurationRepository: Repository for Configuration operations
     ConfigurationSelectionRepository: Repository for ConfigurationSelection operations
     CustomerRepository: Repository for Customer operations
+    DocumentCounterRepository: Repository for DocumentCounter operations
     QuoteRepository: Repository for Quote operations
     ConfigurationTemplateRepository: Repository for ConfigurationTemplate operations
     TemplateSelectionRepository: Repository for TemplateSelection operations
@@ -31,6 +32,7 @@ from app.repositories.configuration import ConfigurationRepository
 from app.repositories.configuration_selection import ConfigurationSelectionRepository
 from app.repositories.configuration_template import ConfigurationTemplateRepository
 from app.repositories.customer import CustomerRepository
+from app.repositories.document_counter import DocumentCounterRepository
 from app.repositories.manufacturing_type import ManufacturingTypeRepository
 from app.repositories.order import OrderRepository
 from app.repositories.quote import QuoteRepository
@@ -47,6 +49,7 @@ __all__ = [
     "ConfigurationRepository",
     "ConfigurationSelectionRepository",
     "CustomerRepository",
+    "DocumentCounterRepository",
     "QuoteRepository",
     "ConfigurationTemplateRepository",
     "TemplateSelectionRepository",
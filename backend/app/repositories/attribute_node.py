@@ -9,7 +9,12 @@ Public Classes:
 Features:
     - Hierarchical queries via HierarchicalRepository
     - Get by manufacturing type
+    - Batch lookup by IDs
+    - Option children of many parents in one query
+    - Pricing rule rows for evaluation plans
+    - Whole-tree rows for in-memory snapshots
     - Get root nodes
+    - Single-statement subtree moves and cycle checks
     - LTREE pattern matching
     - Efficient tree traversal
     - Tree building utilities
@@ -17,9 +22,24 @@ Features:
 
 from __future__ import annotations
 
-from sqlalchemy import Select, select
+from sqlalchemy import (
+    Row,
+    RowMapping,
+    Select,
+    case,
+    exists,
+    inspect,
+    literal,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
+from app.database.types import LTREE, ltree_nlevel, ltree_subpath
 from app.models.attribute_node import AttributeNode
 from app.repositories.windx_base import HierarchicalRepository
 from app.schemas.attribute_node import (
@@ -30,6 +50,10 @@ from app.schemas.attribute_node import (
 
 __all__ = ["AttributeNodeRepository"]
 
+# Session setting read by update_attribute_node_ltree_path(); while "on", the
+# trigger trusts the paths an UPDATE sets instead of recomputing them
+LTREE_REWRITE_SETTING = "windx.ltree_rewrite"
+
 
 # noinspection PyTypeChecker
 class AttributeNodeRepository(
@@ -78,6 +102,112 @@ class AttributeNodeRepository(
         )
         return list(result.scalars().all())
 
+    async def get_by_ids(self, node_ids: set[int] | list[int]) -> dict[int, AttributeNode]:
+        """Get several attribute nodes by ID in one query.
+
+        Args:
+            node_ids (set[int] | list[int]): Attribute node IDs
+
+        Returns:
+            dict[int, AttributeNode]: Nodes keyed by ID; missing IDs are absent
+
+        Example:
+            ```python
+            nodes = await repo.get_by_ids({s.attribute_node_id for s in selections})
+            ```
+        """
+        if not node_ids:
+            return {}
+
+        # noinspection PyTypeChecker
+        result = await self.db.execute(
+            select(AttributeNode).where(AttributeNode.id.in_(list(node_ids)))
+        )
+        return {node.id: node for node in result.scalars().all()}
+
+    async def get_options_by_parents(
+        self, parent_ids: set[int] | list[int]
+    ) -> dict[int, list[AttributeNode]]:
+        """Get the option children of several nodes in one query.
+
+        Args:
+            parent_ids (set[int] | list[int]): Parent attribute node IDs
+
+        Returns:
+            dict[int, list[AttributeNode]]: Option nodes keyed by parent ID,
+                ordered by sort_order then name; parents without options are absent
+
+        Example:
+            ```python
+            options = await repo.get_options_by_parents({field.id for field in fields})
+            ```
+        """
+        if not parent_ids:
+            return {}
+
+        # noinspection PyTypeChecker
+        result = await self.db.execute(
+            select(AttributeNode)
+            .where(
+                AttributeNode.parent_node_id.in_(list(parent_ids)),
+                AttributeNode.node_type == "option",
+            )
+            .order_by(AttributeNode.sort_order, AttributeNode.name)
+        )
+        options: dict[int, list[AttributeNode]] = {}
+        for node in result.scalars().all():
+            options.setdefault(node.parent_node_id, []).append(node)
+        return options
+
+    async def get_pricing_rules(self, manufacturing_type_id: int) -> list[Row]:
+        """Get the pricing columns of every node of a manufacturing type.
+
+        Returns lightweight rows (no ORM instances) for building pricing
+        plans of large attribute trees.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+
+        Returns:
+            list[Row]: Rows with id, name, ltree_path, price_impact_type,
+                price_impact_value, price_formula, weight_impact and weight_formula
+        """
+        result = await self.db.execute(
+            select(
+                AttributeNode.id,
+                AttributeNode.name,
+                AttributeNode.ltree_path,
+                AttributeNode.price_impact_type,
+                AttributeNode.price_impact_value,
+                AttributeNode.price_formula,
+                AttributeNode.weight_impact,
+                AttributeNode.weight_formula,
+            ).where(AttributeNode.manufacturing_type_id == manufacturing_type_id)
+        )
+        return list(result.all())
+
+    async def get_tree_rows(self, manufacturing_type_id: int) -> list[RowMapping]:
+        """Get every column of every node of a manufacturing type.
+
+        Returns plain row mappings (no ORM instances) keyed by attribute
+        name, for building in-memory tree snapshots.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+
+        Returns:
+            list[RowMapping]: One mapping per node with every AttributeNode
+                column attribute
+        """
+        columns = [
+            getattr(AttributeNode, attr.key).label(attr.key)
+            for attr in inspect(AttributeNode).column_attrs
+        ]
+        result = await self.db.execute(
+            select(*columns).where(AttributeNode.manufacturing_type_id == manufacturing_type_id)
+        )
+        return list(result.mappings().all())
+
     async def get_root_nodes(self, manufacturing_type_id: int | None = None) -> list[AttributeNode]:
         """Get root nodes (top-level nodes with no parent).
 
@@ -337,7 +467,8 @@ class AttributeNodeRepository(
         """Check if setting a new parent would create a cycle.
 
         Validates that moving a node to a new parent would not create
-        a circular reference in the hierarchy.
+        a circular reference in the hierarchy, with one ``@>`` query
+        joining both nodes.
 
         Args:
             node_id (int): Node to be moved
@@ -362,20 +493,88 @@ class AttributeNodeRepository(
         if node_id == new_parent_id:
             return True
 
-        # Get the proposed parent node
-        parent = await self.get(new_parent_id)
-        if not parent:
-            return False  # Parent doesn't exist, no cycle
+        # The parent is a descendant of the node if the node's path contains
+        # the parent's; missing nodes never form a cycle
+        node = aliased(AttributeNode)
+        parent = aliased(AttributeNode)
+        return bool(
+            await self.db.scalar(
+                select(
+                    exists().where(
+                        node.id == node_id,
+                        parent.id == new_parent_id,
+                        parent.manufacturing_type_id == node.manufacturing_type_id,
+                        node.ltree_path.ancestor_of(parent.ltree_path),
+                    )
+                )
+            )
+        )
 
-        # Check if the node is an ancestor of the proposed parent
-        # If the parent's path contains the node, it would create a cycle
-        node = await self.get(node_id)
-        if not node:
-            return False  # Node doesn't exist, no cycle
+    async def move_subtree(
+        self, node: AttributeNode, new_parent_id: int | None, new_path: str
+    ) -> list[RowMapping]:
+        """Move a node and its subtree with one UPDATE statement.
 
-        # Check if parent's ltree_path starts with node's ltree_path
-        # This means the parent is a descendant of the node
-        if parent.ltree_path.startswith(node.ltree_path + "."):
-            return True
+        Rewrites the paths of the whole subtree as
+        ``new_path || subpath(ltree_path, nlevel(old_path))``, shifts
+        depths by the change of the node's depth and re-parents the node,
+        so the cost is one statement regardless of the subtree size. The
+        ltree maintenance trigger is told to keep the rewritten paths for
+        this statement only. Nodes of the subtree already loaded in the
+        session get the new values.
+
+        Args:
+            node (AttributeNode): Node to move, with its current path
+            new_parent_id (int | None): New parent ID (None for root level)
+            new_path (str): New LTREE path of the node
 
-        return False
+        Returns:
+            list[RowMapping]: Moved rows with id, parent_node_id, ltree_path and depth
+
+        Example:
+            ```python
+            rows = await repo.move_subtree(node, 10, "frame.material")
+            ```
+        """
+        table = AttributeNode.__table__
+        old_path = node.ltree_path
+        # Paths have one label per level
+        depth_change = new_path.count(".") - old_path.count(".")
+        is_moved_node = table.c.id == node.id
+        new_prefix = literal(new_path, LTREE())
+
+        # Only descendants take the ELSE branch; subpath() rejects an empty remainder
+        descendant_path = new_prefix.op("||")(
+            ltree_subpath(table.c.ltree_path, ltree_nlevel(literal(old_path, LTREE())))
+        )
+        set_rewrite = text("SELECT set_config(:setting, :value, true)")
+        await self.db.execute(set_rewrite, {"setting": LTREE_REWRITE_SETTING, "value": "on"})
+        result = await self.db.execute(
+            update(table)
+            .where(
+                table.c.manufacturing_type_id == node.manufacturing_type_id,
+                table.c.ltree_path.descendant_of(old_path),
+            )
+            .values(
+                parent_node_id=case((is_moved_node, new_parent_id), else_=table.c.parent_node_id),
+                ltree_path=case((is_moved_node, new_prefix), else_=descendant_path),
+                depth=table.c.depth + depth_change,
+            )
+            .returning(
+                table.c.id,
+                table.c.parent_node_id,
+                table.c.ltree_path,
+                table.c.depth,
+            )
+        )
+        rows = list(result.mappings().all())
+        await self.db.execute(set_rewrite, {"setting": LTREE_REWRITE_SETTING, "value": "off"})
+
+        # Core statements bypass the identity map; keep loaded nodes current
+        identity_map = self.db.sync_session.identity_map
+        for row in rows:
+            loaded = identity_map.get(identity_key(AttributeNode, row["id"]))
+            if loaded is not None:
+                for key in ("parent_node_id", "ltree_path", "depth"):
+                    set_committed_value(loaded, key, row[key])
+        return rows
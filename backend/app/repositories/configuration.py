@@ -11,11 +11,17 @@ Features:
     - Get by customer with optional status filter
     - Get by status
     - Eager loading of selections
+    - Batch loading for pricing
+    - Bulk price write-back with a single UPDATE ... FROM (VALUES ...)
+    - Atomic price deltas for incremental pricing
+    - Multi-row inserts returning the new IDs in input order
 """
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from decimal import Decimal
+
+from sqlalchemy import Integer, Numeric, Row, column, func, insert, or_, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -186,3 +192,160 @@ class ConfigurationRepository(
             )
         )
         return result.scalar_one_or_none()
+
+    async def get_many_with_manufacturing_type(self, config_ids: list[int]) -> list[Configuration]:
+        """Get several configurations with their manufacturing types eager-loaded.
+
+        Loads all requested configurations in one query (plus one eager-load
+        query for manufacturing types) for batch operations such as pricing.
+        IDs that do not exist are silently skipped.
+
+        Args:
+            config_ids (list[int]): Configuration IDs
+
+        Returns:
+            list[Configuration]: Configurations ordered by ID
+
+        Example:
+            ```python
+            configs = await repo.get_many_with_manufacturing_type([1, 2, 3])
+            for config in configs:
+                print(config.manufacturing_type.base_weight)
+            ```
+        """
+        if not config_ids:
+            return []
+
+        result = await self.db.execute(
+            select(Configuration)
+            .where(Configuration.id.in_(config_ids))
+            .options(selectinload(Configuration.manufacturing_type))
+            .order_by(Configuration.id)
+        )
+        return list(result.scalars().all())
+
+    async def get_price_rows_by_manufacturing_type(self, manufacturing_type_id: int) -> list[Row]:
+        """Get the stored prices of every configuration of a manufacturing type.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+
+        Returns:
+            list[Row]: Rows of (id, base_price, total_price, calculated_weight)
+                ordered by ID
+        """
+        result = await self.db.execute(
+            select(
+                Configuration.id,
+                Configuration.base_price,
+                Configuration.total_price,
+                Configuration.calculated_weight,
+            )
+            .where(Configuration.manufacturing_type_id == manufacturing_type_id)
+            .order_by(Configuration.id)
+        )
+        return list(result.all())
+
+    async def bulk_update_prices(
+        self,
+        prices: list[tuple[int, Decimal, Decimal]],
+        batch_size: int = 2000,
+    ) -> int:
+        """Write new totals with one UPDATE ... FROM (VALUES ...) per batch.
+
+        Only rows whose total_price or calculated_weight actually differ are
+        touched, so the price history trigger records real changes only.
+        The caller owns the transaction.
+
+        Args:
+            prices (list[tuple[int, Decimal, Decimal]]): Tuples of
+                (configuration_id, total_price, calculated_weight)
+            batch_size (int): Maximum rows per statement
+
+        Returns:
+            int: Number of configurations updated
+        """
+        updated = 0
+        for start in range(0, len(prices), batch_size):
+            new_prices = values(
+                column("id", Integer),
+                column("total_price", Numeric(12, 2)),
+                column("calculated_weight", Numeric(10, 2)),
+                name="new_prices",
+            ).data(prices[start : start + batch_size])
+
+            result = await self.db.execute(
+                update(Configuration)
+                .where(Configuration.id == new_prices.c.id)
+                .where(
+                    or_(
+                        Configuration.total_price.is_distinct_from(new_prices.c.total_price),
+                        Configuration.calculated_weight.is_distinct_from(
+                            new_prices.c.calculated_weight
+                        ),
+                    )
+                )
+                .values(
+                    total_price=new_prices.c.total_price,
+                    calculated_weight=new_prices.c.calculated_weight,
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        return updated
+
+    async def apply_price_delta(
+        self, config_id: int, price_delta: Decimal, weight_delta: Decimal
+    ) -> tuple[Decimal, Decimal] | None:
+        """Atomically add a price and weight delta to a configuration's totals.
+
+        The increment happens in the database, so concurrent single-selection
+        edits of the same configuration cannot overwrite each other. The
+        caller owns the transaction.
+
+        Args:
+            config_id (int): Configuration ID
+            price_delta (Decimal): Amount added to total_price
+            weight_delta (Decimal): Amount added to calculated_weight
+
+        Returns:
+            tuple[Decimal, Decimal] | None: New (total_price, calculated_weight),
+                or None if the configuration does not exist
+        """
+        result = await self.db.execute(
+            update(Configuration)
+            .where(Configuration.id == config_id)
+            .values(
+                total_price=Configuration.total_price + price_delta,
+                calculated_weight=Configuration.calculated_weight + weight_delta,
+                updated_at=func.now(),
+            )
+            .returning(Configuration.total_price, Configuration.calculated_weight)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        return (row.total_price, row.calculated_weight) if row else None
+
+    async def bulk_insert(self, rows: list[dict]) -> list[int]:
+        """Insert configurations with multi-row INSERT ... RETURNING statements.
+
+        Rows are sent in as few statements as the driver allows and no ORM
+        objects are created. The caller owns the transaction.
+
+        Args:
+            rows (list[dict]): Column values per configuration; every row
+                must have the same keys
+
+        Returns:
+            list[int]: IDs of the new configurations, in the order of rows
+        """
+        if not rows:
+            return []
+        result = await self.db.execute(
+            insert(Configuration.__table__).returning(
+                Configuration.__table__.c.id, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        return list(result.scalars().all())
@@ -9,16 +9,22 @@ Public Classes:
 Features:
     - CRUD operations for configuration selections
     - Bulk operations for selections
+    - Paged multi-row inserts without ORM objects
     - Query by configuration or attribute node
+    - Batch loading across configurations
+    - Columnar pricing rows for a whole manufacturing type
+    - Running-price rule detection for incremental pricing
     - Price impact calculations
 """
 
 from decimal import Decimal
 
-from sqlalchemy import delete, select
+from sqlalchemy import Row, and_, delete, exists, insert, or_, select
 from sqlalchemy.engine.cursor import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
 from app.models.configuration_selection import ConfigurationSelection
 from app.repositories.base import BaseRepository
 from app.schemas.configuration_selection import (
@@ -28,6 +34,11 @@ from app.schemas.configuration_selection import (
 
 __all__ = ["ConfigurationSelectionRepository"]
 
+# Rows per multi-row selection INSERT, and the bind parameter budget per
+# statement (Postgres accepts at most 32,767)
+INSERT_PAGE_ROWS = 1000
+INSERT_PAGE_PARAMETERS = 32_000
+
 
 # noinspection PyTypeChecker
 class ConfigurationSelectionRepository(
@@ -70,6 +81,96 @@ class ConfigurationSelectionRepository(
         )
         return list(result.scalars().all())
 
+    async def get_by_configurations(
+        self, config_ids: list[int]
+    ) -> dict[int, list[ConfigurationSelection]]:
+        """Get all selections for several configurations in one query.
+
+        Args:
+            config_ids (list[int]): Configuration IDs
+
+        Returns:
+            dict[int, list[ConfigurationSelection]]: Selections grouped by
+                configuration ID; configurations without selections map to
+                an empty list
+        """
+        grouped: dict[int, list[ConfigurationSelection]] = {
+            config_id: [] for config_id in config_ids
+        }
+        if not grouped:
+            return grouped
+
+        result = await self.db.execute(
+            select(ConfigurationSelection)
+            .where(ConfigurationSelection.configuration_id.in_(list(grouped)))
+            .order_by(ConfigurationSelection.configuration_id, ConfigurationSelection.created_at)
+        )
+        for selection in result.scalars().all():
+            grouped[selection.configuration_id].append(selection)
+        return grouped
+
+    async def get_pricing_rows_by_manufacturing_type(self, manufacturing_type_id: int) -> list[Row]:
+        """Get the pricing inputs of every selection of a manufacturing type.
+
+        Returns plain rows instead of ORM instances so bulk repricing can
+        turn them into column arrays without identity-map overhead.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+
+        Returns:
+            list[Row]: Rows of (id, configuration_id, attribute_node_id,
+                numeric_value, string_value, calculated_price_impact,
+                calculated_weight_impact) ordered by configuration ID
+        """
+        result = await self.db.execute(
+            select(
+                ConfigurationSelection.id,
+                ConfigurationSelection.configuration_id,
+                ConfigurationSelection.attribute_node_id,
+                ConfigurationSelection.numeric_value,
+                ConfigurationSelection.string_value,
+                ConfigurationSelection.calculated_price_impact,
+                ConfigurationSelection.calculated_weight_impact,
+            )
+            .join(Configuration, Configuration.id == ConfigurationSelection.configuration_id)
+            .where(Configuration.manufacturing_type_id == manufacturing_type_id)
+            .order_by(ConfigurationSelection.configuration_id, ConfigurationSelection.id)
+        )
+        return list(result.all())
+
+    async def has_running_price_rules(self, config_id: int) -> bool:
+        """Check whether any selection of a configuration reads the running price.
+
+        Percentage rules and formulas referencing ``subtotal`` depend on the
+        other selections, so edits to such configurations cannot be applied
+        as isolated deltas.
+
+        Args:
+            config_id (int): Configuration ID
+
+        Returns:
+            bool: True if a selected attribute node uses a running-price rule
+        """
+        reads_subtotal = r"\msubtotal\M"
+        result = await self.db.execute(
+            select(
+                exists().where(
+                    ConfigurationSelection.configuration_id == config_id,
+                    AttributeNode.id == ConfigurationSelection.attribute_node_id,
+                    or_(
+                        AttributeNode.price_impact_type == "percentage",
+                        and_(
+                            AttributeNode.price_impact_type == "formula",
+                            AttributeNode.price_formula.regexp_match(reads_subtotal),
+                        ),
+                        AttributeNode.weight_formula.regexp_match(reads_subtotal),
+                    ),
+                )
+            )
+        )
+        return bool(result.scalar())
+
     async def get_by_attribute_node(self, node_id: int) -> list[ConfigurationSelection]:
         """Get all selections for an attribute node.
 
@@ -104,6 +205,27 @@ class ConfigurationSelectionRepository(
         await self.db.flush()
         return created_selections
 
+    async def bulk_insert(self, rows: list[dict]) -> None:
+        """Insert selections with multi-row INSERT ... VALUES statements.
+
+        Rows go out in pages of up to INSERT_PAGE_ROWS, fewer when their
+        bind parameters would exceed INSERT_PAGE_PARAMETERS; a plain
+        parameter list would run as one INSERT per row. Unlike bulk_create,
+        no ORM objects are created or flushed. The caller owns the
+        transaction.
+
+        Args:
+            rows (list[dict]): Column values per selection; every row must
+                have the same keys
+        """
+        if not rows:
+            return
+        page_size = min(INSERT_PAGE_ROWS, INSERT_PAGE_PARAMETERS // len(rows[0]))
+        for start in range(0, len(rows), page_size):
+            await self.db.execute(
+                insert(ConfigurationSelection.__table__).values(rows[start : start + page_size])
+            )
+
     # noinspection PyTypeChecker
     async def delete_by_configuration(self, config_id: int) -> int:
         """Delete all selections for a configuration.
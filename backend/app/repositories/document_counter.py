@@ -0,0 +1,88 @@
+"""Repository for DocumentCounter operations.
+
+This module provides the data access methods behind quote and order
+number allocation.
+
+Public Classes:
+    DocumentCounterRepository: Repository for document counter operations
+
+Features:
+    - Block reservation with a single ``UPDATE ... RETURNING``
+    - Creation of the first counter of a day
+    - Plain SQL, so PostgreSQL and the SQLite benchmark stand-in share it
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document_counter import DocumentCounter
+
+__all__ = ["DocumentCounterRepository"]
+
+
+class DocumentCounterRepository:
+    """Repository for DocumentCounter operations.
+
+    Attributes:
+        db: Database session
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Initialize repository.
+
+        Args:
+            db (AsyncSession): Database session
+        """
+        self.db = db
+
+    async def increment(self, prefix: str, day: date, count: int) -> int | None:
+        """Reserve the next ``count`` numbers of an existing counter.
+
+        The row is locked until the transaction ends, so concurrent
+        reservations of the same prefix and day never overlap. Does not commit.
+
+        Args:
+            prefix (str): Document prefix
+            day (date): Day the numbers belong to
+            count (int): Number of values to reserve
+
+        Returns:
+            int | None: Last reserved value, or None if the day has no
+                counter yet
+
+        Example:
+            ```python
+            last = await repo.increment("Q", date.today(), 10)  # reserves last-9..last
+            ```
+        """
+        result = await self.db.execute(
+            update(DocumentCounter)
+            .where(DocumentCounter.prefix == prefix, DocumentCounter.day == day)
+            .values(value=DocumentCounter.value + count)
+            .returning(DocumentCounter.value)
+        )
+        return result.scalar_one_or_none()
+
+    async def insert(self, prefix: str, day: date, value: int) -> None:
+        """Create the counter of a prefix and day.
+
+        Does not commit.
+
+        Args:
+            prefix (str): Document prefix
+            day (date): Day the numbers belong to
+            value (int): Last reserved value
+
+        Raises:
+            IntegrityError: If another transaction created the counter first
+
+        Example:
+            ```python
+            await repo.insert("Q", date.today(), 10)  # reserves 1..10
+            ```
+        """
+        await self.db.execute(insert(DocumentCounter).values(prefix=prefix, day=day, value=value))
@@ -11,11 +11,12 @@ Features:
     - Get by quote number
     - Get by customer
     - Get by configuration
+    - Multi-row insert of many quotes
 """
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.quote import Quote
@@ -61,6 +62,31 @@ class QuoteRepository(BaseRepository[Quote, QuoteCreate, QuoteUpdate]):
         result = await self.db.execute(select(Quote).where(Quote.quote_number == quote_number))
         return result.scalar_one_or_none()
 
+    async def create_many(self, objs_in: list[QuoteCreate]) -> list[Quote]:
+        """Insert many quotes with a single multi-row INSERT.
+
+        Does not commit.
+
+        Args:
+            objs_in (list[QuoteCreate]): Quotes to create
+
+        Returns:
+            list[Quote]: Created quotes in the order given
+
+        Example:
+            ```python
+            quotes = await repo.create_many([quote_a, quote_b])
+            ```
+        """
+        if not objs_in:
+            return []
+
+        result = await self.db.scalars(
+            insert(Quote).returning(Quote, sort_by_parameter_order=True),
+            [obj_in.model_dump() for obj_in in objs_in],
+        )
+        return list(result.all())
+
     async def get_by_customer(self, customer_id: int) -> list[Quote]:
         """Get all quotes for a customer.
 
@@ -10,6 +10,8 @@ Public Classes:
     ProfileEntryData: Profile page form data
     PreviewTable: Preview table structure
     ProfilePreviewData: Profile preview response
+    ProfileImportRowError: Errors of one rejected import row
+    ProfileImportResult: Summary of a bulk profile sheet import
 
 Features:
     - Schema-driven form generation
@@ -37,6 +39,8 @@ __all__ = [
     "ProfileEntryData",
     "PreviewTable",
     "ProfilePreviewData",
+    "ProfileImportRowError",
+    "ProfileImportResult",
     "DependencyAction",
     "DependencyRule",
 ]
@@ -663,3 +667,55 @@ class InlineEditRequest(BaseModel):
             examples=["Aluminum", 48.5],
         ),
     ]
+
+
+class ProfileImportRowError(BaseModel):
+    """Errors of one rejected row of a profile sheet import.
+
+    Attributes:
+        row: Spreadsheet row number (the header is row 1)
+        name: Configuration name of the row, if present
+        errors: Error message keyed by field name
+    """
+
+    row: Annotated[int, Field(ge=2, description="Spreadsheet row number (header is row 1)")]
+    name: Annotated[
+        str | None, Field(default=None, description="Configuration name of the row")
+    ] = None
+    errors: Annotated[
+        dict[str, str],
+        Field(
+            description="Error message keyed by field name",
+            examples=[{"width": "Width must be at least 10"}],
+        ),
+    ]
+
+
+class ProfileImportResult(BaseModel):
+    """Summary of a bulk profile sheet import.
+
+    Attributes:
+        manufacturing_type_id: Manufacturing type the rows were imported into
+        rows: Data rows read, excluding the header and blank rows
+        imported: Configurations created
+        failed: Rows rejected by validation or the database
+        errors: Errors of rejected rows (truncated)
+        configuration_ids: IDs of the created configurations (truncated)
+        duration_seconds: Wall-clock duration of the import
+        rows_per_second: Throughput of the import
+    """
+
+    manufacturing_type_id: Annotated[PositiveInt, Field(description="Manufacturing type ID")]
+    rows: Annotated[int, Field(ge=0, description="Data rows read")]
+    imported: Annotated[int, Field(ge=0, description="Configurations created")]
+    failed: Annotated[int, Field(ge=0, description="Rows rejected")]
+    errors: Annotated[
+        list[ProfileImportRowError],
+        Field(default_factory=list, description="Errors of rejected rows"),
+    ]
+    configuration_ids: Annotated[
+        list[int],
+        Field(default_factory=list, description="IDs of the created configurations"),
+    ]
+    duration_seconds: Annotated[float, Field(ge=0, description="Import duration in seconds")]
+    rows_per_second: Annotated[float, Field(ge=0, description="Throughput (rows/sec)")]
@@ -8,6 +8,7 @@ Public Classes:
     ManufacturingTypeCreate: Schema for creating manufacturing types
     ManufacturingTypeUpdate: Schema for updating manufacturing types (partial)
     ManufacturingType: Schema for API responses
+    RepricingResult: Summary of a bulk repricing run
 
 Features:
     - Composed schemas (not monolithic)
@@ -30,6 +31,7 @@ __all__ = [
     "ManufacturingTypeCreate",
     "ManufacturingTypeUpdate",
     "ManufacturingType",
+    "RepricingResult",
 ]
 
 
@@ -213,3 +215,34 @@ class ManufacturingType(ManufacturingTypeBase):
     ]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RepricingResult(BaseModel):
+    """Summary of a bulk repricing run for one manufacturing type.
+
+    Attributes:
+        manufacturing_type_id: Repriced manufacturing type ID
+        configurations: Number of configurations priced
+        selections: Number of selections evaluated
+        updated: Configurations whose stored totals changed
+        unchanged: Configurations whose stored totals were already current
+        failed: Configurations skipped because a selection failed to price
+        errors: Error messages of failed configurations (truncated)
+        dry_run: Whether totals were computed without writing them
+        duration_seconds: Wall-clock duration of the run
+        configs_per_second: Throughput of the run
+    """
+
+    manufacturing_type_id: Annotated[PositiveInt, Field(description="Manufacturing type ID")]
+    configurations: Annotated[int, Field(ge=0, description="Configurations priced")]
+    selections: Annotated[int, Field(ge=0, description="Selections evaluated")]
+    updated: Annotated[int, Field(ge=0, description="Configurations with changed totals")]
+    unchanged: Annotated[int, Field(ge=0, description="Configurations already up to date")]
+    failed: Annotated[int, Field(ge=0, description="Configurations that failed to price")]
+    errors: Annotated[
+        list[str],
+        Field(default_factory=list, description="Error messages of failed configurations"),
+    ]
+    dry_run: Annotated[bool, Field(description="Whether totals were not written")]
+    duration_seconds: Annotated[float, Field(ge=0, description="Run duration in seconds")]
+    configs_per_second: Annotated[float, Field(ge=0, description="Throughput (configs/sec)")]
@@ -5,6 +5,8 @@ serialization, and API request/response handling.
 
 Public Classes:
     QuoteBase: Base schema with common attributes
+    QuoteCreateRequest: Schema for quote creation requests
+    QuoteBatchCreateRequest: Schema for quoting many configurations at once
     QuoteCreate: Schema for creating quotes
     QuoteUpdate: Schema for updating quotes (partial)
     Quote: Schema for API responses
@@ -30,6 +32,7 @@ __all__ = [
     "QuoteBase",
     "QuoteCreate",
     "QuoteCreateRequest",
+    "QuoteBatchCreateRequest",
     "QuoteUpdate",
     "Quote",
 ]
@@ -195,6 +198,83 @@ class QuoteCreateRequest(BaseModel):
         return v
 
 
+class QuoteBatchCreateRequest(BaseModel):
+    """Schema for quoting many configurations in one request.
+
+    Every configuration gets its own quote with the same tax rate,
+    discount, requirements and validity. Duplicate IDs are quoted once.
+
+    Attributes:
+        configuration_ids: Configuration IDs to quote
+        customer_id: Optional customer ID for every quote
+        tax_rate: Tax rate percentage
+        discount_amount: Discount amount applied to each quote
+        technical_requirements: Customer-specific needs
+        valid_until: Quote expiration date
+    """
+
+    configuration_ids: Annotated[
+        list[PositiveInt],
+        Field(
+            min_length=1,
+            max_length=500,
+            description="Configuration IDs to quote",
+            examples=[[123, 124, 125]],
+        ),
+    ]
+    customer_id: Annotated[
+        PositiveInt | None,
+        Field(
+            default=None,
+            description="Customer ID (optional, defaults to each configuration's customer)",
+            examples=[42, 123],
+        ),
+    ] = None
+    tax_rate: Annotated[
+        Decimal,
+        Field(
+            ge=0,
+            le=100,
+            decimal_places=2,
+            description="Applicable tax rate percentage",
+            examples=[8.50, 10.00, 0.00],
+        ),
+    ] = Decimal("0.00")
+    discount_amount: Annotated[
+        Decimal,
+        Field(
+            ge=0,
+            decimal_places=2,
+            description="Discount applied to each quote",
+            examples=[0.00, 25.00, 50.00],
+        ),
+    ] = Decimal("0.00")
+    technical_requirements: Annotated[
+        dict | None,
+        Field(
+            default=None,
+            description="Customer-specific technical needs",
+            examples=[{"installation": "professional", "delivery": "white_glove"}],
+        ),
+    ] = None
+    valid_until: Annotated[
+        date | None,
+        Field(
+            default=None,
+            description="Quote expiration date (optional, defaults to 30 days from now)",
+            examples=["2025-02-24", "2025-03-15"],
+        ),
+    ] = None
+
+    @field_validator("valid_until")
+    @classmethod
+    def validate_valid_until(cls, v: date | None) -> date | None:
+        """Validate that valid_until is not in the past."""
+        if v is not None and v < date.today():
+            raise ValueError("valid_until cannot be in the past")
+        return v
+
+
 class QuoteCreate(QuoteBase):
     """Schema for creating a new quote (internal use).
 
@@ -0,0 +1,212 @@
+"""Table-driven business rules for entry forms.
+
+Business rules decide which fields apply to a profile: a field is only
+available while its rule's condition holds, is hidden from forms and
+previews otherwise, and a value entered for it is rejected. The rules are
+declared in the ``business_rules`` section of the profile page
+configuration (``config/pages/profile.yaml``) using the display condition
+syntax, compiled once and indexed by the form fields that trigger them.
+
+Public Classes:
+    BusinessRule: Compiled availability rule of one field
+    BusinessRuleSet: Compiled business rules indexed by triggering field
+
+Public Functions:
+    get_business_rules: Get the process-wide business rule set
+
+Features:
+    - Rules declared as data; adding one needs no code change
+    - Conditions compiled once with the display condition engine
+    - Triggering field index for partial re-evaluation
+    - Validation runs only the rules of fields that have a value
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from app.services.condition_engine import CompiledCondition, compile_condition
+
+__all__ = ["RULES_PATH", "BusinessRule", "BusinessRuleSet", "get_business_rules"]
+
+# Page configuration declaring the business rules
+RULES_PATH = Path(__file__).resolve().parents[2] / "config" / "pages" / "profile.yaml"
+
+
+def _has_meaningful_value(value: Any) -> bool:
+    """Check if a field value is meaningful (not null, empty, or default false for booleans)."""
+    if value is None or value == "":
+        return False
+    # Unchecked checkboxes should not trigger validation errors
+    return value is not False
+
+
+@dataclass(frozen=True, slots=True)
+class BusinessRule:
+    """Compiled availability rule of one field.
+
+    Attributes:
+        field: Field the rule makes available
+        condition: Condition under which the field applies
+        message: Error for a value entered while the field does not apply
+    """
+
+    field: str
+    condition: CompiledCondition
+    message: str
+
+    @property
+    def inputs(self) -> frozenset[str]:
+        """Top-level form fields the rule reads."""
+        return self.condition.fields
+
+
+class BusinessRuleSet:
+    """Compiled business rules, one per field, indexed by triggering field.
+
+    Attributes:
+        fields: Fields the rules decide
+    """
+
+    __slots__ = ("fields", "_rules", "_dependents")
+
+    def __init__(self, rules: Iterable[BusinessRule]) -> None:
+        """Initialize rule set and index rules by the fields that trigger them.
+
+        Args:
+            rules (Iterable[BusinessRule]): Compiled rules, in evaluation order
+
+        Raises:
+            ValueError: If two rules decide the same field
+        """
+        self._rules: dict[str, BusinessRule] = {}
+        dependents: dict[str, set[str]] = {}
+        for rule in rules:
+            if rule.field in self._rules:
+                raise ValueError(f"Duplicate business rule for field: {rule.field}")
+            self._rules[rule.field] = rule
+            for field in rule.inputs:
+                dependents.setdefault(field, set()).add(rule.field)
+        self.fields = frozenset(self._rules)
+        self._dependents = {field: frozenset(names) for field, names in dependents.items()}
+
+    @classmethod
+    def compile(cls, definitions: Iterable[Mapping[str, Any]]) -> BusinessRuleSet:
+        """Compile a business rules table.
+
+        Args:
+            definitions (Iterable[Mapping[str, Any]]): Rules with ``field``,
+                ``condition`` and ``message`` keys
+
+        Returns:
+            BusinessRuleSet: Compiled rules
+
+        Raises:
+            ValueError: If a rule misses a key
+        """
+        rules = []
+        for definition in definitions:
+            missing = {"field", "condition", "message"} - definition.keys()
+            if missing:
+                raise ValueError(f"Business rule misses keys: {', '.join(sorted(missing))}")
+            rules.append(
+                BusinessRule(
+                    field=definition["field"],
+                    condition=compile_condition(definition["condition"]),
+                    message=definition["message"],
+                )
+            )
+        return cls(rules)
+
+    @classmethod
+    def load(cls, path: Path = RULES_PATH) -> BusinessRuleSet:
+        """Load and compile the business rules of a page configuration file.
+
+        Args:
+            path (Path): YAML page configuration with a ``business_rules`` section
+
+        Returns:
+            BusinessRuleSet: Compiled rules, empty if the page declares none
+        """
+        with open(path, encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        return cls.compile(config.get("business_rules") or [])
+
+    def __len__(self) -> int:
+        """Number of rules."""
+        return len(self._rules)
+
+    def __getitem__(self, field_name: str) -> BusinessRule:
+        """Get the rule deciding a field."""
+        return self._rules[field_name]
+
+    def affected_by(self, changed_fields: Iterable[str]) -> set[str]:
+        """Get the fields whose rules read any of the changed fields.
+
+        Args:
+            changed_fields (Iterable[str]): Changed form fields; dotted paths
+                count as their top-level field
+
+        Returns:
+            set[str]: Names of the fields to re-evaluate
+        """
+        affected: set[str] = set()
+        for field in changed_fields:
+            affected |= self._dependents.get(field.split(".", 1)[0], frozenset())
+        return affected
+
+    def evaluate(
+        self, form_data: Mapping[str, Any], fields: Iterable[str] | None = None
+    ) -> dict[str, bool]:
+        """Evaluate which fields apply to form data.
+
+        Args:
+            form_data (Mapping[str, Any]): Current form data
+            fields (Iterable[str] | None): Fields to evaluate, e.g. from
+                affected_by; None evaluates every rule
+
+        Returns:
+            dict[str, bool]: Field visibility map
+        """
+        if fields is None:
+            return {name: rule.condition(form_data) for name, rule in self._rules.items()}
+        return {
+            name: self._rules[name].condition(form_data) for name in fields if name in self._rules
+        }
+
+    def validate(self, form_data: Mapping[str, Any]) -> dict[str, str]:
+        """Get the business rule violations of form data.
+
+        Only the rules of fields that have a value are evaluated.
+
+        Args:
+            form_data (Mapping[str, Any]): Form data to validate
+
+        Returns:
+            dict[str, str]: Field errors from business rule violations
+        """
+        return {
+            name: rule.message
+            for name, rule in self._rules.items()
+            if _has_meaningful_value(form_data.get(name)) and not rule.condition(form_data)
+        }
+
+
+_business_rules: BusinessRuleSet | None = None
+
+
+def get_business_rules() -> BusinessRuleSet:
+    """Get the process-wide business rule set.
+
+    Returns:
+        BusinessRuleSet: Rules compiled from the profile page configuration
+    """
+    global _business_rules
+    if _business_rules is None:
+        _business_rules = BusinessRuleSet.load()
+    return _business_rules
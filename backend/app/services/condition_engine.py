@@ -0,0 +1,353 @@
+"""Compiled display conditions for entry forms.
+
+Display conditions are JSON trees (``{"operator": ..., "field": ...,
+"value": ...}`` combined with ``and``/``or``/``not``). This module compiles
+each tree once into a Python closure: field paths are split, expected
+values normalized and regular expressions compiled up front, so evaluating
+a form state only calls closures.
+
+Public Classes:
+    CompiledCondition: Display condition compiled to a closure
+    ConditionSet: Compiled display conditions of a form
+
+Public Functions:
+    compile_condition: Compile a display condition tree
+
+Features:
+    - Same results as the interpreting ConditionEvaluator, including for
+      malformed conditions, which raise when (and only when) evaluated
+    - Pre-split dotted field paths and precompiled regex patterns
+    - Referenced field names recorded per condition and indexed into a
+      field dependency graph for partial re-evaluation
+    - Batch evaluation of many form states in one call
+"""
+
+from __future__ import annotations
+
+import logging
+import operator
+import re
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+__all__ = ["OPERATORS", "CompiledCondition", "ConditionSet", "compile_condition"]
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[Mapping[str, Any]], bool]
+
+
+def _safe_numeric_compare(a: Any, b: Any, compare_fn) -> bool:
+    """Safely compare two values numerically, handling type conversions.
+
+    Args:
+        a: First value
+        b: Second value
+        compare_fn: Comparison function (e.g., lambda x, y: x > y)
+
+    Returns:
+        bool: Result of comparison, False if types are incompatible
+    """
+    try:
+        # Convert to numeric types if possible
+        a_num = float(a) if a is not None and a != "" else 0
+        b_num = float(b) if b is not None and b != "" else 0
+        return compare_fn(a_num, b_num)
+    except (TypeError, ValueError):
+        # If conversion fails, return False
+        return False
+
+
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    # Comparison operators
+    "equals": lambda a, b: a == b,
+    "not_equals": lambda a, b: a != b,
+    "equals_ignore_case": lambda a, b: str(a or "").lower() == str(b).lower(),
+    "greater_than": lambda a, b: _safe_numeric_compare(a, b, lambda x, y: x > y),
+    "less_than": lambda a, b: _safe_numeric_compare(a, b, lambda x, y: x < y),
+    "greater_equal": lambda a, b: _safe_numeric_compare(a, b, lambda x, y: x >= y),
+    "less_equal": lambda a, b: _safe_numeric_compare(a, b, lambda x, y: x <= y),
+    # String operators
+    "contains": lambda a, b: str(b).lower() in str(a or "").lower(),
+    "starts_with": lambda a, b: str(a or "").lower().startswith(str(b).lower()),
+    "ends_with": lambda a, b: str(a or "").lower().endswith(str(b).lower()),
+    "matches_pattern": lambda a, b: bool(re.match(b, str(a or ""))),
+    # Collection operators
+    "in": lambda a, b: a in (b if isinstance(b, list) else [b]),
+    "not_in": lambda a, b: a not in (b if isinstance(b, list) else [b]),
+    "any_of": lambda a, b: any(item in (a if isinstance(a, list) else [a]) for item in b),
+    "all_of": lambda a, b: all(item in (a if isinstance(a, list) else [a]) for item in b),
+    # Existence operators
+    "exists": lambda a, b: a is not None and a != "",
+    "not_exists": lambda a, b: a is None or a == "",
+    "is_empty": lambda a, b: not bool(a),
+    "is_not_empty": lambda a, b: bool(a),
+}
+
+# Numeric comparisons whose expected value is converted once at compile time
+_NUMERIC_COMPARISONS = {
+    "greater_than": operator.gt,
+    "less_than": operator.lt,
+    "greater_equal": operator.ge,
+    "less_equal": operator.le,
+}
+
+
+def _always_true(form_data: Mapping[str, Any]) -> bool:
+    return True
+
+
+def _raising(error: Exception) -> Predicate:
+    """Build a predicate that raises a compile error when evaluated."""
+
+    def predicate(form_data: Mapping[str, Any]) -> bool:
+        raise error
+
+    return predicate
+
+
+def _compile_field(field_path: Any) -> Callable[[Mapping[str, Any]], Any]:
+    """Compile a field path into a value getter supporting dot notation."""
+    path = field_path if isinstance(field_path, str) else str(field_path)
+    if "." not in path:
+        return lambda form_data: form_data.get(path)
+
+    parts = tuple(path.split("."))
+
+    def get(form_data: Mapping[str, Any]) -> Any:
+        value: Any = form_data
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    return get
+
+
+def _compile_test(op: str, expected: Any) -> Callable[[Any], bool]:
+    """Compile an operator with its expected value into a value test."""
+    if op in _NUMERIC_COMPARISONS:
+        compare = _NUMERIC_COMPARISONS[op]
+        try:
+            bound = float(expected) if expected is not None and expected != "" else 0
+        except (TypeError, ValueError):
+            return lambda value: False
+        return lambda value: _safe_numeric_compare(value, bound, compare)
+    if op == "equals":
+        return lambda value: value == expected
+    if op == "equals_ignore_case":
+        folded = str(expected).lower()
+        return lambda value: str(value or "").lower() == folded
+    if op == "contains":
+        needle = str(expected).lower()
+        return lambda value: needle in str(value or "").lower()
+    if op == "starts_with":
+        prefix = str(expected).lower()
+        return lambda value: str(value or "").lower().startswith(prefix)
+    if op == "ends_with":
+        suffix = str(expected).lower()
+        return lambda value: str(value or "").lower().endswith(suffix)
+    if op == "matches_pattern" and isinstance(expected, str):
+        try:
+            pattern = re.compile(expected)
+        except re.error as e:
+            return _raising(e)
+        return lambda value: bool(pattern.match(str(value or "")))
+    if op in ("in", "not_in"):
+        choices = expected if isinstance(expected, list) else [expected]
+        if op == "in":
+            return lambda value: value in choices
+        return lambda value: value not in choices
+
+    test = OPERATORS[op]
+    return lambda value: test(value, expected)
+
+
+def _compile(condition: Any, fields: set[str]) -> Predicate:
+    """Compile a condition tree, collecting referenced field names."""
+    try:
+        if not condition:
+            return _always_true
+
+        op = condition.get("operator")
+        if not op:
+            return _always_true
+
+        # Logical operators
+        if op in ("and", "or"):
+            parts = tuple(_compile(c, fields) for c in condition.get("conditions", []))
+            if op == "and":
+                return lambda form_data: all(part(form_data) for part in parts)
+            return lambda form_data: any(part(form_data) for part in parts)
+        if op == "not":
+            inner = _compile(condition.get("condition", {}), fields)
+            return lambda form_data: not inner(form_data)
+
+        # Field-based operators
+        field = condition.get("field")
+        if not field:
+            return _always_true
+        fields.add(str(field).split(".", 1)[0])
+        if op not in OPERATORS:
+            return _raising(ValueError(f"Unknown operator: {op}"))
+
+        get = _compile_field(field)
+        test = _compile_test(op, condition.get("value"))
+        return lambda form_data: test(get(form_data))
+    except Exception as e:
+        return _raising(e)
+
+
+class CompiledCondition:
+    """Display condition compiled to a closure.
+
+    Attributes:
+        fields: Top-level form fields the condition reads
+    """
+
+    __slots__ = ("fields", "_predicate")
+
+    def __init__(self, fields: frozenset[str], predicate: Predicate) -> None:
+        """Initialize compiled condition.
+
+        Args:
+            fields (frozenset[str]): Top-level form fields the condition reads
+            predicate (Predicate): Compiled closure
+        """
+        self.fields = fields
+        self._predicate = predicate
+
+    def evaluate(self, form_data: Mapping[str, Any]) -> bool:
+        """Evaluate the condition against form data.
+
+        Args:
+            form_data (Mapping[str, Any]): Form data to evaluate against
+
+        Returns:
+            bool: True if the condition is met
+
+        Raises:
+            ValueError: If the condition uses an unknown operator
+        """
+        return self._predicate(form_data)
+
+    __call__ = evaluate
+
+
+def compile_condition(condition: Any) -> CompiledCondition:
+    """Compile a display condition tree.
+
+    Never raises; errors in malformed conditions are raised on evaluation,
+    like the interpreting evaluator does.
+
+    Args:
+        condition (Any): Condition dictionary with operator, field, value, etc.
+
+    Returns:
+        CompiledCondition: Compiled condition
+    """
+    fields: set[str] = set()
+    predicate = _compile(condition, fields)
+    return CompiledCondition(frozenset(fields), predicate)
+
+
+class ConditionSet:
+    """Compiled display conditions of a form, keyed by field name.
+
+    Conditions that fail to evaluate leave their field visible.
+    """
+
+    __slots__ = ("_conditions", "_dependents")
+
+    def __init__(self, conditions: Mapping[str, CompiledCondition]) -> None:
+        """Initialize condition set and index conditions by the fields they read.
+
+        Args:
+            conditions (Mapping[str, CompiledCondition]): Compiled condition per field
+        """
+        self._conditions = dict(conditions)
+        dependents: dict[str, set[str]] = {}
+        for field_name, condition in self._conditions.items():
+            for field in condition.fields:
+                dependents.setdefault(field, set()).add(field_name)
+        self._dependents = {field: frozenset(names) for field, names in dependents.items()}
+
+    @classmethod
+    def compile(cls, conditional_logic: Mapping[str, Any]) -> ConditionSet:
+        """Compile the conditional logic of a form schema.
+
+        Args:
+            conditional_logic (Mapping[str, Any]): Display condition per field name
+
+        Returns:
+            ConditionSet: Compiled conditions
+        """
+        return cls(
+            {name: compile_condition(condition) for name, condition in conditional_logic.items()}
+        )
+
+    def __len__(self) -> int:
+        """Number of conditional fields."""
+        return len(self._conditions)
+
+    def __getitem__(self, field_name: str) -> CompiledCondition:
+        """Get the compiled condition of a field."""
+        return self._conditions[field_name]
+
+    def items(self) -> Iterable[tuple[str, CompiledCondition]]:
+        """Iterate over field names and their compiled conditions."""
+        return self._conditions.items()
+
+    def affected_by(self, changed_fields: Iterable[str]) -> set[str]:
+        """Get the conditional fields whose visibility can depend on changed fields.
+
+        Args:
+            changed_fields (Iterable[str]): Changed form fields; dotted paths
+                count as their top-level field
+
+        Returns:
+            set[str]: Names of the conditional fields to re-evaluate
+        """
+        affected: set[str] = set()
+        for field in changed_fields:
+            affected |= self._dependents.get(field.split(".", 1)[0], frozenset())
+        return affected
+
+    def evaluate(
+        self, form_data: Mapping[str, Any], fields: Iterable[str] | None = None
+    ) -> dict[str, bool]:
+        """Evaluate the visibility of conditional fields.
+
+        Args:
+            form_data (Mapping[str, Any]): Current form data
+            fields (Iterable[str] | None): Fields to evaluate, e.g. from
+                affected_by; None evaluates every conditional field
+
+        Returns:
+            dict[str, bool]: Field visibility map
+        """
+        names = self._conditions if fields is None else fields
+        visibility: dict[str, bool] = {}
+        for field_name in names:
+            condition = self._conditions.get(field_name)
+            if condition is None:
+                continue
+            try:
+                visibility[field_name] = condition.evaluate(form_data)
+            except Exception as e:
+                # Default to visible
+                logger.warning("Error evaluating condition for %s: %s", field_name, e)
+                visibility[field_name] = True
+        return visibility
+
+    def evaluate_many(self, form_states: Iterable[Mapping[str, Any]]) -> list[dict[str, bool]]:
+        """Evaluate the visibility of every conditional field for many form states.
+
+        Args:
+            form_states (Iterable[Mapping[str, Any]]): Form data per state
+
+        Returns:
+            list[dict[str, bool]]: Field visibility map per state, in order
+        """
+        return [self.evaluate(form_data) for form_data in form_states]
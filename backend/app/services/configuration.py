@@ -9,7 +9,7 @@ Public Classes:
 Features:
     - Configuration creation with initial selections
     - Selection management (add, update, remove)
-    - Price and weight calculation
+    - Price and weight calculation (incremental on single-selection edits)
     - Configuration validation
     - Detailed configuration retrieval
 """
@@ -26,6 +26,7 @@ from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import NotFoundException, ValidationException
 from app.core.rbac import Permission, Privilege, ResourceOwnership, Role, require
+from app.models.attribute_node import AttributeNode
 from app.models.configuration import Configuration
 from app.models.configuration_selection import ConfigurationSelection
 from app.repositories.attribute_node import AttributeNodeRepository
@@ -174,10 +175,20 @@ class ConfigurationService(BaseService):
         await self.get_configuration(config_id)
 
         # Add selection
-        selection = await self._add_selection_internal(config_id, selection_value)
-
-        # Recalculate totals
-        await self.calculate_totals(config_id)
+        selection, attr_node = await self._create_selection(config_id, selection_value)
+
+        # Apply the selection's impact to the stored totals
+        await self.pricing_service.apply_selection_change(
+            config_id,
+            attr_node,
+            old_impacts=None,
+            new_impacts={
+                "price_impact": selection.calculated_price_impact,
+                "weight_impact": selection.calculated_weight_impact,
+            },
+        )
+        await self.commit()
+        await self.refresh(selection)
 
         return selection
 
@@ -193,6 +204,29 @@ class ConfigurationService(BaseService):
         Returns:
             ConfigurationSelection: Created selection
 
+        Raises:
+            NotFoundException: If attribute node not found
+            ValidationException: If selection is invalid
+        """
+        selection, _ = await self._create_selection(config_id, selection_value)
+        await self.commit()
+        await self.refresh(selection)
+
+        return selection
+
+    async def _create_selection(
+        self, config_id: int, selection_value: ConfigurationSelectionValue
+    ) -> tuple[ConfigurationSelection, AttributeNode]:
+        """Create a selection with calculated impacts without committing.
+
+        Args:
+            config_id (int): Configuration ID
+            selection_value (ConfigurationSelectionValue): Selection data
+
+        Returns:
+            tuple[ConfigurationSelection, AttributeNode]: Pending selection and
+                its attribute node
+
         Raises:
             NotFoundException: If attribute node not found
             ValidationException: If selection is invalid
@@ -214,15 +248,13 @@ class ConfigurationService(BaseService):
         )
 
         # Calculate impacts
-        impacts = await self.pricing_service.calculate_selection_impact(selection)
+        impacts = await self.pricing_service.calculate_selection_impact(selection, attr_node)
         selection.calculated_price_impact = impacts["price_impact"]
         selection.calculated_weight_impact = impacts["weight_impact"]
 
         self.selection_repo.db.add(selection)
-        await self.commit()
-        await self.refresh(selection)
 
-        return selection
+        return selection, attr_node
 
     async def remove_selection(self, config_id: PositiveInt, selection_id: PositiveInt) -> None:
         """Remove a selection from a configuration.
@@ -255,13 +287,19 @@ class ConfigurationService(BaseService):
                 },
             )
 
-        # Delete selection
+        attr_node = await self.attr_node_repo.get(selection.attribute_node_id)
+        old_impacts = {
+            "price_impact": selection.calculated_price_impact,
+            "weight_impact": selection.calculated_weight_impact,
+        }
+
+        # Delete selection and remove its impact from the stored totals
         await self.selection_repo.delete(selection_id)
+        await self.pricing_service.apply_selection_change(
+            config_id, attr_node, old_impacts=old_impacts, new_impacts=None
+        )
         await self.commit()
 
-        # Recalculate totals
-        await self.calculate_totals(config_id)
-
     async def calculate_totals(self, config_id: PositiveInt) -> dict[str, Decimal]:
         """Calculate and update total price and weight for a configuration.
 
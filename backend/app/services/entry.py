@@ -7,6 +7,7 @@ and configuration management.
 Public Classes:
     ConditionEvaluator: Smart condition evaluator with complex expression support
     EntryService: Service class for entry page operations
+    PreviewStream: Keyset-paginated stream of preview rows
 
 Features:
     - Schema-driven form generation from attribute hierarchy
@@ -14,18 +15,32 @@ Features:
     - Comprehensive validation with error handling
     - Configuration creation and management
     - Preview data generation
+    - Compiled form schemas cached per attribute tree version
+    - Field options loaded for the whole form in two queries
+    - Preview tables assembled in bulk from pivoted selection rows
+    - Streamed previews paged by keyset with header filters and sorting
+    - CSV and XLSX profile sheet exports streamed from a server-side cursor
+    - Preview headers kept in a bounded, versioned header registry
+    - Display conditions compiled once per schema and evaluated in batches
+    - Partial visibility re-evaluation driven by a field dependency graph
+    - Table-driven business rules compiled once and indexed by triggering field
     - Performance optimizations with caching
 """
 
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 import logging
 import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import ColumnElement, Select, String, and_, cast, delete, exists, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -36,6 +51,7 @@ from app.models.configuration import Configuration
 from app.models.configuration_selection import ConfigurationSelection
 from app.models.manufacturing_type import ManufacturingType
 from app.models.user import User
+from app.repositories.attribute_node import AttributeNodeRepository
 from app.schemas.entry import (
     FieldDefinition,
     FormSection,
@@ -46,9 +62,16 @@ from app.schemas.entry import (
     FieldMetadata,
 )
 from app.services.base import BaseService
+from app.services.business_rules import get_business_rules
+from app.services.pricing import PricingService
+from app.services.profile_export import EXPORT_YIELD_PER, ExportFormat, ProfileExport
 from app.services.rbac import RBACService
+from app.services.condition_engine import OPERATORS, ConditionSet
+from app.services.header_registry import PreviewHeaders, get_header_registry
+from app.services.schema_cache import CompiledSchema, get_profile_schema_cache
+from app.services.tree_versions import get_tree_version, has_pending_changes
 
-__all__ = ["ConditionEvaluator", "EntryService"]
+__all__ = ["ConditionEvaluator", "EntryService", "PreviewStream"]
 logger = logging.getLogger("EntrySystem")
 
 
@@ -86,25 +109,223 @@ ConfigurationDeleter = Privilege(
 )
 
 
-def _safe_numeric_compare(a: Any, b: Any, compare_fn) -> bool:
-    """Safely compare two values numerically, handling type conversions.
+# Select fields whose options come from relation entities, mapped to entity type
+RELATION_FIELD_ENTITY_TYPES = {
+    "system_series": "system_series",
+    "company": "company",
+    "material": "material",
+    "opening_system": "opening_system",
+    "colours": "color",  # Note: colours field maps to color entity type
+}
+
+# UI components whose fields list options
+OPTION_UI_COMPONENTS = frozenset({"dropdown", "radio", "multi-select"})
+
+
+@dataclass(slots=True)
+class _OptionSources:
+    """Option nodes and relation entities preloaded for a set of fields."""
 
-    Args:
-        a: First value
-        b: Second value
-        compare_fn: Comparison function (e.g., lambda x, y: x > y)
+    children: dict[int, list[AttributeNode]]
+    entities: dict[str, list[Any]]
 
-    Returns:
-        bool: Result of comparison, False if types are incompatible
+
+@dataclass(slots=True)
+class _PreviewLayout:
+    """Header layout shared by every row of a preview table.
+
+    Attributes:
+        headers: Ordered table headers
+        header_mapping: Header to field name
+        field_headers: Field name to header
+        node_names: Attribute node ID to field name for the manufacturing type
+        name_header: Header showing the configuration name
+        numeric_fields: Fields sorted by their numeric selection values
     """
-    try:
-        # Convert to numeric types if possible
-        a_num = float(a) if a is not None and a != "" else 0
-        b_num = float(b) if b is not None and b != "" else 0
-        return compare_fn(a_num, b_num)
-    except (TypeError, ValueError):
-        # If conversion fails, return False
-        return False
+
+    headers: list[str]
+    header_mapping: dict[str, str]
+    field_headers: dict[str, str]
+    node_names: dict[int, str]
+    name_header: str
+    numeric_fields: frozenset[str] = frozenset()
+
+    def node_ids(self, field_name: str) -> list[int]:
+        """Get the IDs of the attribute nodes storing a field."""
+        return [node_id for node_id, name in self.node_names.items() if name == field_name]
+
+
+# Configurations read per query when streaming previews
+PREVIEW_STREAM_PAGE_SIZE = 500
+
+
+class PreviewStream:
+    """Keyset-paginated stream of preview rows.
+
+    Iterating reads ``page_size`` configurations at a time, ordered by the
+    sort expression and then ID, and continues each page strictly after the
+    last row of the previous one. Rows without a value for the sort column
+    come last in either direction.
+
+    Attributes:
+        headers: Ordered table headers
+        sort: Header the rows are sorted by
+        descending: Whether rows are sorted in descending order
+        limit: Maximum number of rows to stream
+        count: Rows streamed so far
+        next_cursor: Cursor of the row after the last streamed one, set once
+            iteration stops at ``limit``; None when the table was exhausted
+    """
+
+    DEFAULT_SORT = "updated_at"
+
+    def __init__(
+        self,
+        service: EntryService,
+        layout: _PreviewLayout,
+        query: Select | None,
+        *,
+        sort: str,
+        sort_key: ColumnElement,
+        descending: bool = True,
+        position: tuple[Any, int] | None = None,
+        limit: int | None = None,
+        page_size: int = PREVIEW_STREAM_PAGE_SIZE,
+    ) -> None:
+        """Initialize preview stream.
+
+        Args:
+            service: Entry service building the rows
+            layout: Header layout of the table
+            query: SELECT of configuration id and name, or None for no rows
+            sort: Header the rows are sorted by
+            sort_key: SQL expression of the sort column
+            descending: Sort in descending order
+            position: Sort value and ID of the row to continue after
+            limit: Maximum number of rows to stream; None for all rows
+            page_size: Configurations read per query
+        """
+        self.headers = layout.headers
+        self.sort = sort
+        self.descending = descending
+        self.limit = limit
+        self.count = 0
+        self.next_cursor: str | None = None
+        self._service = service
+        self._layout = layout
+        self._query = query
+        self._sort_key = sort_key
+        self._position = position
+        self._page_size = page_size
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield preview rows page by page."""
+        if self._query is None:
+            return
+
+        while self.limit is None or self.count < self.limit:
+            size = self._page_size
+            if self.limit is not None:
+                size = min(size, self.limit - self.count)
+            page = await self._fetch_page(size)
+            if not page:
+                return
+
+            values = await self._service._load_selection_values(
+                [row.id for row in page], self._layout.node_names
+            )
+            for row in page:
+                yield self._service._configuration_row(
+                    self._layout, row.id, row.name, values.get(row.id, {})
+                )
+            self.count += len(page)
+            self._position = (page[-1].sort_value, page[-1].id)
+            if len(page) < size:
+                return
+
+        self.next_cursor = self.encode_cursor(self.sort, *self._position)
+
+    async def _fetch_page(self, size: int) -> list[Any]:
+        """Read the next page of configurations."""
+        sort_key = self._sort_key
+        order = (sort_key.desc(), Configuration.id.desc())
+        if not self.descending:
+            order = (sort_key.asc(), Configuration.id.asc())
+        stmt = (
+            self._query.add_columns(sort_key.label("sort_value"))
+            .order_by(order[0].nulls_last(), order[1])
+            .limit(size)
+        )
+        if self._position is not None:
+            stmt = stmt.where(self._after(*self._position))
+        result = await self._service.db.execute(stmt)
+        return list(result.all())
+
+    def _after(self, value: Any, last_id: int) -> ColumnElement:
+        """Get the keyset condition for rows after a sort value and ID."""
+        sort_key = self._sort_key
+        if self.descending:
+            beyond_value, beyond_id = sort_key < value, Configuration.id < last_id
+        else:
+            beyond_value, beyond_id = sort_key > value, Configuration.id > last_id
+        if value is None:
+            return and_(sort_key.is_(None), beyond_id)
+        return or_(
+            beyond_value,
+            and_(sort_key == value, beyond_id),
+            sort_key.is_(None),
+        )
+
+    @staticmethod
+    def encode_cursor(sort: str, value: Any, last_id: int) -> str:
+        """Encode the position of a row as an opaque cursor.
+
+        Args:
+            sort: Header the rows are sorted by
+            value: Sort value of the row
+            last_id: Configuration ID of the row
+
+        Returns:
+            str: URL-safe cursor
+        """
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        payload = json.dumps([sort, value, last_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, sort: str, sort_type: str) -> tuple[Any, int]:
+        """Decode a cursor created by encode_cursor.
+
+        Args:
+            cursor: Cursor from a previous stream
+            sort: Header the rows are sorted by
+            sort_type: Value type of the sort column (datetime, int, numeric, text)
+
+        Returns:
+            tuple: Sort value and configuration ID of the row to continue after
+
+        Raises:
+            ValidationException: If the cursor is malformed or was created
+                for another sort
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            cursor_sort, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+            if cursor_sort != sort or not isinstance(last_id, int):
+                raise ValueError("cursor belongs to another sort")
+            if value is not None:
+                if sort_type == "datetime":
+                    value = datetime.fromisoformat(value)
+                elif sort_type == "numeric":
+                    value = Decimal(value)
+                elif sort_type == "int":
+                    value = int(value)
+        except (ValueError, TypeError, InvalidOperation, binascii.Error):
+            raise ValidationException("Invalid preview cursor") from None
+        return value, last_id
 
 
 class ConditionEvaluator:
@@ -113,32 +334,12 @@ class ConditionEvaluator:
     Supports a rich set of operators for comparison, string operations,
     collection operations, existence checks, and logical operations.
     Provides consistent evaluation in both Python and JavaScript.
+
+    Interprets the condition tree on every call; forms evaluate their
+    conditions through the ConditionSet compiled with their schema.
     """
 
-    OPERATORS = {
-        # Comparison operators
-        "equals": lambda a, b: a == b,
-        "not_equals": lambda a, b: a != b,
-        "greater_than": lambda a, b: _safe_numeric_compare(a, b, lambda x, y: x > y),
-        "less_than": lambda a, b: _safe_numeric_compare(a, b, lambda x, y: x < y),
-        "greater_equal": lambda a, b: _safe_numeric_compare(a, b, lambda x, y: x >= y),
-        "less_equal": lambda a, b: _safe_numeric_compare(a, b, lambda x, y: x <= y),
-        # String operators
-        "contains": lambda a, b: str(b).lower() in str(a or "").lower(),
-        "starts_with": lambda a, b: str(a or "").lower().startswith(str(b).lower()),
-        "ends_with": lambda a, b: str(a or "").lower().endswith(str(b).lower()),
-        "matches_pattern": lambda a, b: bool(re.match(b, str(a or ""))),
-        # Collection operators
-        "in": lambda a, b: a in (b if isinstance(b, list) else [b]),
-        "not_in": lambda a, b: a not in (b if isinstance(b, list) else [b]),
-        "any_of": lambda a, b: any(item in (a if isinstance(a, list) else [a]) for item in b),
-        "all_of": lambda a, b: all(item in (a if isinstance(a, list) else [a]) for item in b),
-        # Existence operators
-        "exists": lambda a, b: a is not None and a != "",
-        "not_exists": lambda a, b: a is None or a == "",
-        "is_empty": lambda a, b: not bool(a),
-        "is_not_empty": lambda a, b: bool(a),
-    }
+    OPERATORS = OPERATORS
 
     def evaluate_condition(self, condition: dict[str, Any], form_data: dict[str, Any]) -> bool:
         """Evaluate a condition against form data.
@@ -229,12 +430,66 @@ class EntryService(BaseService):
         super().__init__(db)
         self.condition_evaluator = ConditionEvaluator()
         self.rbac_service = RBACService(db)
+        self.pricing_service = PricingService(db)
 
     async def get_profile_schema(
         self, manufacturing_type_id: int, page_type: str = "profile"
     ) -> ProfileSchema:
         """Get profile form schema for a manufacturing type and page type.
 
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            page_type: Page type (profile, accessories, glazing)
+
+        Returns:
+            ProfileSchema: Generated form schema; shared, do not mutate
+
+        Raises:
+            NotFoundException: If manufacturing type not found
+        """
+        compiled = await self.get_compiled_profile_schema(manufacturing_type_id, page_type)
+        return compiled.schema
+
+    async def get_compiled_profile_schema(
+        self, manufacturing_type_id: int, page_type: str = "profile"
+    ) -> CompiledSchema:
+        """Get the compiled form schema, building it only when the tree changed.
+
+        Schemas are cached per manufacturing type, page type and tree version,
+        so repeated requests cost one version lookup and no queries.
+
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            page_type: Page type (profile, accessories, glazing)
+
+        Returns:
+            CompiledSchema: Schema with its JSON body and ETag
+
+        Raises:
+            NotFoundException: If manufacturing type not found
+        """
+        cache = get_profile_schema_cache()
+        key = None
+        if not has_pending_changes(self.db):
+            version = await cache.get_version(self.db, manufacturing_type_id)
+            key = cache.make_key(manufacturing_type_id, page_type, version)
+            compiled = await cache.get(key)
+            if compiled is not None:
+                return compiled
+
+        compiled = CompiledSchema.compile(
+            await self._build_profile_schema(manufacturing_type_id, page_type)
+        )
+        # Building may have flushed pending changes of the session
+        if key is not None and not has_pending_changes(self.db):
+            await cache.set(key, compiled)
+        return compiled
+
+    async def _build_profile_schema(
+        self, manufacturing_type_id: int, page_type: str
+    ) -> ProfileSchema:
+        """Build the form schema of a manufacturing type and page type.
+
         Args:
             manufacturing_type_id: Manufacturing type ID
             page_type: Page type (profile, accessories, glazing)
@@ -281,9 +536,14 @@ class EntryService(BaseService):
     ) -> ProfileSchema:
         """Generate form schema from attribute nodes.
 
+        Options of every select field are loaded up front (one query for
+        option nodes, one for relation entities) and fields are assembled
+        in memory.
+
         Args:
             manufacturing_type_id: Manufacturing type ID
             attribute_nodes: List of attribute nodes
+            dependencies: Field dependencies of the page's definition scope
 
         Returns:
             ProfileSchema: Generated form schema
@@ -291,11 +551,13 @@ class EntryService(BaseService):
         sections_dict: dict[str, FormSection] = {}
         conditional_logic: dict[str, Any] = {}
 
-        for node in attribute_nodes:
-            # Skip category and option nodes - only process attribute nodes
-            if node.node_type in ["category", "option"]:
-                continue
+        # Skip category and option nodes - only process attribute nodes
+        field_nodes = [
+            node for node in attribute_nodes if node.node_type not in ["category", "option"]
+        ]
+        option_sources = await self._load_option_sources(field_nodes)
 
+        for node in field_nodes:
             # Determine section based on LTREE path
             section_name = self.get_section_name(node.ltree_path)
 
@@ -305,8 +567,7 @@ class EntryService(BaseService):
                     title=section_name, fields=[], sort_order=len(sections_dict)
                 )
 
-            # Create field definition (now async)
-            field = await self.create_field_definition(node)
+            field = await self.create_field_definition(node, option_sources)
             sections_dict[section_name].fields.append(field)
 
             # Add conditional logic if present
@@ -354,52 +615,40 @@ class EntryService(BaseService):
             return section_name.replace("_", " ").title()
         return "General"
 
-    async def create_field_definition(self, node: AttributeNode) -> FieldDefinition:
+    async def create_field_definition(
+        self, node: AttributeNode, option_sources: _OptionSources | None = None
+    ) -> FieldDefinition:
         """Create field definition from attribute node.
 
         Args:
             node: Attribute node
+            option_sources: Options preloaded by generate_form_schema; loaded
+                for this node alone when omitted
 
         Returns:
             FieldDefinition: Field definition
         """
         # Use display_name from the node, with fallback to auto-generated name
         label = node.get_display_name()
-
-        # Map ui_component values to match template expectations
-        # Handle variations like 'input', 'string', etc. to ensure they map to 'text'
-        ui_component = (node.ui_component or "").lower()
-        if ui_component in ["input", "text", "string", "textinput"]:
-            ui_component = "text"
-        elif ui_component in ["multiselect", "multi_select"]:
-            ui_component = "multi-select"
-        elif ui_component in ["file", "image", "picture", "pic"]:
-            ui_component = "picture-input"
-        elif not ui_component:
-            # Fallback based on data_type
-            if node.data_type == "boolean":
-                ui_component = "checkbox"
-            elif node.data_type in ["number", "float"]:
-                ui_component = "number"
-            elif node.data_type == "selection":
-                ui_component = "dropdown"
-            else:
-                ui_component = "text"
+        ui_component = self._resolve_ui_component(node)
 
         # Extract options from child nodes or relations system
         options = None
         options_data = None
-        if ui_component in ["dropdown", "radio", "multi-select"]:
+        if ui_component in OPTION_UI_COMPONENTS:
+            if option_sources is None:
+                option_sources = await self._load_option_sources([node])
             # Check if this is a relations field that should get options from relations system
-            if node.name in ["system_series", "company", "material", "opening_system", "colours"]:
-                logger.info(f"Using relations system for field: {node.name}")
-                options, options_data = await self._extract_options_from_relations(node.name)
-                logger.info(f"Relations system returned {len(options)} options for {node.name}: {options}")
+            entity_type = RELATION_FIELD_ENTITY_TYPES.get(node.name)
+            if entity_type:
+                options, options_data = self._options_from_entities(
+                    option_sources.entities.get(entity_type, [])
+                )
             else:
                 # Use traditional child nodes approach
-                logger.info(f"Using child nodes for field: {node.name}")
-                options = await self._extract_options_from_children(node)
-                options_data = await self._extract_options_with_metadata(node)
+                options, options_data = self._options_from_children(
+                    option_sources.children.get(node.id, [])
+                )
 
         # Extract short help text
         help_text = node.help_text
@@ -426,49 +675,99 @@ class EntryService(BaseService):
             sort_order=node.sort_order or 0,
         )
 
-    async def _extract_options_from_children(self, parent_node: AttributeNode) -> list[str]:
-        """Extract option values from child nodes.
+    @staticmethod
+    def _resolve_ui_component(node: AttributeNode) -> str:
+        """Get the UI component of a field.
 
         Args:
-            parent_node: Parent attribute node
+            node: Attribute node
 
         Returns:
-            list[str]: List of option values
+            str: Normalized UI component name
         """
-        stmt = (
-            select(AttributeNode)
-            .where(
-                AttributeNode.parent_node_id == parent_node.id, AttributeNode.node_type == "option"
-            )
-            .order_by(AttributeNode.sort_order, AttributeNode.name)
-        )
-        result = await self.db.execute(stmt)
-        option_nodes = result.scalars().all()
+        # Map ui_component values to match template expectations
+        # Handle variations like 'input', 'string', etc. to ensure they map to 'text'
+        ui_component = (node.ui_component or "").lower()
+        if ui_component in ["input", "text", "string", "textinput"]:
+            return "text"
+        if ui_component in ["multiselect", "multi_select"]:
+            return "multi-select"
+        if ui_component in ["file", "image", "picture", "pic"]:
+            return "picture-input"
+        if ui_component:
+            return ui_component
+
+        # Fallback based on data_type
+        if node.data_type == "boolean":
+            return "checkbox"
+        if node.data_type in ["number", "float"]:
+            return "number"
+        if node.data_type == "selection":
+            return "dropdown"
+        return "text"
+
+    async def _load_option_sources(self, nodes: list[AttributeNode]) -> _OptionSources:
+        """Load the options of every select field with one query per source.
+
+        Args:
+            nodes: Attribute nodes rendered as fields
+
+        Returns:
+            _OptionSources: Option nodes keyed by parent ID and relation
+                entities keyed by entity type
+        """
+        parent_ids: set[int] = set()
+        entity_types: set[str] = set()
+        for node in nodes:
+            if self._resolve_ui_component(node) not in OPTION_UI_COMPONENTS:
+                continue
+            entity_type = RELATION_FIELD_ENTITY_TYPES.get(node.name)
+            if entity_type:
+                entity_types.add(entity_type)
+            elif node.id is not None:
+                parent_ids.add(node.id)
 
-        return [node.name for node in option_nodes]
+        children = await AttributeNodeRepository(self.db).get_options_by_parents(parent_ids)
+        entities = await self._load_relation_entities(sorted(entity_types))
+        return _OptionSources(children=children, entities=entities)
 
-    async def _extract_options_with_metadata(
-        self, parent_node: AttributeNode
-    ) -> list[dict[str, Any]]:
-        """Extract option values and metadata from child nodes.
+    async def _load_relation_entities(self, entity_types: list[str]) -> dict[str, list[Any]]:
+        """Load relation entities of several types from the relations system.
 
         Args:
-            parent_node: Parent attribute node
+            entity_types: Entity types (system_series, company, material, etc.)
 
         Returns:
-            list[dict]: List of option dictionaries with id, name, and other metadata
+            dict[str, list[Any]]: Entities keyed by entity type; empty if loading failed
         """
-        stmt = (
-            select(AttributeNode)
-            .where(
-                AttributeNode.parent_node_id == parent_node.id, AttributeNode.node_type == "option"
-            )
-            .order_by(AttributeNode.sort_order, AttributeNode.name)
-        )
-        result = await self.db.execute(stmt)
-        option_nodes = result.scalars().all()
+        if not entity_types:
+            return {}
+
+        from app.services.product_definition import get_product_definition_service
+
+        relations_service = get_product_definition_service("profile", self.db)
+        try:
+            return await relations_service.get_entities_by_types(entity_types)
+        except Exception as e:
+            logger.error(f"Error loading options from relations for {entity_types}: {e}")
+            import traceback
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return {}
+
+    @staticmethod
+    def _options_from_children(
+        option_nodes: list[AttributeNode],
+    ) -> tuple[list[str], list[dict[str, Any]]]:
+        """Build options from child option nodes.
+
+        Args:
+            option_nodes: Option nodes ordered by sort_order and name
 
-        return [
+        Returns:
+            tuple: (options list, options_data list with id, name and other metadata)
+        """
+        options = [node.name for node in option_nodes]
+        options_data = [
             {
                 "id": node.id,
                 "name": node.name,
@@ -481,114 +780,108 @@ class EntryService(BaseService):
             }
             for node in option_nodes
         ]
+        return options, options_data
 
-    async def _extract_options_from_relations(
-        self, field_name: str
-    ) -> tuple[list[str], list[dict[str, Any]]]:
-        """Extract options from the relations system for specific fields.
+    @staticmethod
+    def _options_from_entities(entities: list[Any]) -> tuple[list[str], list[dict[str, Any]]]:
+        """Build options from relation entities, keeping the first entity of each name.
 
         Args:
-            field_name: Name of the field (system_series, company, material, etc.)
+            entities: Relation entities ordered by name
 
         Returns:
             tuple: (options list, options_data list)
         """
-        logger.info(f"Loading options for field: {field_name}")
-        
-        from app.services.product_definition import get_product_definition_service
-
-        relations_service = get_product_definition_service("profile", self.db)
-
-        # Map field names to entity types
-        field_to_entity_type = {
-            "system_series": "system_series",
-            "company": "company", 
-            "material": "material",
-            "opening_system": "opening_system",
-            "colours": "color",  # Note: colours field maps to color entity type
-        }
-
-        entity_type = field_to_entity_type.get(field_name)
-        if not entity_type:
-            logger.info(f"No entity type mapping for field: {field_name}")
-            return [], []
-
-        try:
-            logger.info(f"Getting entities for type: {entity_type}")
-            # Get entities from relations system
-            entities = await relations_service.get_entities_by_type(entity_type)
-            logger.info(f"Found {len(entities)} entities")
-            
-            # Remove duplicates and ensure unique names
-            seen_names = set()
-            unique_entities = []
-            for entity in entities:
-                if entity.name and entity.name not in seen_names:
-                    seen_names.add(entity.name)
-                    unique_entities.append(entity)
-                    logger.info(f"Added unique entity: {entity.name} (ID: {entity.id})")
-                elif entity.name in seen_names:
-                    logger.info(f"Skipping duplicate entity: {entity.name} (ID: {entity.id})")
-            
-            logger.info(f"After deduplication: {len(unique_entities)} unique entities from {len(entities)} total")
-            
-            # Convert to options format - ensure strings only for options array
-            options = [str(entity.name) for entity in unique_entities if entity.name]
-            options_data = [
-                {
-                    "id": entity.id,
-                    "name": str(entity.name),
-                    "description": entity.description,
-                    "price_impact_value": float(entity.price_impact_value)
-                    if entity.price_impact_value
-                    else None,
-                    "sort_order": 0,  # Relations entities don't have sort_order
-                    "image_url": entity.image_url,
-                    "metadata_": entity.metadata_,
-                }
-                for entity in unique_entities  # Use unique_entities, not entities
-                if entity.name  # Only include entities with names
-            ]
-            
-            logger.info(f"Returning {len(options)} unique options: {options}")
-            return options, options_data
-            
-        except Exception as e:
-            logger.error(f"Error loading options from relations for {field_name}: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return [], []
+        # Remove duplicates and ensure unique names
+        seen_names = set()
+        unique_entities = []
+        for entity in entities:
+            if entity.name and entity.name not in seen_names:
+                seen_names.add(entity.name)
+                unique_entities.append(entity)
+
+        # Convert to options format - ensure strings only for options array
+        options = [str(entity.name) for entity in unique_entities]
+        options_data = [
+            {
+                "id": entity.id,
+                "name": str(entity.name),
+                "description": entity.description,
+                "price_impact_value": float(entity.price_impact_value)
+                if entity.price_impact_value
+                else None,
+                "sort_order": 0,  # Relations entities don't have sort_order
+                "image_url": entity.image_url,
+                "metadata_": entity.metadata_,
+            }
+            for entity in unique_entities
+        ]
+        return options, options_data
 
     async def evaluate_display_conditions(
-        self, form_data: dict[str, Any], schema: ProfileSchema
+        self,
+        form_data: dict[str, Any],
+        schema: ProfileSchema | CompiledSchema,
+        changed_fields: list[str] | None = None,
     ) -> dict[str, bool]:
-        """Evaluate display conditions for all fields.
+        """Evaluate display conditions for all fields, or those changed fields affect.
+
+        With changed_fields, only fields whose display condition or
+        business rule reads one of them are re-evaluated, and only their
+        visibility is returned; merging it into the previous map gives the
+        full map for the new form data.
 
         Args:
             form_data: Current form data
-            schema: Form schema with conditional logic
+            schema: Form schema with conditional logic; compiled schemas
+                reuse their compiled conditions
+            changed_fields: Fields changed since the previous evaluation,
+                or None to evaluate every field
 
         Returns:
-            dict[str, bool]: Field visibility map
+            dict[str, bool]: Field visibility map, or the visibility of the
+                affected fields when changed_fields is given
         """
-        visibility: dict[str, bool] = {}
+        conditions = self._compiled_conditions(schema)
+        if changed_fields is None:
+            visibility = conditions.evaluate(form_data)
+            # Apply business rules for field availability
+            visibility.update(self.evaluate_business_rules(form_data))
+            return visibility
+
+        rules = get_business_rules()
+        # Business rules decide their fields regardless of display conditions
+        visibility = conditions.evaluate(
+            form_data, conditions.affected_by(changed_fields) - rules.fields
+        )
+        visibility.update(rules.evaluate(form_data, rules.affected_by(changed_fields)))
+        return visibility
 
-        # Evaluate each field's display condition
-        for field_name, condition in schema.conditional_logic.items():
-            try:
-                visibility[field_name] = self.condition_evaluator.evaluate_condition(
-                    condition, form_data
-                )
-            except Exception as e:
-                # Log error and default to visible
-                print(f"Error evaluating condition for {field_name}: {e}")
-                visibility[field_name] = True
+    async def evaluate_display_conditions_batch(
+        self, form_states: list[dict[str, Any]], schema: ProfileSchema | CompiledSchema
+    ) -> list[dict[str, bool]]:
+        """Evaluate display conditions for all fields of many form states.
 
-        # Apply business rules for field availability
-        business_rules_visibility = self.evaluate_business_rules(form_data)
-        visibility.update(business_rules_visibility)
+        Args:
+            form_states: Form data per state
+            schema: Form schema with conditional logic; compiled schemas
+                reuse their compiled conditions
 
-        return visibility
+        Returns:
+            list[dict[str, bool]]: Field visibility map per state, in order
+        """
+        conditions = self._compiled_conditions(schema)
+        visibilities = conditions.evaluate_many(form_states)
+        for form_data, visibility in zip(form_states, visibilities, strict=True):
+            visibility.update(self.evaluate_business_rules(form_data))
+        return visibilities
+
+    @staticmethod
+    def _compiled_conditions(schema: ProfileSchema | CompiledSchema) -> ConditionSet:
+        """Get the compiled display conditions of a schema."""
+        if isinstance(schema, CompiledSchema):
+            return schema.conditions
+        return ConditionSet.compile(schema.conditional_logic)
 
     @staticmethod
     def evaluate_business_rules(form_data: dict[str, Any]) -> dict[str, bool]:
@@ -600,53 +893,7 @@ class EntryService(BaseService):
         Returns:
             dict[str, bool]: Field visibility map based on business rules
         """
-        visibility: dict[str, bool] = {}
-        product_type = form_data.get("type", "").lower()
-        opening_system = form_data.get("opening_system", "").lower()
-
-        # Business Rule 1: "Renovation only for frame" → Only when Type = "Frame"
-        renovation_field = "renovation"
-        visibility[renovation_field] = product_type == "frame"
-
-        # Business Rule 2: "builtin Flyscreen track only for sliding frame" → Only for sliding frames
-        flyscreen_field = "builtin_flyscreen_track"
-        visibility[flyscreen_field] = product_type == "frame" and "sliding" in opening_system
-
-        # Business Rule 3: "Total width only for frame with builtin flyscreen"
-        total_width_field = "total_width"
-        visibility[total_width_field] = (
-            product_type == "frame" and form_data.get("builtin_flyscreen_track") is True
-        )
-
-        # Business Rule 4: "flyscreen track height only for frame with builtin flyscreen"
-        flyscreen_height_field = "flyscreen_track_height"
-        visibility[flyscreen_height_field] = (
-            product_type == "frame" and form_data.get("builtin_flyscreen_track") is True
-        )
-
-        # Business Rule 5: "Sash overlap only for sashs" → Only when Type = "sash"
-        sash_overlap_field = "sash_overlap"
-        visibility[sash_overlap_field] = product_type == "sash"
-
-        # Business Rule 6: "Flying mullion clearances" → Only when Type = "Flying mullion"
-        flying_mullion_horizontal_field = "flying_mullion_horizontal_clearance"
-        flying_mullion_vertical_field = "flying_mullion_vertical_clearance"
-        visibility[flying_mullion_horizontal_field] = product_type == "flying mullion"
-        visibility[flying_mullion_vertical_field] = product_type == "flying mullion"
-
-        # Business Rule 7: "Glazing undercut height only for glazing bead" → Only when Type = "glazing bead"
-        glazing_undercut_field = "glazing_undercut_height"
-        visibility[glazing_undercut_field] = product_type == "glazing bead"
-
-        # Business Rule 8: "Renovation height mm only for frame"
-        renovation_height_field = "renovation_height"
-        visibility[renovation_height_field] = product_type == "frame"
-
-        # Business Rule 9: "Steel material thickness only for reinforcement"
-        steel_thickness_field = "steel_material_thickness"
-        visibility[steel_thickness_field] = product_type == "reinforcement"
-
-        return visibility
+        return get_business_rules().evaluate(form_data)
 
     def get_field_display_value(
         self, field_name: str, value: Any, form_data: dict[str, Any]
@@ -662,9 +909,7 @@ class EntryService(BaseService):
             str: Display value or 'N/A' if field doesn't apply
         """
         # Check if field should be visible based on business rules
-        business_rules_visibility = self.evaluate_business_rules(form_data)
-
-        if field_name in business_rules_visibility and not business_rules_visibility[field_name]:
+        if get_business_rules().evaluate(form_data, [field_name]).get(field_name) is False:
             return "N/A"
 
         # Format the value normally if field is applicable
@@ -685,8 +930,6 @@ class EntryService(BaseService):
         Raises:
             ValidationException: If validation fails
         """
-        errors: dict[str, str] = {}
-
         # Get schema for validation rules
         try:
             schema = await self.get_profile_schema(data.manufacturing_type_id, page_type)
@@ -695,9 +938,31 @@ class EntryService(BaseService):
                 "Invalid manufacturing type", field_errors={"manufacturing_type_id": "Not found"}
             ) from nfe
 
-        # Validate each field against its rules
-        form_data = data.model_dump()
+        errors = self.collect_field_errors(data.model_dump(), schema)
+        if errors:
+            raise ValidationException("Validation failed", field_errors=errors)
+
+        return {"valid": True}
+
+    @classmethod
+    def collect_field_errors(
+        cls, form_data: dict[str, Any], schema: ProfileSchema
+    ) -> dict[str, str]:
+        """Check form data against the field, cross-field and business rules.
 
+        Synchronous and free of database access, so compiled schemas can be
+        applied to many rows, including in worker processes.
+
+        Args:
+            form_data: Form data to validate
+            schema: Form schema with field definitions
+
+        Returns:
+            dict[str, str]: Error message keyed by field name
+        """
+        errors: dict[str, str] = {}
+
+        # Validate each field against its rules
         for section in schema.sections:
             for field in section.fields:
                 field_value = form_data.get(field.name)
@@ -709,24 +974,18 @@ class EntryService(BaseService):
 
                 # Apply validation rules if present
                 if field.validation_rules and field_value is not None:
-                    field_errors = self.validate_field_value(
+                    field_errors = cls.validate_field_value(
                         field_value, field.validation_rules, field.label
                     )
                     if field_errors:
                         errors[field.name] = field_errors
 
         # Cross-field validation
-        cross_field_errors = self.validate_cross_field_rules(form_data, schema)
-        errors.update(cross_field_errors)
+        errors.update(cls.validate_cross_field_rules(form_data, schema))
 
         # Business rules validation
-        business_rule_errors = await self.validate_business_rules(form_data)
-        errors.update(business_rule_errors)
-
-        if errors:
-            raise ValidationException("Validation failed", field_errors=errors)
-
-        return {"valid": True}
+        errors.update(cls._business_rule_errors(form_data))
+        return errors
 
     @staticmethod
     def validate_field_value(
@@ -846,26 +1105,20 @@ class EntryService(BaseService):
 
         return None
 
-    @staticmethod
-    def _has_meaningful_value(value: Any) -> bool:
-        """Check if a field value is meaningful (not null, empty, or default false for booleans).
+    async def validate_business_rules(self, form_data: dict[str, Any]) -> dict[str, str]:
+        """Validate business rules and return field-specific errors.
 
         Args:
-            value: Field value to check
+            form_data: Form data to validate
 
         Returns:
-            bool: True if value is meaningful, False otherwise
+            dict[str, str]: Field errors from business rule violations
         """
-        if value is None or value == "":
-            return False
-        # For boolean fields, False is not considered meaningful in this context
-        # because unchecked checkboxes should not trigger validation errors
-        if isinstance(value, bool) and value is False:
-            return False
-        return True
+        return self._business_rule_errors(form_data)
 
-    async def validate_business_rules(self, form_data: dict[str, Any]) -> dict[str, str]:
-        """Validate business rules and return field-specific errors.
+    @staticmethod
+    def _business_rule_errors(form_data: dict[str, Any]) -> dict[str, str]:
+        """Get the business rule violations of form data.
 
         Args:
             form_data: Form data to validate
@@ -873,87 +1126,7 @@ class EntryService(BaseService):
         Returns:
             dict[str, str]: Field errors from business rule violations
         """
-        errors: dict[str, str] = {}
-        product_type = form_data.get("type", "").lower()
-        opening_system = form_data.get("opening_system", "").lower()
-
-        # Validate business rule violations
-
-        # Rule 1: Renovation should only have values for frames
-        if self._has_meaningful_value(form_data.get("renovation")) and product_type != "frame":
-            errors["renovation"] = "Renovation is only applicable for frame types"
-
-        # Rule 2: Builtin flyscreen track should only be set for sliding frames
-        if self._has_meaningful_value(form_data.get("builtin_flyscreen_track")) and not (
-            product_type == "frame" and "sliding" in opening_system
-        ):
-            errors["builtin_flyscreen_track"] = (
-                "Builtin flyscreen track is only applicable for sliding frames"
-            )
-
-        # Rule 3: Total width should only be set when builtin flyscreen is enabled
-        if self._has_meaningful_value(form_data.get("total_width")) and not (
-            product_type == "frame" and form_data.get("builtin_flyscreen_track") is True
-        ):
-            errors["total_width"] = (
-                "Total width is only applicable when builtin flyscreen track is enabled"
-            )
-
-        # Rule 4: Flyscreen track height should only be set when builtin flyscreen is enabled
-        if self._has_meaningful_value(form_data.get("flyscreen_track_height")) and not (
-            product_type == "frame" and form_data.get("builtin_flyscreen_track") is True
-        ):
-            errors["flyscreen_track_height"] = (
-                "Flyscreen track height is only applicable when builtin flyscreen track is enabled"
-            )
-
-        # Rule 5: Sash overlap should only have values for sash types
-        if self._has_meaningful_value(form_data.get("sash_overlap")) and product_type != "sash":
-            errors["sash_overlap"] = "Sash overlap is only applicable for sash types"
-
-        # Rule 6: Flying mullion clearances should only have values for flying mullion types
-        if (
-            self._has_meaningful_value(form_data.get("flying_mullion_horizontal_clearance"))
-            and product_type != "flying mullion"
-        ):
-            errors["flying_mullion_horizontal_clearance"] = (
-                "Flying mullion horizontal clearance is only applicable for flying mullion types"
-            )
-
-        if (
-            self._has_meaningful_value(form_data.get("flying_mullion_vertical_clearance"))
-            and product_type != "flying mullion"
-        ):
-            errors["flying_mullion_vertical_clearance"] = (
-                "Flying mullion vertical clearance is only applicable for flying mullion types"
-            )
-
-        # Rule 7: Glazing undercut height should only have values for glazing bead types
-        if (
-            self._has_meaningful_value(form_data.get("glazing_undercut_height"))
-            and product_type != "glazing bead"
-        ):
-            errors["glazing_undercut_height"] = (
-                "Glazing undercut height is only applicable for glazing bead types"
-            )
-
-        # Rule 8: Renovation height should only have values for frame types
-        if (
-            self._has_meaningful_value(form_data.get("renovation_height"))
-            and product_type != "frame"
-        ):
-            errors["renovation_height"] = "Renovation height is only applicable for frame types"
-
-        # Rule 9: Steel material thickness should only have values for reinforcement types
-        if (
-            self._has_meaningful_value(form_data.get("steel_material_thickness"))
-            and product_type != "reinforcement"
-        ):
-            errors["steel_material_thickness"] = (
-                "Steel material thickness is only applicable for reinforcement types"
-            )
-
-        return errors
+        return get_business_rules().validate(form_data)
 
     @staticmethod
     def validate_cross_field_rules(
@@ -1089,28 +1262,36 @@ class EntryService(BaseService):
                 attribute_node = field_to_node[field_name]
 
                 # Create selection with proper attribute node mapping
-                selection_data = {
-                    "configuration_id": configuration.id,
-                    "attribute_node_id": attribute_node.id,
-                    "selection_path": attribute_node.ltree_path,
-                }
-
-                # Store value in appropriate field based on data type
-                if isinstance(field_value, bool):
-                    selection_data["boolean_value"] = field_value
-                elif isinstance(field_value, (int, float)):
-                    selection_data["numeric_value"] = field_value
-                elif isinstance(field_value, (list, dict)):
-                    selection_data["json_value"] = field_value
-                else:
-                    selection_data["string_value"] = str(field_value)
-
-                selection = ConfigurationSelection(**selection_data)
+                selection = ConfigurationSelection(
+                    configuration_id=configuration.id,
+                    attribute_node_id=attribute_node.id,
+                    selection_path=attribute_node.ltree_path,
+                    **self.selection_value_columns(field_value),
+                )
                 self.db.add(selection)
 
         await self.commit()
         return configuration
 
+    @staticmethod
+    def selection_value_columns(value: Any) -> dict[str, Any]:
+        """Get the selection column storing a form value.
+
+        Args:
+            value: Non-null form field value
+
+        Returns:
+            dict[str, Any]: Value keyed by the ConfigurationSelection column
+                matching its data type
+        """
+        if isinstance(value, bool):
+            return {"boolean_value": value}
+        elif isinstance(value, (int, float)):
+            return {"numeric_value": value}
+        elif isinstance(value, (list, dict)):
+            return {"json_value": value}
+        return {"string_value": str(value)}
+
     # @require(ConfigurationViewer)
     # @require(AdminAccess)  # Admins can view any configuration
     async def load_profile_configuration(
@@ -1220,55 +1401,75 @@ class EntryService(BaseService):
             last_updated=configuration.updated_at,
         )
 
-    # Cache for generated headers and mappings to improve performance
-    _header_cache: dict[int, list[str]] = {}
-    _mapping_cache: dict[int, dict[str, str]] = {}
-    _reverse_mapping_cache: dict[int, dict[str, str]] = {}
-
-    async def generate_preview_headers(
+    async def get_preview_headers(
         self, manufacturing_type_id: int, page_type: str = "profile"
-    ) -> list[str]:
-        """Generate dynamic preview headers from attribute nodes.
+    ) -> PreviewHeaders:
+        """Get the preview headers of an entry page and their field mappings.
+
+        Header sets are kept in the process-wide header registry and reloaded
+        when the attribute tree version changes or their TTL runs out.
 
         Args:
             manufacturing_type_id: Manufacturing type ID
             page_type: Page type (profile, accessories, glazing)
 
         Returns:
-            list[str]: Ordered list of preview headers
+            PreviewHeaders: Headers, header mapping and reverse mapping
         """
-        # Create cache key that includes page_type
-        cache_key = f"{manufacturing_type_id}_{page_type}"
+        if has_pending_changes(self.db):
+            # Registry entries do not show this session's uncommitted nodes
+            return await self._load_preview_headers(manufacturing_type_id, page_type)
+
+        registry = get_header_registry()
+        key = registry.make_key(manufacturing_type_id, page_type)
+        version = await get_tree_version(self.db, manufacturing_type_id)
+        headers = registry.get(key, version)
+        if headers is None:
+            headers = await self._load_preview_headers(manufacturing_type_id, page_type)
+            # Loading may have flushed pending changes of the session
+            if not has_pending_changes(self.db):
+                registry.put(key, version, headers)
+        return headers
+
+    async def _load_preview_headers(
+        self, manufacturing_type_id: int, page_type: str
+    ) -> PreviewHeaders:
+        """Build the preview headers of an entry page from its attribute nodes.
 
-        # Check cache first
-        if cache_key in self._header_cache:
-            return self._header_cache[cache_key]
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            page_type: Page type (profile, accessories, glazing)
 
-        # Get attribute nodes for this manufacturing type and page type, ordered by sort_order
+        Returns:
+            PreviewHeaders: Headers, header mapping and reverse mapping
+        """
+        # Only attributes generate headers, ordered by sort_order
         stmt = (
             select(AttributeNode)
             .where(
                 AttributeNode.manufacturing_type_id == manufacturing_type_id,
                 AttributeNode.page_type == page_type,
-                AttributeNode.node_type == "attribute",  # Only attributes generate headers
+                AttributeNode.node_type == "attribute",
             )
             .order_by(AttributeNode.sort_order, AttributeNode.name)
         )
         result = await self.db.execute(stmt)
-        attribute_nodes = result.scalars().all()
+        return PreviewHeaders.from_nodes(result.scalars().all())
 
-        # Generate headers list starting with id only
-        # All attributes including "name" will be processed and get proper labels
-        headers = ["id"]
+    async def generate_preview_headers(
+        self, manufacturing_type_id: int, page_type: str = "profile"
+    ) -> list[str]:
+        """Generate dynamic preview headers from attribute nodes.
 
-        for node in attribute_nodes:
-            # Use display_name from the node, with fallback to auto-generated name
-            header = node.get_display_name()
-            headers.append(header)
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            page_type: Page type (profile, accessories, glazing)
 
-        # Cache the result
-        self._header_cache[cache_key] = headers
-        return headers
+        Returns:
+            list[str]: Ordered list of preview headers
+        """
+        preview_headers = await self.get_preview_headers(manufacturing_type_id, page_type)
+        return preview_headers.headers
 
     async def generate_header_mapping(
         self, manufacturing_type_id: int, page_type: str = "profile"
@@ -1282,34 +1483,8 @@ class EntryService(BaseService):
         Returns:
             dict[str, str]: Mapping from header names to field names
         """
-        # Check cache first
-        if manufacturing_type_id in self._mapping_cache:
-            return self._mapping_cache[manufacturing_type_id]
-
-        # Get attribute nodes for this manufacturing type, ordered by sort_order
-        stmt = (
-            select(AttributeNode)
-            .where(
-                AttributeNode.manufacturing_type_id == manufacturing_type_id,
-                AttributeNode.page_type == page_type,
-                AttributeNode.node_type == "attribute",  # Only attributes generate mappings
-            )
-            .order_by(AttributeNode.sort_order, AttributeNode.name)
-        )
-        result = await self.db.execute(stmt)
-        attribute_nodes = result.scalars().all()
-
-        # Generate mapping starting with special cases
-        mapping = {"id": "id"}
-
-        for node in attribute_nodes:
-            # Map human-readable header to field name using display_name
-            header = node.get_display_name()
-            mapping[header] = node.name
-
-        # Cache the result
-        self._mapping_cache[manufacturing_type_id] = mapping
-        return mapping
+        preview_headers = await self.get_preview_headers(manufacturing_type_id, page_type)
+        return preview_headers.mapping
 
     async def get_reverse_header_mapping(
         self, manufacturing_type_id: int, page_type: str = "profile"
@@ -1323,35 +1498,16 @@ class EntryService(BaseService):
         Returns:
             dict[str, str]: Mapping from field names to header names
         """
-        # Check cache first
-        cache_key = f"{manufacturing_type_id}:{page_type}"
-        if cache_key in self._reverse_mapping_cache:
-            return self._reverse_mapping_cache[cache_key]
-
-        # Generate forward mapping first
-        forward_mapping = await self.generate_header_mapping(manufacturing_type_id, page_type)
-
-        # Create reverse mapping
-        reverse_mapping = {v: k for k, v in forward_mapping.items()}
-
-        # Cache the result
-        self._reverse_mapping_cache[cache_key] = reverse_mapping
-        return reverse_mapping
+        preview_headers = await self.get_preview_headers(manufacturing_type_id, page_type)
+        return preview_headers.reverse_mapping
 
     def clear_header_cache(self, manufacturing_type_id: int | None = None) -> None:
-        """Clear header cache for a specific manufacturing type or all types.
+        """Clear this worker's header sets for a manufacturing type or all types.
 
         Args:
             manufacturing_type_id: Manufacturing type ID to clear, or None for all
         """
-        if manufacturing_type_id is None:
-            self._header_cache.clear()
-            self._mapping_cache.clear()
-            self._reverse_mapping_cache.clear()
-        else:
-            self._header_cache.pop(manufacturing_type_id, None)
-            self._mapping_cache.pop(manufacturing_type_id, None)
-            self._reverse_mapping_cache.pop(manufacturing_type_id, None)
+        get_header_registry().invalidate(manufacturing_type_id)
 
     @require(ConfigurationViewer)
     @require(AdminAccess)  # Admins can view any configuration
@@ -1368,13 +1524,156 @@ class EntryService(BaseService):
         Returns:
             PreviewTable: Table with all configurations
         """
+        stmt = await self._accessible_configurations(manufacturing_type_id, user)
+        if stmt is None:
+            # If no accessible customers, return empty table
+            headers = await self.generate_preview_headers(manufacturing_type_id)
+            return PreviewTable(headers=headers, rows=[])
+        stmt = stmt.order_by(Configuration.updated_at.desc())
+
+        layout = await self._load_preview_layout(manufacturing_type_id, page_type)
+        result = await self.db.execute(stmt)
+        configurations = result.all()
+        values = await self._load_selection_values(
+            stmt.with_only_columns(Configuration.id).order_by(None), layout.node_names
+        )
+
+        rows = [
+            self._configuration_row(layout, config_id, name, values.get(config_id, {}))
+            for config_id, name in configurations
+        ]
+        return PreviewTable(headers=layout.headers, rows=rows)
+
+    @require(ConfigurationViewer)
+    @require(AdminAccess)  # Admins can view any configuration
+    async def stream_previews(
+        self,
+        manufacturing_type_id: int,
+        user: User,
+        page_type: str = "profile",
+        *,
+        filters: dict[str, str] | None = None,
+        sort: str | None = None,
+        descending: bool = True,
+        cursor: str | None = None,
+        limit: int | None = None,
+        page_size: int | None = None,
+    ) -> PreviewStream:
+        """Stream profile configuration previews page by page.
+
+        Configurations are paged by the (sort value, id) keyset, so every
+        page costs two indexed queries however deep into the table it is,
+        and only one page of rows is held in memory at a time.
+
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            user: Current user
+            page_type: Page type (profile, accessories, glazing)
+            filters: Case-insensitive substring filters keyed by header
+            sort: Header to sort by; defaults to the last update time
+            descending: Sort in descending order
+            cursor: Cursor returned by a previous stream to continue after
+            limit: Maximum number of rows to stream; None for all rows
+            page_size: Configurations read per query
+
+        Returns:
+            PreviewStream: Stream of preview rows
+
+        Raises:
+            ValidationException: If a filter or sort header is unknown, or
+                the cursor is invalid or belongs to another sort
+
+        Example:
+            ```python
+            stream = await service.stream_previews(1, user, filters={"Material": "alu"})
+            async for row in stream:
+                ...
+            ```
+        """
+        layout = await self._load_preview_layout(manufacturing_type_id, page_type)
+        sort = sort or PreviewStream.DEFAULT_SORT
+        sort_key, sort_type = self._preview_sort_key(layout, sort)
+        position = PreviewStream.decode_cursor(cursor, sort, sort_type) if cursor else None
+
+        stmt = await self._accessible_configurations(manufacturing_type_id, user)
+        if stmt is not None:
+            for header, value in (filters or {}).items():
+                stmt = stmt.where(self._preview_filter(layout, header, value))
+
+        return PreviewStream(
+            self,
+            layout,
+            stmt,
+            sort=sort,
+            sort_key=sort_key,
+            descending=descending,
+            position=position,
+            limit=limit,
+            page_size=page_size or PREVIEW_STREAM_PAGE_SIZE,
+        )
+
+    @require(ConfigurationViewer)
+    @require(AdminAccess)  # Admins can export any configuration
+    async def export_previews(
+        self,
+        manufacturing_type_id: int,
+        user: User,
+        page_type: str = "profile",
+        *,
+        format: ExportFormat = "csv",
+        yield_per: int = EXPORT_YIELD_PER,
+    ) -> ProfileExport:
+        """Export the profile sheet of a manufacturing type.
+
+        The sheet has the preview table's columns and is read with a single
+        query on a server-side cursor while it is being written, so exports
+        of any size use constant memory.
+
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            user: Current user
+            page_type: Page type (profile, accessories, glazing)
+            format: Output format (csv, xlsx)
+            yield_per: Selection rows fetched per round trip
+
+        Returns:
+            ProfileExport: Stream of encoded file chunks
+
+        Example:
+            ```python
+            export = await service.export_previews(1, user, format="xlsx")
+            async for chunk in export:
+                ...
+            ```
+        """
+        layout = await self._load_preview_layout(manufacturing_type_id, page_type)
+        stmt = await self._accessible_configurations(manufacturing_type_id, user)
+        return ProfileExport(
+            self,
+            layout,
+            stmt,
+            format=format,
+            name=f"{page_type}_{manufacturing_type_id}",
+            yield_per=yield_per,
+        )
+
+    async def _accessible_configurations(
+        self, manufacturing_type_id: int, user: User
+    ) -> Select | None:
+        """Select the configurations of a manufacturing type the user may view.
+
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            user: Current user
+
+        Returns:
+            Select | None: SELECT of configuration id and name, or None if the
+                user has no accessible customers
+        """
         # Fetch all configurations for this manufacturing type and user
         # In admin context, we might want to see all for this type
-        stmt = (
-            select(Configuration)
-            .where(Configuration.manufacturing_type_id == manufacturing_type_id)
-            .options(selectinload(Configuration.selections))
-            .order_by(Configuration.updated_at.desc())
+        stmt = select(Configuration.id, Configuration.name).where(
+            Configuration.manufacturing_type_id == manufacturing_type_id
         )
 
         # Apply RBAC filtering if not superadmin
@@ -1383,17 +1682,108 @@ class EntryService(BaseService):
 
             rbac_service = RBACService(self.db)
             accessible_customers = await rbac_service.get_accessible_customers(user)
-            if accessible_customers:
-                stmt = stmt.where(Configuration.customer_id.in_(accessible_customers))
-            else:
-                # If no accessible customers, return empty table
-                headers = await self.generate_preview_headers(manufacturing_type_id)
-                return PreviewTable(headers=headers, rows=[])
+            if not accessible_customers:
+                return None
+            stmt = stmt.where(Configuration.customer_id.in_(accessible_customers))
+        return stmt
 
-        result = await self.db.execute(stmt)
-        configurations = result.scalars().all()
+    @staticmethod
+    def _preview_field(layout: _PreviewLayout, header: str) -> tuple[str, list[int]]:
+        """Resolve a preview header to its field name and attribute nodes.
+
+        Args:
+            layout: Header layout of the table
+            header: Table header
+
+        Returns:
+            tuple: Field name and IDs of the nodes storing it
+
+        Raises:
+            ValidationException: If the header is not a column of the table
+        """
+        field_name = layout.header_mapping.get(header)
+        if header == layout.name_header:
+            field_name = "name"
+        if field_name is None:
+            raise ValidationException(f"Unknown preview column: {header}")
+        return field_name, layout.node_ids(field_name)
+
+    def _preview_sort_key(
+        self, layout: _PreviewLayout, sort: str
+    ) -> tuple[ColumnElement, str]:
+        """Get the SQL expression ordering preview rows by a header.
+
+        Args:
+            layout: Header layout of the table
+            sort: Header to sort by, or "updated_at"
+
+        Returns:
+            tuple: Sort expression and its value type (datetime, int, numeric, text)
+
+        Raises:
+            ValidationException: If the header is not a column of the table
+        """
+        if sort == PreviewStream.DEFAULT_SORT:
+            return Configuration.updated_at, "datetime"
+
+        field_name, node_ids = self._preview_field(layout, sort)
+        if field_name == "id":
+            return Configuration.id, "int"
+        if field_name == "name":
+            return Configuration.name, "text"
+
+        numeric = field_name in layout.numeric_fields
+        value_column = (
+            ConfigurationSelection.numeric_value if numeric else ConfigurationSelection.string_value
+        )
+        sort_key = (
+            select(value_column)
+            .where(
+                ConfigurationSelection.configuration_id == Configuration.id,
+                ConfigurationSelection.attribute_node_id.in_(node_ids),
+            )
+            .order_by(ConfigurationSelection.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        return sort_key, "numeric" if numeric else "text"
+
+    def _preview_filter(self, layout: _PreviewLayout, header: str, value: str) -> ColumnElement:
+        """Get the SQL condition matching preview rows whose column contains a value.
+
+        Args:
+            layout: Header layout of the table
+            header: Table header
+            value: Case-insensitive substring of the stored value
+
+        Returns:
+            ColumnElement: WHERE condition on configurations
 
-        return await self.generate_preview_table(configurations, manufacturing_type_id, page_type)
+        Raises:
+            ValidationException: If the header is unknown, or an ID filter is
+                not an integer
+        """
+        field_name, node_ids = self._preview_field(layout, header)
+        if field_name == "id":
+            try:
+                return Configuration.id == int(value)
+            except ValueError:
+                raise ValidationException(f"Invalid ID filter: {value}") from None
+
+        pattern = "%" + re.sub(r"([\\%_])", r"\\\1", value) + "%"
+        if field_name == "name":
+            return Configuration.name.ilike(pattern, escape="\\")
+
+        stored_text = func.coalesce(
+            ConfigurationSelection.string_value,
+            cast(ConfigurationSelection.numeric_value, String),
+            cast(ConfigurationSelection.boolean_value, String),
+        )
+        return exists().where(
+            ConfigurationSelection.configuration_id == Configuration.id,
+            ConfigurationSelection.attribute_node_id.in_(node_ids),
+            stored_text.ilike(pattern, escape="\\"),
+        )
 
     async def generate_preview_table(
         self,
@@ -1422,108 +1812,192 @@ class EntryService(BaseService):
             if manufacturing_type_id is None:
                 raise ValueError("manufacturing_type_id is required for dynamic header generation")
 
-        # Generate dynamic headers
-        headers = await self.generate_preview_headers(manufacturing_type_id, page_type)
-        rows = []
+        layout = await self._load_preview_layout(manufacturing_type_id, page_type)
+        items = data if isinstance(data, list) else [data]
+        rows = [self._preview_row(layout, item) for item in items]
 
-        if isinstance(data, list):
-            for item in data:
-                rows.append(await self._create_row(item, manufacturing_type_id, page_type))
-        else:
-            rows.append(await self._create_row(data, manufacturing_type_id, page_type))
+        return PreviewTable(headers=layout.headers, rows=rows)
 
-        return PreviewTable(headers=headers, rows=rows)
+    async def _load_preview_layout(
+        self, manufacturing_type_id: int, page_type: str = "profile"
+    ) -> _PreviewLayout:
+        """Load the header layout shared by every row of a preview table.
 
-    async def _create_row(
-        self,
-        data: Configuration | dict[str, Any],
-        manufacturing_type_id: int,
-        page_type: str = "profile",
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            page_type: Page type (profile, accessories, glazing)
+
+        Returns:
+            _PreviewLayout: Headers, header mappings and node names
+        """
+        preview_headers = await self.get_preview_headers(manufacturing_type_id, page_type)
+        field_headers = preview_headers.reverse_mapping
+
+        result = await self.db.execute(
+            select(AttributeNode.id, AttributeNode.name, AttributeNode.data_type).where(
+                AttributeNode.manufacturing_type_id == manufacturing_type_id
+            )
+        )
+        nodes = result.all()
+        return _PreviewLayout(
+            headers=preview_headers.headers,
+            header_mapping=preview_headers.mapping,
+            field_headers=field_headers,
+            node_names={node.id: node.name for node in nodes},
+            # Default to "Product Name" if not found
+            name_header=field_headers.get("name", "Product Name"),
+            numeric_fields=frozenset(
+                node.name for node in nodes if node.data_type in ["number", "float"]
+            ),
+        )
+
+    async def _load_selection_values(
+        self, configuration_ids: Any, node_names: dict[int, str]
+    ) -> dict[int, dict[str, Any]]:
+        """Pivot the selections of many configurations with one query.
+
+        Args:
+            configuration_ids: Configuration IDs, or a SELECT of them
+            node_names: Attribute node ID to field name
+
+        Returns:
+            dict[int, dict[str, Any]]: Field values keyed by configuration ID
+        """
+        result = await self.db.execute(
+            select(
+                ConfigurationSelection.configuration_id,
+                ConfigurationSelection.attribute_node_id,
+                ConfigurationSelection.string_value,
+                ConfigurationSelection.json_value,
+                ConfigurationSelection.numeric_value,
+                ConfigurationSelection.boolean_value,
+            )
+            .where(ConfigurationSelection.configuration_id.in_(configuration_ids))
+            .order_by(ConfigurationSelection.configuration_id, ConfigurationSelection.id)
+        )
+
+        values: dict[int, dict[str, Any]] = {}
+        for selection in result:
+            field_name = node_names.get(selection.attribute_node_id)
+            if field_name:
+                values.setdefault(selection.configuration_id, {})[field_name] = (
+                    self._selection_value(selection)
+                )
+        return values
+
+    @staticmethod
+    def _selection_value(selection: Any) -> Any:
+        """Get the stored value of a selection or selection row.
+
+        Args:
+            selection: ConfigurationSelection or row with its value columns
+
+        Returns:
+            Any: First non-null of string, JSON, numeric and boolean value
+        """
+        return (
+            selection.string_value
+            if selection.string_value is not None
+            else selection.json_value
+            if selection.json_value is not None
+            else selection.numeric_value
+            if selection.numeric_value is not None
+            else selection.boolean_value
+        )
+
+    def _preview_row(
+        self, layout: _PreviewLayout, data: Configuration | dict[str, Any]
     ) -> dict[str, Any]:
-        """Create a single table row.
+        """Create a table row from a configuration or form data.
 
         Args:
-            data: Configuration or form data dictionary
-            manufacturing_type_id: Manufacturing type ID for dynamic mapping
+            layout: Header layout of the table
+            data: Configuration with loaded selections, or form data dictionary
 
         Returns:
             dict: Row data
         """
-        row_data: dict[str, Any] = {}
+        if not isinstance(data, Configuration):
+            return self._form_data_row(layout, data)
 
-        # Get dynamic mappings
-        header_mapping = await self.generate_header_mapping(manufacturing_type_id, page_type)
-        reverse_mapping = await self.get_reverse_header_mapping(manufacturing_type_id, page_type)
-
-        if isinstance(data, Configuration):
-            row_data["id"] = data.id
+        values: dict[str, Any] = {}
+        for selection in data.selections:
+            field_name = layout.node_names.get(selection.attribute_node_id)
+            if field_name:
+                values[field_name] = self._selection_value(selection)
+        return self._configuration_row(layout, data.id, data.name, values)
 
-            # Use the correct header name for the name field
-            name_header = reverse_mapping.get(
-                "name", "Product Name"
-            )  # Default to "Product Name" if not found
-            row_data[name_header] = data.name
+    def _configuration_row(
+        self, layout: _PreviewLayout, configuration_id: int, name: str, values: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Create the table row of a configuration.
 
-            # Preload attribute nodes for this configuration's manufacturing type
-            stmt = select(AttributeNode).where(
-                AttributeNode.manufacturing_type_id == data.manufacturing_type_id
-            )
-            result = await self.db.execute(stmt)
-            attribute_nodes = {node.id: node.name for node in result.scalars().all()}
-
-            # Create form data for business rules evaluation
-            form_data = {"name": data.name}
-            for selection in data.selections:
-                field_name = attribute_nodes.get(selection.attribute_node_id)
-                if field_name:
-                    value = (
-                        selection.string_value
-                        if selection.string_value is not None
-                        else selection.json_value
-                        if selection.json_value is not None
-                        else selection.numeric_value
-                        if selection.numeric_value is not None
-                        else selection.boolean_value
-                    )
-                    form_data[field_name] = value
-
-            # Map selections to CSV columns using attribute node names
-            for selection in data.selections:
-                field_name = attribute_nodes.get(selection.attribute_node_id)
-                if field_name:
-                    value = (
-                        selection.string_value
-                        if selection.string_value is not None
-                        else selection.json_value
-                        if selection.json_value is not None
-                        else selection.numeric_value
-                        if selection.numeric_value is not None
-                        else selection.boolean_value
-                    )
+        Args:
+            layout: Header layout of the table
+            configuration_id: Configuration ID
+            name: Configuration name
+            values: Selected values keyed by field name
 
-                    header = reverse_mapping.get(field_name)
-                    if header:
-                        # Use business rules to determine display value
-                        row_data[header] = self.get_field_display_value(
-                            field_name, value, form_data
-                        )
-        else:
-            # Handle dictionary (form data)
-            row_data["id"] = data.get("id", "N/A")
-            for header, field_name in header_mapping.items():
-                if header == "id":
-                    continue
-                value = data.get(field_name)
+        Returns:
+            dict: Row data with "N/A" for missing columns
+        """
+        # Create form data for business rules evaluation
+        form_data = {"name": name, **values}
+        hidden = self._hidden_fields(form_data)
+
+        row_data: dict[str, Any] = dict.fromkeys(layout.header_mapping, "N/A")
+        row_data["id"] = configuration_id
+        row_data[layout.name_header] = name
+
+        # Map selections to CSV columns using attribute node names
+        for field_name, value in values.items():
+            header = layout.field_headers.get(field_name)
+            if header:
                 # Use business rules to determine display value
-                row_data[header] = self.get_field_display_value(field_name, value, data)
+                row_data[header] = (
+                    "N/A" if field_name in hidden else self.format_preview_value(value)
+                )
+        return row_data
+
+    def _form_data_row(self, layout: _PreviewLayout, data: dict[str, Any]) -> dict[str, Any]:
+        """Create the table row of unsaved form data.
 
-        # Fill missing columns with N/A
-        for header in header_mapping.keys():
-            if header not in row_data:
-                row_data[header] = "N/A"
+        Args:
+            layout: Header layout of the table
+            data: Form data dictionary
 
+        Returns:
+            dict: Row data
+        """
+        hidden = self._hidden_fields(data)
+        row_data: dict[str, Any] = {"id": data.get("id", "N/A")}
+        for header, field_name in layout.header_mapping.items():
+            if header == "id":
+                continue
+            # Use business rules to determine display value
+            row_data[header] = (
+                "N/A" if field_name in hidden else self.format_preview_value(data.get(field_name))
+            )
         return row_data
 
+    def _hidden_fields(self, form_data: dict[str, Any]) -> set[str]:
+        """Get the fields business rules hide for the given form data.
+
+        Evaluated once per row; get_field_display_value gives the same
+        display values cell by cell.
+
+        Args:
+            form_data: Current form data
+
+        Returns:
+            set[str]: Names of fields that don't apply
+        """
+        return {
+            field_name
+            for field_name, visible in self.evaluate_business_rules(form_data).items()
+            if not visible
+        }
+
     @staticmethod
     def format_preview_value(value: Any) -> str:
         """Format value for preview display.
@@ -1608,8 +2082,14 @@ class EntryService(BaseService):
 
             # Find existing selection or create new
             selection = next((s for s in config.selections if s.attribute_node_id == node.id), None)
+            old_impacts = None
 
-            if not selection:
+            if selection:
+                old_impacts = {
+                    "price_impact": selection.calculated_price_impact,
+                    "weight_impact": selection.calculated_weight_impact,
+                }
+            else:
                 selection = ConfigurationSelection(
                     configuration_id=config.id,
                     attribute_node_id=node.id,
@@ -1644,6 +2124,14 @@ class EntryService(BaseService):
                 else:
                     selection.string_value = str(value)
 
+            # Re-price only the edited cell and apply its delta to the totals
+            new_impacts = await self.pricing_service.calculate_selection_impact(selection, node)
+            selection.calculated_price_impact = new_impacts["price_impact"]
+            selection.calculated_weight_impact = new_impacts["weight_impact"]
+            await self.pricing_service.apply_selection_change(
+                config.id, node, old_impacts=old_impacts, new_impacts=new_impacts
+            )
+
         config.updated_at = datetime.now()
         await self.commit()
         await self.refresh(config)
@@ -0,0 +1,216 @@
+"""Write-time static analysis of pricing formulas.
+
+Price and weight formulas are analyzed when an attribute node is created or
+updated, so invalid formulas are rejected before they are stored instead of
+surfacing as ``InvalidFormulaException`` while a customer is being quoted.
+The normalized form is what gets stored. Every worker reads that stored text
+and compiles it once per tree version when it builds the manufacturing
+type's pricing plan (see ``pricing_plan``), so pricing neither parses nor
+validates formulas per configuration.
+
+Public Classes:
+    FormulaAnalysis: Result of analyzing one formula
+
+Public Functions:
+    analyze_formula: Validate, constant-fold and compile a formula
+    prepare_node_formulas: Normalize the formulas of attribute node fields
+
+Features:
+    - Safe-operator validation through the compiled formula engine
+    - Variable extraction checked against the pricing formula context
+    - Constant folding of variable-free sub-expressions
+    - Normalized formula text stored for every worker to compile
+"""
+
+from __future__ import annotations
+
+import ast
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.exceptions import InvalidFormulaException
+from app.services.formula_engine import CompiledFormula, compile_formula
+
+__all__ = [
+    "FORMULA_CONTEXT_VARIABLES",
+    "FORMULA_FIELDS",
+    "FormulaAnalysis",
+    "analyze_formula",
+    "prepare_node_formulas",
+]
+
+# Variables PricingService.build_formula_context can bind
+FORMULA_CONTEXT_VARIABLES = frozenset(
+    {
+        "value",
+        "width",
+        "height",
+        "depth",
+        "quantity",
+        "price_impact",
+        "weight_impact",
+        "subtotal",
+    }
+)
+
+# Attribute node fields evaluated by the pricing engine
+FORMULA_FIELDS = ("price_formula", "weight_formula")
+
+
+@dataclass(frozen=True, slots=True)
+class FormulaAnalysis:
+    """Result of analyzing one formula.
+
+    Attributes:
+        formula: Normalized, constant-folded formula text to store
+        variables: Names of the variables referenced by the formula
+        compiled: Compiled form of the normalized formula
+    """
+
+    formula: str
+    variables: frozenset[str]
+    compiled: CompiledFormula
+
+
+def _constant(value: float) -> ast.expr:
+    """Create the AST node of a folded constant.
+
+    Integral values keep their integer spelling and negative values are
+    written as a negation so unparsing keeps precedence (``(-2) ** x``).
+    """
+    if math.copysign(1.0, value) < 0:
+        return ast.UnaryOp(op=ast.USub(), operand=_constant(-value))
+    if value.is_integer():
+        return ast.Constant(value=int(value))
+    return ast.Constant(value=value)
+
+
+def _fold_constants(node: ast.expr) -> ast.expr:
+    """Replace variable-free operations with their value.
+
+    Folded values are computed by the formula engine itself, so they are
+    exactly what every evaluation would have computed.
+
+    Args:
+        node (ast.expr): Expression validated by ``compile_formula``
+
+    Returns:
+        ast.expr: Expression with constant sub-expressions folded
+
+    Raises:
+        ZeroDivisionError: If any divisor folds to zero
+        ValueError: If a constant sub-expression is out of range
+    """
+    if isinstance(node, ast.BinOp):
+        left = _fold_constants(node.left)
+        right = _fold_constants(node.right)
+        if isinstance(node.op, ast.Div) and isinstance(right, ast.Constant) and right.value == 0:
+            raise ZeroDivisionError("Division by zero")
+        node = ast.BinOp(left=left, op=node.op, right=right)
+    elif isinstance(node, ast.UnaryOp):
+        node = ast.UnaryOp(op=node.op, operand=_fold_constants(node.operand))
+    else:
+        return node
+
+    if any(isinstance(child, ast.Name) for child in ast.walk(node)):
+        return node
+    return _constant(compile_formula(ast.unparse(node)).evaluate({}))
+
+
+def analyze_formula(
+    formula: str, variables: frozenset[str] = FORMULA_CONTEXT_VARIABLES
+) -> FormulaAnalysis:
+    """Validate, constant-fold and compile a formula.
+
+    Args:
+        formula (str): Formula string (e.g., "width * (height + 2 * 3)")
+        variables (frozenset[str]): Variables the formula may reference
+
+    Returns:
+        FormulaAnalysis: Normalized formula, its variables and compiled form
+
+    Raises:
+        InvalidFormulaException: If the formula cannot be parsed, uses unsafe
+            nodes or operators, has an out-of-range or zero-dividing constant
+            sub-expression, or references a variable outside ``variables``
+    """
+    formula = formula.strip()
+    try:
+        # Validate before folding so only safe nodes are walked
+        compile_formula(formula)
+        normalized = ast.unparse(_fold_constants(ast.parse(formula, mode="eval").body))
+        compiled = compile_formula(normalized)
+    except SyntaxError as e:
+        raise InvalidFormulaException(
+            message=f"Formula syntax error: {str(e)}",
+            formula=formula,
+            details={"error": str(e), "error_type": "syntax_error"},
+        )
+    except InvalidFormulaException as e:
+        raise InvalidFormulaException(
+            message=e.message,
+            formula=formula,
+            details={**e.details, "error_type": "unsafe_expression"},
+        )
+    except ZeroDivisionError:
+        raise InvalidFormulaException(
+            message="Division by zero in formula",
+            formula=formula,
+            details={"error": "Division by zero", "error_type": "division_by_zero"},
+        )
+    except (ValueError, OverflowError) as e:
+        raise InvalidFormulaException(
+            message=f"Calculation error in formula: {str(e)}",
+            formula=formula,
+            details={"error": str(e), "error_type": "calculation_error"},
+        )
+
+    unknown = compiled.variables - variables
+    if unknown:
+        raise InvalidFormulaException(
+            message=f"Unknown variable in formula: {', '.join(sorted(unknown))}",
+            formula=formula,
+            details={
+                "error_type": "unknown_variable",
+                "unknown_variables": sorted(unknown),
+                "available_variables": sorted(variables),
+            },
+        )
+
+    return FormulaAnalysis(formula=normalized, variables=compiled.variables, compiled=compiled)
+
+
+def prepare_node_formulas(values: Mapping[str, Any]) -> dict[str, Any]:
+    """Normalize the formulas of attribute node fields before they are stored.
+
+    Every non-empty ``price_formula`` and ``weight_formula`` in ``values`` is
+    analyzed and replaced by its normalized text. Other fields and empty
+    formulas are returned unchanged.
+
+    Args:
+        values (Mapping[str, Any]): Attribute node field values
+
+    Returns:
+        dict[str, Any]: Copy of ``values`` with normalized formulas
+
+    Raises:
+        InvalidFormulaException: If a formula is invalid; ``details["field"]``
+            names the offending field
+    """
+    prepared = dict(values)
+    for field in FORMULA_FIELDS:
+        formula = values.get(field)
+        if not formula or not formula.strip():
+            continue
+        try:
+            analysis = analyze_formula(formula)
+        except InvalidFormulaException as e:
+            raise InvalidFormulaException(
+                message=f"Invalid {field}: {e.message}",
+                formula=e.formula,
+                details={**e.details, "field": field},
+            )
+        prepared[field] = analysis.formula
+    return prepared
@@ -0,0 +1,498 @@
+"""Compiled formula engine for pricing calculations.
+
+This module compiles price and weight formulas into Python closures once
+and keeps the compiled artifacts in a bounded LRU cache keyed by formula
+text, so hot pricing paths skip ``ast.parse`` and the recursive tree walk.
+
+Public Classes:
+    CompiledFormula: Validated, compiled formula ready for evaluation
+    FormulaCache: Bounded LRU cache of compiled formulas
+
+Public Functions:
+    compile_formula: Parse, validate and compile a formula string
+    interpret_formula: Reference tree-walking interpreter
+    get_formula_cache: Get the process-wide formula cache
+
+Features:
+    - Single parse and safe-operator validation per formula text
+    - Closure-compiled evaluation with the same range checks as the AST walker
+    - Vectorized NumPy evaluation over column arrays for bulk repricing
+    - Bounded LRU with hit/miss statistics
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import Any
+
+import numpy as np
+
+from app.core.exceptions import InvalidFormulaException
+
+__all__ = [
+    "SAFE_OPERATORS",
+    "CompiledFormula",
+    "FormulaCache",
+    "compile_formula",
+    "interpret_formula",
+    "get_formula_cache",
+]
+
+
+# Safe operators for formula evaluation
+SAFE_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+# Absolute bound applied to constants, variables and intermediate results
+VALUE_LIMIT = 1e10
+
+Evaluator = Callable[[dict[str, Any]], float]
+ArrayEvaluator = Callable[[Mapping[str, np.ndarray]], np.ndarray | float]
+
+
+class CompiledFormula:
+    """Validated formula compiled to a closure.
+
+    Evaluation raises the same errors as the tree-walking interpreter
+    (``ZeroDivisionError``, ``KeyError`` for unknown variables and
+    ``ValueError``/``OverflowError`` for out-of-range values), so callers
+    can map them to ``InvalidFormulaException`` exactly as before.
+
+    Attributes:
+        formula: Normalized (stripped) formula text
+        variables: Names of the variables referenced by the formula
+    """
+
+    __slots__ = ("formula", "variables", "_evaluator", "_tree", "_array_evaluator")
+
+    def __init__(
+        self,
+        formula: str,
+        variables: frozenset[str],
+        evaluator: Evaluator,
+        tree: ast.AST | None = None,
+    ) -> None:
+        """Initialize compiled formula.
+
+        Args:
+            formula (str): Normalized formula text
+            variables (frozenset[str]): Referenced variable names
+            evaluator (Evaluator): Compiled closure
+            tree (ast.AST | None): Validated expression body, used to build
+                the vectorized evaluator on first use
+        """
+        self.formula = formula
+        self.variables = variables
+        self._evaluator = evaluator
+        self._tree = tree
+        self._array_evaluator: ArrayEvaluator | None = None
+
+    def evaluate(self, context: dict[str, Any]) -> float:
+        """Evaluate the formula against a variable context.
+
+        Args:
+            context (dict[str, Any]): Variable context
+
+        Returns:
+            float: Evaluated result
+        """
+        return self._evaluator(context)
+
+    def evaluate_array(self, columns: Mapping[str, np.ndarray], size: int) -> np.ndarray:
+        """Evaluate the formula for many rows at once.
+
+        Each variable is a float64 column holding one value per row. The
+        whole batch fails if any row would fail on the scalar path; callers
+        fall back to :meth:`evaluate` row by row to find the offending rows.
+
+        Args:
+            columns (Mapping[str, np.ndarray]): Variable columns of equal length
+            size (int): Number of rows (used when the formula has no variables)
+
+        Returns:
+            np.ndarray: One result per row
+
+        Raises:
+            ZeroDivisionError: If any divisor is zero
+            KeyError: If a referenced column is missing
+            ValueError: If any value or intermediate result is out of range
+        """
+        if self._array_evaluator is None:
+            if self._tree is None:
+                raise ValueError(f"Formula has no syntax tree to vectorize: {self.formula}")
+            self._array_evaluator = _compile_array_node(self._tree)
+
+        with np.errstate(all="ignore"):
+            result = self._array_evaluator(columns)
+        return np.broadcast_to(np.asarray(result, dtype=np.float64), (size,))
+
+    def __repr__(self) -> str:
+        """String representation of CompiledFormula."""
+        return f"<CompiledFormula(formula='{self.formula}')>"
+
+
+def _unsafe_operator(op: ast.AST) -> InvalidFormulaException:
+    return InvalidFormulaException(
+        message=f"Unsafe operator: {type(op).__name__}",
+        details={"operator": type(op).__name__},
+    )
+
+
+def _compile_node(node: ast.AST, variables: set[str]) -> Evaluator:
+    """Compile an AST node into a closure.
+
+    Args:
+        node (ast.AST): AST node to compile
+        variables (set[str]): Collector for referenced variable names
+
+    Returns:
+        Evaluator: Closure evaluating the node
+
+    Raises:
+        InvalidFormulaException: If node type or operator is not allowed
+        ValueError: If a constant is out of range
+    """
+    if isinstance(node, ast.Constant):
+        value = float(node.value)
+        if not (-VALUE_LIMIT < value < VALUE_LIMIT):
+            raise ValueError(f"Constant value out of range: {value}")
+        return lambda context: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        variables.add(name)
+
+        def load(context: dict[str, Any]) -> float:
+            value = float(context[name])
+            if not (-VALUE_LIMIT < value < VALUE_LIMIT):
+                raise ValueError(f"Variable value out of range: {name}={value}")
+            return value
+
+        return load
+
+    if isinstance(node, ast.BinOp):
+        op = SAFE_OPERATORS.get(type(node.op))
+        if op is None:
+            raise _unsafe_operator(node.op)
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+
+        if isinstance(node.op, ast.Div):
+
+            def divide(context: dict[str, Any]) -> float:
+                lhs = left(context)
+                rhs = right(context)
+                if rhs == 0:
+                    raise ZeroDivisionError("Division by zero")
+                result = lhs / rhs
+                if not (-VALUE_LIMIT < result < VALUE_LIMIT):
+                    raise ValueError(f"Operation result out of range: {result}")
+                return result
+
+            return divide
+
+        if isinstance(node.op, ast.Pow):
+
+            def power(context: dict[str, Any]) -> float:
+                result = left(context) ** right(context)
+                # Negative base with fractional exponent yields a complex number
+                if not isinstance(result, (int, float)) or not (
+                    -VALUE_LIMIT < result < VALUE_LIMIT
+                ):
+                    raise ValueError(f"Operation result out of range: {result}")
+                return result
+
+            return power
+
+        def binary(context: dict[str, Any]) -> float:
+            result = op(left(context), right(context))
+            if not (-VALUE_LIMIT < result < VALUE_LIMIT):
+                raise ValueError(f"Operation result out of range: {result}")
+            return result
+
+        return binary
+
+    if isinstance(node, ast.UnaryOp):
+        op = SAFE_OPERATORS.get(type(node.op))
+        if op is None:
+            raise _unsafe_operator(node.op)
+        operand = _compile_node(node.operand, variables)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+
+        def unary(context: dict[str, Any]) -> float:
+            return op(operand(context))
+
+        return unary
+
+    raise InvalidFormulaException(
+        message=f"Unsafe node type: {type(node).__name__}",
+        details={"node_type": type(node).__name__},
+    )
+
+
+def compile_formula(formula: str) -> CompiledFormula:
+    """Parse, validate and compile a formula string.
+
+    Args:
+        formula (str): Formula string (e.g., "width * height * 0.05")
+
+    Returns:
+        CompiledFormula: Compiled formula
+
+    Raises:
+        SyntaxError: If the formula cannot be parsed
+        InvalidFormulaException: If the formula uses unsafe nodes or operators
+        ValueError: If a constant is out of range
+    """
+    formula = formula.strip()
+    tree = ast.parse(formula, mode="eval")
+    variables: set[str] = set()
+    evaluator = _compile_node(tree.body, variables)
+    return CompiledFormula(formula, frozenset(variables), evaluator, tree.body)
+
+
+def _check_array_range(values: np.ndarray | float, message: str) -> None:
+    """Raise ValueError unless every value lies strictly inside VALUE_LIMIT.
+
+    NaN (e.g. a negative base with a fractional exponent) fails the check,
+    mirroring the complex-result check of the scalar path.
+    """
+    if not np.all((values > -VALUE_LIMIT) & (values < VALUE_LIMIT)):
+        raise ValueError(message)
+
+
+def _compile_array_node(node: ast.AST) -> ArrayEvaluator:
+    """Compile an already validated AST node into a vectorized closure.
+
+    Args:
+        node (ast.AST): AST node validated by ``_compile_node``
+
+    Returns:
+        ArrayEvaluator: Closure evaluating the node over column arrays
+    """
+    if isinstance(node, ast.Constant):
+        value = float(node.value)
+        return lambda columns: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+
+        def load(columns: Mapping[str, np.ndarray]) -> np.ndarray:
+            values = columns[name]
+            _check_array_range(values, f"Variable value out of range: {name}")
+            return values
+
+        return load
+
+    if isinstance(node, ast.BinOp):
+        op = SAFE_OPERATORS[type(node.op)]
+        left = _compile_array_node(node.left)
+        right = _compile_array_node(node.right)
+        is_division = isinstance(node.op, ast.Div)
+
+        def binary(columns: Mapping[str, np.ndarray]) -> np.ndarray | float:
+            lhs = left(columns)
+            rhs = right(columns)
+            if is_division and np.any(np.asarray(rhs) == 0):
+                raise ZeroDivisionError("Division by zero")
+            result = op(lhs, rhs)
+            _check_array_range(result, "Operation result out of range")
+            return result
+
+        return binary
+
+    if isinstance(node, ast.UnaryOp):
+        op = SAFE_OPERATORS[type(node.op)]
+        operand = _compile_array_node(node.operand)
+        return lambda columns: op(operand(columns))
+
+    raise InvalidFormulaException(
+        message=f"Unsafe node type: {type(node).__name__}",
+        details={"node_type": type(node).__name__},
+    )
+
+
+def interpret_formula(node: ast.AST, context: dict[str, Any]) -> float:
+    """Recursively evaluate an AST node without compilation.
+
+    Reference tree-walking interpreter with the same semantics as the
+    compiled path. Pricing never calls it; the engine tests check compiled
+    results against it and the ``formula_interpret`` benchmark times it
+    next to ``formula_eval``.
+
+    Args:
+        node (ast.AST): AST node to evaluate
+        context (dict[str, Any]): Variable context
+
+    Returns:
+        float: Evaluated result
+
+    Raises:
+        InvalidFormulaException: If node type is not allowed
+        ZeroDivisionError: If division by zero occurs
+        KeyError: If variable not found in context
+    """
+    if isinstance(node, ast.Constant):
+        value = float(node.value)
+        if not (-VALUE_LIMIT < value < VALUE_LIMIT):
+            raise ValueError(f"Constant value out of range: {value}")
+        return value
+
+    elif isinstance(node, ast.Name):
+        if node.id not in context:
+            raise KeyError(node.id)
+        value = float(context[node.id])
+        if not (-VALUE_LIMIT < value < VALUE_LIMIT):
+            raise ValueError(f"Variable value out of range: {node.id}={value}")
+        return value
+
+    elif isinstance(node, ast.BinOp):
+        if type(node.op) not in SAFE_OPERATORS:
+            raise _unsafe_operator(node.op)
+        left = interpret_formula(node.left, context)
+        right = interpret_formula(node.right, context)
+
+        if isinstance(node.op, ast.Div) and right == 0:
+            raise ZeroDivisionError("Division by zero")
+
+        result = SAFE_OPERATORS[type(node.op)](left, right)
+        if not isinstance(result, (int, float)) or not (-VALUE_LIMIT < result < VALUE_LIMIT):
+            raise ValueError(f"Operation result out of range: {result}")
+        return result
+
+    elif isinstance(node, ast.UnaryOp):
+        if type(node.op) not in SAFE_OPERATORS:
+            raise _unsafe_operator(node.op)
+        operand = interpret_formula(node.operand, context)
+        return SAFE_OPERATORS[type(node.op)](operand)
+
+    raise InvalidFormulaException(
+        message=f"Unsafe node type: {type(node).__name__}",
+        details={"node_type": type(node).__name__},
+    )
+
+
+class FormulaCache:
+    """Bounded LRU cache of compiled formulas keyed by formula text.
+
+    Formulas that fail to compile are not cached, so invalid formulas
+    keep raising on every evaluation.
+
+    Attributes:
+        maxsize: Maximum number of compiled formulas kept
+        hits: Number of cache hits
+        misses: Number of cache misses (compilations)
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Initialize formula cache.
+
+        Args:
+            maxsize (int): Maximum number of compiled formulas kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CompiledFormula] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, formula: str) -> CompiledFormula:
+        """Get the compiled form of a formula, compiling it on a miss.
+
+        Args:
+            formula (str): Formula string
+
+        Returns:
+            CompiledFormula: Compiled formula
+
+        Raises:
+            SyntaxError: If the formula cannot be parsed
+            InvalidFormulaException: If the formula is unsafe
+            ValueError: If a constant is out of range
+        """
+        key = formula.strip()
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+
+        compiled = compile_formula(key)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, formula: str) -> bool:
+        """Evict a formula from the cache.
+
+        Args:
+            formula (str): Formula string
+
+        Returns:
+            bool: True if an entry was evicted
+        """
+        with self._lock:
+            return self._entries.pop(formula.strip(), None) is not None
+
+    def clear(self) -> None:
+        """Clear all compiled formulas and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Number of cached formulas."""
+        return len(self._entries)
+
+    def __contains__(self, formula: object) -> bool:
+        """Check whether a formula is cached."""
+        return isinstance(formula, str) and formula.strip() in self._entries
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache statistics for monitoring.
+
+        Returns:
+            dict[str, int]: Size, capacity, hits and misses
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_formula_cache: FormulaCache | None = None
+
+
+def get_formula_cache() -> FormulaCache:
+    """Get the process-wide formula cache.
+
+    Returns:
+        FormulaCache: Shared formula cache sized from Windx settings
+    """
+    global _formula_cache
+    if _formula_cache is None:
+        from app.core.config import get_settings
+
+        _formula_cache = FormulaCache(maxsize=get_settings().windx.formula_cache_size)
+    return _formula_cache
@@ -0,0 +1,262 @@
+"""Entry page preview headers keyed by manufacturing type and page type.
+
+Preview tables, exports and imports all need the headers of an entry page
+and the mappings between headers and field names. They are derived from
+the page's attribute nodes, so each worker keeps them in a bounded LRU
+under a single ``<manufacturing_type_id>:<page_type>`` key, stamped with
+the manufacturing type's database tree version (see ``tree_versions``).
+
+The database bumps that version whenever any writer changes the type's
+nodes, so a stale header set is never served after the tree changes. A
+manufacturing type's entries are also dropped as soon as a version
+notification arrives. Entries expire after a TTL as well, which keeps
+rarely used pages from pinning memory.
+
+Public Classes:
+    PreviewHeaders: Headers of an entry page and their field mappings
+    HeaderRegistry: Bounded, versioned in-process header registry
+
+Public Functions:
+    get_header_registry: Get the process-wide header registry
+
+Features:
+    - One canonical key per manufacturing type and page type
+    - Headers, mapping and reverse mapping built from one query
+    - LRU bound and per-entry TTL
+    - Stamped with database tree versions, whoever wrote the nodes
+    - Dropped as soon as a tree version notification arrives
+    - Hit/miss/expiry counters for monitoring
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from app.models.attribute_node import AttributeNode
+from app.services.tree_versions import get_tree_versions
+
+__all__ = ["HeaderRegistry", "PreviewHeaders", "get_header_registry"]
+
+
+@dataclass(frozen=True, slots=True)
+class PreviewHeaders:
+    """Headers of an entry page and their field mappings.
+
+    Instances are shared between requests; do not mutate their members.
+
+    Attributes:
+        headers: Ordered preview headers, starting with ``id``
+        mapping: Header to field name
+        reverse_mapping: Field name to header
+    """
+
+    headers: list[str]
+    mapping: dict[str, str]
+    reverse_mapping: dict[str, str]
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[AttributeNode]) -> PreviewHeaders:
+        """Build headers from attribute nodes in display order.
+
+        Args:
+            nodes (Iterable[AttributeNode]): Attribute nodes of the page
+
+        Returns:
+            PreviewHeaders: Headers and mappings
+        """
+        headers = ["id"]
+        mapping = {"id": "id"}
+        for node in nodes:
+            header = node.get_display_name()
+            headers.append(header)
+            mapping[header] = node.name
+        return cls(
+            headers=headers,
+            mapping=mapping,
+            reverse_mapping={field: header for header, field in mapping.items()},
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    """Registry entry with the tree version it was built from."""
+
+    version: int
+    expires_at: float
+    headers: PreviewHeaders
+
+
+class HeaderRegistry:
+    """Bounded, versioned registry of entry page headers.
+
+    Attributes:
+        maxsize: Maximum number of header sets kept
+        ttl: Seconds a header set is kept before it is reloaded
+        hits: Lookups served from the registry
+        misses: Lookups that had to be loaded
+        expired: Entries dropped because their TTL ran out
+        stale: Entries dropped because the tree version changed
+        evictions: Entries dropped to stay within maxsize
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize header registry.
+
+        Args:
+            maxsize (int): Maximum number of header sets kept
+            ttl (float): Seconds a header set is kept before it is reloaded
+            clock (Callable[[], float]): Monotonic time source
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stale = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(manufacturing_type_id: int, page_type: str) -> str:
+        """Build the key of an entry page.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            page_type (str): Page type
+
+        Returns:
+            str: Registry key
+        """
+        return f"{manufacturing_type_id}:{page_type}"
+
+    def get(self, key: str, version: int) -> PreviewHeaders | None:
+        """Get the headers of an entry page at a tree version.
+
+        Args:
+            key (str): Registry key from make_key
+            version (int): Tree version of the manufacturing type
+
+        Returns:
+            PreviewHeaders | None: Headers, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version != version:
+                del self._entries[key]
+                self.stale += 1
+                entry = None
+            elif entry is not None and entry.expires_at <= self._clock():
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.headers
+
+    def put(self, key: str, version: int, headers: PreviewHeaders) -> None:
+        """Store the headers of an entry page at a tree version.
+
+        Args:
+            key (str): Registry key from make_key
+            version (int): Tree version the headers were built from
+            headers (PreviewHeaders): Headers to store
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = _Entry(version, self._clock() + self.ttl, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, manufacturing_type_id: int | None = None) -> None:
+        """Drop the header sets of a manufacturing type, or all of them.
+
+        Only affects this worker; committed node changes are picked up by
+        every worker through the tree version.
+
+        Args:
+            manufacturing_type_id (int | None): Manufacturing type ID, or None for all
+        """
+        with self._lock:
+            if manufacturing_type_id is None:
+                self._entries.clear()
+                return
+            prefix = f"{manufacturing_type_id}:"
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Clear all header sets and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.expired = 0
+            self.stale = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        """Number of header sets kept."""
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether an entry page has a header set, current or not."""
+        return key in self._entries
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get registry statistics for monitoring.
+
+        Returns:
+            dict[str, Any]: Size, capacity, TTL and hit/miss/drop counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "stale": self.stale,
+            "evictions": self.evictions,
+        }
+
+
+_header_registry: HeaderRegistry | None = None
+
+
+def get_header_registry() -> HeaderRegistry:
+    """Get the process-wide header registry.
+
+    Returns:
+        HeaderRegistry: Shared registry sized from Windx settings
+    """
+    global _header_registry
+    if _header_registry is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+        _header_registry = HeaderRegistry(
+            maxsize=settings.windx.header_registry_size,
+            ttl=settings.windx.header_registry_ttl,
+        )
+        get_tree_versions().subscribe(_header_registry.invalidate)
+    return _header_registry
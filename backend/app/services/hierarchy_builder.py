@@ -17,9 +17,12 @@ Key Features:
     - Manufacturing type creation and management
     - Single node creation with comprehensive validation
     - Batch hierarchy creation from nested dictionaries
-    - Tree visualization (ASCII and Pydantic/JSON)
+    - Set-based bulk inserts with pre-allocated ids and client-side paths
+    - Tree visualization (ASCII and Pydantic/JSON) from shared tree snapshots
     - Circular reference detection
+    - Single-statement subtree moves with LTREE path rewriting
     - Duplicate name detection at same level
+    - Formula validation and normalization before nodes are stored
     - Transactional batch operations (all-or-nothing)
 
 Usage Example:
@@ -86,6 +89,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
+from operator import attrgetter
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -96,9 +100,16 @@ from app.repositories.manufacturing_type import ManufacturingTypeRepository
 from app.schemas.attribute_node import AttributeNodeTree
 from app.schemas.manufacturing_type import ManufacturingTypeCreate
 from app.services.base import BaseService
+from app.services.formula_analysis import prepare_node_formulas
+from app.services.tree_snapshot import get_tree_snapshot
 
 __all__ = ["NodeParams", "HierarchyBuilderService"]
 
+# Rows per multi-row node INSERT, and the bind parameter budget per statement
+# (Postgres accepts at most 32,767)
+INSERT_PAGE_ROWS = 1000
+INSERT_PAGE_PARAMETERS = 32_000
+
 
 @dataclass
 class NodeParams:
@@ -484,6 +495,7 @@ class HierarchyBuilderService(BaseService):
 
         Raises:
             ValueError: If input validation fails
+            InvalidFormulaException: If the price or weight formula is invalid
             NotFoundException: If parent node or manufacturing type not found
             DatabaseException: If creation fails
 
@@ -556,6 +568,11 @@ class HierarchyBuilderService(BaseService):
         if sort_order < 0:
             raise ValueError("sort_order cannot be negative")
 
+        # Validate formulas and store their normalized form
+        formulas = prepare_node_formulas(
+            {"price_formula": price_formula, "weight_formula": weight_formula}
+        )
+
         # Validate manufacturing type exists
         mfg_type = await self.mfg_type_repo.get(manufacturing_type_id)
         if mfg_type is None:
@@ -624,9 +641,9 @@ class HierarchyBuilderService(BaseService):
             required=required,
             price_impact_type=price_impact_type,
             price_impact_value=price_impact_value,
-            price_formula=price_formula,
+            price_formula=formulas["price_formula"],
             weight_impact=weight_impact,
-            weight_formula=weight_formula,
+            weight_formula=formulas["weight_formula"],
             technical_property_type=technical_property_type,
             technical_impact_formula=technical_impact_formula,
             ltree_path=ltree_path,  # Calculated field
@@ -653,7 +670,9 @@ class HierarchyBuilderService(BaseService):
 
         Moves an existing attribute node to a new parent, recalculating
         its LTREE path and depth. Validates that the move would not create
-        a circular reference.
+        a circular reference. The paths and depths of the whole subtree are
+        rewritten with a single UPDATE, so moving a category costs the same
+        statements however many descendants it has.
 
         Args:
             node_id: ID of the node to move
@@ -707,28 +726,9 @@ class HierarchyBuilderService(BaseService):
                     "this would create a circular reference in the hierarchy"
                 )
 
-        # Calculate new ltree_path and depth
+        # Rewrite the whole subtree with one statement
         new_ltree_path = self._calculate_ltree_path(new_parent, node.name)
-        new_depth = self._calculate_depth(new_parent)
-
-        # Update node
-        node.parent_node_id = new_parent_id
-        node.ltree_path = new_ltree_path
-        node.depth = new_depth
-
-        # Update all descendants' paths and depths
-        descendants = await self.attr_node_repo.get_descendants(node_id)
-        for descendant in descendants:
-            # Calculate relative path from node to descendant
-            old_node_path = node.ltree_path
-            descendant_relative_path = descendant.ltree_path[len(old_node_path) + 1 :]
-
-            # Update descendant's path
-            descendant.ltree_path = f"{new_ltree_path}.{descendant_relative_path}"
-
-            # Update descendant's depth (add the depth change)
-            depth_change = new_depth - node.depth
-            descendant.depth += depth_change
+        await self.attr_node_repo.move_subtree(node, new_parent_id, new_ltree_path)
 
         await self.commit()
         await self.refresh(node)
@@ -740,13 +740,18 @@ class HierarchyBuilderService(BaseService):
         manufacturing_type_id: int,
         hierarchy_data: dict,
         parent: AttributeNode | None = None,
-        _is_root_call: bool = True,
     ) -> AttributeNode:
         """Create a hierarchy from nested dictionary structure.
 
-        Creates an entire attribute hierarchy from a nested dictionary,
-        recursively processing children. This enables batch creation of
-        complex hierarchies with a single method call.
+        Creates an entire attribute hierarchy from a nested dictionary in
+        bulk. The whole tree is validated in memory first (required fields,
+        node types, formulas, duplicate siblings, LTREE labels), then ids are
+        allocated in one call, paths and depths computed client-side and
+        the nodes inserted parents first with multi-row INSERT statements
+        of up to INSERT_PAGE_ROWS rows (fewer when their bind parameters
+        would exceed INSERT_PAGE_PARAMETERS), so round trips, and the
+        statement-level tree version triggers they fire, grow with pages of
+        nodes rather than with nodes.
 
         The operation is transactional - either all nodes are created
         successfully, or none are created (all-or-nothing).
@@ -755,7 +760,6 @@ class HierarchyBuilderService(BaseService):
             manufacturing_type_id: Manufacturing type ID
             hierarchy_data: Dictionary containing node data and optional children
             parent: Optional parent node (None for root level)
-            _is_root_call: Internal flag to track root call (do not set manually)
 
         Returns:
             AttributeNode: The root node of the created hierarchy
@@ -764,6 +768,7 @@ class HierarchyBuilderService(BaseService):
             ValueError: If hierarchy_data is invalid or missing required fields
             NotFoundException: If manufacturing type or parent not found
             ConflictException: If duplicate names exist at same level
+            InvalidFormulaException: If a price or weight formula is invalid
             DatabaseException: If creation fails (triggers rollback)
 
         Dictionary Structure:
@@ -818,147 +823,253 @@ class HierarchyBuilderService(BaseService):
             ... )
             >>> # Creates: Frame Material → Material Type → [Aluminum, Vinyl]
         """
+        from sqlalchemy import insert, select
+
         from app.core.exceptions import (
             ConflictException,
             DatabaseException,
+            InvalidFormulaException,
             NotFoundException,
             ValidationException,
         )
 
+        # Validate the whole tree before touching the database
+        rows, parent_indexes = self._plan_hierarchy(manufacturing_type_id, hierarchy_data, parent)
+        root_name = rows[0]["name"]
+
+        try:
+            # Validate manufacturing type exists
+            mfg_type = await self.mfg_type_repo.get(manufacturing_type_id)
+            if mfg_type is None:
+                raise NotFoundException(
+                    f"Manufacturing type with id {manufacturing_type_id} not found"
+                )
+
+            # Only the root can collide with stored nodes; the rest are new
+            parent_id = parent.id if parent else None
+            existing_sibling = await self.attr_node_repo.db.scalar(
+                select(AttributeNode.id).where(
+                    AttributeNode.manufacturing_type_id == manufacturing_type_id,
+                    AttributeNode.parent_node_id == parent_id,
+                    AttributeNode.name == root_name,
+                )
+            )
+            if existing_sibling is not None:
+                parent_desc = f"parent node {parent_id}" if parent else "root level"
+                raise ConflictException(
+                    f"A node with name '{root_name}' already exists at {parent_desc} "
+                    f"in manufacturing type {manufacturing_type_id}"
+                )
+
+            # Link rows through pre-allocated ids and insert them parents first
+            ids = await self._allocate_node_ids(len(rows))
+            for row, node_id, parent_index in zip(rows, ids, parent_indexes, strict=True):
+                row["id"] = node_id
+                row["parent_node_id"] = parent_id if parent_index is None else ids[parent_index]
+            # Multi-row pages; a parameter list would run as one INSERT per node
+            page_size = min(INSERT_PAGE_ROWS, INSERT_PAGE_PARAMETERS // len(rows[0]))
+            for start in range(0, len(rows), page_size):
+                await self.attr_node_repo.db.execute(
+                    insert(AttributeNode.__table__).values(rows[start : start + page_size])
+                )
+
+            await self.commit()
+        except Exception as e:
+            await self.rollback()
+
+            # For validation errors, preserve the original exception type
+            if isinstance(
+                e,
+                (
+                    NotFoundException,
+                    ValidationException,
+                    ConflictException,
+                    InvalidFormulaException,
+                    DatabaseException,
+                    ValueError,
+                ),
+            ):
+                raise
+
+            parent_name = parent.name if parent else "<root>"
+            raise DatabaseException(
+                f"Failed to create hierarchy '{root_name}' under parent '{parent_name}': {str(e)}"
+            ) from e
+
+        return await self.attr_node_repo.get(ids[0])
+
+    def _plan_hierarchy(
+        self,
+        manufacturing_type_id: int,
+        hierarchy_data: dict,
+        parent: AttributeNode | None,
+    ) -> tuple[list[dict], list[int | None]]:
+        """Validate a nested hierarchy and flatten it into insertable rows.
+
+        Args:
+            manufacturing_type_id: Manufacturing type ID
+            hierarchy_data: Dictionary containing node data and optional children
+            parent: Optional parent node (None for root level)
+
+        Returns:
+            tuple[list[dict], list[int | None]]: Table rows in depth-first
+                order, and the index of each row's parent row (None for the root)
+
+        Raises:
+            ValueError: If hierarchy_data is invalid or missing required fields
+            ValidationException: If a node type is invalid
+            ConflictException: If sibling nodes share a name
+            InvalidFormulaException: If a price or weight formula is invalid
+        """
+        from app.core.exceptions import ConflictException, ValidationException
+
         # Validate hierarchy_data is a dictionary
         if not isinstance(hierarchy_data, dict):
             raise ValueError(
                 f"hierarchy_data must be a dictionary, got {type(hierarchy_data).__name__}"
             )
 
-        # Validate required fields
-        if "name" not in hierarchy_data:
-            raise ValueError("hierarchy_data must contain 'name' field")
-
-        if "node_type" not in hierarchy_data:
-            raise ValueError("hierarchy_data must contain 'node_type' field")
-
-        # Make a copy to avoid modifying the original dict
-        hierarchy_data = hierarchy_data.copy()
+        # Node fields by attribute name, with their column keys and defaults;
+        # ids, tree position and timestamps are set here or by the database
+        reserved = {
+            "id",
+            "manufacturing_type_id",
+            "parent_node_id",
+            "ltree_path",
+            "depth",
+            "created_at",
+            "updated_at",
+        }
+        columns = {
+            attr.key: attr.columns[0]
+            for attr in AttributeNode.__mapper__.column_attrs
+            if attr.key not in reserved
+        }
+        defaults = {
+            column.key: column.default.arg
+            if column.default is not None and column.default.is_scalar
+            else None
+            for column in columns.values()
+        }
 
-        # Extract children before creating node (we'll process them after)
-        children_data = hierarchy_data.pop("children", [])
+        valid_node_types = {"category", "attribute", "option", "component", "technical_spec"}
+        rows: list[dict] = []
+        parent_indexes: list[int | None] = []
+        # Depth-first, children in order: (data, parent row index, path, depth, parent name)
+        pending: list[tuple[dict, int | None, str | None, int, str | None]] = [
+            (
+                hierarchy_data,
+                None,
+                parent.ltree_path if parent else None,
+                self._calculate_depth(parent),
+                None,
+            )
+        ]
+        while pending:
+            node_data, parent_index, parent_path, depth, parent_name = pending.pop()
 
-        # Validate children is a list if provided
-        if children_data is not None and not isinstance(children_data, list):
-            raise ValueError(f"'children' must be a list, got {type(children_data).__name__}")
+            # Validate each child is a dictionary
+            if not isinstance(node_data, dict):
+                raise ValueError(
+                    f"Each child must be a dictionary, got {type(node_data).__name__} "
+                    f"for child of node '{parent_name}'"
+                )
 
-        try:
-            # Extract node data from dictionary
-            node_data = {
-                "manufacturing_type_id": manufacturing_type_id,
-                "parent_node_id": parent.id if parent else None,
-                **hierarchy_data,  # Spread all other fields from dict
-            }
+            # Validate required fields
+            if "name" not in node_data:
+                raise ValueError("hierarchy_data must contain 'name' field")
 
-            # Convert Decimal fields if they're provided as strings or floats
-            if "price_impact_value" in node_data and node_data["price_impact_value"] is not None:
-                node_data["price_impact_value"] = Decimal(str(node_data["price_impact_value"]))
+            if "node_type" not in node_data:
+                raise ValueError("hierarchy_data must contain 'node_type' field")
 
-            if "weight_impact" in node_data and node_data["weight_impact"] is not None:
-                node_data["weight_impact"] = Decimal(str(node_data["weight_impact"]))
+            # Make a copy to avoid modifying the original dict
+            node_data = node_data.copy()
+            children_data = node_data.pop("children", [])
 
-            # Create the node - but don't commit yet if we're in a batch operation
-            # We'll commit at the end of the root call
-            from sqlalchemy import select
+            # Validate children is a list if provided
+            if children_data is not None and not isinstance(children_data, list):
+                raise ValueError(f"'children' must be a list, got {type(children_data).__name__}")
 
-            from app.models.attribute_node import AttributeNode as AttributeNodeModel
+            unknown = node_data.keys() - columns.keys()
+            if unknown:
+                raise ValueError(
+                    f"Invalid node fields for '{node_data['name']}': {', '.join(sorted(unknown))}"
+                )
 
-            # Perform all the same validations as create_node
             name = node_data["name"]
             node_type = node_data["node_type"]
-
-            # Validate manufacturing type exists
-            mfg_type = await self.mfg_type_repo.get(manufacturing_type_id)
-            if mfg_type is None:
-                raise NotFoundException(
-                    f"Manufacturing type with id {manufacturing_type_id} not found"
-                )
-
-            # Validate node_type
-            valid_node_types = {"category", "attribute", "option", "component", "technical_spec"}
             if node_type not in valid_node_types:
                 raise ValidationException(
                     f"Invalid node_type '{node_type}'. Must be one of: {', '.join(valid_node_types)}"
                 )
 
-            # Check for duplicate names at the same level
-            siblings_query = select(AttributeNodeModel).where(
-                AttributeNodeModel.manufacturing_type_id == manufacturing_type_id,
-                AttributeNodeModel.parent_node_id == (parent.id if parent else None),
-                AttributeNodeModel.name == name,
-            )
-            result = await self.attr_node_repo.db.execute(siblings_query)
-            existing_sibling = result.scalar_one_or_none()
+            # Convert Decimal fields if they're provided as strings or floats
+            for decimal_field in ("price_impact_value", "weight_impact"):
+                if node_data.get(decimal_field) is not None:
+                    node_data[decimal_field] = Decimal(str(node_data[decimal_field]))
 
-            if existing_sibling is not None:
-                parent_desc = (
-                    f"parent node {parent.id if parent else None}" if parent else "root level"
-                )
-                raise ConflictException(
-                    f"A node with name '{name}' already exists at {parent_desc} "
-                    f"in manufacturing type {manufacturing_type_id}"
-                )
+            # Validate formulas and store their normalized form
+            node_data = prepare_node_formulas(node_data)
 
             # Calculate ltree_path and depth
-            ltree_path = self._calculate_ltree_path(parent, name)
-            depth = self._calculate_depth(parent)
-
-            # Create the node model
-            node = AttributeNodeModel(ltree_path=ltree_path, depth=depth, **node_data)
-
-            # Add to session but don't commit yet
-            self.attr_node_repo.db.add(node)
-            await self.attr_node_repo.db.flush()  # Flush to get the ID
-
-            # Recursively process children
-            if children_data:
-                for child_data in children_data:
-                    # Validate each child is a dictionary
-                    if not isinstance(child_data, dict):
-                        raise ValueError(
-                            f"Each child must be a dictionary, got {type(child_data).__name__} "
-                            f"for child of node '{node.name}'"
+            label = self._sanitize_for_ltree(name)
+            ltree_path = f"{parent_path}.{label}" if parent_path else label
+
+            row = dict(defaults)
+            row.update({columns[key].key: value for key, value in node_data.items()})
+            row.update(
+                manufacturing_type_id=manufacturing_type_id,
+                ltree_path=ltree_path,
+                depth=depth,
+            )
+            index = len(rows)
+            rows.append(row)
+            parent_indexes.append(parent_index)
+
+            # Check for duplicate names among the new siblings
+            sibling_names: set[str] = set()
+            for child_data in children_data or []:
+                if isinstance(child_data, dict) and "name" in child_data:
+                    if child_data["name"] in sibling_names:
+                        raise ConflictException(
+                            f"A node with name '{child_data['name']}' appears more than once "
+                            f"under '{name}' in manufacturing type {manufacturing_type_id}"
                         )
+                    sibling_names.add(child_data["name"])
 
-                    # Recursively create child hierarchy (not a root call)
-                    await self.create_hierarchy_from_dict(
-                        manufacturing_type_id=manufacturing_type_id,
-                        hierarchy_data=child_data,
-                        parent=node,
-                        _is_root_call=False,
-                    )
-
-            # Only commit if this is the root call
-            if _is_root_call:
-                await self.commit()
-                await self.refresh(node)
+            pending.extend(
+                (child_data, index, ltree_path, depth + 1, name)
+                for child_data in reversed(children_data or [])
+            )
 
-            return node
+        return rows, parent_indexes
 
-        except Exception as e:
-            # Only rollback if this is the root call
-            if _is_root_call:
-                await self.rollback()
+    async def _allocate_node_ids(self, count: int) -> list[int]:
+        """Allocate ids for new attribute nodes in one round trip.
 
-            # Re-raise with additional context about which node failed
-            node_name = hierarchy_data.get("name", "<unknown>")
-            parent_name = parent.name if parent else "<root>"
+        Args:
+            count: Number of ids
 
-            # For validation errors, preserve the original exception type
-            if isinstance(
-                e, (NotFoundException, ValidationException, ConflictException, ValueError)
-            ):
-                raise
+        Returns:
+            list[int]: Unused node ids
+        """
+        from sqlalchemy import func, select, text
+
+        db = self.attr_node_repo.db
+        if db.get_bind().dialect.name == "postgresql":
+            result = await db.execute(
+                text(
+                    "SELECT nextval(pg_get_serial_sequence('attribute_nodes', 'id')) "
+                    "FROM generate_series(1, :count)"
+                ),
+                {"count": count},
+            )
+            return list(result.scalars())
 
-            raise DatabaseException(
-                f"Failed to create node '{node_name}' under parent '{parent_name}': {str(e)}"
-            ) from e
+        # Without sequences, continue after the highest id; the insert runs
+        # in the same transaction
+        highest = await db.scalar(select(func.coalesce(func.max(AttributeNode.id), 0)))
+        return list(range(highest + 1, highest + count + 1))
 
     async def pydantify(
         self,
@@ -1003,23 +1114,24 @@ class HierarchyBuilderService(BaseService):
         if mfg_type is None:
             raise NotFoundException(f"Manufacturing type with id {manufacturing_type_id} not found")
 
+        # Nodes are read from the shared tree snapshot, in ltree_path order
+        snapshot = await get_tree_snapshot(self.db, manufacturing_type_id)
+
         # If root_node_id is provided, validate it exists and build subtree
         if root_node_id is not None:
-            root_node = await self.attr_node_repo.get(root_node_id)
-            if root_node is None:
-                raise NotFoundException(f"Root node with id {root_node_id} not found")
+            if root_node_id not in snapshot:
+                root_node = await self.attr_node_repo.get(root_node_id)
+                if root_node is None:
+                    raise NotFoundException(f"Root node with id {root_node_id} not found")
 
-            # Validate root node belongs to the manufacturing type
-            if root_node.manufacturing_type_id != manufacturing_type_id:
+                # Root node belongs to another manufacturing type
                 raise ValueError(
                     f"Root node {root_node_id} belongs to manufacturing type "
                     f"{root_node.manufacturing_type_id}, not {manufacturing_type_id}"
                 )
 
-            # Get all descendants of the root node
-            descendants = await self.attr_node_repo.get_descendants(root_node_id)
-            # Include the root node itself at the beginning
-            nodes = [root_node] + descendants
+            # The root node itself followed by all its descendants
+            nodes = sorted(snapshot.subtree(root_node_id), key=attrgetter("ltree_path"))
 
             # For subtree, we need to build the tree treating the specified node as root
             # Create a mapping of node_id to node with children list
@@ -1073,7 +1185,7 @@ class HierarchyBuilderService(BaseService):
             return [node_map[root_node_id]]
         else:
             # Get all nodes for the manufacturing type
-            nodes = await self.attr_node_repo.get_by_manufacturing_type(manufacturing_type_id)
+            nodes = sorted(snapshot, key=attrgetter("ltree_path"))
 
             # Build tree structure using repository method
             tree = self.attr_node_repo.build_tree(nodes)
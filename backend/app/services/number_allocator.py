@@ -0,0 +1,188 @@
+"""Quote and order number allocation.
+
+Business numbers (``Q-YYYYMMDD-NNN``, ``O-YYYYMMDD-NNN``) are taken from a
+per-prefix, per-day counter row, so allocating a number costs one
+``UPDATE ... RETURNING`` however many documents were already numbered that
+day and concurrent workers never hand out the same number. Each worker may
+reserve a block of numbers per update and serve bursts from memory.
+
+Public Classes:
+    NumberAllocator: Per-worker allocator of business document numbers
+
+Public Functions:
+    format_number: Format a document number
+    get_number_allocator: Get the process-wide number allocator
+
+Features:
+    - Constant-time allocation independent of the day's volume
+    - Block pre-allocation per worker (``windx.number_block_size``)
+    - Batch allocation of many numbers with one counter update
+    - Reservations committed in their own short transaction
+    - Daily numbering restart in the existing formats
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.document_counter import DocumentCounterRepository
+
+__all__ = ["NumberAllocator", "format_number", "get_number_allocator"]
+
+
+def format_number(prefix: str, day: date, value: int) -> str:
+    """Format a document number.
+
+    Args:
+        prefix (str): Document prefix (e.g., "Q")
+        day (date): Day the number belongs to
+        value (int): Counter value; padded to at least three digits
+
+    Returns:
+        str: Number in format PREFIX-YYYYMMDD-NNN
+    """
+    return f"{prefix}-{day:%Y%m%d}-{value:03d}"
+
+
+@dataclass(slots=True)
+class _Block:
+    """Reserved counter values a worker has not handed out yet."""
+
+    day: date
+    next_value: int
+    last_value: int
+
+    @property
+    def remaining(self) -> int:
+        return self.last_value - self.next_value + 1
+
+
+class NumberAllocator:
+    """Per-worker allocator of business document numbers.
+
+    Reservations run in their own transaction on the caller's database, so
+    the counter row is locked only for the duration of one UPDATE rather
+    than until the document is committed. Numbers reserved by a worker but
+    never used (rolled back transactions, restarts, unused block
+    remainders) are skipped, never reissued.
+
+    Attributes:
+        block_size: Minimum numbers reserved per counter update
+        reservations: Counter updates issued by this worker
+    """
+
+    def __init__(self, block_size: int = 1) -> None:
+        """Initialize number allocator.
+
+        Args:
+            block_size (int): Minimum numbers reserved per counter update
+        """
+        self.block_size = block_size
+        self.reservations = 0
+        self._blocks: dict[str, _Block] = {}
+        self._lock = asyncio.Lock()
+
+    async def allocate(
+        self,
+        db: AsyncSession,
+        prefix: str,
+        count: int = 1,
+        day: date | None = None,
+    ) -> list[str]:
+        """Allocate document numbers.
+
+        Numbers left in the worker's block are handed out first; the rest
+        are reserved with a single counter update of at least
+        ``block_size`` numbers.
+
+        Args:
+            db (AsyncSession): Session whose database holds the counters
+            prefix (str): Document prefix (e.g., "Q")
+            count (int): Number of document numbers to allocate
+            day (date | None): Day to number for; defaults to today
+
+        Returns:
+            list[str]: Formatted numbers in ascending order
+
+        Example:
+            ```python
+            numbers = await allocator.allocate(db, "Q", 2)
+            # ["Q-20260101-041", "Q-20260101-042"]
+            ```
+        """
+        if count <= 0:
+            return []
+        day = day or date.today()
+
+        async with self._lock:
+            values: list[int] = []
+            block = self._blocks.get(prefix)
+            if block is not None and block.day == day:
+                take = min(count, block.remaining)
+                values.extend(range(block.next_value, block.next_value + take))
+                block.next_value += take
+
+            missing = count - len(values)
+            if missing:
+                size = max(missing, self.block_size)
+                last_value = await self._reserve(db, prefix, day, size)
+                first_value = last_value - size + 1
+                values.extend(range(first_value, first_value + missing))
+                self._blocks[prefix] = _Block(day, first_value + missing, last_value)
+
+        return [format_number(prefix, day, value) for value in values]
+
+    async def _reserve(self, db: AsyncSession, prefix: str, day: date, count: int) -> int:
+        """Reserve ``count`` counter values in a short transaction of their own.
+
+        Args:
+            db (AsyncSession): Session whose database holds the counters
+            prefix (str): Document prefix
+            day (date): Day the numbers belong to
+            count (int): Number of values to reserve
+
+        Returns:
+            int: Last reserved value
+        """
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            repo = DocumentCounterRepository(session)
+            value = await repo.increment(prefix, day, count)
+            if value is None:
+                try:
+                    await repo.insert(prefix, day, count)
+                    value = count
+                except IntegrityError:
+                    # Another worker created the day's counter first
+                    await session.rollback()
+                    value = await repo.increment(prefix, day, count)
+            await session.commit()
+
+        self.reservations += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop the worker's reserved blocks and reset statistics."""
+        self._blocks.clear()
+        self.reservations = 0
+
+
+_number_allocator: NumberAllocator | None = None
+
+
+def get_number_allocator() -> NumberAllocator:
+    """Get the process-wide number allocator.
+
+    Returns:
+        NumberAllocator: Shared allocator sized from Windx settings
+    """
+    global _number_allocator
+    if _number_allocator is None:
+        from app.core.config import get_settings
+
+        _number_allocator = NumberAllocator(block_size=get_settings().windx.number_block_size)
+    return _number_allocator
@@ -10,13 +10,13 @@ Features:
     - Order creation from quotes
     - Order status management
     - Order item management
-    - Order number generation
+    - Order number allocation from per-day document counters
     - Authorization checks
 """
 
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date
 
 from pydantic import PositiveInt
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -31,6 +31,7 @@ from app.models.order import Order
 from app.repositories.order import OrderRepository
 from app.repositories.quote import QuoteRepository
 from app.services.base import BaseService
+from app.services.number_allocator import get_number_allocator
 from app.services.rbac import RBACService
 
 __all__ = ["OrderService"]
@@ -62,6 +63,7 @@ class OrderService(BaseService):
         db: Database session
         order_repo: Order repository
         quote_repo: Quote repository
+        number_allocator: Allocator of order numbers
     """
 
     def __init__(self, db: AsyncSession) -> None:
@@ -74,6 +76,7 @@ class OrderService(BaseService):
         self.order_repo = OrderRepository(db)
         self.quote_repo = QuoteRepository(db)
         self.rbac_service = RBACService(db)
+        self.number_allocator = get_number_allocator()
 
     @require(Permission("order", "create"))
     async def create_order_from_quote(
@@ -246,27 +249,7 @@ class OrderService(BaseService):
         Returns:
             str: Unique order number in format O-YYYYMMDD-NNN
         """
-        # Generate base order number with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d")
-        base_number = f"O-{timestamp}"
-
-        # Find the next available sequence number
-        sequence = 1
-        while True:
-            order_number = f"{base_number}-{sequence:03d}"
-
-            # Check if this number already exists
-            existing = await self.order_repo.get_by_order_number(order_number)
-            if not existing:
-                return order_number
-
-            sequence += 1
-
-            # Safety check to prevent infinite loop
-            if sequence > 999:
-                # Fall back to timestamp with microseconds
-                timestamp_micro = datetime.now().strftime("%Y%m%d%H%M%S%f")
-                return f"O-{timestamp_micro}"
+        return (await self.number_allocator.allocate(self.db, "O"))[0]
 
     @staticmethod
     def get_user_orders_query(user, status: str | None = None):
@@ -0,0 +1,299 @@
+"""Memoized configuration prices keyed by selection fingerprint.
+
+Configurations of the same manufacturing type with identical selections
+always price the same, so pricing results are cached under a canonical
+hash of the pricing inputs combined with the database-maintained version
+of the type's attribute tree (see ``tree_versions``), which every writer
+bumps. Results live in a per-worker LRU and, when caching is enabled, in
+Redis so every worker shares them.
+
+Public Classes:
+    PriceQuoteCache: Two-tier (in-process + Redis) pricing result cache
+
+Public Functions:
+    get_price_quote_cache: Get the process-wide price quote cache
+
+Features:
+    - Canonical SHA-256 fingerprint of base price, base weight and selections
+    - Keys stamped with database tree versions, so any tree write retires entries
+    - In-process LRU tier in front of Redis (MGET / pipelined SET)
+    - In-process entries of a type dropped when its tree version changes
+    - Hit/miss counters for monitoring
+    - Redis failures bypass the cache instead of failing pricing
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+from typing import Any
+
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.services.tree_versions import get_tree_versions
+
+__all__ = ["PriceQuoteCache", "get_price_quote_cache"]
+
+logger = logging.getLogger(__name__)
+
+
+def _canonical(value: Any) -> Any:
+    """Normalize a pricing input so equal values hash identically."""
+    if isinstance(value, Decimal):
+        return format(value.normalize(), "f") if value else "0"
+    return value
+
+
+class PriceQuoteCache:
+    """Two-tier cache of configuration pricing results.
+
+    Keys combine the manufacturing type, its database tree version and the
+    selection fingerprint, so a write to the type's tree makes every older
+    entry unreachable without scanning Redis.
+
+    Attributes:
+        maxsize: Maximum number of results kept in process
+        ttl: Seconds results are kept in Redis
+        hits: Lookups served from the in-process tier
+        redis_hits: Lookups served from Redis
+        misses: Lookups that had to be priced
+        invalidations: Tree version changes that dropped in-process entries
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: int = 3600, use_redis: bool = False) -> None:
+        """Initialize price quote cache.
+
+        Args:
+            maxsize (int): Maximum number of results kept in process
+            ttl (int): Seconds results are kept in Redis
+            use_redis (bool): Share results through Redis
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, tuple[Decimal, Decimal]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(config: Configuration, selections: Iterable[ConfigurationSelection]) -> str:
+        """Build the canonical hash of everything pricing reads.
+
+        Selection order and ``Decimal`` scale do not affect the hash.
+
+        Args:
+            config (Configuration): Configuration with manufacturing type loaded
+            selections (Iterable[ConfigurationSelection]): Configuration selections
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        base_weight = config.manufacturing_type.base_weight if config.manufacturing_type else None
+        payload = [
+            _canonical(config.base_price),
+            _canonical(base_weight),
+            sorted(
+                (
+                    [
+                        selection.attribute_node_id,
+                        _canonical(selection.numeric_value),
+                        selection.string_value,
+                        _canonical(selection.calculated_price_impact),
+                        _canonical(selection.calculated_weight_impact),
+                    ]
+                    for selection in selections
+                ),
+                key=lambda item: json.dumps(item),
+            ),
+        ]
+        encoded = json.dumps(payload, separators=(",", ":")).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    @staticmethod
+    def make_key(manufacturing_type_id: int, version: int, fingerprint: str) -> str:
+        """Build the cache key for a fingerprint under a tree version.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            version (int): Tree version of the manufacturing type from get_tree_version
+            fingerprint (str): Selection fingerprint
+
+        Returns:
+            str: Cache key
+        """
+        return f"{manufacturing_type_id}:{version}:{fingerprint}"
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Decimal]]:
+        """Look up pricing results, in process first and then in Redis.
+
+        Args:
+            keys (Iterable[str]): Cache keys from make_key
+
+        Returns:
+            dict[str, dict[str, Decimal]]: total_price and total_weight for the
+                keys that were found
+        """
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, dict[str, Decimal]] = {}
+        remote: list[str] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    remote.append(key)
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                found[key] = {"total_price": entry[0], "total_weight": entry[1]}
+
+        if remote and self.use_redis:
+            try:
+                values = await self._redis().mget([self._redis_key(key) for key in remote])
+            except Exception as e:
+                logger.warning("Price cache Redis read failed, using local tier: %s", e)
+                values = [None] * len(remote)
+            for key, value in zip(remote, values, strict=True):
+                if value is None:
+                    continue
+                price, weight = json.loads(value)
+                entry = (Decimal(price), Decimal(weight))
+                self._store_local(key, entry)
+                self.redis_hits += 1
+                found[key] = {"total_price": entry[0], "total_weight": entry[1]}
+
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def set_many(self, results: Mapping[str, Mapping[str, Decimal]]) -> None:
+        """Store pricing results in both tiers.
+
+        Args:
+            results (Mapping[str, Mapping[str, Decimal]]): total_price and
+                total_weight keyed by cache key
+        """
+        if not results:
+            return
+        for key, totals in results.items():
+            self._store_local(key, (totals["total_price"], totals["total_weight"]))
+
+        if self.use_redis:
+            try:
+                async with self._redis().pipeline(transaction=False) as pipe:
+                    for key, totals in results.items():
+                        value = json.dumps(
+                            [str(totals["total_price"]), str(totals["total_weight"])]
+                        )
+                        pipe.set(self._redis_key(key), value, ex=self.ttl)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning("Price cache Redis write failed: %s", e)
+
+    def invalidate(self, manufacturing_type_id: int | None = None) -> None:
+        """Drop in-process results of a manufacturing type, or all of them.
+
+        Entries of older tree versions can no longer be reached; this only
+        frees their memory. Redis entries expire with their TTL.
+
+        Args:
+            manufacturing_type_id (int | None): Manufacturing type ID, or None for all
+        """
+        with self._lock:
+            self.invalidations += 1
+            if manufacturing_type_id is None:
+                self._entries.clear()
+                return
+            prefix = f"{manufacturing_type_id}:"
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Clear in-process results and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.redis_hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def __len__(self) -> int:
+        """Number of results kept in process."""
+        return len(self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics for monitoring.
+
+        Returns:
+            dict[str, Any]: Size, capacity, hit/miss counters and Redis usage
+        """
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "redis": self.use_redis,
+        }
+
+    def _store_local(self, key: str, entry: tuple[Decimal, Decimal]) -> None:
+        """Insert an entry into the in-process LRU."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _redis() -> Any:
+        """Get the shared Redis client."""
+        from app.core.cache import get_redis_client
+
+        return get_redis_client()
+
+    @staticmethod
+    def _prefix() -> str:
+        """Get the Redis key prefix for pricing entries."""
+        from app.core.config import get_settings
+
+        return f"{get_settings().cache.prefix}:pricing"
+
+    def _redis_key(self, key: str) -> str:
+        """Build the Redis key of a cache entry."""
+        return f"{self._prefix()}:quote:{key}"
+
+
+_price_quote_cache: PriceQuoteCache | None = None
+
+
+def get_price_quote_cache() -> PriceQuoteCache:
+    """Get the process-wide price quote cache.
+
+    In-process results are dropped when their tree version changes.
+
+    Returns:
+        PriceQuoteCache: Shared cache sized from Windx and cache settings
+    """
+    global _price_quote_cache
+    if _price_quote_cache is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+        _price_quote_cache = PriceQuoteCache(
+            maxsize=settings.windx.price_cache_size,
+            ttl=settings.windx.price_cache_ttl,
+            use_redis=settings.cache.enabled,
+        )
+        get_tree_versions().subscribe(_price_quote_cache.invalidate)
+    return _price_quote_cache
@@ -8,39 +8,51 @@ Public Classes:
 
 Features:
     - Configuration price calculation
+    - Batched pricing of many configurations in a fixed number of queries
+    - Memoized results keyed by selection fingerprint (see price_cache)
+    - Single-pass evaluation in pricing plan order (see pricing_plan)
     - Individual selection impact calculation
-    - Safe formula evaluation
-    - Fixed, percentage, and formula-based pricing
+    - Incremental (delta) totals for single-selection edits
+    - Safe formula evaluation with compiled, cached formulas
+    - Fixed, percentage (of the running subtotal), and formula-based pricing
 """
 
-import ast
-import operator
 import re
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import InvalidFormulaException, ValidationException
+from app.core.config import get_settings
+from app.core.exceptions import (
+    InvalidFormulaException,
+    NotFoundException,
+)
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
 from app.models.configuration_selection import ConfigurationSelection
 from app.repositories.attribute_node import AttributeNodeRepository
 from app.repositories.configuration import ConfigurationRepository
 from app.repositories.configuration_selection import ConfigurationSelectionRepository
 from app.services.base import BaseService
+from app.services.formula_analysis import analyze_formula
+from app.services.formula_engine import get_formula_cache
+from app.services.price_cache import get_price_quote_cache
+from app.services.pricing_plan import (
+    STAGE_RUNNING_PRICE,
+    PricingPlan,
+    PricingStep,
+    build_pricing_plan,
+    get_pricing_plan_cache,
+    pricing_stage,
+)
+from app.services.tree_versions import get_tree_version, has_pending_changes
 
 __all__ = ["PricingService"]
 
-
-# Safe operators for formula evaluation
-SAFE_OPERATORS = {
-    ast.Add: operator.add,
-    ast.Sub: operator.sub,
-    ast.Mult: operator.mul,
-    ast.Div: operator.truediv,
-    ast.Pow: operator.pow,
-    ast.USub: operator.neg,
-    ast.UAdd: operator.pos,
-}
+# Formula variables taken from previously stored impacts rather than the
+# selection's own value; rules using them cannot be updated by delta
+CONTEXT_DEPENDENT_VARIABLES = frozenset({"price_impact", "weight_impact"})
 
 
 class PricingService(BaseService):
@@ -71,7 +83,8 @@ class PricingService(BaseService):
         """Calculate total price and weight for a configuration.
 
         Calculates the total price and weight by summing the base price/weight
-        from the manufacturing type and all selection impacts.
+        from the manufacturing type and all selection impacts. All attribute
+        nodes referenced by the selections are loaded in a single query.
 
         Args:
             config_id (int): Configuration ID
@@ -82,31 +95,222 @@ class PricingService(BaseService):
         Raises:
             NotFoundException: If configuration not found
         """
-        from app.core.exceptions import NotFoundException
-
-        # Get configuration with manufacturing type
-        config = await self.config_repo.get(config_id)
-        if not config:
+        prices = await self.calculate_prices_for_configurations([config_id])
+        if config_id not in prices:
             raise NotFoundException(
                 resource="Configuration",
                 details={"config_id": config_id},
             )
+        return prices[config_id]
+
+    async def calculate_prices_for_configurations(
+        self, config_ids: list[int]
+    ) -> dict[int, dict[str, Decimal]]:
+        """Calculate total price and weight for many configurations at once.
 
-        # Start with base price and weight from manufacturing type
-        total_price = config.base_price
-        total_weight = Decimal("0")
+        Loads configurations and their selections with a fixed number of
+        queries (independent of the number of configurations or selections),
+        then prices everything in memory using the cached pricing plan of each
+        manufacturing type. Results are memoized by selection fingerprint and
+        tree version, so configurations whose price is cached skip pricing.
 
-        # Get manufacturing type to get base weight
-        if config.manufacturing_type:
-            total_weight = config.manufacturing_type.base_weight
+        Args:
+            config_ids (list[int]): Configuration IDs
+
+        Returns:
+            dict[int, dict[str, Decimal]]: total_price and total_weight keyed by
+                configuration ID; IDs that do not exist are omitted
+
+        Raises:
+            InvalidFormulaException: If any selection fails to price
+        """
+        config_ids = list(dict.fromkeys(config_ids))
+        configs = await self.config_repo.get_many_with_manufacturing_type(config_ids)
+        if not configs:
+            return {}
+
+        selections_by_config = await self.selection_repo.get_by_configurations(
+            [config.id for config in configs]
+        )
+        cache = get_price_quote_cache()
+        versions = await self.get_tree_versions(
+            {config.manufacturing_type_id for config in configs}
+        )
+
+        # Identical selection sets under the same tree version price the same
+        cache_keys: dict[int, str] = {}
+        prices: dict[int, dict[str, Decimal]] = {}
+        if versions is not None and get_settings().windx.price_cache_enabled:
+            cache_keys = {
+                config.id: cache.make_key(
+                    config.manufacturing_type_id,
+                    versions[config.manufacturing_type_id],
+                    cache.fingerprint(config, selections_by_config[config.id]),
+                )
+                for config in configs
+            }
+            cached = await cache.get_many(cache_keys.values())
+            prices = {
+                config_id: dict(cached[key])
+                for config_id, key in cache_keys.items()
+                if key in cached
+            }
+
+        misses = [config for config in configs if config.id not in prices]
+        if misses:
+            plans = await self.get_pricing_plans(
+                {config.manufacturing_type_id for config in misses}, versions
+            )
+            plans = await self._extend_plans(plans, misses, selections_by_config)
+            priced = {
+                config.id: self.price_configuration(
+                    config.id,
+                    config.base_price,
+                    config.manufacturing_type.base_weight
+                    if config.manufacturing_type
+                    else Decimal("0"),
+                    selections_by_config[config.id],
+                    plans[config.manufacturing_type_id],
+                )
+                for config in misses
+            }
+            # Pricing may have flushed pending changes of the session
+            if cache_keys and not has_pending_changes(self.db):
+                await cache.set_many(
+                    {cache_keys[config_id]: totals for config_id, totals in priced.items()}
+                )
+            prices.update(priced)
+
+        return {config.id: prices[config.id] for config in configs}
+
+    async def get_tree_versions(self, manufacturing_type_ids: set[int]) -> dict[int, int] | None:
+        """Get the database tree versions that cached plans and prices are keyed by.
+
+        Args:
+            manufacturing_type_ids (set[int]): Manufacturing type IDs
+
+        Returns:
+            dict[int, int] | None: Tree version keyed by manufacturing type ID,
+                or None if the session holds uncommitted tree changes and must
+                neither read nor store shared entries
+        """
+        if has_pending_changes(self.db):
+            return None
+        return {
+            type_id: await get_tree_version(self.db, type_id)
+            for type_id in sorted(manufacturing_type_ids)
+        }
+
+    async def get_pricing_plans(
+        self,
+        manufacturing_type_ids: set[int],
+        versions: dict[int, int] | None = None,
+    ) -> dict[int, PricingPlan]:
+        """Get the pricing plans of manufacturing types.
+
+        Plans are served from the plan cache for the current tree version
+        and built from the type's pricing rules on a miss.
+
+        Args:
+            manufacturing_type_ids (set[int]): Manufacturing type IDs
+            versions (dict[int, int] | None): Tree versions from
+                get_tree_versions; read here when omitted
+
+        Returns:
+            dict[int, PricingPlan]: Plans keyed by manufacturing type ID
+        """
+        if versions is None:
+            # Read the versions first: a plan is never older than its stamp
+            versions = await self.get_tree_versions(manufacturing_type_ids)
+        plan_cache = get_pricing_plan_cache()
+        plans: dict[int, PricingPlan] = {}
+        for type_id in manufacturing_type_ids:
+            plan = plan_cache.get(type_id, versions[type_id]) if versions is not None else None
+            if plan is None:
+                rules = await self.attr_node_repo.get_pricing_rules(type_id)
+                plan = build_pricing_plan(type_id, rules)
+                # Loading may have flushed pending changes of the session
+                if versions is not None and not has_pending_changes(self.db):
+                    plan_cache.put(type_id, versions[type_id], plan)
+            plans[type_id] = plan
+        return plans
+
+    async def _extend_plans(
+        self,
+        plans: dict[int, PricingPlan],
+        configs: list[Configuration],
+        selections_by_config: dict[int, list[ConfigurationSelection]],
+    ) -> dict[int, PricingPlan]:
+        """Add nodes selected outside their configuration's type to its plan.
+
+        Args:
+            plans (dict[int, PricingPlan]): Plans keyed by manufacturing type ID
+            configs (list[Configuration]): Configurations being priced
+            selections_by_config (dict[int, list[ConfigurationSelection]]): Selections
+                keyed by configuration ID
+
+        Returns:
+            dict[int, PricingPlan]: Plans covering every available selected node
+        """
+        foreign: dict[int, set[int]] = {}
+        for config in configs:
+            plan = plans[config.manufacturing_type_id]
+            for selection in selections_by_config[config.id]:
+                if selection.attribute_node_id not in plan:
+                    foreign.setdefault(config.manufacturing_type_id, set()).add(
+                        selection.attribute_node_id
+                    )
+        if not foreign:
+            return plans
+
+        attr_nodes = await self.attr_node_repo.get_by_ids(set().union(*foreign.values()))
+        return {
+            type_id: plan.with_rules(
+                attr_nodes[node_id] for node_id in foreign.get(type_id, ()) if node_id in attr_nodes
+            )
+            for type_id, plan in plans.items()
+        }
+
+    def price_configuration(
+        self,
+        config_id: int,
+        base_price: Decimal,
+        base_weight: Decimal,
+        selections: list[ConfigurationSelection],
+        plan: PricingPlan,
+    ) -> dict[str, Decimal]:
+        """Price a loaded configuration in memory in a single pass.
 
-        # Get all selections for this configuration
-        selections = await self.selection_repo.get_by_configuration(config_id)
+        Selections are applied in plan order, so percentage rules and
+        formulas reading ``subtotal`` see the running price of every rule
+        evaluated before them.
 
-        # Calculate impacts for each selection
-        for selection in selections:
+        Args:
+            config_id (int): Configuration ID
+            base_price (Decimal): Configuration base price
+            base_weight (Decimal): Manufacturing type base weight
+            selections (list[ConfigurationSelection]): Configuration selections
+            plan (PricingPlan): Pricing plan covering the selected nodes
+
+        Returns:
+            dict[str, Decimal]: Dictionary with total_price and total_weight
+
+        Raises:
+            InvalidFormulaException: If a selection fails to price
+        """
+        total_price = base_price
+        total_weight = base_weight
+
+        # Calculate impacts in plan order with the running subtotal
+        for selection in plan.order(selections):
             try:
-                impact = await self.calculate_selection_impact(selection)
+                step = plan.steps.get(selection.attribute_node_id)
+                if not step:
+                    raise NotFoundException(
+                        resource="AttributeNode",
+                        details={"attribute_node_id": selection.attribute_node_id},
+                    )
+                impact = self._calculate_impact(step, selection, subtotal=total_price)
                 total_price += impact["price_impact"]
                 total_weight += impact["weight_impact"]
             except InvalidFormulaException as e:
@@ -138,15 +342,24 @@ class PricingService(BaseService):
         }
 
     async def calculate_selection_impact(
-        self, selection: ConfigurationSelection
+        self,
+        selection: ConfigurationSelection,
+        attr_node: AttributeNode | None = None,
+        subtotal: Decimal | None = None,
     ) -> dict[str, Decimal]:
         """Calculate price and weight impact for a single selection.
 
         Evaluates the attribute node's pricing rules (fixed, percentage, or formula)
         to determine the impact of this selection on the configuration's total.
+        Running-price rules (percentage, formulas reading ``subtotal``) have no
+        price impact without a subtotal; their impact is only known when the
+        whole configuration is priced.
 
         Args:
             selection (ConfigurationSelection): Configuration selection
+            attr_node (AttributeNode | None): Already-loaded attribute node for the
+                selection; fetched from the database when omitted
+            subtotal (Decimal | None): Running configuration price before this rule
 
         Returns:
             dict[str, Decimal]: Dictionary with price_impact and weight_impact
@@ -154,18 +367,40 @@ class PricingService(BaseService):
         Raises:
             NotFoundException: If attribute node not found
         """
-        from app.core.exceptions import NotFoundException
-
-        # Get attribute node
-        attr_node = await self.attr_node_repo.get(selection.attribute_node_id)
+        if attr_node is None:
+            attr_node = await self.attr_node_repo.get(selection.attribute_node_id)
         if not attr_node:
             raise NotFoundException(
                 resource="AttributeNode",
                 details={"attribute_node_id": selection.attribute_node_id},
             )
 
+        return self._calculate_impact(attr_node, selection, subtotal)
+
+    def _calculate_impact(
+        self,
+        attr_node: AttributeNode | PricingStep,
+        selection: ConfigurationSelection,
+        subtotal: Decimal | None = None,
+    ) -> dict[str, Decimal]:
+        """Calculate price and weight impact of a selection for a loaded node.
+
+        Args:
+            attr_node (AttributeNode | PricingStep): Pricing rule of the selection
+            selection (ConfigurationSelection): Configuration selection
+            subtotal (Decimal | None): Running configuration price before this
+                rule; running-price rules have no price impact without it
+
+        Returns:
+            dict[str, Decimal]: Dictionary with price_impact and weight_impact
+
+        Raises:
+            InvalidFormulaException: If a price or weight formula fails
+        """
         price_impact = Decimal("0")
         weight_impact = Decimal("0")
+        if subtotal is None and pricing_stage(attr_node) == STAGE_RUNNING_PRICE:
+            return {"price_impact": price_impact, "weight_impact": weight_impact}
 
         # Calculate price impact based on type
         if attr_node.price_impact_type == "fixed":
@@ -174,21 +409,20 @@ class PricingService(BaseService):
                 price_impact = attr_node.price_impact_value
 
         elif attr_node.price_impact_type == "percentage":
-            # Percentage of current price (requires context)
-            # For now, we'll just use the value as a multiplier
+            # Percentage of the running price of all rules applied before it,
+            # rounded to currency precision like the totals it adds up to
             if attr_node.price_impact_value:
-                # This would need the current configuration price as context
-                # For simplicity, we'll treat it as a fixed value for now
-                price_impact = attr_node.price_impact_value
+                price_impact = (subtotal * attr_node.price_impact_value / 100).quantize(
+                    Decimal(1).scaleb(-get_settings().windx.price_calculation_precision),
+                    ROUND_HALF_UP,
+                )
 
         elif attr_node.price_impact_type == "formula":
             # Formula-based calculation
             if attr_node.price_formula:
                 try:
-                    context = self._build_formula_context(selection)
-                    price_impact = await self.evaluate_price_formula(
-                        attr_node.price_formula, context
-                    )
+                    context = self.build_formula_context(selection, subtotal)
+                    price_impact = self.evaluate_formula(attr_node.price_formula, context)
                 except InvalidFormulaException as e:
                     # Re-raise with additional context
                     raise InvalidFormulaException(
@@ -206,8 +440,8 @@ class PricingService(BaseService):
         if attr_node.weight_formula:
             # Formula-based weight calculation
             try:
-                context = self._build_formula_context(selection)
-                weight_impact = await self.evaluate_price_formula(attr_node.weight_formula, context)
+                context = self.build_formula_context(selection, subtotal)
+                weight_impact = self.evaluate_formula(attr_node.weight_formula, context)
             except InvalidFormulaException as e:
                 # Re-raise with additional context
                 raise InvalidFormulaException(
@@ -229,11 +463,120 @@ class PricingService(BaseService):
             "weight_impact": weight_impact,
         }
 
+    def requires_full_recalculation(self, attr_node: AttributeNode | None) -> bool:
+        """Check whether a change to a selection of this node needs a full recompute.
+
+        Running-price rules (percentage, formulas reading ``subtotal``) depend
+        on the rest of the configuration and formulas reading stored impacts
+        depend on earlier calculations, so their impact cannot be applied as
+        an isolated delta.
+
+        Args:
+            attr_node (AttributeNode | None): Attribute node of the changed selection
+
+        Returns:
+            bool: True if totals must be recalculated from all selections
+        """
+        if attr_node is None or pricing_stage(attr_node) == STAGE_RUNNING_PRICE:
+            return True
+
+        formulas = [attr_node.weight_formula]
+        if attr_node.price_impact_type == "formula":
+            formulas.append(attr_node.price_formula)
+
+        for formula in formulas:
+            if not formula or not formula.strip():
+                continue
+            try:
+                variables = get_formula_cache().get(formula).variables
+            except Exception:
+                # Let the full recalculation report the invalid formula
+                return True
+            if variables & CONTEXT_DEPENDENT_VARIABLES:
+                return True
+        return False
+
+    async def apply_selection_change(
+        self,
+        config_id: int,
+        attr_node: AttributeNode | None,
+        old_impacts: dict[str, Decimal | None] | None,
+        new_impacts: dict[str, Decimal] | None,
+    ) -> dict[str, Decimal]:
+        """Update a configuration's stored totals after one selection changed.
+
+        Applies ``new - old`` impact as an atomic delta to ``total_price`` and
+        ``calculated_weight`` (O(1) regardless of the number of selections).
+        Falls back to a full recalculation when incremental pricing is
+        disabled, the node's rule is running-price or context-dependent, the
+        configuration contains running-price selections, or the old impact
+        was never stored. Does not commit.
+
+        Args:
+            config_id (int): Configuration ID
+            attr_node (AttributeNode | None): Attribute node of the changed selection
+            old_impacts (dict[str, Decimal | None] | None): Stored price_impact and
+                weight_impact before the change; None if the selection was added
+            new_impacts (dict[str, Decimal] | None): price_impact and weight_impact
+                after the change; None if the selection was removed
+
+        Returns:
+            dict[str, Decimal]: Dictionary with total_price and total_weight
+
+        Raises:
+            NotFoundException: If configuration not found
+            InvalidFormulaException: If the full recalculation fails
+        """
+        zero = {"price_impact": Decimal("0"), "weight_impact": Decimal("0")}
+        old_impacts = old_impacts or zero
+        new_impacts = new_impacts or zero
+
+        if (
+            get_settings().windx.incremental_pricing
+            and None not in old_impacts.values()
+            and not self.requires_full_recalculation(attr_node)
+            and not await self.selection_repo.has_running_price_rules(config_id)
+        ):
+            totals = await self.config_repo.apply_price_delta(
+                config_id,
+                self._round_impact(new_impacts["price_impact"])
+                - self._round_impact(old_impacts["price_impact"]),
+                self._round_impact(new_impacts["weight_impact"])
+                - self._round_impact(old_impacts["weight_impact"]),
+            )
+            if totals is None:
+                raise NotFoundException(
+                    resource="Configuration",
+                    details={"config_id": config_id},
+                )
+            return {"total_price": totals[0], "total_weight": totals[1]}
+
+        # Full recalculation must see the pending selection change
+        await self.db.flush()
+        totals = await self.calculate_configuration_price(config_id)
+        await self.config_repo.bulk_update_prices(
+            [(config_id, totals["total_price"], totals["total_weight"])]
+        )
+        return totals
+
+    @staticmethod
+    def _round_impact(impact: Decimal) -> Decimal:
+        """Round an impact the way its Numeric(10, 2) column stores it.
+
+        Args:
+            impact (Decimal): Calculated impact
+
+        Returns:
+            Decimal: Impact rounded to cents
+        """
+        return Decimal(impact).quantize(Decimal("0.01"), ROUND_HALF_UP)
+
     async def evaluate_price_formula(self, formula: str, context: dict[str, Any]) -> Decimal:
         """Evaluate a price formula with safe execution.
 
         Safely evaluates mathematical formulas using a restricted set of
-        operators and variables from the context.
+        operators and variables from the context. Formulas are parsed,
+        validated and compiled once, then served from the formula cache.
 
         Args:
             formula (str): Formula string (e.g., "width * height * 0.05")
@@ -242,6 +585,22 @@ class PricingService(BaseService):
         Returns:
             Decimal: Calculated result
 
+        Raises:
+            InvalidFormulaException: If formula is invalid, unsafe, or evaluation fails
+        """
+        return self.evaluate_formula(formula, context)
+
+    @staticmethod
+    def evaluate_formula(formula: str, context: dict[str, Any]) -> Decimal:
+        """Evaluate a formula synchronously (see evaluate_price_formula).
+
+        Args:
+            formula (str): Formula string
+            context (dict[str, Any]): Variable context for formula evaluation
+
+        Returns:
+            Decimal: Calculated result
+
         Raises:
             InvalidFormulaException: If formula is invalid, unsafe, or evaluation fails
         """
@@ -251,19 +610,16 @@ class PricingService(BaseService):
             if not formula:
                 return Decimal("0")
 
-            # Parse the formula into an AST
+            # Compile (or fetch the compiled formula) and evaluate it
             try:
-                tree = ast.parse(formula, mode="eval")
+                compiled = get_formula_cache().get(formula)
+                result = compiled.evaluate(context)
             except SyntaxError as e:
                 raise InvalidFormulaException(
                     message=f"Formula syntax error: {str(e)}",
                     formula=formula,
                     details={"error": str(e), "error_type": "syntax_error"},
                 )
-
-            # Evaluate the AST safely
-            try:
-                result = self._eval_node(tree.body, context)
             except ZeroDivisionError:
                 raise InvalidFormulaException(
                     message="Division by zero in formula",
@@ -324,83 +680,10 @@ class PricingService(BaseService):
                 },
             )
 
-    def _eval_node(self, node: ast.AST, context: dict[str, Any]) -> float:
-        """Recursively evaluate an AST node.
-
-        Args:
-            node (ast.AST): AST node to evaluate
-            context (dict[str, Any]): Variable context
-
-        Returns:
-            float: Evaluated result
-
-        Raises:
-            InvalidFormulaException: If node type is not allowed
-            ZeroDivisionError: If division by zero occurs
-            KeyError: If variable not found in context
-        """
-        if isinstance(node, ast.Constant):
-            # Numeric constant
-            value = float(node.value)
-            if not (-1e10 < value < 1e10):
-                raise ValueError(f"Constant value out of range: {value}")
-            return value
-
-        elif isinstance(node, ast.Name):
-            # Variable lookup
-            if node.id not in context:
-                raise KeyError(node.id)
-            value = float(context[node.id])
-            if not (-1e10 < value < 1e10):
-                raise ValueError(f"Variable value out of range: {node.id}={value}")
-            return value
-
-        elif isinstance(node, ast.BinOp):
-            # Binary operation (e.g., a + b, a * b)
-            if type(node.op) not in SAFE_OPERATORS:
-                raise InvalidFormulaException(
-                    message=f"Unsafe operator: {type(node.op).__name__}",
-                    details={"operator": type(node.op).__name__},
-                )
-            left = self._eval_node(node.left, context)
-            right = self._eval_node(node.right, context)
-
-            # Special handling for division to provide better error messages
-            if isinstance(node.op, ast.Div):
-                if right == 0:
-                    raise ZeroDivisionError("Division by zero")
-
-            result = SAFE_OPERATORS[type(node.op)](left, right)
-
-            # Check for overflow or invalid results
-            if not isinstance(result, (int, float)) or not (-1e10 < result < 1e10):
-                raise ValueError(f"Operation result out of range: {result}")
-
-            return result
-
-        elif isinstance(node, ast.UnaryOp):
-            # Unary operation (e.g., -a, +a)
-            if type(node.op) not in SAFE_OPERATORS:
-                raise InvalidFormulaException(
-                    message=f"Unsafe operator: {type(node.op).__name__}",
-                    details={"operator": type(node.op).__name__},
-                )
-            operand = self._eval_node(node.operand, context)
-            result = SAFE_OPERATORS[type(node.op)](operand)
-
-            if not isinstance(result, (int, float)) or not (-1e10 < result < 1e10):
-                raise ValueError(f"Operation result out of range: {result}")
-
-            return result
-
-        else:
-            raise InvalidFormulaException(
-                message=f"Unsafe node type: {type(node).__name__}",
-                details={"node_type": type(node).__name__},
-            )
-
     @staticmethod
-    def _build_formula_context(selection: ConfigurationSelection) -> dict[str, Any]:
+    def build_formula_context(
+        selection: ConfigurationSelection, subtotal: Decimal | None = None
+    ) -> dict[str, Any]:
         """Build context dictionary for formula evaluation.
 
         Extracts relevant values from the selection to use as variables
@@ -408,6 +691,8 @@ class PricingService(BaseService):
 
         Args:
             selection (ConfigurationSelection): Configuration selection
+            subtotal (Decimal | None): Running configuration price, exposed
+                as ``subtotal`` when known
 
         Returns:
             dict[str, Any]: Context dictionary with available variables
@@ -437,6 +722,10 @@ class PricingService(BaseService):
         if selection.calculated_weight_impact:
             context["weight_impact"] = float(selection.calculated_weight_impact)
 
+        # Running price of the rules applied before this one
+        if subtotal is not None:
+            context["subtotal"] = float(subtotal)
+
         # Add default values for common variables
         context.setdefault("value", 1.0)
         context.setdefault("width", 1.0)
@@ -447,7 +736,10 @@ class PricingService(BaseService):
         return context
 
     def validate_formula(self, formula: str) -> bool:
-        """Validate formula syntax without evaluating.
+        """Validate a formula without evaluating it.
+
+        Runs the write-time formula analysis: syntax, safe operators,
+        constant sub-expressions and variables the formula context can bind.
 
         Args:
             formula (str): Formula string to validate
@@ -455,56 +747,10 @@ class PricingService(BaseService):
         Returns:
             bool: True if formula is valid, False otherwise
         """
-        try:
-            formula = formula.strip()
-            if not formula:
-                return True
-
-            # Try to parse the formula
-            tree = ast.parse(formula, mode="eval")
-
-            # Check if all nodes are safe
-            self._validate_ast_node(tree.body)
-
+        if not formula.strip():
             return True
-
-        except (SyntaxError, ValidationException):
+        try:
+            analyze_formula(formula)
+        except InvalidFormulaException:
             return False
-
-    def _validate_ast_node(self, node: ast.AST) -> None:
-        """Recursively validate an AST node.
-
-        Args:
-            node (ast.AST): AST node to validate
-
-        Raises:
-            ValidationException: If node type is not allowed
-        """
-        if isinstance(node, (ast.Constant, ast.Name)):
-            # Safe leaf nodes
-            pass
-
-        elif isinstance(node, ast.BinOp):
-            # Binary operation
-            if type(node.op) not in SAFE_OPERATORS:
-                raise ValidationException(
-                    message=f"Unsafe operator: {type(node.op).__name__}",
-                    details={"operator": type(node.op).__name__},
-                )
-            self._validate_ast_node(node.left)
-            self._validate_ast_node(node.right)
-
-        elif isinstance(node, ast.UnaryOp):
-            # Unary operation
-            if type(node.op) not in SAFE_OPERATORS:
-                raise ValidationException(
-                    message=f"Unsafe operator: {type(node.op).__name__}",
-                    details={"operator": type(node.op).__name__},
-                )
-            self._validate_ast_node(node.operand)
-
-        else:
-            raise ValidationException(
-                message=f"Unsafe node type: {type(node).__name__}",
-                details={"node_type": type(node).__name__},
-            )
+        return True
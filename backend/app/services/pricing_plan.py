@@ -0,0 +1,379 @@
+"""Pricing evaluation plans for manufacturing types.
+
+A pricing plan fixes the order in which the pricing rules of a
+manufacturing type's attribute tree are applied, so a configuration can be
+priced in a single pass with a correct running subtotal. Plans are built
+once per database tree version (see ``tree_versions``) and kept in a
+bounded LRU cache.
+
+Evaluation order:
+    1. Fixed rules (order independent)
+    2. Formula rules that only read the selection's own values
+    3. Running-price rules: percentage rules and formulas reading ``subtotal``
+
+Within a stage rules are ordered by ``ltree_path`` (ancestors before their
+descendants), then by node ID. Every dependency edge (stage boundaries and
+ltree ancestry) points from a smaller sort key to a larger one, so the
+sorted order is a topological order of the rule dependency graph.
+
+Public Classes:
+    PricingStep: Immutable pricing rule of one attribute node
+    PricingPlan: Ranked pricing rules of a manufacturing type
+    PricingPlanCache: Bounded LRU cache of plans keyed by tree version
+
+Public Functions:
+    pricing_stage: Determine the evaluation stage of a pricing rule
+    build_pricing_plan: Build the evaluation plan from pricing rules
+    get_pricing_plan_cache: Get the process-wide plan cache
+
+Features:
+    - Percentage rules applied to the running subtotal in plan order
+    - Formula variable analysis through the compiled formula cache
+    - Stored formulas compiled once per worker and tree version, at plan build
+    - Immutable plans, safe to share between requests
+    - Plans cached per (manufacturing type, tree version)
+    - Plans of a type dropped when its tree version changes
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from app.services.formula_engine import get_formula_cache
+from app.services.tree_versions import get_tree_versions
+
+__all__ = [
+    "STAGE_FIXED",
+    "STAGE_FORMULA",
+    "STAGE_RUNNING_PRICE",
+    "RUNNING_PRICE_VARIABLES",
+    "PricingStep",
+    "PricingPlan",
+    "PricingPlanCache",
+    "pricing_stage",
+    "build_pricing_plan",
+    "get_pricing_plan_cache",
+]
+
+# Evaluation stages, applied in ascending order
+STAGE_FIXED = 0
+STAGE_FORMULA = 1
+STAGE_RUNNING_PRICE = 2
+
+# Formula variables bound to the running configuration price
+RUNNING_PRICE_VARIABLES = frozenset({"subtotal"})
+
+
+def _reads_running_price(formula: str | None) -> bool:
+    """Check whether a formula references the running subtotal."""
+    if not formula or not formula.strip():
+        return False
+    try:
+        return bool(get_formula_cache().get(formula).variables & RUNNING_PRICE_VARIABLES)
+    except Exception:
+        # Invalid formulas keep their stage and fail when evaluated
+        return False
+
+
+def pricing_stage(rule: Any) -> int:
+    """Determine the evaluation stage of a pricing rule.
+
+    Args:
+        rule (Any): Attribute node, pricing rule row or PricingStep
+
+    Returns:
+        int: STAGE_FIXED, STAGE_FORMULA or STAGE_RUNNING_PRICE
+    """
+    if rule.price_impact_type == "percentage":
+        return STAGE_RUNNING_PRICE
+    if _reads_running_price(rule.weight_formula):
+        return STAGE_RUNNING_PRICE
+    if rule.price_impact_type == "formula" and rule.price_formula:
+        if _reads_running_price(rule.price_formula):
+            return STAGE_RUNNING_PRICE
+        return STAGE_FORMULA
+    return STAGE_FIXED
+
+
+@dataclass(frozen=True, slots=True)
+class PricingStep:
+    """Immutable pricing rule of one attribute node.
+
+    Exposes the same pricing attributes as ``AttributeNode`` so it can be
+    passed wherever a node's pricing rule is read.
+
+    Attributes:
+        id: Attribute node ID
+        name: Attribute node name
+        ltree_path: Hierarchical path of the node
+        stage: Evaluation stage
+        price_impact_type: fixed, percentage or formula
+        price_impact_value: Fixed amount or percentage
+        price_formula: Price formula
+        weight_impact: Fixed weight
+        weight_formula: Weight formula
+    """
+
+    id: int
+    name: str
+    ltree_path: str
+    stage: int
+    price_impact_type: str
+    price_impact_value: Decimal | None
+    price_formula: str | None
+    weight_impact: Decimal | None
+    weight_formula: str | None
+
+    @classmethod
+    def from_rule(cls, rule: Any) -> PricingStep:
+        """Create a step from an attribute node or pricing rule row.
+
+        Args:
+            rule (Any): Object with AttributeNode pricing attributes
+
+        Returns:
+            PricingStep: Immutable step
+        """
+        return cls(
+            id=rule.id,
+            name=rule.name,
+            ltree_path=str(rule.ltree_path or ""),
+            stage=pricing_stage(rule),
+            price_impact_type=rule.price_impact_type,
+            price_impact_value=rule.price_impact_value,
+            price_formula=rule.price_formula,
+            weight_impact=rule.weight_impact,
+            weight_formula=rule.weight_formula,
+        )
+
+    @property
+    def sort_key(self) -> tuple[int, str, int]:
+        """Position of the step in the evaluation order."""
+        return (self.stage, self.ltree_path, self.id)
+
+
+class PricingPlan:
+    """Ranked pricing rules of a manufacturing type.
+
+    Attributes:
+        manufacturing_type_id: Manufacturing type the plan was built for
+        steps: Pricing steps keyed by attribute node ID
+        ranks: Evaluation rank keyed by attribute node ID
+        has_running_price_rules: Whether any rule reads the running subtotal
+    """
+
+    __slots__ = ("manufacturing_type_id", "steps", "ranks", "has_running_price_rules")
+
+    def __init__(self, manufacturing_type_id: int | None, steps: Iterable[PricingStep]) -> None:
+        """Initialize pricing plan.
+
+        Args:
+            manufacturing_type_id (int | None): Manufacturing type ID
+            steps (Iterable[PricingStep]): Pricing steps in any order
+        """
+        ordered = sorted(steps, key=lambda step: step.sort_key)
+        self.manufacturing_type_id = manufacturing_type_id
+        self.steps = {step.id: step for step in ordered}
+        self.ranks = {step.id: rank for rank, step in enumerate(ordered)}
+        self.has_running_price_rules = any(step.stage == STAGE_RUNNING_PRICE for step in ordered)
+
+    def order(self, selections: Iterable[Any]) -> list[Any]:
+        """Sort selections into evaluation order.
+
+        Selections of nodes outside the plan come last.
+
+        Args:
+            selections (Iterable[Any]): Objects with attribute_node_id and id
+
+        Returns:
+            list[Any]: Selections in evaluation order
+        """
+        unknown = len(self.ranks)
+        return sorted(
+            selections,
+            key=lambda selection: (
+                self.ranks.get(selection.attribute_node_id, unknown),
+                selection.id or 0,
+            ),
+        )
+
+    def with_rules(self, rules: Iterable[Any]) -> PricingPlan:
+        """Create a plan that also covers rules outside the manufacturing type.
+
+        Args:
+            rules (Iterable[Any]): Extra attribute nodes or pricing rule rows
+
+        Returns:
+            PricingPlan: New plan; this plan is left unchanged
+        """
+        extra = [PricingStep.from_rule(rule) for rule in rules if rule.id not in self.steps]
+        if not extra:
+            return self
+        return PricingPlan(self.manufacturing_type_id, [*self.steps.values(), *extra])
+
+    def __len__(self) -> int:
+        """Number of steps in the plan."""
+        return len(self.steps)
+
+    def __contains__(self, node_id: object) -> bool:
+        """Check whether an attribute node is part of the plan."""
+        return node_id in self.steps
+
+
+def _compile_formulas(steps: Iterable[PricingStep]) -> None:
+    """Compile the formulas pricing will evaluate into this worker's formula cache."""
+    cache = get_formula_cache()
+    for step in steps:
+        formulas = (
+            step.price_formula if step.price_impact_type == "formula" else None,
+            step.weight_formula,
+        )
+        for formula in formulas:
+            if formula and formula.strip():
+                try:
+                    cache.get(formula)
+                except Exception:
+                    # Invalid stored formulas fail when evaluated
+                    continue
+
+
+def build_pricing_plan(manufacturing_type_id: int | None, rules: Iterable[Any]) -> PricingPlan:
+    """Build the evaluation plan from a manufacturing type's pricing rules.
+
+    The normalized formulas stored with the rules are compiled while the
+    plan is built, so each worker parses them once per tree version
+    instead of on the first configuration that selects them.
+
+    Args:
+        manufacturing_type_id (int | None): Manufacturing type ID
+        rules (Iterable[Any]): Attribute nodes or pricing rule rows
+
+    Returns:
+        PricingPlan: Plan covering every given rule
+    """
+    steps = [PricingStep.from_rule(rule) for rule in rules]
+    _compile_formulas(steps)
+    return PricingPlan(manufacturing_type_id, steps)
+
+
+class PricingPlanCache:
+    """Bounded LRU cache of pricing plans keyed by tree version.
+
+    Attributes:
+        maxsize: Maximum number of plans kept
+        hits: Number of cache hits
+        misses: Number of cache misses (plan builds)
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        """Initialize plan cache.
+
+        Args:
+            maxsize (int): Maximum number of plans kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[int, int], PricingPlan] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, manufacturing_type_id: int, version: int) -> PricingPlan | None:
+        """Get the plan of a manufacturing type at a tree version.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            version (int): Tree version from get_tree_version
+
+        Returns:
+            PricingPlan | None: Cached plan, or None on a miss
+        """
+        key = (manufacturing_type_id, version)
+        with self._lock:
+            plan = self._entries.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, manufacturing_type_id: int, version: int, plan: PricingPlan) -> None:
+        """Store the plan of a manufacturing type at a tree version.
+
+        Plans of older versions of the same type are dropped.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            version (int): Tree version
+            plan (PricingPlan): Plan to store
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == manufacturing_type_id]:
+                if key[1] < version:
+                    del self._entries[key]
+            self._entries[(manufacturing_type_id, version)] = plan
+            self._entries.move_to_end((manufacturing_type_id, version))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, manufacturing_type_id: int | None = None) -> None:
+        """Drop the plans of a manufacturing type, or all of them.
+
+        Args:
+            manufacturing_type_id (int | None): Manufacturing type ID, or None for all
+        """
+        with self._lock:
+            if manufacturing_type_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == manufacturing_type_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Clear all plans and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Number of cached plans."""
+        return len(self._entries)
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache statistics for monitoring.
+
+        Returns:
+            dict[str, int]: Size, capacity, hits and misses
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_pricing_plan_cache: PricingPlanCache | None = None
+
+
+def get_pricing_plan_cache() -> PricingPlanCache:
+    """Get the process-wide pricing plan cache.
+
+    Plans are dropped when their tree version changes.
+
+    Returns:
+        PricingPlanCache: Shared plan cache sized from Windx settings
+    """
+    global _pricing_plan_cache
+    if _pricing_plan_cache is None:
+        from app.core.config import get_settings
+
+        _pricing_plan_cache = PricingPlanCache(maxsize=get_settings().windx.pricing_plan_cache_size)
+        get_tree_versions().subscribe(_pricing_plan_cache.invalidate)
+    return _pricing_plan_cache
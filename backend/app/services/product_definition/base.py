@@ -6,17 +6,24 @@ with common functionality and abstract methods for scope-specific implementation
 
 from __future__ import annotations
 
+import copy
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.base import BaseService
+from app.services.tree_versions import UNTYPED_TREE_ID, get_tree_version, has_pending_changes
 from .types import EntityData, EntityCreateData, EntityUpdateData
 
 __all__ = ["BaseProductDefinitionService"]
 
+# Scope metadata shared by this worker's services: scope -> (tree version, metadata)
+# Scope metadata nodes belong to no manufacturing type, so the version of
+# the untyped attribute tree tells when they change
+_shared_scope_metadata: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
 
 class BaseProductDefinitionService(BaseService, ABC):
     """Base service for product definitions with common functionality.
@@ -63,6 +70,22 @@ class BaseProductDefinitionService(BaseService, ABC):
         """
         return await self.get_entities(entity_type)
 
+    async def get_entities_by_types(self, entity_types: List[str]) -> Dict[str, List[Any]]:
+        """Get entities of several types for this scope.
+
+        Scopes override this to load all types with a single query.
+
+        Args:
+            entity_types: Types of entities to retrieve
+
+        Returns:
+            Entities keyed by entity type
+        """
+        return {
+            entity_type: await self.get_entities(entity_type)
+            for entity_type in dict.fromkeys(entity_types)
+        }
+
     @abstractmethod
     async def create_entity(self, data: EntityCreateData) -> Any:
         """Create entity for this scope.
@@ -106,6 +129,9 @@ class BaseProductDefinitionService(BaseService, ABC):
 
     async def get_scope_metadata(self) -> Dict[str, Any]:
         """Get metadata for this scope, merging YAML configuration with database extensions.
+
+        The merged metadata is shared by the worker's services until the
+        attribute tree holding the scope metadata nodes changes.
         
         Returns:
         	Scope metadata dictionary
@@ -113,6 +139,16 @@ class BaseProductDefinitionService(BaseService, ABC):
         if self._scope_metadata_cache is not None:
             return self._scope_metadata_cache
 
+        # Sessions with uncommitted tree changes see metadata of their own
+        version = None
+        if not has_pending_changes(self.db):
+            # Read the version first: shared metadata is never older than its version
+            version = await get_tree_version(self.db, UNTYPED_TREE_ID)
+        shared = _shared_scope_metadata.get(self.scope)
+        if version is not None and shared is not None and shared[0] == version:
+            self._scope_metadata_cache = copy.deepcopy(shared[1])
+            return self._scope_metadata_cache
+
         # 1. Load from YAML (Core Configuration)
         metadata = await self._load_scope_metadata_from_yaml()
         
@@ -132,6 +168,8 @@ class BaseProductDefinitionService(BaseService, ABC):
             # For now, we'll continue with update() but after the key fix
             metadata.update(db_metadata)
             
+        if version is not None and not has_pending_changes(self.db):
+            _shared_scope_metadata[self.scope] = (version, copy.deepcopy(metadata))
         self._scope_metadata_cache = metadata
         return metadata
 
@@ -195,6 +233,7 @@ class BaseProductDefinitionService(BaseService, ABC):
     def clear_scope_metadata_cache(self) -> None:
         """Clear the cached scope metadata to force reload from database."""
         self._scope_metadata_cache = None
+        _shared_scope_metadata.pop(self.scope, None)
 
     def _slugify(self, name: str) -> str:
         """Convert name to LTREE-safe slug.
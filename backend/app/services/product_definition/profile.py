@@ -40,69 +40,114 @@ class ProfileProductDefinitionService(BaseProductDefinitionService):
 
     async def get_entities(self, entity_type: str) -> List[Any]:
         """Get profile entities of specific type."""
+        return (await self.get_entities_by_types([entity_type]))[entity_type]
+
+    async def get_entities_by_types(self, entity_types: List[str]) -> Dict[str, List[Any]]:
+        """Get profile entities of several types with a single query.
+
+        System series are enriched with the names of their company, material
+        and opening system for the frontend dependency engine; the dependency
+        paths they come from are loaded by the same query.
+
+        Args:
+            entity_types: Types of entities to retrieve
+
+        Returns:
+            Entities keyed by entity type, each list ordered by name
+        """
         from sqlalchemy import select
+
         from app.models.attribute_node import AttributeNode
-        
+
+        entities: Dict[str, List[Any]] = {entity_type: [] for entity_type in entity_types}
+        if not entities:
+            return entities
+
         try:
+            load_types = list(entities)
+            if "system_series" in entities and "entity_path" not in entities:
+                load_types.append("entity_path")
             stmt = select(AttributeNode).where(
-                AttributeNode.node_type == entity_type,
+                AttributeNode.node_type.in_(load_types),
                 AttributeNode.page_type == self.scope
             ).order_by(AttributeNode.name)
-            
+
             result = await self.db.execute(stmt)
-            entities = list(result.scalars().all())
-
-            # Enrich system_series with parent information from paths for dynamic autofill
-            if entity_type == "system_series":
-                # Get all paths to find parents
-                path_stmt = select(AttributeNode).where(
-                    AttributeNode.node_type == "entity_path",
-                    AttributeNode.page_type == self.scope
-                )
-                path_result = await self.db.execute(path_stmt)
-                paths = path_result.scalars().all()
-
-                # Build a lookup for parents by series_id
-                # Since multiple paths might exist for one series (different colors), 
-                # we just need any one path to find the parents
-                series_to_parents = {}
-                for path in paths:
-                    pm = path.metadata_ or {}
-                    sid = pm.get("system_series_id")
-                    if sid and sid not in series_to_parents:
-                        series_to_parents[sid] = {
-                            "company_id": pm.get("company_id"),
-                            "material_id": pm.get("material_id"),
-                            "opening_system_id": pm.get("opening_system_id")
-                        }
+            paths = []
+            for node in result.scalars().all():
+                if node.node_type in entities:
+                    entities[node.node_type].append(node)
+                else:
+                    paths.append(node)
 
-                # Get names for all referenced parent IDs to avoid N+1
-                all_parent_ids = set()
-                for p in series_to_parents.values():
-                    all_parent_ids.update([v for v in p.values() if v])
-                
-                parent_map = {}
-                if all_parent_ids:
-                    p_stmt = select(AttributeNode).where(AttributeNode.id.in_(all_parent_ids))
-                    p_res = await self.db.execute(p_stmt)
-                    for p_node in p_res.scalars().all():
-                        parent_map[p_node.id] = p_node.name
-
-                # Inject parent names into series metadata
-                for entity in entities:
-                    parents = series_to_parents.get(entity.id)
-                    if parents:
-                        if not entity.metadata_:
-                            entity.metadata_ = {}
-                        
-                        # Add parent names to metadata for frontend dependency engine
-                        entity.metadata_["company"] = parent_map.get(parents["company_id"])
-                        entity.metadata_["material"] = parent_map.get(parents["material_id"])
-                        entity.metadata_["opening_system"] = parent_map.get(parents["opening_system_id"])
+            if "system_series" in entities:
+                paths = entities.get("entity_path", paths)
+                await self._attach_series_parents(entities["system_series"], paths, entities)
 
             return entities
         except Exception as e:
-            self._handle_service_error(e, f"getting {entity_type} entities")
+            self._handle_service_error(e, f"getting {', '.join(entity_types)} entities")
+
+    async def _attach_series_parents(
+        self,
+        series: List[Any],
+        paths: List[Any],
+        loaded: Dict[str, List[Any]],
+    ) -> None:
+        """Add parent names from dependency paths to system series metadata.
+
+        Args:
+            series: System series entities to enrich
+            paths: Dependency path nodes of this scope
+            loaded: Entities already loaded, used before querying parent names
+        """
+        from sqlalchemy import select
+
+        from app.models.attribute_node import AttributeNode
+
+        # Build a lookup for parents by series_id
+        # Since multiple paths might exist for one series (different colors),
+        # we just need any one path to find the parents
+        series_to_parents = {}
+        for path in paths:
+            pm = path.metadata_ or {}
+            sid = pm.get("system_series_id")
+            if sid and sid not in series_to_parents:
+                series_to_parents[sid] = {
+                    "company_id": pm.get("company_id"),
+                    "material_id": pm.get("material_id"),
+                    "opening_system_id": pm.get("opening_system_id")
+                }
+
+        # Get names for all referenced parent IDs to avoid N+1
+        all_parent_ids = set()
+        for p in series_to_parents.values():
+            all_parent_ids.update([v for v in p.values() if v])
+
+        parent_map = {
+            node.id: node.name
+            for nodes in loaded.values()
+            for node in nodes
+            if node.id in all_parent_ids
+        }
+        missing_ids = all_parent_ids - parent_map.keys()
+        if missing_ids:
+            p_stmt = select(AttributeNode).where(AttributeNode.id.in_(missing_ids))
+            p_res = await self.db.execute(p_stmt)
+            for p_node in p_res.scalars().all():
+                parent_map[p_node.id] = p_node.name
+
+        # Inject parent names into series metadata
+        for entity in series:
+            parents = series_to_parents.get(entity.id)
+            if parents:
+                if not entity.metadata_:
+                    entity.metadata_ = {}
+
+                # Add parent names to metadata for frontend dependency engine
+                entity.metadata_["company"] = parent_map.get(parents["company_id"])
+                entity.metadata_["material"] = parent_map.get(parents["material_id"])
+                entity.metadata_["opening_system"] = parent_map.get(parents["opening_system_id"])
 
 
     async def create_entity(self, data: EntityCreateData) -> Any:
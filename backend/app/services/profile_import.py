@@ -0,0 +1,567 @@
+"""Bulk profile sheet imports.
+
+This module creates profile configurations from a CSV in the profile sheet
+format, the columns of the preview table and its CSV export. The form
+schema and validators are compiled once per import, rows are validated in
+worker processes, and valid rows are written in batches with multi-row
+inserts. Rejected rows are reported with their errors instead of aborting
+the import.
+
+Public Classes:
+    ProfileRowValidator: Compiled, picklable validator of profile sheet rows
+    ProfileImportService: Bulk import of profile sheets
+
+Features:
+    - Schema, header mapping and attribute nodes loaded once per import
+    - Same field, cross-field and business rules as single saves
+    - Rows validated in a process pool, inline for small batches
+    - Configurations written with multi-row INSERT ... RETURNING, selections
+      with multi-row INSERT pages, per batch
+    - Savepoint per batch; a failing batch is retried row by row
+    - Per-row errors keyed by spreadsheet row number and field
+    - Throughput reporting (rows/sec)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import logging
+import multiprocessing
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.exceptions import NotFoundException, ValidationException
+from app.core.rbac import Permission, Privilege, Role, require
+from app.models.attribute_node import AttributeNode
+from app.models.user import User
+from app.repositories.configuration import ConfigurationRepository
+from app.repositories.configuration_selection import ConfigurationSelectionRepository
+from app.repositories.manufacturing_type import ManufacturingTypeRepository
+from app.schemas.entry import (
+    ProfileEntryData,
+    ProfileImportResult,
+    ProfileImportRowError,
+    ProfileSchema,
+)
+from app.services.base import BaseService
+from app.services.entry import EntryService
+
+__all__ = ["ProfileImportService", "ProfileRowValidator"]
+
+logger = logging.getLogger(__name__)
+
+ConfigurationImporter = Privilege(
+    roles=[Role.DATA_ENTRY, Role.SUPERADMIN],
+    permission=Permission("configuration", "create"),
+)
+
+# Cell values read as "no value", matching the preview table and export
+EMPTY_CELLS = frozenset({"", "N/A"})
+
+# Maximum number of row errors and configuration IDs returned in a result
+MAX_REPORTED_ROWS = 1000
+
+# Batches smaller than this are validated inline; starting workers costs more
+POOL_MIN_ROWS = 200
+
+_TRUE_CELLS = frozenset({"yes", "true", "1"})
+_FALSE_CELLS = frozenset({"no", "false", "0"})
+_NUMBER_TYPES = frozenset({"number", "float", "dimension"})
+
+# Columns not stored by ProfileEntryData fields or selections
+_NON_SELECTION_FIELDS = frozenset({"manufacturing_type_id", "name"})
+
+_EMPTY_SELECTION_VALUES = {
+    "string_value": None,
+    "numeric_value": None,
+    "boolean_value": None,
+    "json_value": None,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileRowValidator:
+    """Compiled, picklable validator of profile sheet rows.
+
+    Holds everything needed to turn a CSV row into validated form data, so
+    it can be shipped to worker processes once and applied to any number
+    of rows without database access.
+
+    Attributes:
+        manufacturing_type_id: Manufacturing type the rows belong to
+        columns: Field name per CSV column; None for ignored columns (id)
+        data_types: Data type of each schema field
+        schema: Compiled form schema with the field rules
+    """
+
+    manufacturing_type_id: int
+    columns: tuple[str | None, ...]
+    data_types: dict[str, str]
+    schema: ProfileSchema
+
+    @classmethod
+    def compile(
+        cls,
+        manufacturing_type_id: int,
+        header: list[str],
+        header_mapping: dict[str, str],
+        schema: ProfileSchema,
+    ) -> ProfileRowValidator:
+        """Compile the validator of a CSV header.
+
+        Args:
+            manufacturing_type_id: Manufacturing type the rows belong to
+            header: Header row of the CSV
+            header_mapping: Header to field name from generate_header_mapping
+            schema: Compiled form schema of the page
+
+        Returns:
+            ProfileRowValidator: Validator of the CSV's rows
+
+        Raises:
+            ValidationException: If a header is unknown or repeated
+        """
+        columns: list[str | None] = []
+        unknown: list[str] = []
+        for header_name in header:
+            header_name = header_name.strip().lstrip("\ufeff")
+            field_name = header_mapping.get(header_name)
+            if field_name is None:
+                unknown.append(header_name)
+            columns.append(None if field_name == "id" else field_name)
+        if unknown:
+            raise ValidationException(
+                "Unknown profile sheet columns",
+                field_errors=dict.fromkeys(unknown, "Unknown column"),
+            )
+        named = [column for column in columns if column]
+        if len(named) != len(set(named)):
+            raise ValidationException("Profile sheet has repeated columns")
+
+        return cls(
+            manufacturing_type_id=manufacturing_type_id,
+            columns=tuple(columns),
+            data_types={
+                field.name: field.data_type
+                for section in schema.sections
+                for field in section.fields
+            },
+            schema=schema,
+        )
+
+    def validate_rows(
+        self, rows: list[tuple[int, list[str]]]
+    ) -> list[dict[str, Any] | ProfileImportRowError]:
+        """Validate rows.
+
+        Args:
+            rows: Spreadsheet row number and cells of each row
+
+        Returns:
+            list: Form data of each valid row, or the errors of each rejected row
+        """
+        return [self.validate(row, cells) for row, cells in rows]
+
+    def validate(self, row: int, cells: list[str]) -> dict[str, Any] | ProfileImportRowError:
+        """Validate one row.
+
+        Args:
+            row: Spreadsheet row number
+            cells: Cell values in header order
+
+        Returns:
+            dict | ProfileImportRowError: Form data of a valid row, or its errors
+        """
+        values: dict[str, str] = {}
+        for field_name, cell in zip(self.columns, cells, strict=False):
+            cell = cell.strip()
+            if field_name and cell not in EMPTY_CELLS:
+                values[field_name] = cell
+        name = values.get("name")
+        if len(cells) > len(self.columns):
+            return ProfileImportRowError(
+                row=row,
+                name=name,
+                errors={
+                    "row": f"Row has {len(cells)} cells but the header has {len(self.columns)}"
+                },
+            )
+
+        errors: dict[str, str] = {}
+        try:
+            data = ProfileEntryData(manufacturing_type_id=self.manufacturing_type_id, **values)
+        except PydanticValidationError as e:
+            for error in e.errors():
+                field_name = str(error["loc"][0]) if error["loc"] else "row"
+                errors.setdefault(field_name, error["msg"])
+            return ProfileImportRowError(row=row, name=name, errors=errors)
+
+        # Columns of attributes ProfileEntryData doesn't declare
+        form_data: dict[str, Any] = {}
+        for field_name, value in values.items():
+            if field_name in ProfileEntryData.model_fields:
+                continue
+            try:
+                form_data[field_name] = self._coerce(value, self.data_types.get(field_name))
+            except ValueError as e:
+                errors[field_name] = str(e)
+        form_data.update(data.model_dump())
+
+        errors.update(EntryService.collect_field_errors(form_data, self.schema))
+        if errors:
+            return ProfileImportRowError(row=row, name=name, errors=errors)
+        return form_data
+
+    @staticmethod
+    def _coerce(value: str, data_type: str | None) -> Any:
+        """Convert a cell to its field's data type."""
+        if data_type == "boolean":
+            if value.lower() in _TRUE_CELLS:
+                return True
+            if value.lower() in _FALSE_CELLS:
+                return False
+            raise ValueError(f"'{value}' is not yes or no")
+        if data_type in _NUMBER_TYPES:
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"'{value}' is not a number") from None
+        return value
+
+
+# Validator of the current worker process, set by the pool initializer
+_worker_validator: ProfileRowValidator | None = None
+
+
+def _init_worker(validator: ProfileRowValidator) -> None:
+    """Keep the validator in a worker process for all its batches."""
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_in_worker(
+    rows: list[tuple[int, list[str]]],
+) -> list[dict[str, Any] | ProfileImportRowError]:
+    """Validate rows with the worker's validator."""
+    return _worker_validator.validate_rows(rows)
+
+
+class _ValidationPool:
+    """Validates batches in worker processes, started on the first large batch.
+
+    Falls back to inline validation when workers are disabled, batches are
+    small, or worker processes can't be started.
+    """
+
+    def __init__(self, validator: ProfileRowValidator, workers: int) -> None:
+        self._validator = validator
+        self._workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> _ValidationPool:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    async def validate(
+        self, rows: list[tuple[int, list[str]]]
+    ) -> list[dict[str, Any] | ProfileImportRowError]:
+        """Validate a batch of rows, in parallel if it is large enough."""
+        if self._workers < 1 or len(rows) < POOL_MIN_ROWS:
+            return self._validator.validate_rows(rows)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                # Forking a process with a running event loop isn't safe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._validator,),
+            )
+        size = -(-len(rows) // self._workers)
+        loop = asyncio.get_running_loop()
+        try:
+            chunks = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._executor, _validate_in_worker, rows[i : i + size])
+                    for i in range(0, len(rows), size)
+                )
+            )
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning("Import workers unavailable, validating inline: %s", e)
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+            self._workers = 0
+            return self._validator.validate_rows(rows)
+        return [outcome for chunk in chunks for outcome in chunk]
+
+
+class ProfileImportService(BaseService):
+    """Bulk import of profile sheets.
+
+    Rows go through the same checks as ``EntryService.validate_profile_data``
+    and are stored like ``EntryService.save_profile_configuration`` stores
+    them, but the schema is compiled once and rows are written in batches
+    instead of two commits per configuration.
+
+    Attributes:
+        db: Database session
+        entry_service: Entry service providing schemas and header mappings
+        mfg_type_repo: Manufacturing type repository
+        config_repo: Configuration repository
+        selection_repo: Configuration selection repository
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Initialize profile import service.
+
+        Args:
+            db (AsyncSession): Database session
+        """
+        super().__init__(db)
+        self.entry_service = EntryService(db)
+        self.mfg_type_repo = ManufacturingTypeRepository(db)
+        self.config_repo = ConfigurationRepository(db)
+        self.selection_repo = ConfigurationSelectionRepository(db)
+
+    @require(ConfigurationImporter)
+    async def import_csv(
+        self,
+        manufacturing_type_id: int,
+        user: User,
+        lines: Iterable[str],
+        page_type: str = "profile",
+        *,
+        batch_size: int | None = None,
+        workers: int | None = None,
+    ) -> ProfileImportResult:
+        """Create configurations from a profile sheet CSV.
+
+        Each batch is written in its own savepoint and committed, so rows
+        rejected by validation or the database never abort other rows.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type to import into
+            user (User): Current user; configurations belong to their customer
+            lines (Iterable[str]): Lines of the CSV, header first
+            page_type (str): Page type (profile, accessories, glazing)
+            batch_size (int | None): Rows per batch; defaults to the
+                ``import_batch_size`` setting
+            workers (int | None): Validation worker processes; defaults to
+                the ``import_workers`` setting, 0 validates inline
+
+        Returns:
+            ProfileImportResult: Counts, row errors and throughput of the import
+
+        Raises:
+            NotFoundException: If manufacturing type not found
+            ValidationException: If the CSV has no header or unknown columns
+            DatabaseException: If a batch fails to commit
+        """
+        start_time = time.perf_counter()
+        settings = get_settings().windx
+        batch_size = batch_size or settings.import_batch_size
+        workers = settings.import_workers if workers is None else workers
+
+        mfg_type = await self.mfg_type_repo.get(manufacturing_type_id)
+        if not mfg_type:
+            raise NotFoundException(
+                resource="ManufacturingType",
+                details={"manufacturing_type_id": manufacturing_type_id},
+            )
+
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if not header:
+            raise ValidationException("Profile sheet has no header row")
+        validator = await self.compile_validator(manufacturing_type_id, header, page_type)
+
+        result = await self.db.execute(
+            select(AttributeNode.name, AttributeNode.id, AttributeNode.ltree_path).where(
+                AttributeNode.manufacturing_type_id == manufacturing_type_id
+            )
+        )
+        nodes = {row.name: (row.id, row.ltree_path) for row in result}
+
+        customer = await self.entry_service.rbac_service.get_or_create_customer_for_user(user)
+        template = {
+            "manufacturing_type_id": manufacturing_type_id,
+            "customer_id": customer.id,
+            "status": "draft",
+            "base_price": mfg_type.base_price,
+            "total_price": mfg_type.base_price,
+            "calculated_weight": mfg_type.base_weight,
+            "calculated_technical_data": {},
+        }
+
+        rows = 0
+        configuration_ids: list[int] = []
+        errors: list[ProfileImportRowError] = []
+        imported = failed = 0
+        with _ValidationPool(validator, workers) as pool:
+            for batch in self._batches(reader, batch_size):
+                rows += len(batch)
+                valid: list[tuple[int, dict[str, Any]]] = []
+                for (row, _), outcome in zip(batch, await pool.validate(batch), strict=True):
+                    if isinstance(outcome, ProfileImportRowError):
+                        failed += 1
+                        if len(errors) < MAX_REPORTED_ROWS:
+                            errors.append(outcome)
+                    else:
+                        valid.append((row, outcome))
+
+                ids, rejected = await self._write_batch(valid, template, nodes)
+                imported += len(ids)
+                failed += len(rejected)
+                configuration_ids += ids[: MAX_REPORTED_ROWS - len(configuration_ids)]
+                errors += rejected[: MAX_REPORTED_ROWS - len(errors)]
+
+        duration = time.perf_counter() - start_time
+        import_result = ProfileImportResult(
+            manufacturing_type_id=manufacturing_type_id,
+            rows=rows,
+            imported=imported,
+            failed=failed,
+            errors=sorted(errors, key=lambda error: error.row),
+            configuration_ids=configuration_ids,
+            duration_seconds=duration,
+            rows_per_second=rows / duration if duration > 0 else 0.0,
+        )
+        logger.info(
+            "Imported profile sheet into manufacturing type %s: %s rows, %s imported, "
+            "%s failed in %.3fs (%.0f rows/sec)",
+            manufacturing_type_id,
+            import_result.rows,
+            import_result.imported,
+            import_result.failed,
+            import_result.duration_seconds,
+            import_result.rows_per_second,
+        )
+        return import_result
+
+    async def compile_validator(
+        self, manufacturing_type_id: int, header: list[str], page_type: str = "profile"
+    ) -> ProfileRowValidator:
+        """Compile the row validator of a profile sheet header.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type to import into
+            header (list[str]): Header row of the CSV
+            page_type (str): Page type (profile, accessories, glazing)
+
+        Returns:
+            ProfileRowValidator: Validator of the sheet's rows
+
+        Raises:
+            ValidationException: If a header is unknown or repeated
+        """
+        schema = await self.entry_service.get_profile_schema(manufacturing_type_id, page_type)
+        header_mapping = await self.entry_service.generate_header_mapping(
+            manufacturing_type_id, page_type
+        )
+        return ProfileRowValidator.compile(manufacturing_type_id, header, header_mapping, schema)
+
+    @staticmethod
+    def _batches(
+        reader: Iterator[list[str]], batch_size: int
+    ) -> Iterator[list[tuple[int, list[str]]]]:
+        """Group non-blank rows with their spreadsheet row numbers."""
+        batch: list[tuple[int, list[str]]] = []
+        # The header is row 1
+        for row, cells in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in cells):
+                continue
+            batch.append((row, cells))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _write_batch(
+        self,
+        rows: list[tuple[int, dict[str, Any]]],
+        template: dict[str, Any],
+        nodes: dict[str, tuple[int, str]],
+    ) -> tuple[list[int], list[ProfileImportRowError]]:
+        """Insert a batch of validated rows and commit it.
+
+        Args:
+            rows: Spreadsheet row number and form data of each row
+            template: Column values shared by every configuration
+            nodes: Attribute node ID and path keyed by field name
+
+        Returns:
+            tuple: IDs of the created configurations and errors of rows the
+                database rejected
+        """
+        if not rows:
+            return [], []
+
+        rejected: list[ProfileImportRowError] = []
+        try:
+            async with self.db.begin_nested():
+                ids = await self._insert_rows(rows, template, nodes)
+        except DBAPIError:
+            # Find the offending rows one savepoint at a time
+            ids = []
+            for row, form_data in rows:
+                try:
+                    async with self.db.begin_nested():
+                        ids += await self._insert_rows([(row, form_data)], template, nodes)
+                except DBAPIError as e:
+                    rejected.append(
+                        ProfileImportRowError(
+                            row=row, name=form_data.get("name"), errors={"row": str(e.orig)}
+                        )
+                    )
+        await self.commit()
+        return ids, rejected
+
+    async def _insert_rows(
+        self,
+        rows: list[tuple[int, dict[str, Any]]],
+        template: dict[str, Any],
+        nodes: dict[str, tuple[int, str]],
+    ) -> list[int]:
+        """Insert configurations and their selections with multi-row INSERTs."""
+        ids = await self.config_repo.bulk_insert(
+            [
+                {
+                    **template,
+                    "name": form_data["name"],
+                    "description": f"Profile entry for {form_data['type']}",
+                }
+                for _, form_data in rows
+            ]
+        )
+        await self.selection_repo.bulk_insert(
+            [
+                {
+                    "configuration_id": configuration_id,
+                    "attribute_node_id": nodes[field_name][0],
+                    "selection_path": nodes[field_name][1],
+                    **_EMPTY_SELECTION_VALUES,
+                    **EntryService.selection_value_columns(value),
+                }
+                for configuration_id, (_, form_data) in zip(ids, rows, strict=True)
+                for field_name, value in form_data.items()
+                if value is not None
+                and field_name not in _NON_SELECTION_FIELDS
+                and field_name in nodes
+            ]
+        )
+        return ids
@@ -8,14 +8,16 @@ Public Classes:
 
 Features:
     - Quote generation with price snapshot
+    - Batch quoting of many configurations with bulk pricing and one insert
+    - Memoized configuration pricing for quote subtotals
     - Quote totals calculation (tax, discounts)
     - Quote status management
-    - Quote number generation
+    - Quote number allocation from per-day document counters
 """
 
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from decimal import Decimal
 
 from pydantic import PositiveInt
@@ -27,8 +29,10 @@ from app.models.configuration import Configuration
 from app.models.quote import Quote
 from app.repositories.configuration import ConfigurationRepository
 from app.repositories.quote import QuoteRepository
-from app.schemas.quote import QuoteCreate, QuoteUpdate
+from app.schemas.quote import QuoteBatchCreateRequest, QuoteCreate, QuoteUpdate
 from app.services.base import BaseService
+from app.services.number_allocator import get_number_allocator
+from app.services.pricing import PricingService
 from app.services.rbac import RBACService
 
 __all__ = ["QuoteService"]
@@ -60,6 +64,8 @@ class QuoteService(BaseService):
         db: Database session
         quote_repo: Quote repository
         config_repo: Configuration repository
+        pricing_service: Pricing service used for quote subtotals
+        number_allocator: Allocator of quote numbers
     """
 
     def __init__(self, db: AsyncSession) -> None:
@@ -72,6 +78,8 @@ class QuoteService(BaseService):
         self.quote_repo = QuoteRepository(db)
         self.config_repo = ConfigurationRepository(db)
         self.rbac_service = RBACService(db)
+        self.pricing_service = PricingService(db)
+        self.number_allocator = get_number_allocator()
 
     @require(Permission("quote", "create"))
     async def generate_quote(
@@ -87,6 +95,8 @@ class QuoteService(BaseService):
         """Generate a quote from a configuration.
 
         Creates a quote with calculated pricing including tax and discounts.
+        The subtotal is the configuration's current price, served from the
+        price quote cache when an identical configuration was priced before.
         Sets validity period and creates a price snapshot.
 
         Args:
@@ -103,6 +113,7 @@ class QuoteService(BaseService):
         Raises:
             NotFoundException: If configuration not found
             ValidationException: If configuration is invalid
+            InvalidFormulaException: If the configuration fails to price
         """
         # Validate configuration exists
         config = await self.config_repo.get(configuration_id)
@@ -112,9 +123,13 @@ class QuoteService(BaseService):
                 details={"configuration_id": configuration_id},
             )
 
+        # Price the configuration; identical configurations are served from
+        # the price quote cache instead of being re-priced
+        prices = await self.pricing_service.calculate_configuration_price(configuration_id)
+
         # Calculate quote totals
         totals = self.calculate_quote_totals(
-            subtotal=config.total_price,
+            subtotal=prices["total_price"],
             tax_rate=tax_rate,
             discount_amount=discount_amount,
         )
@@ -399,27 +414,18 @@ class QuoteService(BaseService):
         Returns:
             str: Unique quote number in format Q-YYYYMMDD-NNN
         """
-        # Generate base quote number with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d")
-        base_number = f"Q-{timestamp}"
-
-        # Find the next available sequence number
-        sequence = 1
-        while True:
-            quote_number = f"{base_number}-{sequence:03d}"
+        return (await self._allocate_quote_numbers(1))[0]
 
-            # Check if this number already exists
-            existing = await self.quote_repo.get_by_quote_number(quote_number)
-            if not existing:
-                return quote_number
+    async def _allocate_quote_numbers(self, count: int) -> list[str]:
+        """Allocate unique quote numbers with at most one counter update.
 
-            sequence += 1
+        Args:
+            count (int): Number of quote numbers to allocate
 
-            # Safety check to prevent infinite loop
-            if sequence > 999:
-                # Fall back to timestamp with microseconds
-                timestamp_micro = datetime.now().strftime("%Y%m%d%H%M%S%f")
-                return f"Q-{timestamp_micro}"
+        Returns:
+            list[str]: Quote numbers in format Q-YYYYMMDD-NNN, ascending
+        """
+        return await self.number_allocator.allocate(self.db, "Q", count)
 
     async def create_configuration_snapshot(self, quote_id: int, config: Configuration) -> None:
         """Create a configuration snapshot for quote history.
@@ -536,9 +542,15 @@ class QuoteService(BaseService):
                 "You do not have permission to create a quote for this configuration"
             )
 
+        # Price the configuration; identical configurations are served from
+        # the price quote cache instead of being re-priced
+        prices = await self.pricing_service.calculate_configuration_price(
+            quote_request.configuration_id
+        )
+
         # Calculate quote totals
         totals = self.calculate_quote_totals(
-            subtotal=config.total_price,
+            subtotal=prices["total_price"],
             tax_rate=quote_request.tax_rate,
             discount_amount=quote_request.discount_amount,
         )
@@ -573,3 +585,88 @@ class QuoteService(BaseService):
         # await self.create_configuration_snapshot(quote.id, config)
 
         return quote
+
+    async def create_quotes_with_auth(
+        self, batch_request: QuoteBatchCreateRequest, user
+    ) -> list[Quote]:
+        """Generate quotes for many configurations with authorization check.
+
+        Loads and prices all configurations with a fixed number of bulk
+        queries, allocates every quote number with one counter update and
+        inserts all quotes with a single multi-row INSERT. Either every
+        quote is created or none is.
+
+        Args:
+            batch_request (QuoteBatchCreateRequest): Batch quote request data
+            user: Current user
+
+        Returns:
+            list[Quote]: Created quotes in configuration ID order
+
+        Raises:
+            NotFoundException: If any configuration is not found
+            AuthorizationException: If user lacks permission for any configuration
+            ValidationException: If the discount exceeds a configuration's price
+            InvalidFormulaException: If a configuration fails to price
+        """
+        from app.core.exceptions import AuthorizationException
+
+        config_ids = list(dict.fromkeys(batch_request.configuration_ids))
+        configs = await self.config_repo.get_many_with_manufacturing_type(config_ids)
+        missing = sorted(set(config_ids) - {config.id for config in configs})
+        if missing:
+            raise NotFoundException(
+                resource="Configuration",
+                details={"configuration_ids": missing},
+            )
+
+        # Authorization check using RBAC service
+        if user.role != Role.SUPERADMIN.value:
+            accessible_customers = await self.rbac_service.get_accessible_customers(user)
+            forbidden = [
+                config.id for config in configs if config.customer_id not in accessible_customers
+            ]
+            if forbidden:
+                raise AuthorizationException(
+                    "You do not have permission to create quotes for configurations "
+                    f"{', '.join(map(str, forbidden))}"
+                )
+
+        # Price every configuration in one batch; identical configurations
+        # are served from the price quote cache
+        prices = await self.pricing_service.calculate_prices_for_configurations(config_ids)
+        totals = {
+            config.id: self.calculate_quote_totals(
+                subtotal=prices[config.id]["total_price"],
+                tax_rate=batch_request.tax_rate,
+                discount_amount=batch_request.discount_amount,
+            )
+            for config in configs
+        }
+
+        quote_numbers = await self._allocate_quote_numbers(len(configs))
+
+        valid_until = batch_request.valid_until
+        if valid_until is None:
+            valid_until = date.today() + timedelta(days=30)
+
+        quotes = await self.quote_repo.create_many(
+            [
+                QuoteCreate(
+                    configuration_id=config.id,
+                    customer_id=batch_request.customer_id or config.customer_id,
+                    quote_number=quote_number,
+                    subtotal=totals[config.id]["subtotal"],
+                    tax_rate=batch_request.tax_rate,
+                    tax_amount=totals[config.id]["tax_amount"],
+                    discount_amount=batch_request.discount_amount,
+                    total_amount=totals[config.id]["total_amount"],
+                    technical_requirements=batch_request.technical_requirements,
+                    valid_until=valid_until,
+                )
+                for config, quote_number in zip(configs, quote_numbers, strict=True)
+            ]
+        )
+        await self.commit()
+
+        return quotes
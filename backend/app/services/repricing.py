@@ -0,0 +1,554 @@
+"""Bulk repricing service for whole manufacturing types.
+
+This module recalculates ``total_price`` and ``calculated_weight`` for every
+configuration of a manufacturing type after its pricing rules change. All
+selections are loaded once as column arrays, impacts are evaluated in a
+vectorized pass (one NumPy evaluation per distinct formula) and the new
+totals are written back with ``UPDATE ... FROM (VALUES ...)`` statements.
+
+Public Classes:
+    BulkRepricingService: Vectorized repricing of a manufacturing type
+
+Features:
+    - Fixed loading cost: one query each for configurations, selections and nodes
+    - Fixed impacts gathered by node index, formula impacts evaluated per formula
+    - Running-price rules (percentage, ``subtotal`` formulas) priced in plan order
+    - Per-configuration sums with ``np.bincount``, rounded like the Decimal path
+    - Only changed totals are written, so the price history trigger logs real changes
+    - Change reason recorded for the ``log_configuration_price_change`` trigger
+    - Throughput reporting (configs/sec)
+"""
+
+import logging
+import re
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+from sqlalchemy import Row, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.exceptions import InvalidFormulaException, NotFoundException
+from app.repositories.attribute_node import AttributeNodeRepository
+from app.repositories.configuration import ConfigurationRepository
+from app.repositories.configuration_selection import ConfigurationSelectionRepository
+from app.repositories.manufacturing_type import ManufacturingTypeRepository
+from app.schemas.manufacturing_type import RepricingResult
+from app.services.base import BaseService
+from app.services.formula_engine import get_formula_cache
+from app.services.pricing import PricingService
+from app.services.pricing_plan import STAGE_RUNNING_PRICE, PricingPlan, PricingStep
+
+__all__ = ["BulkRepricingService"]
+
+logger = logging.getLogger(__name__)
+
+# Session setting read by log_configuration_price_change() for change_reason
+PRICE_CHANGE_REASON_SETTING = "windx.price_change_reason"
+
+# Maximum number of error messages returned in a repricing result
+MAX_REPORTED_ERRORS = 20
+
+_NUMBER_PATTERN = re.compile(r"\d+\.?\d*")
+
+# Float totals this close to a rounding midpoint are re-summed exactly
+MIDPOINT_TOLERANCE = 1e-6
+
+
+class BulkRepricingService(BaseService):
+    """Vectorized repricing of every configuration of a manufacturing type.
+
+    Pricing semantics match ``PricingService``: fixed rules add
+    ``price_impact_value``, formula rules evaluate ``price_formula`` and
+    weights use ``weight_formula`` or the fixed ``weight_impact``. Formula
+    variables are the same as ``PricingService.build_formula_context``.
+    Configurations with running-price rules depend on evaluation order and
+    are priced through the ``PricingService`` plan pass instead.
+
+    Attributes:
+        db: Database session
+        mfg_type_repo: Manufacturing type repository
+        config_repo: Configuration repository
+        selection_repo: Configuration selection repository
+        attr_node_repo: Attribute node repository
+        pricing_service: Pricing service for plans and running-price rules
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Initialize bulk repricing service.
+
+        Args:
+            db (AsyncSession): Database session
+        """
+        super().__init__(db)
+        self.mfg_type_repo = ManufacturingTypeRepository(db)
+        self.config_repo = ConfigurationRepository(db)
+        self.selection_repo = ConfigurationSelectionRepository(db)
+        self.attr_node_repo = AttributeNodeRepository(db)
+        self.pricing_service = PricingService(db)
+
+    async def reprice_manufacturing_type(
+        self, manufacturing_type_id: int, dry_run: bool = False
+    ) -> RepricingResult:
+        """Recalculate and store totals for every configuration of a type.
+
+        Configurations with a selection that fails to price are skipped and
+        reported in the result instead of aborting the whole run.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            dry_run (bool): Compute totals without writing them
+
+        Returns:
+            RepricingResult: Counts, errors and throughput of the run
+
+        Raises:
+            NotFoundException: If manufacturing type not found
+            DatabaseException: If the write-back fails to commit
+        """
+        start_time = time.perf_counter()
+        settings = get_settings().windx
+
+        mfg_type = await self.mfg_type_repo.get(manufacturing_type_id)
+        if not mfg_type:
+            raise NotFoundException(
+                resource="ManufacturingType",
+                details={"manufacturing_type_id": manufacturing_type_id},
+            )
+
+        config_rows = await self.config_repo.get_price_rows_by_manufacturing_type(
+            manufacturing_type_id
+        )
+        selection_rows = await self.selection_repo.get_pricing_rows_by_manufacturing_type(
+            manufacturing_type_id
+        )
+        plan = await self._get_plan(manufacturing_type_id, selection_rows)
+
+        config_ids = np.fromiter((row.id for row in config_rows), dtype=np.int64)
+        base_prices = np.fromiter((float(row.base_price) for row in config_rows), dtype=np.float64)
+
+        price_impacts, weight_impacts, errors = self._calculate_impacts(selection_rows, plan.steps)
+
+        # Sum impacts per configuration
+        config_positions = np.searchsorted(
+            config_ids,
+            np.fromiter((row.configuration_id for row in selection_rows), dtype=np.int64),
+        )
+        new_prices = self._quantize_totals(
+            base_prices
+            + np.bincount(config_positions, weights=price_impacts, minlength=len(config_ids)),
+            [row.base_price for row in config_rows],
+            price_impacts,
+            config_positions,
+            settings.price_calculation_precision,
+        )
+        new_weights = self._quantize_totals(
+            float(mfg_type.base_weight)
+            + np.bincount(config_positions, weights=weight_impacts, minlength=len(config_ids)),
+            [mfg_type.base_weight] * len(config_rows),
+            weight_impacts,
+            config_positions,
+            settings.weight_calculation_precision,
+        )
+        self._price_running_configurations(
+            config_rows,
+            selection_rows,
+            plan,
+            mfg_type.base_weight,
+            new_prices,
+            new_weights,
+            errors,
+        )
+
+        changed: list[tuple[int, Decimal, Decimal]] = [
+            (row.id, new_price, new_weight)
+            for row, new_price, new_weight in zip(config_rows, new_prices, new_weights, strict=True)
+            if row.id not in errors
+            and (new_price != row.total_price or new_weight != row.calculated_weight)
+        ]
+
+        updated = 0
+        if changed and not dry_run:
+            await self.db.execute(
+                text("SELECT set_config(:setting, :reason, true)"),
+                {
+                    "setting": PRICE_CHANGE_REASON_SETTING,
+                    "reason": f"Bulk repricing of manufacturing type {manufacturing_type_id}",
+                },
+            )
+            updated = await self.config_repo.bulk_update_prices(
+                changed, batch_size=settings.repricing_batch_size
+            )
+            await self.commit()
+
+        duration = time.perf_counter() - start_time
+        result = RepricingResult(
+            manufacturing_type_id=manufacturing_type_id,
+            configurations=len(config_rows),
+            selections=len(selection_rows),
+            updated=len(changed) if dry_run else updated,
+            unchanged=len(config_rows) - len(changed) - len(errors),
+            failed=len(errors),
+            errors=list(errors.values())[:MAX_REPORTED_ERRORS],
+            dry_run=dry_run,
+            duration_seconds=duration,
+            configs_per_second=len(config_rows) / duration if duration > 0 else 0.0,
+        )
+        logger.info(
+            "Repriced manufacturing type %s: %s configurations, %s updated, %s failed "
+            "in %.3fs (%.0f configs/sec)",
+            manufacturing_type_id,
+            result.configurations,
+            result.updated,
+            result.failed,
+            result.duration_seconds,
+            result.configs_per_second,
+        )
+        return result
+
+    async def _get_plan(self, manufacturing_type_id: int, selection_rows: list[Row]) -> PricingPlan:
+        """Get the pricing plan of a type covering every selected node.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            selection_rows (list[Row]): Selection pricing rows
+
+        Returns:
+            PricingPlan: Plan of the type, extended with foreign selected nodes
+        """
+        plans = await self.pricing_service.get_pricing_plans({manufacturing_type_id})
+        plan = plans[manufacturing_type_id]
+
+        foreign = {row.attribute_node_id for row in selection_rows} - plan.steps.keys()
+        if foreign:
+            plan = plan.with_rules((await self.attr_node_repo.get_by_ids(foreign)).values())
+        return plan
+
+    def _price_running_configurations(
+        self,
+        config_rows: list[Row],
+        selection_rows: list[Row],
+        plan: PricingPlan,
+        base_weight: Decimal,
+        new_prices: list[Decimal],
+        new_weights: list[Decimal],
+        errors: dict[int, str],
+    ) -> None:
+        """Price configurations containing running-price rules in plan order.
+
+        Their impacts depend on the running subtotal, so they go through the
+        ``PricingService`` single-pass evaluation instead of the vectorized sums.
+
+        Args:
+            config_rows (list[Row]): Configuration price rows
+            selection_rows (list[Row]): Selection pricing rows
+            plan (PricingPlan): Pricing plan of the manufacturing type
+            base_weight (Decimal): Manufacturing type base weight
+            new_prices (list[Decimal]): Totals per configuration, updated in place
+            new_weights (list[Decimal]): Weights per configuration, updated in place
+            errors (dict[int, str]): Failed configurations, updated in place
+        """
+        if not plan.has_running_price_rules:
+            return
+
+        running_node_ids = {
+            step.id for step in plan.steps.values() if step.stage == STAGE_RUNNING_PRICE
+        }
+        rows_by_config: dict[int, list[Row]] = {
+            row.configuration_id: []
+            for row in selection_rows
+            if row.attribute_node_id in running_node_ids
+        }
+        if not rows_by_config:
+            return
+        for row in selection_rows:
+            if row.configuration_id in rows_by_config:
+                rows_by_config[row.configuration_id].append(row)
+
+        settings = get_settings().windx
+        price_quantum = Decimal(1).scaleb(-settings.price_calculation_precision)
+        weight_quantum = Decimal(1).scaleb(-settings.weight_calculation_precision)
+        for position, config_row in enumerate(config_rows):
+            rows = rows_by_config.get(config_row.id)
+            if rows is None or config_row.id in errors:
+                continue
+            try:
+                totals = self.pricing_service.price_configuration(
+                    config_row.id, config_row.base_price, base_weight, rows, plan
+                )
+            except InvalidFormulaException as e:
+                errors[config_row.id] = e.message
+                continue
+            new_prices[position] = totals["total_price"].quantize(price_quantum, ROUND_HALF_UP)
+            new_weights[position] = totals["total_weight"].quantize(weight_quantum, ROUND_HALF_UP)
+
+    @staticmethod
+    def _quantize_totals(
+        totals: np.ndarray,
+        bases: list[Decimal],
+        impacts: np.ndarray,
+        config_positions: np.ndarray,
+        precision: int,
+    ) -> list[Decimal]:
+        """Round float totals to Decimal exactly as the Decimal sums would round.
+
+        Float sums are only off in the last bits, which matters solely when a
+        total lies on a rounding midpoint (e.g. 20.555). Those configurations
+        are re-summed with Decimal from the individual impacts.
+
+        Args:
+            totals (np.ndarray): Float totals per configuration
+            bases (list[Decimal]): Decimal base amount per configuration
+            impacts (np.ndarray): Impact per selection row
+            config_positions (np.ndarray): Configuration position per selection row
+            precision (int): Decimal places to round to
+
+        Returns:
+            list[Decimal]: Rounded totals per configuration
+        """
+        quantum = Decimal(1).scaleb(-precision)
+        rounded = [
+            Decimal(repr(total)).quantize(quantum, ROUND_HALF_UP) for total in totals.tolist()
+        ]
+
+        scaled = totals * 10.0**precision
+        near_midpoint = np.abs(scaled - np.floor(scaled) - 0.5) < MIDPOINT_TOLERANCE
+        if near_midpoint.any():
+            exact = {
+                position: bases[position] for position in np.flatnonzero(near_midpoint).tolist()
+            }
+            rows = near_midpoint[config_positions]
+            for position, impact in zip(
+                config_positions[rows].tolist(), impacts[rows].tolist(), strict=True
+            ):
+                exact[position] += Decimal(repr(impact))
+            for position, total in exact.items():
+                rounded[position] = total.quantize(quantum, ROUND_HALF_UP)
+
+        return rounded
+
+    def _calculate_impacts(
+        self, selection_rows: list[Row], attr_nodes: dict[int, PricingStep]
+    ) -> tuple[np.ndarray, np.ndarray, dict[int, str]]:
+        """Calculate price and weight impacts for every selection row.
+
+        Running-price rules contribute nothing here; their configurations
+        are re-priced by ``_price_running_configurations``.
+
+        Args:
+            selection_rows (list[Row]): Selection pricing rows
+            attr_nodes (dict[int, PricingStep]): Pricing steps by node ID
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, dict[int, str]]: Price impacts, weight
+                impacts and error messages keyed by failed configuration ID
+        """
+        size = len(selection_rows)
+        errors: dict[int, str] = {}
+
+        # Per-node rule arrays, gathered to selections by node position
+        node_ids = np.array(sorted(attr_nodes), dtype=np.int64)
+        nodes = [attr_nodes[node_id] for node_id in node_ids.tolist()]
+        vectorized = [node.stage != STAGE_RUNNING_PRICE for node in nodes]
+        fixed_prices = np.array(
+            [
+                float(node.price_impact_value)
+                if vector and node.price_impact_type == "fixed" and node.price_impact_value
+                else 0.0
+                for node, vector in zip(nodes, vectorized, strict=True)
+            ]
+            + [0.0]
+        )
+        fixed_weights = np.array(
+            [
+                float(node.weight_impact)
+                if vector and not node.weight_formula and node.weight_impact
+                else 0.0
+                for node, vector in zip(nodes, vectorized, strict=True)
+            ]
+            + [0.0]
+        )
+
+        selection_node_ids = np.fromiter(
+            (row.attribute_node_id for row in selection_rows), dtype=np.int64, count=size
+        )
+        node_positions = np.searchsorted(node_ids, selection_node_ids)
+        known = node_positions < len(node_ids)
+        known[known] = node_ids[node_positions[known]] == selection_node_ids[known]
+        # Unknown nodes point at the trailing zero entry
+        node_positions = np.where(known, node_positions, len(nodes))
+        for index in np.flatnonzero(~known).tolist():
+            row = selection_rows[index]
+            errors.setdefault(
+                row.configuration_id,
+                f"Configuration {row.configuration_id}: attribute node "
+                f"{row.attribute_node_id} not found",
+            )
+
+        price_impacts = fixed_prices[node_positions]
+        weight_impacts = fixed_weights[node_positions]
+
+        columns = self._build_formula_columns(selection_rows)
+        price_formulas = [
+            node.price_formula if vector and node.price_impact_type == "formula" else None
+            for node, vector in zip(nodes, vectorized, strict=True)
+        ]
+        weight_formulas = [
+            node.weight_formula if vector else None
+            for node, vector in zip(nodes, vectorized, strict=True)
+        ]
+        for formulas, impacts in (
+            (price_formulas, price_impacts),
+            (weight_formulas, weight_impacts),
+        ):
+            for formula, rows in self._group_rows_by_formula(formulas, node_positions):
+                self._evaluate_formula_rows(
+                    formula, rows, columns, impacts, selection_rows, attr_nodes, errors
+                )
+
+        return price_impacts, weight_impacts, errors
+
+    @staticmethod
+    def _build_formula_columns(selection_rows: list[Row]) -> dict[str, np.ndarray]:
+        """Build formula variable columns mirroring the scalar context builder.
+
+        Optional variables (price_impact, weight_impact) are NaN where the
+        scalar context would not define them.
+
+        Args:
+            selection_rows (list[Row]): Selection pricing rows
+
+        Returns:
+            dict[str, np.ndarray]: Variable columns keyed by variable name
+        """
+        size = len(selection_rows)
+        numeric = np.fromiter(
+            (
+                np.nan if row.numeric_value is None else float(row.numeric_value)
+                for row in selection_rows
+            ),
+            dtype=np.float64,
+            count=size,
+        )
+        dimensions = np.where(np.isnan(numeric), 1.0, numeric)
+
+        value = dimensions.copy()
+        for index, row in enumerate(selection_rows):
+            if row.string_value:
+                match = _NUMBER_PATTERN.search(row.string_value)
+                if match:
+                    value[index] = float(match.group())
+
+        price_impact = np.fromiter(
+            (
+                float(row.calculated_price_impact) if row.calculated_price_impact else np.nan
+                for row in selection_rows
+            ),
+            dtype=np.float64,
+            count=size,
+        )
+        weight_impact = np.fromiter(
+            (
+                float(row.calculated_weight_impact) if row.calculated_weight_impact else np.nan
+                for row in selection_rows
+            ),
+            dtype=np.float64,
+            count=size,
+        )
+
+        return {
+            "value": value,
+            "width": dimensions,
+            "height": dimensions,
+            "depth": dimensions,
+            "quantity": dimensions,
+            "price_impact": price_impact,
+            "weight_impact": weight_impact,
+        }
+
+    @staticmethod
+    def _group_rows_by_formula(
+        formulas: list[str | None], node_positions: np.ndarray
+    ) -> list[tuple[str, np.ndarray]]:
+        """Group selection rows by the (normalized) formula of their node.
+
+        Args:
+            formulas (list[str | None]): Formula per node position
+            node_positions (np.ndarray): Node position per selection row
+
+        Returns:
+            list[tuple[str, np.ndarray]]: Formula and selection row indices
+        """
+        codes: dict[str, int] = {}
+        node_codes = []
+        for formula in formulas:
+            key = formula.strip() if formula else ""
+            node_codes.append(codes.setdefault(key, len(codes)) if key else -1)
+        node_codes.append(-1)
+
+        row_codes = np.array(node_codes, dtype=np.int64)[node_positions]
+        return [(formula, np.flatnonzero(row_codes == code)) for formula, code in codes.items()]
+
+    @staticmethod
+    def _evaluate_formula_rows(
+        formula: str,
+        rows: np.ndarray,
+        columns: dict[str, np.ndarray],
+        impacts: np.ndarray,
+        selection_rows: list[Row],
+        attr_nodes: dict[int, PricingStep],
+        errors: dict[int, str],
+    ) -> None:
+        """Evaluate one formula for its selection rows and store the impacts.
+
+        Rows are evaluated in one vectorized call. Rows missing a referenced
+        variable, or the whole group if the vectorized call fails, go through
+        the scalar ``PricingService`` path so errors are identical.
+
+        Args:
+            formula (str): Normalized formula
+            rows (np.ndarray): Selection row indices using the formula
+            columns (dict[str, np.ndarray]): Formula variable columns
+            impacts (np.ndarray): Impact array updated in place
+            selection_rows (list[Row]): Selection pricing rows
+            attr_nodes (dict[int, PricingStep]): Pricing steps by node ID
+            errors (dict[int, str]): Failed configurations, updated in place
+        """
+        scalar_rows = rows
+        try:
+            compiled = get_formula_cache().get(formula)
+            missing = np.zeros(len(rows), dtype=bool)
+            for name in compiled.variables:
+                if name not in columns:
+                    missing[:] = True
+                    break
+                missing |= np.isnan(columns[name][rows])
+
+            vector_rows = rows[~missing]
+            if len(vector_rows):
+                impacts[vector_rows] = compiled.evaluate_array(
+                    {name: columns[name][vector_rows] for name in compiled.variables},
+                    len(vector_rows),
+                )
+            scalar_rows = rows[missing]
+        except Exception:
+            # Let the scalar path report exactly which rows fail and why
+            pass
+
+        for index in scalar_rows.tolist():
+            row = selection_rows[index]
+            try:
+                impacts[index] = float(
+                    PricingService.evaluate_formula(
+                        formula, PricingService.build_formula_context(row)
+                    )
+                )
+            except InvalidFormulaException as e:
+                impacts[index] = 0.0
+                node = attr_nodes[row.attribute_node_id]
+                errors.setdefault(
+                    row.configuration_id,
+                    f"Configuration {row.configuration_id}, selection {row.id}, "
+                    f"attribute node {node.id} ({node.name}): {e.message}",
+                )
@@ -0,0 +1,334 @@
+"""Compiled entry page form schemas keyed by attribute tree version.
+
+Building a ``ProfileSchema`` reads the manufacturing type, its attribute
+nodes, the page's definition scope and the relation entities feeding the
+option lists. The result only changes when one of those nodes changes, so
+it is compiled once per manufacturing type, page type and tree version,
+serialized to JSON with an ETag, and kept in a per-worker LRU and, when
+caching is enabled, in Redis so every worker shares it.
+
+Schemas are keyed by database tree versions (see ``tree_versions``): the
+manufacturing type's own version, bumped whenever any of its nodes is
+created, updated, moved or deleted, and the version of nodes without a
+manufacturing type, which hold the definition scopes and relation
+entities feeding every manufacturing type's schema. Both are bumped by a
+database trigger for every writer, ORM or not.
+
+Public Classes:
+    CompiledSchema: Serialized form schema with its ETag and compiled conditions
+    ProfileSchemaCache: Two-tier (in-process + Redis) form schema cache
+
+Public Functions:
+    get_profile_schema_cache: Get the process-wide form schema cache
+
+Features:
+    - Schemas compiled once per (manufacturing type, page type, tree version)
+    - JSON bodies served as-is with strong ETags for conditional requests
+    - Display conditions compiled once alongside each cached schema
+    - Invalidated by database tree versions, whoever wrote the nodes
+    - Superseded local entries dropped on tree version notifications
+    - Redis failures fall back to the in-process tier
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.entry import ProfileSchema
+from app.services.condition_engine import ConditionSet
+from app.services.tree_versions import UNTYPED_TREE_ID, get_tree_version, get_tree_versions
+
+__all__ = ["CompiledSchema", "ProfileSchemaCache", "get_profile_schema_cache"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchema:
+    """Serialized form schema with its ETag and compiled display conditions.
+
+    Attributes:
+        schema: Parsed schema; shared between requests, do not mutate
+        body: JSON response body
+        etag: Strong ETag of the body
+        conditions: Display conditions of the schema compiled to closures
+    """
+
+    schema: ProfileSchema
+    body: bytes
+    etag: str
+    conditions: ConditionSet = field(compare=False, repr=False)
+
+    @classmethod
+    def compile(cls, schema: ProfileSchema) -> CompiledSchema:
+        """Serialize a schema and compute its ETag.
+
+        Args:
+            schema (ProfileSchema): Generated form schema
+
+        Returns:
+            CompiledSchema: Compiled schema
+        """
+        body = schema.model_dump_json().encode()
+        return cls(
+            schema=schema,
+            body=body,
+            etag=cls._etag(body),
+            conditions=ConditionSet.compile(schema.conditional_logic),
+        )
+
+    @classmethod
+    def from_body(cls, body: bytes) -> CompiledSchema:
+        """Load a schema serialized by ``compile``.
+
+        Args:
+            body (bytes): JSON body
+
+        Returns:
+            CompiledSchema: Compiled schema
+        """
+        schema = ProfileSchema.model_validate_json(body)
+        return cls(
+            schema=schema,
+            body=body,
+            etag=cls._etag(body),
+            conditions=ConditionSet.compile(schema.conditional_logic),
+        )
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Check an ``If-None-Match`` header against the ETag.
+
+        Args:
+            if_none_match (str | None): Header value
+
+        Returns:
+            bool: True if the client's copy is current (respond 304)
+        """
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class ProfileSchemaCache:
+    """Two-tier cache of compiled form schemas.
+
+    Keys combine the manufacturing type, page type and the tree versions
+    the schema depends on, so a tree change makes every older entry
+    unreachable without scanning Redis.
+
+    Attributes:
+        maxsize: Maximum number of schemas kept in process
+        ttl: Seconds schemas are kept in Redis
+        hits: Lookups served from the in-process tier
+        redis_hits: Lookups served from Redis
+        misses: Lookups that had to be compiled
+        invalidations: Tree version notifications applied by this worker
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: int = 3600, use_redis: bool = False) -> None:
+        """Initialize form schema cache.
+
+        Args:
+            maxsize (int): Maximum number of schemas kept in process
+            ttl (int): Seconds schemas are kept in Redis
+            use_redis (bool): Share schemas through Redis
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, CompiledSchema] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(manufacturing_type_id: int, page_type: str, version: str) -> str:
+        """Build the cache key of a schema under a tree version.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            page_type (str): Page type
+            version (str): Tree version from get_version
+
+        Returns:
+            str: Cache key
+        """
+        return f"{manufacturing_type_id}:{page_type}:{version}"
+
+    @staticmethod
+    async def get_version(db: AsyncSession, manufacturing_type_id: int) -> str:
+        """Get the tree version a schema depends on.
+
+        Args:
+            db (AsyncSession): Database session
+            manufacturing_type_id (int): Manufacturing type ID
+
+        Returns:
+            str: Versions of the manufacturing type's nodes and of the
+                definition nodes without a manufacturing type
+        """
+        typed = await get_tree_version(db, manufacturing_type_id)
+        untyped = await get_tree_version(db, UNTYPED_TREE_ID)
+        return f"{typed}.{untyped}"
+
+    async def get(self, key: str) -> CompiledSchema | None:
+        """Look up a compiled schema, in process first and then in Redis.
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            CompiledSchema | None: Compiled schema, or None if not cached
+        """
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+
+        if self.use_redis:
+            try:
+                body = await self._redis().get(self._redis_key(key))
+            except Exception as e:
+                logger.warning("Schema cache Redis read failed, using local tier: %s", e)
+                body = None
+            if body is not None:
+                compiled = CompiledSchema.from_body(
+                    body.encode() if isinstance(body, str) else body
+                )
+                self._store_local(key, compiled)
+                self.redis_hits += 1
+                return compiled
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, compiled: CompiledSchema) -> None:
+        """Store a compiled schema in both tiers.
+
+        Args:
+            key (str): Cache key from make_key
+            compiled (CompiledSchema): Compiled schema
+        """
+        self._store_local(key, compiled)
+        if self.use_redis:
+            try:
+                await self._redis().set(self._redis_key(key), compiled.body, ex=self.ttl)
+            except Exception as e:
+                logger.warning("Schema cache Redis write failed: %s", e)
+
+    def invalidate(self, manufacturing_type_id: int | None = None) -> None:
+        """Drop in-process schemas of a manufacturing type, or all of them.
+
+        Schemas of older tree versions can no longer be reached; this only
+        frees their memory. Definition nodes without a manufacturing type
+        feed every schema, so their changes drop everything.
+
+        Args:
+            manufacturing_type_id (int | None): Manufacturing type ID, or None for all
+        """
+        with self._lock:
+            self.invalidations += 1
+            if manufacturing_type_id is None or manufacturing_type_id == UNTYPED_TREE_ID:
+                self._entries.clear()
+                return
+            prefix = f"{manufacturing_type_id}:"
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Clear in-process schemas and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.redis_hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def __len__(self) -> int:
+        """Number of schemas kept in process."""
+        return len(self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics for monitoring.
+
+        Returns:
+            dict[str, Any]: Size, capacity, hit/miss counters and Redis usage
+        """
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "redis": self.use_redis,
+        }
+
+    def _store_local(self, key: str, compiled: CompiledSchema) -> None:
+        """Insert a schema into the in-process LRU."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _redis() -> Any:
+        """Get the shared Redis client."""
+        from app.core.cache import get_redis_client
+
+        return get_redis_client()
+
+    @staticmethod
+    def _prefix() -> str:
+        """Get the Redis key prefix for schema entries."""
+        from app.core.config import get_settings
+
+        return f"{get_settings().cache.prefix}:schema"
+
+    def _redis_key(self, key: str) -> str:
+        """Build the Redis key of a cache entry."""
+        return f"{self._prefix()}:entry:{key}"
+
+
+_profile_schema_cache: ProfileSchemaCache | None = None
+
+
+def get_profile_schema_cache() -> ProfileSchemaCache:
+    """Get the process-wide form schema cache.
+
+    Returns:
+        ProfileSchemaCache: Shared cache sized from Windx and cache settings
+    """
+    global _profile_schema_cache
+    if _profile_schema_cache is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+        _profile_schema_cache = ProfileSchemaCache(
+            maxsize=settings.windx.schema_cache_size,
+            ttl=settings.windx.schema_cache_ttl,
+            use_redis=settings.cache.enabled,
+        )
+        get_tree_versions().subscribe(_profile_schema_cache.invalidate)
+    return _profile_schema_cache
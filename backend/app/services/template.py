@@ -11,6 +11,7 @@ Features:
     - Template application to create configurations
     - Template usage tracking
     - Template metrics calculation
+    - Selected attribute nodes read from the shared tree snapshot
 """
 
 from __future__ import annotations
@@ -40,6 +41,7 @@ from app.schemas.configuration_template import (
 from app.services.base import BaseService
 from app.services.configuration import ConfigurationService
 from app.services.rbac import RBACService
+from app.services.tree_snapshot import get_tree_snapshot
 
 __all__ = ["TemplateService"]
 
@@ -136,9 +138,10 @@ class TemplateService(BaseService):
         await self.refresh(template)
 
         # Copy selections from configuration to template
+        attr_nodes = await self._get_selected_nodes(config.manufacturing_type_id, config.selections)
         for selection in config.selections:
             # Get attribute node for ltree path
-            attr_node = await self.attr_node_repo.get(selection.attribute_node_id)
+            attr_node = attr_nodes.get(selection.attribute_node_id)
             if not attr_node:
                 continue
 
@@ -442,8 +445,9 @@ class TemplateService(BaseService):
             estimated_weight = template.manufacturing_type.base_weight
 
         # Add impacts from selections
+        attr_nodes = await self._get_selected_nodes(template.manufacturing_type_id, selections)
         for selection in selections:
-            attr_node = await self.attr_node_repo.get(selection.attribute_node_id)
+            attr_node = attr_nodes.get(selection.attribute_node_id)
             if not attr_node:
                 continue
 
@@ -464,6 +468,33 @@ class TemplateService(BaseService):
 
         return template
 
+    async def _get_selected_nodes(
+        self, manufacturing_type_id: int, selections: list[Any]
+    ) -> dict[int, Any]:
+        """Get the attribute nodes referenced by selections.
+
+        Nodes are read from the manufacturing type's tree snapshot; nodes
+        of other types are loaded individually.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type of the selections
+            selections (list[Any]): Configuration or template selections
+
+        Returns:
+            dict[int, Any]: Nodes (snapshot views or AttributeNode instances)
+                keyed by ID; missing nodes are left out
+        """
+        snapshot = await get_tree_snapshot(self.db, manufacturing_type_id)
+        nodes: dict[int, Any] = {}
+        for selection in selections:
+            node_id = selection.attribute_node_id
+            if node_id in nodes:
+                continue
+            node = snapshot.get(node_id) or await self.attr_node_repo.get(node_id)
+            if node is not None:
+                nodes[node_id] = node
+        return nodes
+
     @require(TemplateManagement)
     @require(AdminTemplateAccess)
     async def create_template(
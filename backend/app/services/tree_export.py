@@ -0,0 +1,396 @@
+"""Precomputed JSON exports of attribute trees.
+
+Serving a subtree through ``AttributeNodeTree`` models validates and
+copies every field of every node, then serializes the models again for
+the response. Exports skip the models: the nested structure is built from
+plain dicts read straight from the shared tree snapshot's column tuples,
+serialized once with orjson and compressed once, and the bytes are reused
+until the tree changes.
+
+The JSON matches the ``list[AttributeNodeTree]`` response model: the same
+keys, Decimals as strings, UTC datetimes with a ``Z`` suffix, and children
+nested in ``ltree_path`` order.
+
+Public Classes:
+    TreeExport: Serialized attribute subtree with its compressed encodings
+    TreeExportCache: Bounded in-process cache of tree exports
+
+Public Functions:
+    serialize_nodes: Serialize attribute nodes as a nested JSON tree
+    serialize_snapshot: Serialize a snapshot subtree as a nested JSON tree
+    get_tree_export: Get the export of an attribute subtree
+    get_tree_export_cache: Get the process-wide export cache
+
+Features:
+    - No Pydantic models: one dict per node, serialized by orjson
+    - gzip (and brotli, when installed) encodings compressed once per export
+    - Weak ETags for conditional requests
+    - Exports tied to the snapshot they were serialized from
+    - Dropped as soon as a tree version notification arrives
+    - Sessions with uncommitted tree changes never share exports
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attribute_node import AttributeNode
+from app.repositories.attribute_node import AttributeNodeRepository
+from app.schemas.attribute_node import AttributeNodeTree
+from app.services.tree_snapshot import TreeSnapshot, get_tree_snapshot
+from app.services.tree_versions import get_tree_versions, has_pending_changes
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+__all__ = [
+    "TreeExport",
+    "TreeExportCache",
+    "get_tree_export",
+    "get_tree_export_cache",
+    "serialize_nodes",
+    "serialize_snapshot",
+]
+
+# Bodies smaller than this are not worth compressing (as GZipMiddleware)
+MINIMUM_COMPRESSED_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9
+
+# (JSON key, AttributeNode attribute) of every AttributeNodeTree field but children
+EXPORT_FIELDS: tuple[tuple[str, str], ...] = tuple(
+    (field.alias or name, name)
+    for name, field in AttributeNodeTree.model_fields.items()
+    if name != "children"
+)
+
+
+def _encode_default(value: Any) -> Any:
+    """Encode values orjson does not support natively, as Pydantic does."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _dump_tree(rows: list[dict[str, Any]]) -> bytes:
+    """Nest node rows under their parents and serialize them.
+
+    Args:
+        rows (list[dict[str, Any]]): Node rows keyed like the response model
+
+    Returns:
+        bytes: JSON array of the root nodes
+    """
+    # Children are nested in ltree_path order, as the model-based tree builders do
+    rows.sort(key=lambda row: row["ltree_path"])
+    by_id: dict[int, dict[str, Any]] = {}
+    for row in rows:
+        row["children"] = []
+        by_id[row["id"]] = row
+
+    roots: list[dict[str, Any]] = []
+    for row in rows:
+        parent = by_id.get(row["parent_node_id"])
+        (parent["children"] if parent is not None else roots).append(row)
+    return orjson.dumps(roots, default=_encode_default, option=orjson.OPT_UTC_Z)
+
+
+def serialize_nodes(nodes: Iterable[AttributeNode]) -> bytes:
+    """Serialize attribute nodes as a nested JSON tree.
+
+    Nodes whose parent is not among the nodes become roots.
+
+    Args:
+        nodes (Iterable[AttributeNode]): Nodes, or snapshot node views
+
+    Returns:
+        bytes: JSON array of root nodes with nested children
+    """
+    return _dump_tree([{key: getattr(node, attr) for key, attr in EXPORT_FIELDS} for node in nodes])
+
+
+def serialize_snapshot(snapshot: TreeSnapshot, root_node_id: int | None = None) -> bytes:
+    """Serialize a snapshot subtree as a nested JSON tree.
+
+    Rows are read straight from the snapshot's column tuples.
+
+    Args:
+        snapshot (TreeSnapshot): Snapshot holding the subtree
+        root_node_id (int | None): Subtree root, or None for the whole tree
+
+    Returns:
+        bytes: JSON array of root nodes with nested children
+    """
+    if not len(snapshot):
+        return b"[]"
+    start, end = 0, len(snapshot)
+    if root_node_id is not None:
+        start = snapshot.index_of(root_node_id)
+        end = snapshot.ends[start]
+
+    keys = [key for key, _ in EXPORT_FIELDS]
+    values = zip(*(snapshot.columns[attr][start:end] for _, attr in EXPORT_FIELDS), strict=True)
+    return _dump_tree([dict(zip(keys, row, strict=True)) for row in values])
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    """Get the content codings an Accept-Encoding header allows."""
+    accepted: set[str] = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                continue
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip())
+    return accepted
+
+
+@dataclass(frozen=True, slots=True)
+class TreeExport:
+    """Serialized attribute subtree with its compressed encodings.
+
+    Attributes:
+        body: JSON body
+        etag: Weak ETag of the body, shared by every encoding
+        gzip: gzip-compressed body, or None if not worth compressing
+        brotli: brotli-compressed body, or None if not worth compressing
+            or brotli is not installed
+    """
+
+    body: bytes
+    etag: str
+    gzip: bytes | None = None
+    brotli: bytes | None = None
+
+    @classmethod
+    def from_body(cls, body: bytes) -> TreeExport:
+        """Create an export, compressing the body once.
+
+        Args:
+            body (bytes): JSON body
+
+        Returns:
+            TreeExport: Export with every available encoding
+        """
+        etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if len(body) < MINIMUM_COMPRESSED_SIZE:
+            return cls(body=body, etag=etag)
+        return cls(
+            body=body,
+            etag=etag,
+            # mtime=0 keeps the compressed bytes identical across workers
+            gzip=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+            brotli=brotli.compress(body, quality=BROTLI_QUALITY) if BROTLI_AVAILABLE else None,
+        )
+
+    def encode(self, accept_encoding: str = "") -> tuple[bytes, str | None]:
+        """Pick the smallest encoding a client accepts.
+
+        Args:
+            accept_encoding (str): Accept-Encoding request header
+
+        Returns:
+            tuple[bytes, str | None]: Body and its Content-Encoding, None for identity
+        """
+        accepted = _accepted_encodings(accept_encoding)
+        if self.brotli is not None and "br" in accepted:
+            return self.brotli, "br"
+        if self.gzip is not None and accepted & {"gzip", "*"}:
+            return self.gzip, "gzip"
+        return self.body, None
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the export, all encodings included."""
+        return len(self.body) + len(self.gzip or b"") + len(self.brotli or b"")
+
+
+class TreeExportCache:
+    """Bounded in-process cache of tree exports.
+
+    Keeps one export per manufacturing type and subtree root, tied to the
+    snapshot it was serialized from: an export is served only while its
+    snapshot is the current one, so it follows the snapshot's tree version.
+
+    Attributes:
+        maxsize: Maximum number of exports kept
+        hits: Lookups served from the cache
+        misses: Lookups that had to be serialized
+        stale: Exports dropped because the tree changed
+        evictions: Exports dropped to stay within maxsize
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """Initialize export cache.
+
+        Args:
+            maxsize (int): Maximum number of exports kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[int, int | None], tuple[TreeSnapshot, TreeExport]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, snapshot: TreeSnapshot, root_node_id: int | None = None) -> TreeExport | None:
+        """Get the export of a snapshot subtree.
+
+        Args:
+            snapshot (TreeSnapshot): Current snapshot of the manufacturing type
+            root_node_id (int | None): Subtree root, or None for the whole tree
+
+        Returns:
+            TreeExport | None: Export, or None on a miss
+        """
+        key = (snapshot.manufacturing_type_id, root_node_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not snapshot:
+                del self._entries[key]
+                self.stale += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, snapshot: TreeSnapshot, root_node_id: int | None, export: TreeExport) -> None:
+        """Store the export of a snapshot subtree.
+
+        Args:
+            snapshot (TreeSnapshot): Snapshot the export was serialized from
+            root_node_id (int | None): Subtree root, or None for the whole tree
+            export (TreeExport): Export to store
+        """
+        if self.maxsize <= 0:
+            return
+        key = (snapshot.manufacturing_type_id, root_node_id)
+        with self._lock:
+            self._entries[key] = (snapshot, export)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, manufacturing_type_id: int | None = None) -> None:
+        """Drop the exports of a manufacturing type, or all of them.
+
+        Args:
+            manufacturing_type_id (int | None): Manufacturing type ID, or None for all
+        """
+        with self._lock:
+            if manufacturing_type_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == manufacturing_type_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Clear all exports and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.stale = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        """Number of exports kept."""
+        return len(self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics for monitoring.
+
+        Returns:
+            dict[str, Any]: Size, capacity, bytes held and hit/miss/drop counters
+        """
+        lookups = self.hits + self.misses
+        with self._lock:
+            size_bytes = sum(export.size for _, export in self._entries.values())
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "bytes": size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stale": self.stale,
+            "evictions": self.evictions,
+        }
+
+
+_tree_export_cache: TreeExportCache | None = None
+
+
+def get_tree_export_cache() -> TreeExportCache:
+    """Get the process-wide export cache.
+
+    Exports are dropped when their tree version changes.
+
+    Returns:
+        TreeExportCache: Shared cache sized from Windx settings
+    """
+    global _tree_export_cache
+    if _tree_export_cache is None:
+        from app.core.config import get_settings
+
+        _tree_export_cache = TreeExportCache(maxsize=get_settings().windx.tree_export_cache_size)
+        get_tree_versions().subscribe(_tree_export_cache.invalidate)
+    return _tree_export_cache
+
+
+async def get_tree_export(db: AsyncSession, root: AttributeNode) -> TreeExport:
+    """Get the export of the subtree under an attribute node.
+
+    Subtrees of a manufacturing type are serialized from its shared
+    snapshot and reused until the tree changes. Nodes without a
+    manufacturing type have no snapshot; their subtrees are loaded and
+    serialized per call.
+
+    Args:
+        db (AsyncSession): Database session
+        root (AttributeNode): Subtree root
+
+    Returns:
+        TreeExport: Export of the root and all its descendants
+    """
+    if root.manufacturing_type_id is not None:
+        snapshot = await get_tree_snapshot(db, root.manufacturing_type_id)
+        if root.id in snapshot:
+            # A private snapshot must neither hit nor evict the shared exports
+            if has_pending_changes(db):
+                return TreeExport.from_body(serialize_snapshot(snapshot, root.id))
+            cache = get_tree_export_cache()
+            export = cache.get(snapshot, root.id)
+            if export is None:
+                export = TreeExport.from_body(serialize_snapshot(snapshot, root.id))
+                cache.put(snapshot, root.id, export)
+            return export
+
+    descendants = await AttributeNodeRepository(db).get_descendants(root.id)
+    return TreeExport.from_body(serialize_nodes([root, *descendants]))
@@ -0,0 +1,487 @@
+"""Immutable in-memory snapshots of attribute trees.
+
+Pricing, templates and tree exports read the same attribute nodes of a
+manufacturing type over and over. A snapshot loads the tree once per tree
+version into a compact, read-only structure shared by every request of
+the worker: node fields are stored as one tuple per column and the tree
+structure as integer arrays.
+
+Layout:
+    Nodes are numbered in depth-first preorder, siblings ordered by
+    ``sort_order``, name and ID. ``parents[i]`` is the index of node i's
+    parent (-1 for roots) and ``ends[i]`` the index after its last
+    descendant, so the subtree of node i is the index range
+    ``[i, ends[i])`` (its Euler-tour interval) and a descendant check is
+    two comparisons. The children of node i are
+    ``child_indexes[child_offsets[i]:child_offsets[i + 1]]``.
+
+Public Classes:
+    SnapshotNode: Read-only view of one node of a snapshot
+    TreeSnapshot: Immutable attribute tree of a manufacturing type
+    TreeSnapshotCache: Bounded, versioned in-process snapshot cache
+
+Public Functions:
+    get_tree_snapshot: Get the current snapshot of a manufacturing type
+    get_tree_snapshot_cache: Get the process-wide snapshot cache
+
+Features:
+    - O(1) lookup by ID, O(k) children, descendants and subtrees
+    - O(1) descendant checks through preorder intervals
+    - Node views exposing the AttributeNode column attributes
+    - Built from one query, stamped with the database tree version
+    - Dropped as soon as a tree version notification arrives
+    - Sessions with uncommitted tree changes never share snapshots
+    - Hit/miss counters for monitoring
+"""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping
+from types import MappingProxyType
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.attribute_node import AttributeNodeRepository
+from app.services.tree_versions import get_tree_version, get_tree_versions, has_pending_changes
+
+__all__ = [
+    "SnapshotNode",
+    "TreeSnapshot",
+    "TreeSnapshotCache",
+    "get_tree_snapshot",
+    "get_tree_snapshot_cache",
+]
+
+
+class SnapshotNode:
+    """Read-only view of one node of a snapshot.
+
+    Exposes every AttributeNode column attribute (``id``, ``name``,
+    ``ltree_path``, ``price_impact_value``, ...) read from the snapshot's
+    columns, so a view can be passed wherever a node's fields are read.
+    JSON values are shared between requests; do not mutate them.
+    """
+
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot: TreeSnapshot, index: int) -> None:
+        """Initialize view.
+
+        Args:
+            snapshot (TreeSnapshot): Snapshot holding the node
+            index (int): Preorder index of the node
+        """
+        object.__setattr__(self, "_snapshot", snapshot)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, name: str) -> Any:
+        """Read a column of the node."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        column = self._snapshot.columns.get(name)
+        if column is None:
+            raise AttributeError(f"'SnapshotNode' object has no attribute '{name}'")
+        return column[self._index]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Reject writes; snapshots are shared between requests."""
+        raise AttributeError("Snapshot nodes are read-only")
+
+    def __eq__(self, other: object) -> bool:
+        """Views are equal when they show the same node of the same snapshot."""
+        if not isinstance(other, SnapshotNode):
+            return NotImplemented
+        return self._snapshot is other._snapshot and self._index == other._index
+
+    def __hash__(self) -> int:
+        """Hash of the snapshot and node index."""
+        return hash((id(self._snapshot), self._index))
+
+    def __repr__(self) -> str:
+        """String representation of the view."""
+        return f"<SnapshotNode(id={self.id}, path='{self.ltree_path}')>"
+
+
+class TreeSnapshot:
+    """Immutable attribute tree of a manufacturing type.
+
+    Snapshots are shared between requests; do not mutate their members.
+
+    Attributes:
+        manufacturing_type_id: Manufacturing type the tree belongs to
+        ids: Node IDs in preorder
+        parents: Preorder index of each node's parent, -1 for roots
+        ends: Preorder index after each node's last descendant
+        child_offsets: Start of each node's children in child_indexes
+        child_indexes: Preorder indexes of children, grouped by parent
+        roots: Preorder indexes of root nodes, in sibling order
+        columns: Column values in preorder keyed by attribute name
+    """
+
+    __slots__ = (
+        "manufacturing_type_id",
+        "ids",
+        "parents",
+        "ends",
+        "child_offsets",
+        "child_indexes",
+        "roots",
+        "columns",
+        "_positions",
+    )
+
+    def __init__(self, manufacturing_type_id: int, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Initialize snapshot from node rows.
+
+        Nodes whose parent is not among the rows become roots.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            rows (Iterable[Mapping[str, Any]]): Node rows with at least id,
+                parent_node_id, name and sort_order, in any order
+        """
+        rows = list(rows)
+        by_id = {row["id"]: row for row in rows}
+        children: dict[int | None, list[Mapping[str, Any]]] = {}
+        for row in rows:
+            parent_id = row["parent_node_id"] if row["parent_node_id"] in by_id else None
+            children.setdefault(parent_id, []).append(row)
+        for siblings in children.values():
+            siblings.sort(key=lambda row: (row["sort_order"] or 0, row["name"], row["id"]))
+
+        # Iterative preorder walk; a node's subtree ends where the walk leaves it
+        order: list[Mapping[str, Any]] = []
+        parents: list[int] = []
+        ends = [0] * len(rows)
+        stack: list[tuple[Mapping[str, Any], int]] = [
+            (row, -1) for row in reversed(children.get(None, []))
+        ]
+        open_nodes: list[int] = []
+        while stack:
+            row, parent_index = stack.pop()
+            while open_nodes and open_nodes[-1] != parent_index:
+                ends[open_nodes.pop()] = len(order)
+            open_nodes.append(len(order))
+            order.append(row)
+            parents.append(parent_index)
+            index = len(order) - 1
+            stack.extend((child, index) for child in reversed(children.get(row["id"], [])))
+        for index in open_nodes:
+            ends[index] = len(order)
+        del ends[len(order) :]
+
+        self.manufacturing_type_id = manufacturing_type_id
+        self.ids = array("q", (row["id"] for row in order))
+        self.parents = array("l", parents)
+        self.ends = array("l", ends)
+        self._positions = {node_id: index for index, node_id in enumerate(self.ids)}
+
+        offsets = [0]
+        child_indexes: list[int] = []
+        for row in order:
+            child_indexes.extend(
+                self._positions[child["id"]] for child in children.get(row["id"], [])
+            )
+            offsets.append(len(child_indexes))
+        self.child_offsets = array("l", offsets)
+        self.child_indexes = array("l", child_indexes)
+        self.roots = array("l", (index for index, parent in enumerate(parents) if parent < 0))
+
+        keys = order[0].keys() if order else ()
+        self.columns = MappingProxyType({key: tuple(row[key] for row in order) for key in keys})
+
+    @classmethod
+    def build(cls, manufacturing_type_id: int, rows: Iterable[Mapping[str, Any]]) -> TreeSnapshot:
+        """Build a snapshot from node rows.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            rows (Iterable[Mapping[str, Any]]): Node rows, e.g. from
+                AttributeNodeRepository.get_tree_rows
+
+        Returns:
+            TreeSnapshot: Immutable snapshot
+        """
+        return cls(manufacturing_type_id, rows)
+
+    def __len__(self) -> int:
+        """Number of nodes."""
+        return len(self.ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        """Check whether a node ID belongs to the snapshot."""
+        return node_id in self._positions
+
+    def __iter__(self) -> Iterator[SnapshotNode]:
+        """Iterate over all nodes in preorder."""
+        return (SnapshotNode(self, index) for index in range(len(self.ids)))
+
+    def index_of(self, node_id: int) -> int | None:
+        """Get the preorder index of a node.
+
+        Args:
+            node_id (int): Node ID
+
+        Returns:
+            int | None: Preorder index, or None if the node is not in the tree
+        """
+        return self._positions.get(node_id)
+
+    def get(self, node_id: int) -> SnapshotNode | None:
+        """Get a node by ID.
+
+        Args:
+            node_id (int): Node ID
+
+        Returns:
+            SnapshotNode | None: Node view, or None if the node is not in the tree
+        """
+        index = self._positions.get(node_id)
+        return None if index is None else SnapshotNode(self, index)
+
+    def children(self, node_id: int | None = None) -> list[SnapshotNode]:
+        """Get the children of a node in sibling order.
+
+        Args:
+            node_id (int | None): Node ID, or None for the root nodes
+
+        Returns:
+            list[SnapshotNode]: Children; empty if the node is not in the tree
+        """
+        if node_id is None:
+            return [SnapshotNode(self, index) for index in self.roots]
+        index = self._positions.get(node_id)
+        if index is None:
+            return []
+        start, stop = self.child_offsets[index], self.child_offsets[index + 1]
+        return [SnapshotNode(self, child) for child in self.child_indexes[start:stop]]
+
+    def subtree(self, node_id: int) -> list[SnapshotNode]:
+        """Get a node and its descendants in preorder.
+
+        Args:
+            node_id (int): Node ID
+
+        Returns:
+            list[SnapshotNode]: Node first, then its descendants; empty if
+                the node is not in the tree
+        """
+        index = self._positions.get(node_id)
+        if index is None:
+            return []
+        return [SnapshotNode(self, i) for i in range(index, self.ends[index])]
+
+    def descendants(self, node_id: int) -> list[SnapshotNode]:
+        """Get the descendants of a node in preorder.
+
+        Args:
+            node_id (int): Node ID
+
+        Returns:
+            list[SnapshotNode]: Descendants
+        """
+        return self.subtree(node_id)[1:]
+
+    def ancestors(self, node_id: int) -> list[SnapshotNode]:
+        """Get the ancestors of a node, root first.
+
+        Args:
+            node_id (int): Node ID
+
+        Returns:
+            list[SnapshotNode]: Ancestors; empty for roots and unknown nodes
+        """
+        index = self._positions.get(node_id)
+        path: list[SnapshotNode] = []
+        while index is not None and self.parents[index] >= 0:
+            index = self.parents[index]
+            path.append(SnapshotNode(self, index))
+        return path[::-1]
+
+    def is_descendant(self, node_id: int, ancestor_id: int) -> bool:
+        """Check whether a node lies strictly below another node.
+
+        Args:
+            node_id (int): Candidate descendant ID
+            ancestor_id (int): Candidate ancestor ID
+
+        Returns:
+            bool: True if node_id is in ancestor_id's subtree and not the same node
+        """
+        index = self._positions.get(node_id)
+        ancestor = self._positions.get(ancestor_id)
+        if index is None or ancestor is None:
+            return False
+        return ancestor < index < self.ends[ancestor]
+
+
+class TreeSnapshotCache:
+    """Bounded, versioned in-process cache of tree snapshots.
+
+    Keeps one snapshot per manufacturing type, stamped with the tree
+    version it was built from.
+
+    Attributes:
+        maxsize: Maximum number of manufacturing types kept
+        hits: Lookups served from the cache
+        misses: Lookups that had to be built
+        stale: Snapshots dropped because the tree version changed
+        evictions: Snapshots dropped to stay within maxsize
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        """Initialize snapshot cache.
+
+        Args:
+            maxsize (int): Maximum number of manufacturing types kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self._entries: OrderedDict[int, tuple[int, TreeSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, manufacturing_type_id: int, version: int) -> TreeSnapshot | None:
+        """Get the snapshot of a manufacturing type at a tree version.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            version (int): Tree version
+
+        Returns:
+            TreeSnapshot | None: Snapshot, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(manufacturing_type_id)
+            if entry is not None and entry[0] != version:
+                del self._entries[manufacturing_type_id]
+                self.stale += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(manufacturing_type_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, manufacturing_type_id: int, version: int, snapshot: TreeSnapshot) -> None:
+        """Store the snapshot of a manufacturing type at a tree version.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            version (int): Tree version the snapshot was built from
+            snapshot (TreeSnapshot): Snapshot to store
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[manufacturing_type_id] = (version, snapshot)
+            self._entries.move_to_end(manufacturing_type_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, manufacturing_type_id: int | None = None) -> None:
+        """Drop the snapshot of a manufacturing type, or all of them.
+
+        Args:
+            manufacturing_type_id (int | None): Manufacturing type ID, or None for all
+        """
+        with self._lock:
+            if manufacturing_type_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(manufacturing_type_id, None)
+
+    def clear(self) -> None:
+        """Clear all snapshots and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.stale = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        """Number of snapshots kept."""
+        return len(self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics for monitoring.
+
+        Returns:
+            dict[str, Any]: Size, capacity, node count and hit/miss/drop counters
+        """
+        lookups = self.hits + self.misses
+        with self._lock:
+            nodes = sum(len(snapshot) for _, snapshot in self._entries.values())
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "nodes": nodes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stale": self.stale,
+            "evictions": self.evictions,
+        }
+
+
+_tree_snapshot_cache: TreeSnapshotCache | None = None
+
+
+def get_tree_snapshot_cache() -> TreeSnapshotCache:
+    """Get the process-wide snapshot cache.
+
+    Snapshots are dropped when their tree version changes.
+
+    Returns:
+        TreeSnapshotCache: Shared cache sized from Windx settings
+    """
+    global _tree_snapshot_cache
+    if _tree_snapshot_cache is None:
+        from app.core.config import get_settings
+
+        _tree_snapshot_cache = TreeSnapshotCache(
+            maxsize=get_settings().windx.tree_snapshot_cache_size
+        )
+        get_tree_versions().subscribe(_tree_snapshot_cache.invalidate)
+    return _tree_snapshot_cache
+
+
+async def get_tree_snapshot(db: AsyncSession, manufacturing_type_id: int) -> TreeSnapshot:
+    """Get the current snapshot of a manufacturing type.
+
+    Snapshots are shared per tree version and built with one query on a
+    miss. A session holding uncommitted attribute tree changes gets a
+    private snapshot of its own view instead, which is not shared.
+
+    Args:
+        db (AsyncSession): Database session
+        manufacturing_type_id (int): Manufacturing type ID
+
+    Returns:
+        TreeSnapshot: Snapshot of the manufacturing type's attribute tree
+    """
+    cache = get_tree_snapshot_cache()
+    # Read the version first: a snapshot is never older than its stamp
+    version = None
+    if not has_pending_changes(db):
+        version = await get_tree_version(db, manufacturing_type_id)
+    if version is not None:
+        snapshot = cache.get(manufacturing_type_id, version)
+        if snapshot is not None:
+            return snapshot
+
+    rows = await AttributeNodeRepository(db).get_tree_rows(manufacturing_type_id)
+    snapshot = TreeSnapshot.build(manufacturing_type_id, rows)
+    # Loading may have flushed pending changes of the session
+    if version is not None and not has_pending_changes(db):
+        cache.put(manufacturing_type_id, version, snapshot)
+    return snapshot
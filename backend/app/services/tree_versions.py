@@ -0,0 +1,403 @@
+"""Attribute tree versions maintained by the database.
+
+A trigger on attribute_nodes (``app/database/sql/04_tree_versions.sql``)
+bumps a per-manufacturing-type counter in ``attribute_tree_versions``
+whenever a statement writes nodes of the type, whoever the writer, and
+announces the new version on the ``attribute_tree_versions`` channel when
+the transaction commits.
+
+Each worker listens on that channel over a dedicated connection. While the
+listener is connected, versions the worker has seen are answered from
+memory and caches subscribed to the registry drop the entries of a
+manufacturing type as soon as its tree changes. Without a listener (for
+example behind a transaction pooler, which does not support LISTEN),
+get_tree_version reads the counter row with one primary key lookup.
+
+A session that wrote attribute nodes, through the ORM or with Core
+statements, sees versions no other transaction can see yet. Such sessions
+are tracked until they commit or roll back, and caches keyed by tree
+version must neither serve them shared entries nor store what they build.
+
+Public Classes:
+    TreeVersionRegistry: Per-worker view of attribute tree versions
+
+Public Functions:
+    get_tree_versions: Get the process-wide tree version registry
+    get_tree_version: Get the current tree version of a manufacturing type
+    has_pending_changes: Check whether a session wrote uncommitted tree changes
+    start_tree_version_listener: Start applying version notifications
+    stop_tree_version_listener: Stop applying version notifications
+
+Features:
+    - Versions bumped by the database for every writer, committed or not at all
+    - In-memory reads while notifications keep them current
+    - Per-type subscriptions for precise invalidation of derived caches
+    - Reconnects with everything invalidated, since notifications may have been missed
+    - Sessions with uncommitted tree changes never publish their versions
+    - Uncommitted ORM flushes and Core statements on attribute nodes tracked per session
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.models.attribute_node import AttributeNode
+from app.models.attribute_tree_version import AttributeTreeVersion
+from app.models.manufacturing_type import ManufacturingType
+
+__all__ = [
+    "TREE_VERSION_CHANNEL",
+    "UNTYPED_TREE_ID",
+    "TreeVersionRegistry",
+    "get_tree_version",
+    "get_tree_versions",
+    "has_pending_changes",
+    "start_tree_version_listener",
+    "stop_tree_version_listener",
+]
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel of the attribute tree version trigger
+TREE_VERSION_CHANNEL = "attribute_tree_versions"
+
+# Version key of attribute nodes without a manufacturing type (product definitions)
+UNTYPED_TREE_ID = 0
+
+# Session.info key marking a transaction that wrote attribute nodes
+_PENDING_KEY = "windx_tree_changed"
+
+TreeVersionCallback = Callable[[int | None], None]
+
+
+class TreeVersionRegistry:
+    """Per-worker view of attribute tree versions.
+
+    Subscribers are called with the manufacturing type whose tree changed,
+    or with None when any tree may have changed (listener reconnects).
+
+    Attributes:
+        schema: Database schema whose notifications are applied
+        retry_delay: Seconds to wait before reconnecting the listener
+        listening: Whether notifications currently keep versions current
+        hits: Versions answered from memory
+        misses: Versions read from the database
+        notifications: Version changes applied from notifications
+        resets: Times every version was forgotten
+    """
+
+    def __init__(self, schema: str = "public", retry_delay: float = 5.0) -> None:
+        """Initialize tree version registry.
+
+        Args:
+            schema (str): Database schema whose notifications are applied
+            retry_delay (float): Seconds to wait before reconnecting the listener
+        """
+        self.schema = schema
+        self.retry_delay = retry_delay
+        self.listening = False
+        self.hits = 0
+        self.misses = 0
+        self.notifications = 0
+        self.resets = 0
+        self._versions: dict[int, int] = {}
+        self._epoch = 0
+        self._subscribers: list[TreeVersionCallback] = []
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def get_tree_version(self, db: AsyncSession, manufacturing_type_id: int) -> int:
+        """Get the current tree version of a manufacturing type.
+
+        Args:
+            db (AsyncSession): Database session, used when the version is not known
+            manufacturing_type_id (int): Manufacturing type ID, or UNTYPED_TREE_ID
+
+        Returns:
+            int: Tree version; 0 if the tree was never written
+        """
+        # Inside a session that changed the tree, the row holds its own bump
+        shared = self.listening and not has_pending_changes(db)
+        epoch = self._epoch
+        if shared:
+            with self._lock:
+                version = self._versions.get(manufacturing_type_id)
+            if version is not None:
+                self.hits += 1
+                return version
+
+        self.misses += 1
+        version = await db.scalar(
+            select(AttributeTreeVersion.version).where(
+                AttributeTreeVersion.manufacturing_type_id == manufacturing_type_id
+            )
+        )
+        version = version or 0
+        if shared and not has_pending_changes(db):
+            with self._lock:
+                # A reconnect in between may have missed newer versions
+                if self._epoch == epoch:
+                    known = self._versions.get(manufacturing_type_id, 0)
+                    self._versions[manufacturing_type_id] = max(known, version)
+        return version
+
+    def apply(self, manufacturing_type_id: int, version: int) -> bool:
+        """Apply a committed tree version.
+
+        Args:
+            manufacturing_type_id (int): Manufacturing type ID
+            version (int): Committed tree version
+
+        Returns:
+            bool: True if the version was newer than the known one
+        """
+        with self._lock:
+            known = self._versions.get(manufacturing_type_id)
+            if known is not None and known >= version:
+                return False
+            self._versions[manufacturing_type_id] = version
+            self.notifications += 1
+        self._publish(manufacturing_type_id)
+        return True
+
+    def handle_notification(self, payload: str) -> bool:
+        """Apply a ``<schema>:<manufacturing_type_id>:<version>`` notification.
+
+        Args:
+            payload (str): Notification payload
+
+        Returns:
+            bool: True if a newer version of this worker's schema was applied
+        """
+        try:
+            schema, type_id, version = payload.rsplit(":", 2)
+            manufacturing_type_id, version_number = int(type_id), int(version)
+        except ValueError:
+            logger.warning("Ignoring malformed tree version notification: %r", payload)
+            return False
+        if schema != self.schema:
+            return False
+        return self.apply(manufacturing_type_id, version_number)
+
+    def reset(self) -> None:
+        """Forget every known version and invalidate every subscriber."""
+        with self._lock:
+            self._versions.clear()
+            self._epoch += 1
+            self.resets += 1
+        self._publish(None)
+
+    def subscribe(self, callback: TreeVersionCallback) -> None:
+        """Call a function whenever a tree version changes.
+
+        Callbacks run on the event loop and must not block.
+
+        Args:
+            callback (TreeVersionCallback): Called with the manufacturing
+                type ID, or None when every tree may have changed
+        """
+        self._subscribers.append(callback)
+
+    def start(self, connect: Callable[[], Awaitable[Any]]) -> None:
+        """Start listening for notifications in the background.
+
+        Args:
+            connect (Callable[[], Awaitable[Any]]): Opens a new asyncpg connection
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen(connect))
+
+    async def stop(self) -> None:
+        """Stop listening; versions are read from the database afterwards."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get registry statistics for monitoring.
+
+        Returns:
+            dict[str, Any]: Listener state, known versions and counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "listening": self.listening,
+            "known": len(self._versions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "notifications": self.notifications,
+            "resets": self.resets,
+        }
+
+    def _publish(self, manufacturing_type_id: int | None) -> None:
+        """Call subscribers, isolating their failures."""
+        for callback in list(self._subscribers):
+            try:
+                callback(manufacturing_type_id)
+            except Exception:
+                logger.exception("Tree version subscriber failed")
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """asyncpg notification callback."""
+        self.handle_notification(payload)
+
+    async def _listen(self, connect: Callable[[], Awaitable[Any]]) -> None:
+        """Keep a listener connection open, reconnecting after failures."""
+        while True:
+            try:
+                await self._listen_once(connect)
+                logger.warning("Tree version listener connection closed, reconnecting")
+            except Exception as e:
+                logger.warning("Tree version listener failed, reconnecting: %s", e)
+            await asyncio.sleep(self.retry_delay)
+
+    async def _listen_once(self, connect: Callable[[], Awaitable[Any]]) -> None:
+        """Apply notifications until the listener connection closes."""
+        connection = await connect()
+        closed = asyncio.Event()
+        try:
+            connection.add_termination_listener(lambda _connection: closed.set())
+            await connection.add_listener(TREE_VERSION_CHANNEL, self._on_notification)
+            # Versions read before LISTEN took effect may have missed changes
+            self.reset()
+            self.listening = True
+            logger.info("Listening for attribute tree version notifications")
+            await closed.wait()
+        finally:
+            if self.listening:
+                self.listening = False
+                self.reset()
+            if not connection.is_closed():
+                with contextlib.suppress(Exception):
+                    await connection.close()
+
+
+_tree_versions: TreeVersionRegistry | None = None
+
+
+def get_tree_versions() -> TreeVersionRegistry:
+    """Get the process-wide tree version registry.
+
+    Returns:
+        TreeVersionRegistry: Shared registry for the configured database schema
+    """
+    global _tree_versions
+    if _tree_versions is None:
+        from app.core.config import get_settings
+
+        _tree_versions = TreeVersionRegistry(schema=get_settings().database.schema_)
+    return _tree_versions
+
+
+async def get_tree_version(db: AsyncSession, manufacturing_type_id: int) -> int:
+    """Get the current tree version of a manufacturing type.
+
+    Args:
+        db (AsyncSession): Database session, used when the version is not known
+        manufacturing_type_id (int): Manufacturing type ID, or UNTYPED_TREE_ID
+
+    Returns:
+        int: Tree version; 0 if the tree was never written
+    """
+    return await get_tree_versions().get_tree_version(db, manufacturing_type_id)
+
+
+async def start_tree_version_listener() -> bool:
+    """Start applying tree version notifications in this worker.
+
+    Returns:
+        bool: False if notifications are disabled or unsupported by the
+            connection mode; versions are then read from the database
+    """
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    if not settings.windx.tree_version_notifications:
+        return False
+    if settings.database.connection_mode == "transaction_pooler":
+        logger.info("Transaction pooler does not support LISTEN; reading tree versions per use")
+        return False
+
+    import asyncpg
+    from sqlalchemy.engine import make_url
+
+    dsn = (
+        make_url(settings.database.url)
+        .set(drivername="postgresql")
+        .render_as_string(hide_password=False)
+    )
+    get_tree_versions().start(lambda: asyncpg.connect(dsn))
+    return True
+
+
+async def stop_tree_version_listener() -> None:
+    """Stop applying tree version notifications in this worker."""
+    await get_tree_versions().stop()
+
+
+def has_pending_changes(session: AsyncSession | Session) -> bool:
+    """Check whether a session wrote attribute nodes it has not committed.
+
+    Such a session must build tree-derived data itself; shared entries do
+    not show its own changes, and what it builds must not be shared.
+
+    Args:
+        session (AsyncSession | Session): Database session
+
+    Returns:
+        bool: True if the session's transaction changed attribute nodes
+    """
+    return _PENDING_KEY in session.info
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tree_changes(session: Session, flush_context: Any) -> None:
+    """Mark a session that flushed attribute node changes."""
+    changed = any(isinstance(obj, AttributeNode) for obj in session.new) or any(
+        # Deleted manufacturing types take their nodes with them
+        isinstance(obj, AttributeNode | ManufacturingType)
+        for obj in session.deleted
+    )
+    changed = changed or any(
+        isinstance(obj, AttributeNode) and session.is_modified(obj) for obj in session.dirty
+    )
+    if changed:
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tree_changes(orm_execute_state: ORMExecuteState) -> None:
+    """Mark a session that ran an INSERT, UPDATE or DELETE on attribute nodes.
+
+    Covers bulk ORM statements and Core statements on the table, which
+    bypass flush events.
+    """
+    statement = orm_execute_state.statement
+    if getattr(statement, "is_dml", False) and statement.table.is_derived_from(
+        AttributeNode.__table__
+    ):
+        orm_execute_state.session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_committed_tree_changes(session: Session) -> None:
+    """Forget tree changes once they are visible to every transaction."""
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tree_changes(session: Session) -> None:
+    """Forget tree changes of a rolled back transaction."""
+    session.info.pop(_PENDING_KEY, None)
@@ -38,6 +38,7 @@ from app.core.exceptions import setup_exception_handlers
 from app.core.limiter import close_limiter, init_limiter
 from app.core.middleware import setup_middleware
 from app.database import close_db, get_db, init_db
+from app.services.tree_versions import start_tree_version_listener, stop_tree_version_listener
 
 __all__ = ["app", "root", "health_check", "lifespan"]
 
@@ -77,9 +78,11 @@ async def init_services():
     await init_db()
     await init_cache()
     await init_limiter()
+    await start_tree_version_listener()
 
 
 async def close_servicers():
+    await stop_tree_version_listener()
     await close_db()
     await close_cache()
     await close_limiter()
@@ -116,7 +119,7 @@ async def lifespan(application: FastAPI):
         print(f"[-] Configuration error: {e}")
         raise
 
-    await init_services()  # db, cache, limiter
+    await init_services()  # db, cache, limiter, tree versions
 
     # Check if database is set up
     try:
@@ -130,7 +133,7 @@ async def lifespan(application: FastAPI):
 
     # Shutdown
     print("[*] Shutting down application...")
-    await close_servicers()  # db, cache, limiter
+    await close_servicers()  # tree versions, db, cache, limiter
     print("[+] Application shutdown complete")
 
 
@@ -0,0 +1,17 @@
+"""Pricing engine microbenchmarks and regression suite.
+
+Generates attribute trees and configurations from the ``_manager_factory``
+data pools, seeds them into a database and times the hot paths of the
+pricing engine against stored JSON baselines.
+
+Usage:
+    python -m tests.benchmarks --scale 1k
+    python -m tests.benchmarks --scale 100k --update-baseline
+    pytest tests/benchmarks -m benchmark
+
+Features:
+    - Configurable tree depth, leaf count and configuration count
+    - Preset scales of 10, 1k and 100k configurations
+    - SQLite stand-in with LTREE/JSONB shims, or a local PostgreSQL
+    - JSON baselines per scale that fail runs on regression
+"""
@@ -0,0 +1,5 @@
+"""Run the pricing engine benchmarks from the command line."""
+
+from tests.benchmarks.runner import main
+
+raise SystemExit(main())
@@ -0,0 +1,342 @@
+"""Deterministic benchmark datasets built from the factory data pools.
+
+Mirrors the hierarchy produced by ``create_factory_manufacturing_data``
+(categories → attributes → options → sub-options) but assigns IDs up front
+and returns plain row dictionaries, so datasets of any size can be bulk
+inserted without per-node flushes.
+
+Public Classes:
+    BenchmarkScale: Dataset size of one benchmark run
+    BenchmarkDataset: Generated tree and configuration rows
+
+Public Functions:
+    generate_dataset: Generate a dataset for a scale
+
+Public Constants:
+    SCALES: Preset scales keyed by name (10, 1k, 100k)
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from _manager_factory import (
+    ATTRIBUTES,
+    BOOLEAN_OPTIONS,
+    CATEGORIES,
+    MANUFACTURING_TYPES,
+    OPTIONS,
+    PRICE_FORMULAS,
+    PRICE_IMPACT_TYPE_WEIGHTS,
+    PRICE_IMPACT_TYPES,
+    WEIGHT_FORMULAS,
+)
+from app.services.formula_engine import get_formula_cache
+
+__all__ = ["BenchmarkScale", "BenchmarkDataset", "SCALES", "generate_dataset"]
+
+MANUFACTURING_TYPE_ID = 1
+
+# Variables bound by PricingService.build_formula_context
+PRICING_VARIABLES = frozenset({"value", "width", "height", "depth", "quantity"})
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkScale:
+    """Dataset size of one benchmark run.
+
+    Attributes:
+        name: Scale name, also the baseline file suffix
+        configurations: Number of configurations to generate and price
+        depth: Maximum tree depth (0 = categories, 2 = options, 3+ = sub-options)
+        root_leaves: Number of root categories
+        leaves: Number of options per selection attribute
+        preview_rows: Number of configurations rendered in the preview table
+        repeat: Timed repetitions per benchmark; the fastest one is kept
+    """
+
+    name: str
+    configurations: int
+    depth: int
+    root_leaves: int
+    leaves: int
+    preview_rows: int
+    repeat: int = 5
+
+
+SCALES: dict[str, BenchmarkScale] = {
+    "10": BenchmarkScale(
+        "10", configurations=10, depth=3, root_leaves=3, leaves=3, preview_rows=10
+    ),
+    "1k": BenchmarkScale(
+        "1k", configurations=1_000, depth=3, root_leaves=5, leaves=5, preview_rows=1_000
+    ),
+    "100k": BenchmarkScale(
+        "100k",
+        configurations=100_000,
+        depth=4,
+        root_leaves=8,
+        leaves=8,
+        preview_rows=5_000,
+        repeat=1,
+    ),
+}
+
+
+@dataclass(slots=True)
+class BenchmarkDataset:
+    """Generated tree and configuration rows.
+
+    Attributes:
+        scale: Scale the dataset was generated for
+        manufacturing_type: Manufacturing type row
+        nodes: Attribute node rows in ltree order
+        seed: Random seed used for configurations
+    """
+
+    scale: BenchmarkScale
+    manufacturing_type: dict[str, Any]
+    nodes: list[dict[str, Any]]
+    seed: int
+    _children: dict[int, list[dict[str, Any]]] = field(default_factory=dict, repr=False)
+
+    @property
+    def attributes(self) -> list[dict[str, Any]]:
+        """Attribute node rows a configuration selects values for."""
+        return [node for node in self.nodes if node["node_type"] == "attribute"]
+
+    def iter_configurations(
+        self, batch_size: int = 5_000
+    ) -> Iterator[tuple[list[dict[str, Any]], list[dict[str, Any]]]]:
+        """Generate configuration and selection rows in batches.
+
+        Every configuration selects one option (and possibly one sub-option)
+        per selection attribute and a numeric value per number attribute.
+
+        Args:
+            batch_size (int): Configurations per batch
+
+        Yields:
+            tuple: Configuration rows and their selection rows
+        """
+        rng = random.Random(self.seed)
+        base_price = self.manufacturing_type["base_price"]
+        attributes = self.attributes
+        selection_id = 0
+        configurations: list[dict[str, Any]] = []
+        selections: list[dict[str, Any]] = []
+
+        for config_id in range(1, self.scale.configurations + 1):
+            configurations.append(
+                {
+                    "id": config_id,
+                    "manufacturing_type_id": MANUFACTURING_TYPE_ID,
+                    "name": f"Benchmark Configuration {config_id}",
+                    "status": "draft",
+                    "base_price": base_price,
+                    "total_price": base_price,
+                    "calculated_weight": Decimal("0.00"),
+                }
+            )
+            for attribute in attributes:
+                chosen = [attribute]
+                if attribute["data_type"] != "number":
+                    options = self._children.get(attribute["id"])
+                    if not options:
+                        continue
+                    chosen = [rng.choice(options)]
+                    sub_options = self._children.get(chosen[0]["id"])
+                    if sub_options:
+                        chosen.append(rng.choice(sub_options))
+
+                for node in chosen:
+                    selection_id += 1
+                    selections.append(
+                        {
+                            "id": selection_id,
+                            "configuration_id": config_id,
+                            "attribute_node_id": node["id"],
+                            "numeric_value": Decimal(rng.randint(24, 96))
+                            if node["data_type"] == "number"
+                            else None,
+                            "string_value": node["name"] if node is not attribute else None,
+                            "boolean_value": node["name"] == "Yes"
+                            if node["data_type"] == "boolean"
+                            else None,
+                            "selection_path": node["ltree_path"],
+                        }
+                    )
+
+            if len(configurations) >= batch_size:
+                yield configurations, selections
+                configurations, selections = [], []
+
+        if configurations:
+            yield configurations, selections
+
+
+def _slug(name: str) -> str:
+    """Convert a display name to an ltree label."""
+    return "".join(ch if ch.isalnum() else "_" for ch in name.lower())
+
+
+def _pricing_formulas(templates: list[str]) -> list[str]:
+    """Keep formula templates whose variables the pricing context binds."""
+    cache = get_formula_cache()
+    return [
+        template
+        for template in templates
+        if cache.get(template.format(factor="1")).variables <= PRICING_VARIABLES
+    ]
+
+
+def _cycle(templates: list[dict[str, Any]], count: int) -> list[tuple[dict[str, Any], str]]:
+    """Take ``count`` templates with unique names, suffixing repeats of the pool.
+
+    Returns:
+        list[tuple[dict[str, Any], str]]: Template and name suffix pairs
+    """
+    return [
+        (
+            templates[index % len(templates)],
+            f" {index // len(templates) + 1}" if index >= len(templates) else "",
+        )
+        for index in range(count)
+    ]
+
+
+def generate_dataset(scale: BenchmarkScale, seed: int = 42) -> BenchmarkDataset:
+    """Generate a deterministic attribute tree for a scale.
+
+    Args:
+        scale (BenchmarkScale): Dataset size
+        seed (int): Random seed for prices, rule types and formulas
+
+    Returns:
+        BenchmarkDataset: Tree rows; configurations are generated lazily
+    """
+    rng = random.Random(seed)
+    price_formulas = _pricing_formulas(PRICE_FORMULAS)
+    weight_formulas = _pricing_formulas(WEIGHT_FORMULAS)
+    mfg_template = MANUFACTURING_TYPES[0]
+    manufacturing_type = {
+        "id": MANUFACTURING_TYPE_ID,
+        "name": f"Benchmark {mfg_template['name']}",
+        "description": mfg_template["description"],
+        "base_category": mfg_template["base_category"],
+        "base_price": Decimal(f"{rng.uniform(*mfg_template['base_price']):.2f}"),
+        "base_weight": Decimal(f"{rng.uniform(*mfg_template['base_weight']):.2f}"),
+        "is_active": True,
+    }
+    nodes: list[dict[str, Any]] = []
+    children: dict[int, list[dict[str, Any]]] = {}
+
+    def add_node(parent: dict[str, Any] | None, name: str, sort_order: int, **values) -> dict:
+        path = _slug(name) if parent is None else f"{parent['ltree_path']}.{_slug(name)}"
+        node = {
+            "id": len(nodes) + 1,
+            "manufacturing_type_id": MANUFACTURING_TYPE_ID,
+            "parent_node_id": parent["id"] if parent else None,
+            "name": name,
+            "required": False,
+            "price_impact_type": "fixed",
+            "price_impact_value": Decimal("0.00"),
+            "price_formula": None,
+            "weight_impact": Decimal("0.00"),
+            "weight_formula": None,
+            "ltree_path": path,
+            "depth": 0 if parent is None else parent["depth"] + 1,
+            "sort_order": sort_order,
+            **values,
+        }
+        nodes.append(node)
+        if parent is not None:
+            children.setdefault(parent["id"], []).append(node)
+        return node
+
+    def add_options(
+        parent: dict[str, Any], templates: list[tuple[dict[str, Any], str]], depth: int
+    ) -> None:
+        for index, (template, suffix) in enumerate(templates):
+            price_type = rng.choices(PRICE_IMPACT_TYPES, weights=PRICE_IMPACT_TYPE_WEIGHTS)[0]
+            price_value: Decimal | None = None
+            price_formula = None
+            if price_type == "fixed":
+                price_value = Decimal(f"{rng.uniform(*template.get('price_range', (0, 0))):.2f}")
+            elif price_type == "percentage":
+                price_value = Decimal(f"{rng.uniform(5, 25):.2f}")
+            else:
+                factor = rng.uniform(0.01, 0.15)
+                price_formula = rng.choice(price_formulas).format(factor=f"{factor:.4f}")
+
+            weight_impact = Decimal(f"{rng.uniform(*template.get('weight_range', (0, 0))):.2f}")
+            weight_formula = None
+            if rng.random() < 0.1:
+                factor = rng.uniform(0.001, 0.05)
+                weight_formula = rng.choice(weight_formulas).format(factor=f"{factor:.4f}")
+                weight_impact = Decimal("0.00")
+
+            option = add_node(
+                parent,
+                template["name"] + suffix,
+                index,
+                node_type="option",
+                data_type=parent["data_type"],
+                price_impact_type=price_type,
+                price_impact_value=price_value,
+                price_formula=price_formula,
+                weight_impact=weight_impact,
+                weight_formula=weight_formula,
+                ui_component=parent["ui_component"],
+                description=template.get("description"),
+                help_text=template.get("help_text"),
+            )
+            if depth < scale.depth and rng.random() < 0.3:
+                add_options(option, templates, depth + 1)
+
+    for cat_index, (category, cat_suffix) in enumerate(_cycle(CATEGORIES, scale.root_leaves)):
+        category_node = add_node(
+            None,
+            category["name"] + cat_suffix,
+            cat_index,
+            node_type="category",
+            data_type="string",
+            ui_component=category["ui_component"],
+            description=category["description"],
+        )
+        if scale.depth < 1:
+            continue
+        for attr_index, template in enumerate(ATTRIBUTES.get(category["name"], [])):
+            attribute = add_node(
+                category_node,
+                template["name"] + cat_suffix,
+                attr_index,
+                node_type="attribute",
+                data_type=template["data_type"],
+                required=template["required"],
+                ui_component=template["ui_component"],
+                description=template["description"],
+                help_text=template.get("help_text"),
+                metadata_=template.get("metadata"),
+            )
+            if scale.depth < 2 or template["data_type"] == "number":
+                continue
+            if template["data_type"] == "boolean":
+                option_templates = _cycle(BOOLEAN_OPTIONS, len(BOOLEAN_OPTIONS))
+            else:
+                pool = OPTIONS.get(template["name"], BOOLEAN_OPTIONS)
+                option_templates = _cycle(pool, scale.leaves)
+            add_options(attribute, option_templates, 2)
+
+    nodes.sort(key=lambda node: node["ltree_path"])
+    return BenchmarkDataset(
+        scale=scale,
+        manufacturing_type=manufacturing_type,
+        nodes=nodes,
+        seed=seed,
+        _children=children,
+    )
@@ -0,0 +1,199 @@
+"""Benchmark database setup.
+
+Benchmarks run against a local PostgreSQL database when a URL is given and
+otherwise against an in-memory SQLite stand-in. The stand-in compiles the
+PostgreSQL-only column types (LTREE, JSONB) to SQLite equivalents and
+emulates the LTREE operators (``@>``, ``<@``, ``||``) and functions
+(``subpath``, ``nlevel``) with Python functions registered on each
+connection, and bumps attribute tree versions with row-level triggers in
+place of the PostgreSQL statement-level ones, so the same code paths run
+unchanged on both.
+
+Public Functions:
+    create_benchmark_engine: Create the engine for a benchmark run
+    create_schema: Create the pricing tables
+    drop_schema: Drop the pricing tables
+    seed_dataset: Bulk insert a generated dataset
+
+Warning:
+    ``drop_schema`` drops the pricing tables of the target database. Only
+    point benchmarks at a scratch PostgreSQL database.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import Table, event, insert, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.elements import BinaryExpression
+
+from app.database.types import LTREE
+from app.models.attribute_node import AttributeNode
+from app.models.attribute_tree_version import AttributeTreeVersion
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.models.document_counter import DocumentCounter
+from app.models.manufacturing_type import ManufacturingType
+from tests.benchmarks.data import BenchmarkDataset
+
+__all__ = ["create_benchmark_engine", "create_schema", "drop_schema", "seed_dataset"]
+
+SQLITE_URL = "sqlite+aiosqlite://"
+
+BENCHMARK_TABLES: list[Table] = [
+    ManufacturingType.__table__,
+    AttributeNode.__table__,
+    Configuration.__table__,
+    ConfigurationSelection.__table__,
+    DocumentCounter.__table__,
+    AttributeTreeVersion.__table__,
+]
+
+TREE_VERSION_SCRIPT = (
+    Path(__file__).resolve().parents[2] / "app" / "database" / "sql" / "04_tree_versions.sql"
+)
+
+# Row-level stand-ins for the tree version triggers: every written row bumps its type
+_BUMP_TREE_VERSION = """
+    INSERT INTO attribute_tree_versions (manufacturing_type_id, version, updated_at)
+    VALUES (COALESCE({row}.manufacturing_type_id, 0), 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (manufacturing_type_id) DO UPDATE
+    SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+"""
+SQLITE_TREE_VERSION_TRIGGERS = [
+    f"""
+    CREATE TRIGGER bump_attribute_tree_version_{event} AFTER {event} ON attribute_nodes
+    BEGIN {"".join(_BUMP_TREE_VERSION.format(row=row) for row in rows)} END
+    """
+    for event, rows in (("insert", ["NEW"]), ("update", ["NEW", "OLD"]), ("delete", ["OLD"]))
+]
+
+
+@compiles(LTREE, "sqlite")
+def _compile_ltree_sqlite(type_, compiler, **kw) -> str:
+    """Store LTREE paths as text; benchmarks only compare and sort them."""
+    return "TEXT"
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw) -> str:
+    """Store JSONB documents with SQLite's JSON type."""
+    return "JSON"
+
+
+# LTREE operators and the PostgreSQL functions implementing them
+LTREE_OPERATOR_FUNCTIONS = {"@>": "ltree_isparent", "<@": "ltree_risparent", "||": "ltree_addltree"}
+
+
+@compiles(BinaryExpression, "sqlite")
+def _compile_ltree_operators_sqlite(binary, compiler, **kw) -> str:
+    """Call the emulating functions for LTREE operators."""
+    function = LTREE_OPERATOR_FUNCTIONS.get(getattr(binary.operator, "opstring", None))
+    if function is None or not isinstance(binary.left.type, LTREE):
+        return compiler.visit_binary(binary, **kw)
+    left = compiler.process(binary.left, **kw)
+    right = compiler.process(binary.right, **kw)
+    return f"{function}({left}, {right})"
+
+
+def _ltree_isparent(ancestor: str, path: str) -> bool:
+    return path == ancestor or path.startswith(f"{ancestor}.")
+
+
+def _ltree_subpath(path: str, offset: int, length: int | None = None) -> str:
+    labels = path.split(".")
+    # Like PostgreSQL, refuse offsets past the last label
+    if not 0 <= offset < len(labels):
+        raise ValueError(f"invalid positions: subpath({path!r}, {offset})")
+    return ".".join(labels[offset:] if length is None else labels[offset : offset + length])
+
+
+def _register_ltree_functions(dbapi_connection, connection_record) -> None:
+    """Register the LTREE emulation on a new SQLite connection."""
+    functions = {
+        ("ltree_isparent", 2): _ltree_isparent,
+        ("ltree_risparent", 2): lambda path, ancestor: _ltree_isparent(ancestor, path),
+        ("ltree_addltree", 2): lambda left, right: ".".join(p for p in (left, right) if p),
+        ("subpath", 2): _ltree_subpath,
+        ("subpath", 3): _ltree_subpath,
+        ("nlevel", 1): lambda path: len(path.split(".")) if path else 0,
+        # Session settings only matter to PostgreSQL triggers
+        ("set_config", 3): lambda setting, value, is_local: value,
+    }
+    for (name, arity), function in functions.items():
+        dbapi_connection.create_function(name, arity, function, deterministic=True)
+
+
+def create_benchmark_engine(database_url: str | None = None) -> AsyncEngine:
+    """Create the engine for a benchmark run.
+
+    Args:
+        database_url (str | None): Async PostgreSQL URL, or None for the
+            in-memory SQLite stand-in
+
+    Returns:
+        AsyncEngine: Benchmark engine
+    """
+    if database_url:
+        return create_async_engine(database_url)
+    # One shared connection keeps the in-memory database alive
+    engine = create_async_engine(SQLITE_URL, poolclass=StaticPool)
+    event.listen(engine.sync_engine, "connect", _register_ltree_functions)
+    return engine
+
+
+async def create_schema(engine: AsyncEngine) -> None:
+    """Create the pricing tables, dropping leftovers of an aborted run.
+
+    Args:
+        engine (AsyncEngine): Benchmark engine
+    """
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS ltree"))
+        await conn.run_sync(lambda sync_conn: _drop_tables(sync_conn))
+        await conn.run_sync(
+            lambda sync_conn: BENCHMARK_TABLES[0].metadata.create_all(
+                sync_conn, tables=BENCHMARK_TABLES
+            )
+        )
+        if conn.dialect.name == "postgresql":
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.execute(TREE_VERSION_SCRIPT.read_text(encoding="utf-8"))
+        else:
+            for trigger in SQLITE_TREE_VERSION_TRIGGERS:
+                await conn.execute(text(trigger))
+
+
+async def drop_schema(engine: AsyncEngine) -> None:
+    """Drop the pricing tables.
+
+    Args:
+        engine (AsyncEngine): Benchmark engine
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: _drop_tables(sync_conn))
+
+
+def _drop_tables(sync_conn) -> None:
+    """Drop the pricing tables in dependency order."""
+    BENCHMARK_TABLES[0].metadata.drop_all(sync_conn, tables=BENCHMARK_TABLES, checkfirst=True)
+
+
+async def seed_dataset(session: AsyncSession, dataset: BenchmarkDataset) -> None:
+    """Bulk insert a generated dataset.
+
+    Args:
+        session (AsyncSession): Session bound to the benchmark engine
+        dataset (BenchmarkDataset): Dataset to insert
+    """
+    await session.execute(insert(ManufacturingType), [dataset.manufacturing_type])
+    await session.execute(insert(AttributeNode), dataset.nodes)
+    for configurations, selections in dataset.iter_configurations():
+        await session.execute(insert(Configuration), configurations)
+        await session.execute(insert(ConfigurationSelection), selections)
+    await session.commit()
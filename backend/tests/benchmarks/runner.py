@@ -0,0 +1,606 @@
+"""Benchmark runner with JSON baselines.
+
+Seeds a generated dataset, times the pricing engine hot paths and compares
+the timings with the stored baseline of the same scale and database.
+
+Benchmarks:
+    build_tree: ``AttributeNodeRepository.build_tree`` over the whole tree
+    tree_export: ``serialize_snapshot`` and ``TreeExport.from_body`` over the
+        whole tree (JSON and compressed encodings, uncached)
+    form_schema: ``EntryService.generate_form_schema`` for the profile page
+    pricing: ``PricingService.calculate_prices_for_configurations`` over
+        every configuration, in batches, with a cold quote cache
+    preview_table: ``EntryService.generate_preview_table`` over
+        ``preview_rows`` configurations
+    number_allocation: ``NumberAllocator.allocate`` of one quote number at a
+        time, one per configuration (at most 10k), after 10k quotes were
+        already numbered that day
+    subtree_move: ``HierarchyBuilderService.move_node`` of a deep category
+        (``MOVE_LEVELS_PER_DEPTH * depth`` levels of ``leaves ** 2`` options)
+        back and forth between two root categories
+    formula_eval: ``get_formula_cache().get(formula).evaluate`` of the price
+        and weight formula of every selection, with its pricing context
+    formula_interpret: ``interpret_formula`` of the same formulas and
+        contexts, the uncompiled reference for ``formula_eval``
+
+Each benchmark runs in a fresh session; setup (loading inputs) is not
+timed and garbage collection is paused while timing. The fastest of
+``scale.repeat`` repetitions is reported.
+
+Public Classes:
+    BenchmarkResult: Timing of one benchmark
+    BenchmarkReport: Timings of one run
+
+Public Functions:
+    run_benchmarks: Seed a dataset and run every benchmark
+    baseline_path: Get the baseline file of a run
+    load_baseline: Load a stored baseline
+    save_baseline: Store a report as the new baseline
+    find_regressions: Compare a report with a baseline
+    main: Command line entry point
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import gc
+import json
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.models.document_counter import DocumentCounter
+from app.repositories.attribute_node import AttributeNodeRepository
+from app.repositories.document_counter import DocumentCounterRepository
+from app.services import price_cache, schema_cache
+from app.services.entry import EntryService
+from app.services.formula_engine import get_formula_cache, interpret_formula
+from app.services.hierarchy_builder import HierarchyBuilderService
+from app.services.number_allocator import NumberAllocator
+from app.services.price_cache import PriceQuoteCache
+from app.services.pricing import PricingService
+from app.services.schema_cache import ProfileSchemaCache
+from app.services.tree_export import TreeExport, serialize_snapshot
+from app.services.tree_snapshot import TreeSnapshot
+from tests.benchmarks.data import (
+    MANUFACTURING_TYPE_ID,
+    SCALES,
+    BenchmarkScale,
+    generate_dataset,
+)
+from tests.benchmarks.database import (
+    create_benchmark_engine,
+    create_schema,
+    drop_schema,
+    seed_dataset,
+)
+
+__all__ = [
+    "BenchmarkResult",
+    "BenchmarkReport",
+    "run_benchmarks",
+    "baseline_path",
+    "load_baseline",
+    "save_baseline",
+    "find_regressions",
+    "main",
+]
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DATABASE_URL_ENV = "WINDX_BENCHMARK_DATABASE_URL"
+
+# Allowed slowdown over the baseline before a run fails
+DEFAULT_TOLERANCE = 0.5
+
+# Slowdowns below this many seconds are timer noise
+MIN_REGRESSION_SECONDS = 0.005
+
+# Configurations priced per calculate_prices_for_configurations call
+PRICING_BATCH_SIZE = 1_000
+
+# Quotes already numbered on the day the allocation benchmark runs
+DAILY_QUOTES = 10_000
+
+# Category levels of the moved subtree per level of the dataset tree
+MOVE_LEVELS_PER_DEPTH = 4
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Timing of one benchmark.
+
+    Attributes:
+        seconds: Fastest repetition in seconds
+        operations: Items processed per repetition
+    """
+
+    seconds: float
+    operations: int
+
+    @property
+    def per_second(self) -> float:
+        """Throughput in items per second."""
+        return self.operations / self.seconds if self.seconds else float("inf")
+
+
+@dataclass(slots=True)
+class BenchmarkReport:
+    """Timings of one benchmark run.
+
+    Attributes:
+        scale: Scale name
+        database: Database dialect name (sqlite or postgresql)
+        dataset: Row counts of the seeded dataset
+        results: Benchmark results keyed by benchmark name
+    """
+
+    scale: str
+    database: str
+    dataset: dict[str, int]
+    results: dict[str, BenchmarkResult] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the report for a baseline file."""
+        return {
+            "scale": self.scale,
+            "database": self.database,
+            "dataset": self.dataset,
+            "results": {
+                name: {**asdict(result), "seconds": round(result.seconds, 6)}
+                for name, result in self.results.items()
+            },
+        }
+
+
+@dataclass(slots=True)
+class _Benchmark:
+    """Untimed setup and timed body of one benchmark."""
+
+    name: str
+    setup: Callable[[AsyncSession], Awaitable[Any]]
+    run: Callable[[AsyncSession, Any], Awaitable[int]]
+
+
+async def _load_tree(session: AsyncSession) -> list[AttributeNode]:
+    return await AttributeNodeRepository(session).get_by_manufacturing_type(MANUFACTURING_TYPE_ID)
+
+
+async def _run_build_tree(session: AsyncSession, nodes: list[AttributeNode]) -> int:
+    AttributeNodeRepository.build_tree(nodes)
+    return len(nodes)
+
+
+async def _load_tree_snapshot(session: AsyncSession) -> TreeSnapshot:
+    rows = await AttributeNodeRepository(session).get_tree_rows(MANUFACTURING_TYPE_ID)
+    return TreeSnapshot.build(MANUFACTURING_TYPE_ID, rows)
+
+
+async def _run_tree_export(session: AsyncSession, snapshot: TreeSnapshot) -> int:
+    TreeExport.from_body(serialize_snapshot(snapshot))
+    return len(snapshot)
+
+
+async def _load_profile_nodes(session: AsyncSession) -> list[AttributeNode]:
+    result = await session.execute(
+        select(AttributeNode)
+        .where(
+            AttributeNode.manufacturing_type_id == MANUFACTURING_TYPE_ID,
+            AttributeNode.page_type == "profile",
+        )
+        .order_by(AttributeNode.ltree_path, AttributeNode.sort_order)
+    )
+    return list(result.scalars().all())
+
+
+async def _run_form_schema(session: AsyncSession, nodes: list[AttributeNode]) -> int:
+    await EntryService(session).generate_form_schema(MANUFACTURING_TYPE_ID, nodes)
+    return len(nodes)
+
+
+async def _load_configuration_ids(session: AsyncSession) -> list[int]:
+    # Price cold: the quote cache would otherwise answer every repetition
+    price_cache._price_quote_cache = PriceQuoteCache(use_redis=False)
+    result = await session.execute(select(Configuration.id).order_by(Configuration.id))
+    return list(result.scalars().all())
+
+
+async def _run_pricing(session: AsyncSession, config_ids: list[int]) -> int:
+    service = PricingService(session)
+    for start in range(0, len(config_ids), PRICING_BATCH_SIZE):
+        await service.calculate_prices_for_configurations(
+            config_ids[start : start + PRICING_BATCH_SIZE]
+        )
+    return len(config_ids)
+
+
+def _load_preview_configurations(
+    rows: int,
+) -> Callable[[AsyncSession], Awaitable[tuple[EntryService, list[Configuration]]]]:
+    async def load(session: AsyncSession) -> tuple[EntryService, list[Configuration]]:
+        service = EntryService(session)
+        # Header mappings are cached on the class; rebuild them every repetition
+        service.clear_header_cache()
+        result = await session.execute(
+            select(Configuration)
+            .options(selectinload(Configuration.selections))
+            .order_by(Configuration.id)
+            .limit(rows)
+        )
+        return service, list(result.scalars().all())
+
+    return load
+
+
+async def _run_preview_table(
+    session: AsyncSession, state: tuple[EntryService, list[Configuration]]
+) -> int:
+    service, configs = state
+    await service.generate_preview_table(configs, MANUFACTURING_TYPE_ID)
+    return len(configs)
+
+
+async def _seed_daily_quotes(session: AsyncSession) -> tuple[NumberAllocator, date]:
+    # Every repetition starts from a day that already numbered DAILY_QUOTES
+    day = date.today()
+    await session.execute(delete(DocumentCounter))
+    await DocumentCounterRepository(session).insert("Q", day, DAILY_QUOTES)
+    await session.commit()
+    return NumberAllocator(block_size=1), day
+
+
+def _run_number_allocation(
+    allocations: int,
+) -> Callable[[AsyncSession, tuple[NumberAllocator, date]], Awaitable[int]]:
+    async def run(session: AsyncSession, state: tuple[NumberAllocator, date]) -> int:
+        allocator, day = state
+        for _ in range(allocations):
+            await allocator.allocate(session, "Q", day=day)
+        return allocations
+
+    return run
+
+
+def _deep_category(levels: int, options: int) -> dict[str, Any]:
+    tree: dict[str, Any] = {"name": f"Moved Level {levels}", "node_type": "category"}
+    for level in reversed(range(levels)):
+        tree = {
+            "name": f"Moved Level {level}",
+            "node_type": "category",
+            "children": [
+                tree,
+                *({"name": f"Option {o}", "node_type": "option"} for o in range(options)),
+            ],
+        }
+    return tree
+
+
+def _seed_subtree_move(
+    scale: BenchmarkScale,
+) -> Callable[[AsyncSession], Awaitable[tuple[HierarchyBuilderService, int, int, int]]]:
+    async def setup(session: AsyncSession) -> tuple[HierarchyBuilderService, int, int, int]:
+        service = HierarchyBuilderService(session)
+        roots = dict(
+            (
+                await session.execute(
+                    select(AttributeNode.name, AttributeNode.id).where(
+                        AttributeNode.manufacturing_type_id == MANUFACTURING_TYPE_ID,
+                        AttributeNode.name.in_(("Move Source", "Move Target", "Moved Level 0")),
+                    )
+                )
+            ).all()
+        )
+        if not roots:
+            # First repetition: the deep category starts under the source
+            source = await service.create_hierarchy_from_dict(
+                MANUFACTURING_TYPE_ID,
+                {
+                    "name": "Move Source",
+                    "node_type": "category",
+                    "children": [
+                        _deep_category(MOVE_LEVELS_PER_DEPTH * scale.depth, scale.leaves**2)
+                    ],
+                },
+            )
+            target = await service.create_hierarchy_from_dict(
+                MANUFACTURING_TYPE_ID, {"name": "Move Target", "node_type": "category"}
+            )
+            roots = {"Move Source": source.id, "Move Target": target.id}
+            roots["Moved Level 0"] = await session.scalar(
+                select(AttributeNode.id).where(AttributeNode.parent_node_id == source.id)
+            )
+        moved = await session.get(AttributeNode, roots["Moved Level 0"])
+        # Later repetitions move it back to where it is not
+        target_id = (
+            roots["Move Target"]
+            if moved.parent_node_id == roots["Move Source"]
+            else roots["Move Source"]
+        )
+        subtree = await session.scalar(
+            select(func.count())
+            .select_from(AttributeNode)
+            .where(
+                AttributeNode.manufacturing_type_id == MANUFACTURING_TYPE_ID,
+                AttributeNode.ltree_path.descendant_of(moved.ltree_path),
+            )
+        )
+        return service, moved.id, target_id, subtree
+
+    return setup
+
+
+async def _run_subtree_move(
+    session: AsyncSession, state: tuple[HierarchyBuilderService, int, int, int]
+) -> int:
+    service, node_id, target_id, subtree = state
+    await service.move_node(node_id, target_id)
+    return subtree
+
+
+async def _load_formula_evaluations(
+    session: AsyncSession,
+) -> list[tuple[str, ast.expr, dict[str, Any]]]:
+    result = await session.execute(
+        select(ConfigurationSelection, AttributeNode.price_formula, AttributeNode.weight_formula)
+        .join(AttributeNode, ConfigurationSelection.attribute_node_id == AttributeNode.id)
+        .where(
+            AttributeNode.manufacturing_type_id == MANUFACTURING_TYPE_ID,
+            (AttributeNode.price_formula.is_not(None))
+            | (AttributeNode.weight_formula.is_not(None)),
+        )
+        .order_by(ConfigurationSelection.id)
+    )
+    cache = get_formula_cache()
+    evaluations = []
+    for selection, *formulas in result.all():
+        context = PricingService.build_formula_context(selection)
+        for formula in filter(None, formulas):
+            # Skip contexts pricing would reject for a missing variable;
+            # looking the formula up here also compiles it before timing
+            if cache.get(formula).variables <= context.keys():
+                evaluations.append((formula, ast.parse(formula, mode="eval").body, context))
+    return evaluations
+
+
+async def _run_formula_eval(
+    session: AsyncSession, evaluations: list[tuple[str, ast.expr, dict[str, Any]]]
+) -> int:
+    cache = get_formula_cache()
+    for formula, _, context in evaluations:
+        cache.get(formula).evaluate(context)
+    return len(evaluations)
+
+
+async def _run_formula_interpret(
+    session: AsyncSession, evaluations: list[tuple[str, ast.expr, dict[str, Any]]]
+) -> int:
+    for _, tree, context in evaluations:
+        interpret_formula(tree, context)
+    return len(evaluations)
+
+
+def _benchmarks(scale: BenchmarkScale) -> list[_Benchmark]:
+    return [
+        _Benchmark("build_tree", _load_tree, _run_build_tree),
+        _Benchmark("tree_export", _load_tree_snapshot, _run_tree_export),
+        _Benchmark("form_schema", _load_profile_nodes, _run_form_schema),
+        _Benchmark("pricing", _load_configuration_ids, _run_pricing),
+        _Benchmark(
+            "preview_table",
+            _load_preview_configurations(scale.preview_rows),
+            _run_preview_table,
+        ),
+        _Benchmark(
+            "number_allocation",
+            _seed_daily_quotes,
+            _run_number_allocation(min(scale.configurations, DAILY_QUOTES)),
+        ),
+        _Benchmark("subtree_move", _seed_subtree_move(scale), _run_subtree_move),
+        _Benchmark("formula_eval", _load_formula_evaluations, _run_formula_eval),
+        _Benchmark("formula_interpret", _load_formula_evaluations, _run_formula_interpret),
+    ]
+
+
+async def _count(session: AsyncSession, model: type) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+async def run_benchmarks(
+    scale: BenchmarkScale,
+    database_url: str | None = None,
+    only: list[str] | None = None,
+) -> BenchmarkReport:
+    """Seed a dataset and run every benchmark.
+
+    Args:
+        scale (BenchmarkScale): Dataset size
+        database_url (str | None): Async PostgreSQL URL of a scratch
+            database, or None for the SQLite stand-in
+        only (list[str] | None): Names of the benchmarks to run
+
+    Returns:
+        BenchmarkReport: Timings of the run
+    """
+    engine = create_benchmark_engine(database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    previous_cache = price_cache._price_quote_cache
+    previous_schema_cache = schema_cache._profile_schema_cache
+    # Commits of tree changes bump schema versions in process, not in Redis
+    schema_cache._profile_schema_cache = ProfileSchemaCache(use_redis=False)
+    try:
+        await create_schema(engine)
+        async with session_factory() as session:
+            await seed_dataset(session, generate_dataset(scale))
+            report = BenchmarkReport(
+                scale=scale.name,
+                database=engine.dialect.name,
+                dataset={
+                    "nodes": await _count(session, AttributeNode),
+                    "configurations": await _count(session, Configuration),
+                    "selections": await _count(session, ConfigurationSelection),
+                },
+            )
+
+        for benchmark in _benchmarks(scale):
+            if only and benchmark.name not in only:
+                continue
+            best = float("inf")
+            operations = 0
+            for _ in range(scale.repeat):
+                async with session_factory() as session:
+                    state = await benchmark.setup(session)
+                    # Like timeit, keep the collector out of the timed body
+                    gc.collect()
+                    gc.disable()
+                    try:
+                        start = time.perf_counter()
+                        operations = await benchmark.run(session, state)
+                        best = min(best, time.perf_counter() - start)
+                    finally:
+                        gc.enable()
+            report.results[benchmark.name] = BenchmarkResult(seconds=best, operations=operations)
+        return report
+    finally:
+        price_cache._price_quote_cache = previous_cache
+        schema_cache._profile_schema_cache = previous_schema_cache
+        await drop_schema(engine)
+        await engine.dispose()
+
+
+def baseline_path(report: BenchmarkReport, directory: Path = BASELINE_DIR) -> Path:
+    """Get the baseline file of a run.
+
+    Args:
+        report (BenchmarkReport): Benchmark report
+        directory (Path): Baseline directory
+
+    Returns:
+        Path: ``<database>-<scale>.json`` in the baseline directory
+    """
+    return directory / f"{report.database}-{report.scale}.json"
+
+
+def load_baseline(path: Path) -> dict[str, Any] | None:
+    """Load a stored baseline.
+
+    Args:
+        path (Path): Baseline file
+
+    Returns:
+        dict[str, Any] | None: Baseline, or None if none is stored
+    """
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(report: BenchmarkReport, path: Path) -> None:
+    """Store a report as the new baseline.
+
+    Args:
+        report (BenchmarkReport): Benchmark report
+        path (Path): Baseline file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    report: BenchmarkReport,
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    """Compare a report with a baseline.
+
+    A benchmark regresses when it is more than ``tolerance`` slower than
+    its baseline and the slowdown exceeds the timer noise floor.
+
+    Args:
+        report (BenchmarkReport): Benchmark report
+        baseline (dict[str, Any]): Stored baseline of the same scale
+        tolerance (float): Allowed relative slowdown
+
+    Returns:
+        list[str]: Regression descriptions; empty when the run passes
+    """
+    if baseline.get("dataset") != report.dataset:
+        return [
+            f"dataset changed ({baseline.get('dataset')} -> {report.dataset}); "
+            "re-run with --update-baseline"
+        ]
+
+    regressions = []
+    for name, result in report.results.items():
+        expected = baseline["results"].get(name)
+        if expected is None:
+            continue
+        limit = expected["seconds"] * (1 + tolerance)
+        if result.seconds > limit and result.seconds - expected["seconds"] > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{name}: {result.seconds:.4f}s vs baseline {expected['seconds']:.4f}s "
+                f"(limit {limit:.4f}s)"
+            )
+    return regressions
+
+
+def _print_report(report: BenchmarkReport, baseline: dict[str, Any] | None) -> None:
+    print(f"Scale {report.scale} on {report.database}: {report.dataset}")
+    print(f"{'benchmark':<18}{'seconds':>12}{'items/s':>14}{'baseline':>12}")
+    for name, result in report.results.items():
+        expected = (baseline or {}).get("results", {}).get(name, {}).get("seconds")
+        expected_text = f"{expected:.4f}" if expected is not None else "-"
+        print(f"{name:<18}{result.seconds:>12.4f}{result.per_second:>14,.0f}{expected_text:>12}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command line entry point.
+
+    Args:
+        argv (list[str] | None): Command line arguments
+
+    Returns:
+        int: 0 on success, 1 on regression
+    """
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Windx pricing engine benchmarks")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get(DATABASE_URL_ENV),
+        help=f"Scratch PostgreSQL URL (default: ${DATABASE_URL_ENV}, else SQLite)",
+    )
+    parser.add_argument("--only", nargs="+", help="Benchmarks to run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmarks(SCALES[args.scale], args.database_url, args.only))
+    path = baseline_path(report)
+    baseline = load_baseline(path)
+    _print_report(report, baseline)
+
+    if args.update_baseline:
+        save_baseline(report, path)
+        print(f"Baseline written to {path}")
+        return 0
+    if baseline is None:
+        print(f"No baseline at {path}; run with --update-baseline to create it")
+        return 0
+
+    regressions = find_regressions(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
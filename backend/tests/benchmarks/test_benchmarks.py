@@ -0,0 +1,137 @@
+"""Pricing engine benchmark regression tests.
+
+Runs the benchmark suite at the scale named by ``WINDX_BENCHMARK_SCALE``
+(default ``10``) against the database in ``WINDX_BENCHMARK_DATABASE_URL``
+(default: SQLite stand-in). Baselines hold absolute timings of the machine
+that recorded them, so the comparison with them only runs when
+``WINDX_BENCHMARK_COMPARE=1`` is set.
+
+Tests cover:
+- Deterministic dataset generation from the factory pools
+- Batch pricing on the stand-in matching single-configuration pricing
+- Regression detection against baselines
+"""
+
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.services.formula_engine import get_formula_cache
+from app.services.pricing import PricingService
+from tests.benchmarks.data import PRICING_VARIABLES, SCALES, generate_dataset
+from tests.benchmarks.database import (
+    create_benchmark_engine,
+    create_schema,
+    drop_schema,
+    seed_dataset,
+)
+from tests.benchmarks.runner import (
+    DATABASE_URL_ENV,
+    BenchmarkReport,
+    BenchmarkResult,
+    baseline_path,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+)
+
+pytestmark = pytest.mark.benchmark
+
+SCALE = SCALES[os.environ.get("WINDX_BENCHMARK_SCALE", "10")]
+
+# Opt-in to comparing timings with the stored baselines
+COMPARE_ENV = "WINDX_BENCHMARK_COMPARE"
+
+
+class TestBenchmarkDataset:
+    """Test dataset generation."""
+
+    def test_deterministic(self):
+        """Test the same seed generates the same tree and configurations."""
+        first, second = generate_dataset(SCALES["10"]), generate_dataset(SCALES["10"])
+
+        assert first.nodes == second.nodes
+        assert list(first.iter_configurations()) == list(second.iter_configurations())
+
+    def test_formulas_bind_to_pricing_context(self):
+        """Test generated formulas only read variables the pricing context binds."""
+        dataset = generate_dataset(SCALES["1k"])
+        formulas = [
+            node[key]
+            for node in dataset.nodes
+            for key in ("price_formula", "weight_formula")
+            if node[key]
+        ]
+
+        assert formulas
+        for formula in formulas:
+            assert get_formula_cache().get(formula).variables <= PRICING_VARIABLES
+
+
+@pytest.mark.asyncio
+async def test_stand_in_batch_pricing_matches_single_pricing():
+    """Test batch pricing on the stand-in agrees with per-configuration pricing."""
+    engine = create_benchmark_engine()
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    try:
+        await create_schema(engine)
+        async with session_factory() as session:
+            await seed_dataset(session, generate_dataset(SCALES["10"]))
+            service = PricingService(session)
+
+            batch = await service.calculate_prices_for_configurations(list(range(1, 11)))
+            single = {
+                config_id: await service.calculate_configuration_price(config_id)
+                for config_id in range(1, 11)
+            }
+    finally:
+        await drop_schema(engine)
+        await engine.dispose()
+
+    assert batch == single
+    assert len({totals["total_price"] for totals in batch.values()}) > 1
+
+
+class TestRegressions:
+    """Test regression detection against stored baselines."""
+
+    @staticmethod
+    def report(seconds: float) -> BenchmarkReport:
+        """Create a report with one pricing result."""
+        return BenchmarkReport(
+            scale="10",
+            database="sqlite",
+            dataset={"configurations": 10},
+            results={"pricing": BenchmarkResult(seconds=seconds, operations=10)},
+        )
+
+    def test_find_regressions(self):
+        """Test slowdowns beyond tolerance and the noise floor are reported."""
+        baseline = self.report(0.1).to_dict()
+
+        assert find_regressions(self.report(0.14), baseline, tolerance=0.5) == []
+        assert len(find_regressions(self.report(0.2), baseline, tolerance=0.5)) == 1
+        # Tiny benchmarks may double without exceeding the noise floor
+        tiny = self.report(0.001).to_dict()
+        assert find_regressions(self.report(0.004), tiny, tolerance=0.5) == []
+
+    def test_changed_dataset_requires_new_baseline(self):
+        """Test a baseline of a different dataset is reported as stale."""
+        baseline = {**self.report(0.1).to_dict(), "dataset": {"configurations": 20}}
+
+        assert "update-baseline" in find_regressions(self.report(0.1), baseline)[0]
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(
+        os.environ.get(COMPARE_ENV) != "1",
+        reason=f"Baselines are machine specific; set {COMPARE_ENV}=1 to compare",
+    )
+    async def test_no_regressions(self):
+        """Test the current tree is not slower than the stored baseline."""
+        report = await run_benchmarks(SCALE, os.environ.get(DATABASE_URL_ENV))
+        baseline = load_baseline(baseline_path(report))
+        if baseline is None:
+            pytest.skip(f"No baseline for {report.database}-{report.scale}")
+
+        assert find_regressions(report, baseline) == []
@@ -213,6 +213,43 @@ def setup_test_settings(test_settings: TestSettings):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def isolated_pricing_caches(monkeypatch: pytest.MonkeyPatch):
+    """Give every test its own in-process price quote and pricing plan caches.
+
+    Tests reuse configuration and attribute node IDs with different pricing
+    rules, so memoized prices and plans must not leak between tests.
+    """
+    from app.services import price_cache, pricing_plan
+
+    monkeypatch.setattr(price_cache, "_price_quote_cache", price_cache.PriceQuoteCache())
+    monkeypatch.setattr(pricing_plan, "_pricing_plan_cache", pricing_plan.PricingPlanCache())
+
+
+@pytest.fixture(autouse=True)
+def isolated_schema_cache(monkeypatch: pytest.MonkeyPatch):
+    """Give every test its own in-process form schema cache.
+
+    Tests reuse manufacturing type IDs with different attribute trees, so
+    compiled schemas must not leak between tests.
+    """
+    from app.services import schema_cache
+
+    monkeypatch.setattr(schema_cache, "_profile_schema_cache", schema_cache.ProfileSchemaCache())
+
+
+@pytest.fixture(autouse=True)
+def isolated_header_registry(monkeypatch: pytest.MonkeyPatch):
+    """Give every test its own preview header registry.
+
+    Tests reuse manufacturing type IDs with different attribute nodes, so
+    header sets must not leak between tests.
+    """
+    from app.services import header_registry
+
+    monkeypatch.setattr(header_registry, "_header_registry", header_registry.HeaderRegistry())
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_engine():
     """Create test database engine with asyncpg driver.
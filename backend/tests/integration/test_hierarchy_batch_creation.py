@@ -282,9 +282,9 @@ class TestCreateHierarchyFromDict:
             "required": True,
             "price_impact_type": "percentage",
             "price_impact_value": 15.00,
-            "price_formula": "base_price * 1.15",
+            "price_formula": "value * 1.15",
             "weight_impact": 5.5,
-            "weight_formula": "base_weight * 1.1",
+            "weight_formula": "quantity * 1.1",
             "technical_property_type": "u_value",
             "technical_impact_formula": "1 / r_value",
             "sort_order": 10,
@@ -307,9 +307,9 @@ class TestCreateHierarchyFromDict:
         assert root.required is True
         assert root.price_impact_type == "percentage"
         assert root.price_impact_value == Decimal("15.00")
-        assert root.price_formula == "base_price * 1.15"
+        assert root.price_formula == "value * 1.15"
         assert root.weight_impact == Decimal("5.5")
-        assert root.weight_formula == "base_weight * 1.1"
+        assert root.weight_formula == "quantity * 1.1"
         assert root.technical_property_type == "u_value"
         assert root.technical_impact_formula == "1 / r_value"
         assert root.sort_order == 10
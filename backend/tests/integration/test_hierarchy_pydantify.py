@@ -382,7 +382,7 @@ async def test_pydantify_preserves_all_fields(db_session: AsyncSession):
         required=True,
         price_impact_type="fixed",
         price_impact_value=Decimal("50.00"),
-        price_formula="base * 1.5",
+        price_formula="value * 1.5",
         weight_impact=Decimal("2.50"),
         weight_formula="width * height * 0.01",
         technical_property_type="u_value",
@@ -413,7 +413,7 @@ async def test_pydantify_preserves_all_fields(db_session: AsyncSession):
     assert pydantic_node.required is True
     assert pydantic_node.price_impact_type == "fixed"
     assert pydantic_node.price_impact_value == Decimal("50.00")
-    assert pydantic_node.price_formula == "base * 1.5"
+    assert pydantic_node.price_formula == "value * 1.5"
     assert pydantic_node.weight_impact == Decimal("2.50")
     assert pydantic_node.weight_formula == "width * height * 0.01"
     assert pydantic_node.technical_property_type == "u_value"
@@ -70,7 +70,8 @@ async def configuration(
         description="Test configuration for quotes",
         status="draft",
         reference_code="TEST-CONFIG-001",
-        base_price=manufacturing_type.base_price,
+        # No selections, so the priced total equals the base price
+        base_price=Decimal("525.00"),
         total_price=Decimal("525.00"),
         calculated_weight=Decimal("23.00"),
         calculated_technical_data={},
@@ -0,0 +1,395 @@
+"""Unit tests for vectorized bulk repricing.
+
+Tests cover:
+- Vectorized totals match the PricingService plan pass on mixed fixed/percentage/formula rules
+- Only changed totals are written, with the trigger change reason set
+- Dry runs, failed selections and missing attribute nodes
+- Vectorized formula evaluation against the scalar path
+- Throughput: vectorized pass vs per-configuration pricing
+"""
+
+import random
+import time
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundException
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.models.manufacturing_type import ManufacturingType
+from app.repositories.configuration import ConfigurationRepository
+from app.services.formula_engine import compile_formula
+from app.services.pricing import PricingService
+from app.services.pricing_plan import build_pricing_plan
+from app.services.repricing import BulkRepricingService
+
+ConfigRow = namedtuple("ConfigRow", "id base_price total_price calculated_weight")
+SelectionRow = namedtuple(
+    "SelectionRow",
+    "id configuration_id attribute_node_id numeric_value string_value "
+    "calculated_price_impact calculated_weight_impact",
+)
+
+CENT = Decimal("0.01")
+
+
+def make_nodes() -> dict[int, AttributeNode]:
+    """Create attribute nodes covering every pricing rule."""
+    nodes = [
+        AttributeNode(
+            id=1,
+            name="Aluminum",
+            node_type="option",
+            price_impact_type="fixed",
+            price_impact_value=Decimal("50.00"),
+            weight_impact=Decimal("2.00"),
+        ),
+        AttributeNode(
+            id=2,
+            name="Premium",
+            node_type="option",
+            price_impact_type="percentage",
+            price_impact_value=Decimal("12.50"),
+        ),
+        AttributeNode(
+            id=3,
+            name="Width",
+            node_type="attribute",
+            price_impact_type="formula",
+            price_formula="width * 0.5",
+            weight_formula="width * 0.1",
+            weight_impact=Decimal("9.99"),
+        ),
+        AttributeNode(
+            id=4,
+            name="Glass",
+            node_type="attribute",
+            price_impact_type="formula",
+            price_formula="(value + 10) / 4",
+        ),
+        AttributeNode(
+            id=5,
+            name="Surcharge",
+            node_type="option",
+            price_impact_type="formula",
+            price_formula="price_impact * 0.1",
+        ),
+        AttributeNode(
+            id=6,
+            name="Label",
+            node_type="option",
+            price_impact_type="fixed",
+            price_impact_value=None,
+            weight_formula="  quantity * 0.25 ",
+        ),
+    ]
+    return {node.id: node for node in nodes}
+
+
+def make_dataset(config_count: int, seed: int = 7):
+    """Create configurations and selections with random values."""
+    rng = random.Random(seed)
+    mfg_type = ManufacturingType(
+        id=1, name="Casement Window", base_price=Decimal("200"), base_weight=Decimal("15")
+    )
+    configs = []
+    selections = []
+    selection_id = 0
+    for config_id in range(1, config_count + 1):
+        config = Configuration(
+            id=config_id,
+            manufacturing_type_id=1,
+            name=f"Config {config_id}",
+            base_price=Decimal(rng.randint(100, 300)),
+            total_price=Decimal("0.00"),
+            calculated_weight=Decimal("0.00"),
+        )
+        config.manufacturing_type = mfg_type
+        configs.append(config)
+        for node_id in rng.sample(range(1, 7), rng.randint(1, 6)):
+            selection_id += 1
+            values = {}
+            if node_id in (3, 6):
+                values["numeric_value"] = Decimal(f"{rng.uniform(10, 120):.2f}")
+            if node_id == 4:
+                values["string_value"] = f"{rng.randint(2, 30)}mm"
+            if node_id == 5:
+                values["calculated_price_impact"] = Decimal(f"{rng.uniform(1, 40):.2f}")
+            selections.append(
+                ConfigurationSelection(
+                    id=selection_id,
+                    configuration_id=config_id,
+                    attribute_node_id=node_id,
+                    selection_path="test",
+                    **values,
+                )
+            )
+    return mfg_type, configs, selections
+
+
+def to_config_rows(configs: list[Configuration]) -> list[ConfigRow]:
+    """Convert configurations to repository price rows."""
+    return [
+        ConfigRow(config.id, config.base_price, config.total_price, config.calculated_weight)
+        for config in configs
+    ]
+
+
+def to_selection_rows(selections: list[ConfigurationSelection]) -> list[SelectionRow]:
+    """Convert selections to repository pricing rows."""
+    return [
+        SelectionRow(
+            selection.id,
+            selection.configuration_id,
+            selection.attribute_node_id,
+            selection.numeric_value,
+            selection.string_value,
+            selection.calculated_price_impact,
+            selection.calculated_weight_impact,
+        )
+        for selection in selections
+    ]
+
+
+def make_service(mfg_type, configs, selections, nodes) -> BulkRepricingService:
+    """Create repricing service with mocked repositories."""
+    db = MagicMock(spec=AsyncSession)
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+    service = BulkRepricingService(db)
+    service.mfg_type_repo.get = AsyncMock(return_value=mfg_type)
+    service.config_repo.get_price_rows_by_manufacturing_type = AsyncMock(
+        return_value=to_config_rows(configs)
+    )
+    service.selection_repo.get_pricing_rows_by_manufacturing_type = AsyncMock(
+        return_value=to_selection_rows(selections)
+    )
+    service.pricing_service.attr_node_repo.get_pricing_rules = AsyncMock(
+        return_value=list(nodes.values())
+    )
+    service.attr_node_repo.get_by_ids = AsyncMock(return_value={})
+    service.config_repo.bulk_update_prices = AsyncMock(side_effect=lambda rows, **_: len(rows))
+    return service
+
+
+def expected_totals(configs, selections, nodes) -> dict[int, tuple[Decimal, Decimal]]:
+    """Price every configuration through the scalar PricingService path."""
+    pricing_service = PricingService(MagicMock(spec=AsyncSession))
+    by_config: dict[int, list[ConfigurationSelection]] = {config.id: [] for config in configs}
+    for selection in selections:
+        by_config[selection.configuration_id].append(selection)
+
+    plan = build_pricing_plan(1, nodes.values())
+    totals = {}
+    for config in configs:
+        prices = pricing_service.price_configuration(
+            config.id, config.base_price, Decimal("15"), by_config[config.id], plan
+        )
+        totals[config.id] = (
+            prices["total_price"].quantize(CENT, ROUND_HALF_UP),
+            prices["total_weight"].quantize(CENT, ROUND_HALF_UP),
+        )
+    return totals
+
+
+@pytest.mark.asyncio
+class TestBulkRepricing:
+    """Test repricing a manufacturing type."""
+
+    async def test_matches_pricing_service(self):
+        """Test vectorized totals equal the scalar pricing path."""
+        nodes = make_nodes()
+        mfg_type, configs, selections = make_dataset(300)
+        service = make_service(mfg_type, configs, selections, nodes)
+
+        result = await service.reprice_manufacturing_type(1)
+
+        written = service.config_repo.bulk_update_prices.await_args.args[0]
+        expected = expected_totals(configs, selections, nodes)
+        assert {row[0]: (row[1], row[2]) for row in written} == expected
+        assert result.configurations == 300
+        assert result.selections == len(selections)
+        assert result.updated == 300
+        assert result.failed == 0
+        assert result.configs_per_second > 0
+
+    async def test_only_changed_totals_written(self):
+        """Test configurations already up to date are not written."""
+        nodes = make_nodes()
+        mfg_type, configs, selections = make_dataset(20)
+        expected = expected_totals(configs, selections, nodes)
+        for config in configs[:15]:
+            config.total_price, config.calculated_weight = expected[config.id]
+        service = make_service(mfg_type, configs, selections, nodes)
+
+        result = await service.reprice_manufacturing_type(1)
+
+        written = service.config_repo.bulk_update_prices.await_args.args[0]
+        assert [row[0] for row in written] == [config.id for config in configs[15:]]
+        assert result.updated == 5
+        assert result.unchanged == 15
+        service.db.commit.assert_awaited_once()
+
+    async def test_sets_trigger_change_reason(self):
+        """Test the price history change reason is set before writing."""
+        nodes = make_nodes()
+        mfg_type, configs, selections = make_dataset(5)
+        service = make_service(mfg_type, configs, selections, nodes)
+
+        await service.reprice_manufacturing_type(1)
+
+        statement, params = service.db.execute.await_args.args
+        assert "set_config" in str(statement)
+        assert params["setting"] == "windx.price_change_reason"
+        assert params["reason"] == "Bulk repricing of manufacturing type 1"
+
+    async def test_dry_run_does_not_write(self):
+        """Test dry runs compute totals without touching the database."""
+        nodes = make_nodes()
+        mfg_type, configs, selections = make_dataset(10)
+        service = make_service(mfg_type, configs, selections, nodes)
+
+        result = await service.reprice_manufacturing_type(1, dry_run=True)
+
+        assert result.dry_run is True
+        assert result.updated == 10
+        service.config_repo.bulk_update_prices.assert_not_awaited()
+        service.db.execute.assert_not_awaited()
+        service.db.commit.assert_not_awaited()
+
+    async def test_failed_configurations_skipped(self):
+        """Test a failing formula skips only the affected configuration."""
+        nodes = make_nodes()
+        nodes[3].price_formula = "10 / (width - 50)"
+        mfg_type, configs, selections = make_dataset(0)
+        configs = [
+            Configuration(
+                id=config_id,
+                manufacturing_type_id=1,
+                name=f"Config {config_id}",
+                base_price=Decimal("100"),
+                total_price=Decimal("0.00"),
+                calculated_weight=Decimal("0.00"),
+            )
+            for config_id in (1, 2)
+        ]
+        selections = [
+            ConfigurationSelection(
+                id=1, configuration_id=1, attribute_node_id=3, numeric_value=Decimal("50")
+            ),
+            ConfigurationSelection(
+                id=2, configuration_id=2, attribute_node_id=3, numeric_value=Decimal("60")
+            ),
+        ]
+        service = make_service(mfg_type, configs, selections, nodes)
+
+        result = await service.reprice_manufacturing_type(1)
+
+        written = service.config_repo.bulk_update_prices.await_args.args[0]
+        assert written == [(2, Decimal("101.00"), Decimal("21.00"))]
+        assert result.failed == 1
+        assert "selection 1" in result.errors[0]
+        assert "Division by zero" in result.errors[0]
+
+    async def test_missing_attribute_node(self):
+        """Test selections of deleted nodes fail their configuration."""
+        nodes = make_nodes()
+        mfg_type, configs, selections = make_dataset(3)
+        selections.append(ConfigurationSelection(id=999, configuration_id=2, attribute_node_id=404))
+        service = make_service(mfg_type, configs, selections, nodes)
+
+        result = await service.reprice_manufacturing_type(1)
+
+        written = service.config_repo.bulk_update_prices.await_args.args[0]
+        assert [row[0] for row in written] == [1, 3]
+        assert result.failed == 1
+        assert "attribute node 404 not found" in result.errors[0]
+
+    async def test_unknown_manufacturing_type(self):
+        """Test repricing a missing manufacturing type raises NotFound."""
+        service = make_service(None, [], [], {})
+
+        with pytest.raises(NotFoundException):
+            await service.reprice_manufacturing_type(42)
+
+
+@pytest.mark.asyncio
+class TestBulkUpdatePrices:
+    """Test the bulk price write-back statement."""
+
+    async def test_single_update_from_values_per_batch(self):
+        """Test totals are written with one UPDATE ... FROM (VALUES ...) per batch."""
+        db = MagicMock(spec=AsyncSession)
+        db.execute = AsyncMock(return_value=MagicMock(rowcount=2))
+        repo = ConfigurationRepository(db)
+        prices = [(i, Decimal("10.00"), Decimal("1.00")) for i in range(1, 6)]
+
+        updated = await repo.bulk_update_prices(prices, batch_size=2)
+
+        assert db.execute.await_count == 3
+        assert updated == 6
+        sql = str(db.execute.await_args_list[0].args[0])
+        assert "UPDATE configurations SET total_price" in sql
+        assert "FROM (VALUES" in sql
+        assert "IS DISTINCT FROM" in sql
+
+
+class TestEvaluateArray:
+    """Test vectorized formula evaluation."""
+
+    def test_matches_scalar_evaluation(self):
+        """Test array results equal row-by-row scalar results."""
+        rng = np.random.default_rng(3)
+        width = rng.uniform(1, 200, 500)
+        height = rng.uniform(1, 200, 500)
+        for formula in ("width * height * 0.05", "(width + height) / 2 - 3", "-width ** 2", "7"):
+            compiled = compile_formula(formula)
+            result = compiled.evaluate_array({"width": width, "height": height}, 500)
+            expected = [
+                compiled.evaluate({"width": w, "height": h})
+                for w, h in zip(width, height, strict=True)
+            ]
+            assert result.tolist() == expected
+
+    def test_errors_raised_for_whole_batch(self):
+        """Test any failing row fails the vectorized call."""
+        columns = {"width": np.array([1.0, 0.0, 2.0])}
+        with pytest.raises(ZeroDivisionError):
+            compile_formula("10 / width").evaluate_array(columns, 3)
+        with pytest.raises(ValueError):
+            compile_formula("(width - 1) ** 0.5").evaluate_array(columns, 3)
+        with pytest.raises(ValueError):
+            compile_formula("width * 1e10").evaluate_array(columns, 3)
+        with pytest.raises(KeyError):
+            compile_formula("depth").evaluate_array(columns, 3)
+
+
+@pytest.mark.asyncio
+class TestBulkRepricingPerformance:
+    """Throughput of the vectorized pass vs per-configuration pricing."""
+
+    async def test_vectorized_faster_than_per_configuration_pricing(self):
+        """Test repricing beats pricing configurations one by one."""
+        nodes = make_nodes()
+        mfg_type, configs, selections = make_dataset(5000)
+        service = make_service(mfg_type, configs, selections, nodes)
+
+        start_time = time.perf_counter()
+        expected_totals(configs, selections, nodes)
+        scalar_duration = time.perf_counter() - start_time
+
+        result = await service.reprice_manufacturing_type(1)
+
+        print(
+            f"\n{result.configurations} configurations / {result.selections} selections: "
+            f"per-configuration {scalar_duration:.3f}s, "
+            f"vectorized {result.duration_seconds:.3f}s "
+            f"({result.configs_per_second:,.0f} configs/sec)"
+        )
+        assert result.duration_seconds < scalar_duration
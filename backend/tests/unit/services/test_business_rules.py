@@ -0,0 +1,159 @@
+"""Unit tests for table-driven business rules.
+
+Tests cover:
+- Rules declared in the profile page configuration
+- Visibility and violations matching the former hand-written rules
+- Triggering field index
+- Validation evaluating only the rules of fields with values
+- Malformed rules tables rejected on load
+"""
+
+import itertools
+
+import pytest
+
+from app.services.business_rules import BusinessRuleSet, get_business_rules
+
+RULE_FIELDS = [
+    "renovation",
+    "builtin_flyscreen_track",
+    "total_width",
+    "flyscreen_track_height",
+    "sash_overlap",
+    "flying_mullion_horizontal_clearance",
+    "flying_mullion_vertical_clearance",
+    "glazing_undercut_height",
+    "renovation_height",
+    "steel_material_thickness",
+]
+
+APPLIES_TO = {
+    "renovation": "frame",
+    "sash_overlap": "sash",
+    "flying_mullion_horizontal_clearance": "flying mullion",
+    "flying_mullion_vertical_clearance": "flying mullion",
+    "glazing_undercut_height": "glazing bead",
+    "renovation_height": "frame",
+    "steel_material_thickness": "reinforcement",
+}
+
+
+def expected_visibility(form_data):
+    """Field availability as the hand-written rules decided it."""
+    product_type = form_data.get("type", "").lower()
+    opening_system = form_data.get("opening_system", "").lower()
+    flyscreen = product_type == "frame" and form_data.get("builtin_flyscreen_track") is True
+    visibility = {field: product_type == value for field, value in APPLIES_TO.items()}
+    visibility["builtin_flyscreen_track"] = product_type == "frame" and "sliding" in opening_system
+    visibility["total_width"] = flyscreen
+    visibility["flyscreen_track_height"] = flyscreen
+    return visibility
+
+
+FORM_STATES = [
+    {"type": product_type, "opening_system": opening_system, "builtin_flyscreen_track": track}
+    for product_type, opening_system, track in itertools.product(
+        ["Frame", "frame", "Sash", "Flying mullion", "Glazing bead", "Reinforcement", ""],
+        ["Sliding door", "Casement"],
+        [True, False],
+    )
+] + [{}]
+
+
+@pytest.mark.parametrize("form_data", FORM_STATES)
+def test_visibility_matches_former_rules(form_data):
+    """Test the rules table gives the availability the former rules gave."""
+    visibility = get_business_rules().evaluate(form_data)
+
+    assert list(visibility) == RULE_FIELDS
+    assert visibility == expected_visibility(form_data)
+
+
+@pytest.mark.parametrize("form_data", FORM_STATES)
+def test_violations_match_visibility(form_data):
+    """Test a value is rejected exactly for the fields that don't apply."""
+    form_data = {**dict.fromkeys(RULE_FIELDS, 10), **form_data}
+
+    errors = get_business_rules().validate(form_data)
+
+    hidden = {field for field, visible in expected_visibility(form_data).items() if not visible}
+    # An unchecked flyscreen track is not a value
+    assert set(errors) == hidden - {field for field in hidden if form_data[field] is False}
+
+
+def test_violation_messages():
+    """Test violations carry the message declared with their rule."""
+    errors = get_business_rules().validate(
+        {"type": "Sash", "renovation": True, "sash_overlap": 8, "total_width": ""}
+    )
+
+    assert errors == {"renovation": "Renovation is only applicable for frame types"}
+
+
+def test_rules_indexed_by_triggering_field():
+    """Test changed fields map to the rules that read them."""
+    rules = get_business_rules()
+
+    assert rules.affected_by(["type"]) == set(RULE_FIELDS)
+    assert rules.affected_by(["opening_system"]) == {"builtin_flyscreen_track"}
+    assert rules.affected_by(["builtin_flyscreen_track"]) == {
+        "total_width",
+        "flyscreen_track_height",
+    }
+    assert rules.affected_by(["renovation", "name"]) == set()
+
+
+def test_validation_skips_rules_of_empty_fields():
+    """Test rules of fields without a value are not evaluated."""
+    rules = BusinessRuleSet.compile(
+        [
+            {"field": "broken", "condition": {"operator": "bogus", "field": "type"}, "message": ""},
+            {
+                "field": "sash_overlap",
+                "condition": {"operator": "equals", "field": "type", "value": "Sash"},
+                "message": "Sash only",
+            },
+        ]
+    )
+
+    assert rules.validate({"type": "Frame", "broken": False, "sash_overlap": 8}) == {
+        "sash_overlap": "Sash only"
+    }
+    with pytest.raises(ValueError):
+        rules.validate({"broken": "yes"})
+
+
+def test_rules_loaded_from_page_configuration(tmp_path):
+    """Test a new rule only needs an entry in the rules table."""
+    config = tmp_path / "profile.yaml"
+    config.write_text(
+        "page_type: profile\n"
+        "business_rules:\n"
+        "  - field: frame_depth\n"
+        "    condition: {operator: equals_ignore_case, field: type, value: frame}\n"
+        "    message: Frame depth is only applicable for frame types\n"
+    )
+
+    rules = BusinessRuleSet.load(config)
+
+    assert len(rules) == 1
+    assert rules.evaluate({"type": "FRAME"}) == {"frame_depth": True}
+    assert rules.validate({"type": "Sash", "frame_depth": 70}) == {
+        "frame_depth": "Frame depth is only applicable for frame types"
+    }
+
+
+@pytest.mark.parametrize(
+    "definitions",
+    [
+        [{"field": "renovation", "condition": {}}],
+        [
+            {"field": "renovation", "condition": {}, "message": ""},
+            {"field": "renovation", "condition": {}, "message": ""},
+        ],
+    ],
+)
+def test_malformed_tables_rejected(definitions):
+    """Test rules missing keys or deciding a field twice fail to compile."""
+    with pytest.raises(ValueError):
+        BusinessRuleSet.compile(definitions)
@@ -0,0 +1,294 @@
+"""Unit tests for compiled display conditions.
+
+Tests cover:
+- Compiled conditions matching the interpreting ConditionEvaluator
+- Malformed conditions failing on evaluation only, as before
+- Referenced fields recorded per condition
+- Patterns compiled once instead of per evaluation
+- Batch evaluation and conditions stored with compiled schemas
+- Partial re-evaluation of the fields that changed fields affect
+"""
+
+import itertools
+
+import pytest
+
+from app.schemas.entry import ProfileSchema
+from app.services import condition_engine
+from app.services.condition_engine import ConditionSet, compile_condition
+from app.services.entry import ConditionEvaluator, EntryService
+from app.services.schema_cache import CompiledSchema
+
+CONDITIONS = [
+    None,
+    {},
+    {"operator": "equals"},
+    {"operator": "equals", "field": "type", "value": "Frame"},
+    {"operator": "not_equals", "field": "type", "value": "Frame"},
+    {"operator": "equals_ignore_case", "field": "type", "value": "FRAME"},
+    {"operator": "equals_ignore_case", "field": "width", "value": 60},
+    {"operator": "greater_than", "field": "width", "value": 50},
+    {"operator": "less_equal", "field": "width", "value": "50"},
+    {"operator": "greater_equal", "field": "width", "value": "wide"},
+    {"operator": "less_than", "field": "dimensions.height", "value": 1200},
+    {"operator": "contains", "field": "opening_system", "value": "SLID"},
+    {"operator": "starts_with", "field": "material", "value": "alu"},
+    {"operator": "ends_with", "field": "material", "value": "INUM"},
+    {"operator": "matches_pattern", "field": "system_series", "value": r"^K\d{3}$"},
+    {"operator": "matches_pattern", "field": "system_series", "value": "("},
+    {"operator": "in", "field": "type", "value": ["Frame", "Sash"]},
+    {"operator": "in", "field": "type", "value": "Frame"},
+    {"operator": "not_in", "field": "type", "value": ["Frame"]},
+    {"operator": "any_of", "field": "colors", "value": ["white", "black"]},
+    {"operator": "all_of", "field": "colors", "value": ["white", "black"]},
+    {"operator": "exists", "field": "renovation"},
+    {"operator": "not_exists", "field": "renovation"},
+    {"operator": "is_empty", "field": "colors"},
+    {"operator": "is_not_empty", "field": "dimensions.depth.inner"},
+    {"operator": "bogus", "field": "type", "value": 1},
+    {"operator": "equals", "field": 3, "value": "three"},
+    {
+        "operator": "and",
+        "conditions": [
+            {"operator": "equals", "field": "type", "value": "Frame"},
+            {"operator": "equals", "field": "builtin_flyscreen_track", "value": True},
+        ],
+    },
+    {
+        "operator": "or",
+        "conditions": [
+            {"operator": "equals", "field": "type", "value": "Frame"},
+            {"operator": "bogus", "field": "type"},
+        ],
+    },
+    {"operator": "and", "conditions": [{"operator": "equals", "field": "type"}, "broken"]},
+    {"operator": "not", "condition": {"operator": "equals", "field": "type", "value": "Sash"}},
+    {"operator": "not"},
+    {"operator": "or", "conditions": None},
+]
+
+FORM_STATES = [
+    {},
+    {
+        "type": "Frame",
+        "width": 60,
+        "opening_system": "Sliding door",
+        "material": "Aluminum",
+        "system_series": "K700",
+        "colors": ["white", "black"],
+        "renovation": True,
+        "builtin_flyscreen_track": True,
+        "dimensions": {"height": 1000, "depth": {"inner": 70}},
+        "3": "three",
+    },
+    {
+        "type": "Sash",
+        "width": "",
+        "material": None,
+        "system_series": "K70",
+        "colors": "white",
+        "renovation": "",
+        "dimensions": "flat",
+    },
+]
+
+
+def interpret(condition, form_data):
+    """Evaluate with the interpreter, returning the exception type on failure."""
+    try:
+        return ConditionEvaluator().evaluate_condition(condition, form_data)
+    except Exception as e:
+        return type(e)
+
+
+def run_compiled(condition, form_data):
+    """Evaluate compiled, returning the exception type on failure."""
+    try:
+        return compile_condition(condition).evaluate(form_data)
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize(
+    ("condition", "form_data"),
+    list(itertools.product(CONDITIONS, FORM_STATES)),
+)
+def test_compiled_matches_interpreter(condition, form_data):
+    """Test compiled conditions give the interpreter's result or error."""
+    assert run_compiled(condition, form_data) == interpret(condition, form_data)
+
+
+def test_referenced_fields_recorded():
+    """Test the top-level fields a condition reads are recorded."""
+    condition = compile_condition(
+        {
+            "operator": "or",
+            "conditions": [
+                {"operator": "equals", "field": "type", "value": "Frame"},
+                {"operator": "not", "condition": {"operator": "exists", "field": "size.width"}},
+            ],
+        }
+    )
+
+    assert condition.fields == {"type", "size"}
+
+
+def test_patterns_compiled_once(monkeypatch):
+    """Test evaluating a pattern condition does not go through re.match."""
+    condition = compile_condition(
+        {"operator": "matches_pattern", "field": "code", "value": r"^[A-Z]{2}\d+$"}
+    )
+
+    def fail(*args):
+        raise AssertionError("pattern recompiled")
+
+    monkeypatch.setattr(condition_engine.re, "match", fail)
+
+    assert condition.evaluate({"code": "AB12"}) is True
+    assert condition.evaluate({"code": "ab12"}) is False
+
+
+def test_failing_conditions_leave_fields_visible():
+    """Test a condition that raises shows its field instead of failing the set."""
+    conditions = ConditionSet.compile(
+        {
+            "sash_overlap": {"operator": "equals", "field": "type", "value": "Sash"},
+            "broken": {"operator": "bogus", "field": "type"},
+        }
+    )
+
+    assert conditions.evaluate({"type": "Frame"}) == {"sash_overlap": False, "broken": True}
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_evaluation():
+    """Test batch evaluation equals evaluating each form state on its own."""
+    schema = ProfileSchema(
+        manufacturing_type_id=1,
+        sections=[],
+        conditional_logic={
+            "flyscreen_width": {
+                "operator": "and",
+                "conditions": [
+                    {"operator": "equals", "field": "type", "value": "Frame"},
+                    {"operator": "equals", "field": "builtin_flyscreen_track", "value": True},
+                ],
+            },
+            "glass_thickness": {"operator": "greater_than", "field": "width", "value": 50},
+        },
+    )
+    compiled = CompiledSchema.compile(schema)
+    service = EntryService(None)
+    states = [{"type": "Frame", "builtin_flyscreen_track": True, "width": 80}, {"type": "Sash"}]
+
+    batch = await service.evaluate_display_conditions_batch(states, compiled)
+
+    assert batch == [await service.evaluate_display_conditions(state, schema) for state in states]
+    assert batch[0]["flyscreen_width"] is True
+    assert batch[1]["sash_overlap"] is True
+
+
+def test_conditions_stored_with_compiled_schema():
+    """Test schemas loaded from their cached body carry compiled conditions."""
+    schema = ProfileSchema(
+        manufacturing_type_id=1,
+        sections=[],
+        conditional_logic={"renovation": {"operator": "equals", "field": "type", "value": "Frame"}},
+    )
+
+    loaded = CompiledSchema.from_body(CompiledSchema.compile(schema).body)
+
+    assert len(loaded.conditions) == 1
+    assert loaded.conditions.evaluate({"type": "Frame"}) == {"renovation": True}
+
+
+PARTIAL_SCHEMA = ProfileSchema(
+    manufacturing_type_id=1,
+    sections=[],
+    conditional_logic={
+        "glass_thickness": {"operator": "greater_than", "field": "width", "value": 50},
+        "frame_depth": {
+            "operator": "and",
+            "conditions": [
+                {"operator": "equals", "field": "type", "value": "Frame"},
+                {"operator": "exists", "field": "dimensions.depth"},
+            ],
+        },
+        "handle_color": {"operator": "in", "field": "material", "value": ["Aluminum"]},
+        # Overridden by the business rule for the same field
+        "renovation": {"operator": "equals", "field": "material", "value": "uPVC"},
+        "notes": {},
+    },
+)
+
+
+def test_dependency_graph_indexes_condition_fields():
+    """Test changed fields map to the conditional fields that read them."""
+    conditions = ConditionSet.compile(PARTIAL_SCHEMA.conditional_logic)
+
+    assert conditions.affected_by(["type"]) == {"frame_depth"}
+    assert conditions.affected_by(["dimensions.depth", "width"]) == {
+        "frame_depth",
+        "glass_thickness",
+    }
+    assert conditions.affected_by(["material"]) == {"handle_color", "renovation"}
+    assert conditions.affected_by(["unrelated"]) == set()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("changes", "expected_fields"),
+    [
+        ({"width": 80}, {"glass_thickness"}),
+        ({"material": "uPVC"}, {"handle_color"}),
+        ({"opening_system": "Casement"}, {"builtin_flyscreen_track"}),
+        (
+            {"builtin_flyscreen_track": False},
+            {"total_width", "flyscreen_track_height"},
+        ),
+        ({"dimensions": {}}, {"frame_depth"}),
+        ({"name": "Frame 2"}, set()),
+    ],
+)
+async def test_partial_evaluation_returns_affected_fields(changes, expected_fields):
+    """Test only fields reading the changed fields are re-evaluated."""
+    compiled = CompiledSchema.compile(PARTIAL_SCHEMA)
+    service = EntryService(None)
+    form_data = {
+        "type": "Frame",
+        "opening_system": "Sliding",
+        "builtin_flyscreen_track": True,
+        "material": "Aluminum",
+        **changes,
+    }
+
+    delta = await service.evaluate_display_conditions(form_data, compiled, list(changes))
+
+    assert set(delta) == expected_fields
+
+
+@pytest.mark.asyncio
+async def test_merged_deltas_match_full_evaluation():
+    """Test applying each delta to the previous map gives the full map."""
+    compiled = CompiledSchema.compile(PARTIAL_SCHEMA)
+    service = EntryService(None)
+    steps = [
+        {"type": "Sash"},
+        {"width": "70", "material": "uPVC"},
+        {"type": "Frame"},
+        {"dimensions": {"depth": 70}},
+        {"opening_system": "Sliding door"},
+        {"builtin_flyscreen_track": True},
+        {"material": "Aluminum", "type": "Flying mullion"},
+        {"width": None},
+    ]
+    form_data = {"type": "Frame", "opening_system": "Casement", "material": "Wood"}
+    visibility = await service.evaluate_display_conditions(form_data, compiled)
+
+    for changes in steps:
+        form_data = {**form_data, **changes}
+        visibility.update(
+            await service.evaluate_display_conditions(form_data, compiled, list(changes))
+        )
+
+        assert visibility == await service.evaluate_display_conditions(form_data, compiled)
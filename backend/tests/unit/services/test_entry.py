@@ -17,6 +17,7 @@ from app.models.manufacturing_type import ManufacturingType
 from app.models.user import User
 from app.schemas.entry import ProfileEntryData
 from app.services.entry import ConditionEvaluator, EntryService
+from app.services.header_registry import PreviewHeaders, get_header_registry
 
 
 class TestEntryServiceBusinessRules:
@@ -690,26 +691,22 @@ class TestEntryService:
 
     def test_clear_header_cache(self, entry_service):
         """Test header cache clearing."""
-        # Add some test data to cache
-        entry_service._header_cache[1] = ["test"]
-        entry_service._mapping_cache[1] = {"test": "test"}
-        entry_service._reverse_mapping_cache[1] = {"test": "test"}
+        registry = get_header_registry()
+        headers = PreviewHeaders(["id"], {"id": "id"}, {"id": "id"})
+        # Add some test data to the registry
+        registry.put(registry.make_key(1, "profile"), "0.0.0", headers)
+        registry.put(registry.make_key(1, "glazing"), "0.0.0", headers)
+        registry.put(registry.make_key(2, "profile"), "0.0.0", headers)
 
         # Clear specific manufacturing type
         entry_service.clear_header_cache(1)
-        assert 1 not in entry_service._header_cache
-        assert 1 not in entry_service._mapping_cache
-        assert 1 not in entry_service._reverse_mapping_cache
-
-        # Add test data again
-        entry_service._header_cache[1] = ["test"]
-        entry_service._mapping_cache[1] = {"test": "test"}
+        assert registry.make_key(1, "profile") not in registry
+        assert registry.make_key(1, "glazing") not in registry
+        assert registry.make_key(2, "profile") in registry
 
         # Clear all
         entry_service.clear_header_cache()
-        assert len(entry_service._header_cache) == 0
-        assert len(entry_service._mapping_cache) == 0
-        assert len(entry_service._reverse_mapping_cache) == 0
+        assert len(registry) == 0
 
     def test_get_section_name(self, entry_service):
         """Test section name extraction from LTREE path."""
@@ -0,0 +1,138 @@
+"""Unit tests for form schema option loading.
+
+Runs schema generation against the SQLite benchmark stand-in seeded with a
+generated attribute tree.
+
+Tests cover:
+- Options of every select field loaded with one query
+- Relation entities of every relations field loaded with one query
+- Duplicate relation entity names collapsed into one option
+- Single field definitions matching the batched schema
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attribute_node import AttributeNode
+from app.services.entry import EntryService
+from tests.benchmarks.data import MANUFACTURING_TYPE_ID, SCALES, generate_dataset
+from tests.benchmarks.database import create_benchmark_engine, create_schema, seed_dataset
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session on the SQLite stand-in seeded with a small tree."""
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_dataset(session, generate_dataset(SCALES["10"]))
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(db) -> list[str]:
+    """Record the SQL statements issued through the session."""
+    recorded: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: recorded.append(statement),
+    )
+    return recorded
+
+
+async def load_profile_nodes(db: AsyncSession) -> list[AttributeNode]:
+    """Load the profile page nodes in schema order."""
+    result = await db.execute(
+        select(AttributeNode)
+        .where(
+            AttributeNode.manufacturing_type_id == MANUFACTURING_TYPE_ID,
+            AttributeNode.page_type == "profile",
+        )
+        .order_by(AttributeNode.ltree_path, AttributeNode.sort_order)
+    )
+    return list(result.scalars().all())
+
+
+async def add_relations_field(db: AsyncSession) -> None:
+    """Add a company dropdown and company entities, one of them duplicated."""
+    db.add_all(
+        [
+            AttributeNode(
+                id=9001,
+                manufacturing_type_id=MANUFACTURING_TYPE_ID,
+                name="company",
+                node_type="attribute",
+                data_type="string",
+                ui_component="dropdown",
+                page_type="profile",
+                ltree_path="supplier.company",
+                depth=1,
+            ),
+            *(
+                AttributeNode(
+                    id=9100 + index,
+                    name=name,
+                    node_type="company",
+                    page_type="profile",
+                    ltree_path=f"definitions.profile.company.c{index}",
+                    depth=3,
+                )
+                for index, name in enumerate(["Kommerling", "Aluplast", "Kommerling"])
+            ),
+        ]
+    )
+    await db.commit()
+
+
+def select_fields(schema) -> list:
+    """Get the fields of a schema that list options."""
+    return [field for section in schema.sections for field in section.fields if field.options]
+
+
+@pytest.mark.asyncio
+async def test_options_loaded_with_one_query(db, statements):
+    """Test every select field's options come from a single query."""
+    nodes = await load_profile_nodes(db)
+    statements.clear()
+
+    schema = await EntryService(db).generate_form_schema(MANUFACTURING_TYPE_ID, nodes)
+
+    fields = select_fields(schema)
+    assert len(fields) > 1
+    assert len(statements) == 1
+    for field in fields:
+        assert field.options == [option["name"] for option in field.options_data]
+        assert [option["sort_order"] for option in field.options_data] == sorted(
+            option["sort_order"] for option in field.options_data
+        )
+
+
+@pytest.mark.asyncio
+async def test_relation_entities_loaded_with_one_query(db, statements):
+    """Test relations fields add one entity query and drop duplicate names."""
+    await add_relations_field(db)
+    nodes = await load_profile_nodes(db)
+    statements.clear()
+
+    schema = await EntryService(db).generate_form_schema(MANUFACTURING_TYPE_ID, nodes)
+
+    company = next(field for field in select_fields(schema) if field.name == "company")
+    assert company.options == ["Aluplast", "Kommerling"]
+    assert [option["id"] for option in company.options_data] == [9101, 9100]
+    assert len(statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_field_matches_schema(db):
+    """Test a field built on its own lists the same options as in the schema."""
+    nodes = await load_profile_nodes(db)
+    service = EntryService(db)
+    schema = await service.generate_form_schema(MANUFACTURING_TYPE_ID, nodes)
+
+    for field in select_fields(schema):
+        node = next(node for node in nodes if node.name == field.name)
+        assert await service.create_field_definition(node) == field
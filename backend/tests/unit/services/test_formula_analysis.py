@@ -0,0 +1,158 @@
+"""Unit tests for write-time formula analysis.
+
+Tests cover:
+- Constant folding with unchanged evaluation results
+- Rejection of unsafe, out-of-range and unbindable formulas
+- Normalization of node formula fields
+- Variable set kept in sync with the pricing formula context
+- Rejection of invalid formulas by the hierarchy builder
+"""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import InvalidFormulaException
+from app.models.configuration_selection import ConfigurationSelection
+from app.services.formula_analysis import (
+    FORMULA_CONTEXT_VARIABLES,
+    analyze_formula,
+    prepare_node_formulas,
+)
+from app.services.formula_engine import compile_formula
+from app.services.hierarchy_builder import HierarchyBuilderService
+from app.services.pricing import PricingService
+
+CONTEXT = {"width": 36.5, "height": 48.0, "value": 2.0, "subtotal": 250.0}
+
+
+class TestAnalyzeFormula:
+    """Test formula analysis."""
+
+    @pytest.mark.parametrize(
+        ("formula", "normalized"),
+        [
+            ("width*height*0.05", "width * height * 0.05"),
+            ("  width * (2 + 3) ", "width * 5"),
+            ("2 * 3 * width", "6 * width"),
+            ("width / (10 / 4)", "width / 2.5"),
+            ("(1 - 3) ** value", "(-2) ** value"),
+            ("-(2 * 3) + subtotal", "-6 + subtotal"),
+            ("1 + 2", "3"),
+        ],
+    )
+    def test_constant_folding(self, formula: str, normalized: str):
+        """Test constant sub-expressions fold without changing results."""
+        analysis = analyze_formula(formula)
+
+        assert analysis.formula == normalized
+        assert analysis.compiled.evaluate(CONTEXT) == compile_formula(formula).evaluate(CONTEXT)
+
+    def test_extracts_variables(self):
+        """Test the referenced variables are reported."""
+        analysis = analyze_formula("(width + height) * 2 + subtotal * 0.01")
+
+        assert analysis.variables == frozenset({"width", "height", "subtotal"})
+
+    @pytest.mark.parametrize(
+        ("formula", "error_type"),
+        [
+            ("width +", "syntax_error"),
+            ("__import__('os')", "unsafe_expression"),
+            ("width % 2", "unsafe_expression"),
+            ("width / (2 - 2)", "division_by_zero"),
+            ("width * 10 ** 20", "calculation_error"),
+            ("(-8) ** 0.5 + width", "calculation_error"),
+            ("area * 0.05", "unknown_variable"),
+        ],
+    )
+    def test_rejects_invalid_formulas(self, formula: str, error_type: str):
+        """Test formulas that could never price are rejected."""
+        with pytest.raises(InvalidFormulaException) as exc_info:
+            analyze_formula(formula)
+
+        assert exc_info.value.details["error_type"] == error_type
+        assert exc_info.value.formula == formula
+
+    def test_unknown_variables_listed(self):
+        """Test unknown variables are reported with the available ones."""
+        with pytest.raises(InvalidFormulaException) as exc_info:
+            analyze_formula("base_price * area")
+
+        assert exc_info.value.details["unknown_variables"] == ["area", "base_price"]
+        assert set(exc_info.value.details["available_variables"]) == FORMULA_CONTEXT_VARIABLES
+
+    def test_custom_variables(self):
+        """Test the allowed variable set can be narrowed."""
+        with pytest.raises(InvalidFormulaException):
+            analyze_formula("subtotal * 0.1", frozenset({"width"}))
+
+
+class TestPrepareNodeFormulas:
+    """Test normalization of attribute node fields."""
+
+    def test_normalizes(self):
+        """Test formulas are replaced by their normalized text."""
+        prepared = prepare_node_formulas(
+            {"name": "Width", "price_formula": "width*(0.5/2)", "weight_formula": None}
+        )
+
+        assert prepared == {
+            "name": "Width",
+            "price_formula": "width * 0.25",
+            "weight_formula": None,
+        }
+
+    def test_keeps_empty_formulas(self):
+        """Test empty formulas are stored unchanged."""
+        assert prepare_node_formulas({"price_formula": "  "}) == {"price_formula": "  "}
+
+    def test_reports_field(self):
+        """Test the offending field is named."""
+        with pytest.raises(InvalidFormulaException) as exc_info:
+            prepare_node_formulas({"price_formula": "width", "weight_formula": "volume * 2"})
+
+        assert exc_info.value.details["field"] == "weight_formula"
+        assert exc_info.value.message.startswith("Invalid weight_formula")
+
+
+class TestPricingContextVariables:
+    """Test the analyzed variables match the pricing formula context."""
+
+    def test_matches_build_formula_context(self):
+        """Test a fully populated selection binds exactly the allowed variables."""
+        selection = ConfigurationSelection(
+            numeric_value=Decimal("2"),
+            calculated_price_impact=Decimal("5"),
+            calculated_weight_impact=Decimal("1"),
+        )
+
+        context = PricingService.build_formula_context(selection, Decimal("100"))
+
+        assert set(context) == FORMULA_CONTEXT_VARIABLES
+
+    def test_validate_formula_rejects_unbindable_variables(self):
+        """Test validate_formula applies the write-time analysis."""
+        service = PricingService(MagicMock(spec=AsyncSession))
+
+        assert service.validate_formula("width * 2 + subtotal")
+        assert not service.validate_formula("base_price * 2")
+
+
+@pytest.mark.asyncio
+async def test_hierarchy_builder_rejects_invalid_formula():
+    """Test create_node rejects a formula before touching the database."""
+    service = HierarchyBuilderService(MagicMock(spec=AsyncSession))
+
+    with pytest.raises(InvalidFormulaException) as exc_info:
+        await service.create_node(
+            manufacturing_type_id=1,
+            name="Area",
+            node_type="option",
+            price_impact_type="formula",
+            price_formula="area * 0.05",
+        )
+
+    assert exc_info.value.details["field"] == "price_formula"
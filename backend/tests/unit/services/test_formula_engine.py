@@ -0,0 +1,227 @@
+"""Unit tests for the compiled formula engine.
+
+Tests cover:
+- Compiled results match the reference AST interpreter
+- Safe-operator whitelist enforcement at compile time
+- LRU bounds, statistics and invalidation
+- PricingService error mapping through the compiled path
+- Formulas compiled once across repeated evaluations of factory data
+"""
+
+import ast
+import random
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from _manager_factory import PRICE_FORMULAS, WEIGHT_FORMULAS
+from app.core.exceptions import InvalidFormulaException
+from app.services.formula_engine import (
+    FormulaCache,
+    compile_formula,
+    get_formula_cache,
+    interpret_formula,
+)
+from app.services.pricing import PricingService
+
+FACTORY_CONTEXT = {
+    "width": 36.5,
+    "height": 48.0,
+    "depth": 3.25,
+    "area": 1752.0,
+    "volume": 5694.0,
+    "base_price": 250.0,
+    "value": 1.0,
+    "quantity": 1.0,
+}
+
+
+def factory_formulas(count: int, seed: int = 42) -> list[str]:
+    """Generate formulas the way the factory hierarchy generator does."""
+    rng = random.Random(seed)
+    formulas = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            template = rng.choice(PRICE_FORMULAS)
+            factor = rng.uniform(0.01, 0.15)
+        else:
+            template = rng.choice(WEIGHT_FORMULAS)
+            factor = rng.uniform(0.001, 0.05)
+        formulas.append(template.format(factor=f"{factor:.4f}"))
+    return formulas
+
+
+class TestCompileFormula:
+    """Test formula compilation."""
+
+    @pytest.mark.parametrize(
+        "formula",
+        [
+            "width * height * 0.05",
+            "(width + height) / 2",
+            "width ** 2 - height",
+            "-width + +height",
+            "10",
+        ],
+    )
+    def test_matches_interpreter(self, formula: str):
+        """Test compiled formulas produce the same result as the AST walk."""
+        expected = interpret_formula(ast.parse(formula, mode="eval").body, FACTORY_CONTEXT)
+
+        assert compile_formula(formula).evaluate(FACTORY_CONTEXT) == expected
+
+    def test_factory_formulas_match_interpreter(self):
+        """Test every factory formula template compiles to an equivalent closure."""
+        for formula in factory_formulas(200):
+            expected = interpret_formula(ast.parse(formula, mode="eval").body, FACTORY_CONTEXT)
+            assert compile_formula(formula).evaluate(FACTORY_CONTEXT) == expected
+
+    def test_collects_variables(self):
+        """Test referenced variables are extracted once at compile time."""
+        compiled = compile_formula("  (width + height) * 2 * width ")
+
+        assert compiled.formula == "(width + height) * 2 * width"
+        assert compiled.variables == frozenset({"width", "height"})
+
+    def test_unsafe_node_rejected_at_compile_time(self):
+        """Test function calls are rejected before any evaluation."""
+        with pytest.raises(InvalidFormulaException) as exc_info:
+            compile_formula("__import__('os')")
+
+        assert exc_info.value.details["node_type"] == "Call"
+
+    def test_unsafe_operator_rejected_at_compile_time(self):
+        """Test operators outside the whitelist are rejected."""
+        with pytest.raises(InvalidFormulaException) as exc_info:
+            compile_formula("width % 2")
+
+        assert exc_info.value.details["operator"] == "Mod"
+
+    def test_syntax_error(self):
+        """Test syntax errors surface as SyntaxError."""
+        with pytest.raises(SyntaxError):
+            compile_formula("width * * height")
+
+    def test_runtime_errors_match_interpreter(self):
+        """Test runtime errors are the same exception types as the AST walk."""
+        with pytest.raises(ZeroDivisionError):
+            compile_formula("width / 0").evaluate({"width": 1})
+        with pytest.raises(KeyError):
+            compile_formula("width * missing").evaluate({"width": 1})
+        with pytest.raises(ValueError):
+            compile_formula("width * 1e9").evaluate({"width": 100})
+        with pytest.raises(ValueError):
+            compile_formula("width ** 0.5").evaluate({"width": -4})
+        with pytest.raises(OverflowError):
+            compile_formula("width ** 1000").evaluate({"width": 10})
+
+
+class TestFormulaCache:
+    """Test the bounded formula cache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test repeated lookups are served from the cache."""
+        cache = FormulaCache(maxsize=8)
+
+        first = cache.get("width * 2")
+        second = cache.get(" width * 2 ")
+
+        assert first is second
+        assert cache.get_stats() == {"size": 1, "maxsize": 8, "hits": 1, "misses": 1}
+
+    def test_lru_eviction(self):
+        """Test the least recently used formula is evicted first."""
+        cache = FormulaCache(maxsize=2)
+        cache.get("width")
+        cache.get("height")
+        cache.get("width")
+        cache.get("depth")
+
+        assert "width" in cache
+        assert "height" not in cache
+        assert len(cache) == 2
+
+    def test_invalid_formula_not_cached(self):
+        """Test formulas that fail to compile are never stored."""
+        cache = FormulaCache(maxsize=8)
+
+        with pytest.raises(SyntaxError):
+            cache.get("width +")
+
+        assert len(cache) == 0
+
+    def test_invalidate_and_clear(self):
+        """Test explicit invalidation and clearing."""
+        cache = FormulaCache(maxsize=8)
+        cache.get("width")
+
+        assert cache.invalidate("width") is True
+        assert cache.invalidate("width") is False
+
+        cache.get("height")
+        cache.clear()
+
+        assert cache.get_stats() == {"size": 0, "maxsize": 8, "hits": 0, "misses": 0}
+
+
+@pytest.mark.asyncio
+class TestPricingServiceCompiledPath:
+    """Test PricingService formula evaluation through the compiled path."""
+
+    @pytest.fixture
+    def pricing_service(self) -> PricingService:
+        """Create pricing service with mock database."""
+        return PricingService(MagicMock(spec=AsyncSession))
+
+    async def test_evaluates_and_caches(self, pricing_service: PricingService):
+        """Test repeated evaluation compiles the formula only once."""
+        cache = get_formula_cache()
+        cache.invalidate("width * height * 0.05")
+        misses = cache.misses
+
+        first = await pricing_service.evaluate_price_formula(
+            "width * height * 0.05", FACTORY_CONTEXT
+        )
+        second = await pricing_service.evaluate_price_formula(
+            "width * height * 0.05", FACTORY_CONTEXT
+        )
+
+        assert first == second == Decimal(str(36.5 * 48.0 * 0.05))
+        assert cache.misses == misses + 1
+
+    async def test_error_types_preserved(self, pricing_service: PricingService):
+        """Test error_type details are unchanged by compilation."""
+        cases = {
+            "width / 0": "division_by_zero",
+            "unknown": "unknown_variable",
+            "1 +": "syntax_error",
+            "width ** 1000": "calculation_error",
+        }
+        for formula, error_type in cases.items():
+            with pytest.raises(InvalidFormulaException) as exc_info:
+                await pricing_service.evaluate_price_formula(formula, {"width": 10})
+            assert exc_info.value.details["error_type"] == error_type
+            assert exc_info.value.formula == formula
+
+
+class TestFormulaEngineReuse:
+    """Test repeated evaluations on factory data reuse compiled formulas."""
+
+    def test_formulas_compiled_once_across_rounds(self):
+        """Test every formula is compiled once and then served from the cache."""
+        formulas = factory_formulas(50)
+        rounds = 200
+        cache = FormulaCache(maxsize=len(formulas))
+
+        for _ in range(rounds):
+            for formula in formulas:
+                assert cache.get(formula).evaluate(FACTORY_CONTEXT) == interpret_formula(
+                    ast.parse(formula, mode="eval").body, FACTORY_CONTEXT
+                )
+
+        unique = len(set(formulas))
+        stats = cache.get_stats()
+        assert (stats["size"], stats["misses"]) == (unique, unique)
+        assert stats["hits"] == rounds * len(formulas) - unique
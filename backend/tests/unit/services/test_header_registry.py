@@ -0,0 +1,203 @@
+"""Unit tests for the preview header registry.
+
+Tests cover:
+- LRU bound, TTL expiry and stale tree versions
+- Invalidation per manufacturing type
+- EntryService loading headers and mappings with one query
+- Committed node changes reloading headers
+- Core writes bypassing the ORM reloading headers
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attribute_node import AttributeNode
+from app.services.entry import EntryService
+from app.services.header_registry import HeaderRegistry, PreviewHeaders, get_header_registry
+from tests.benchmarks.data import MANUFACTURING_TYPE_ID, SCALES, generate_dataset
+from tests.benchmarks.database import create_benchmark_engine, create_schema, seed_dataset
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_headers(*names: str) -> PreviewHeaders:
+    """Create headers for attribute nodes with the given names."""
+    return PreviewHeaders.from_nodes(AttributeNode(name=name) for name in names)
+
+
+class TestHeaderRegistry:
+    """Test registry bounds and entry lifetimes."""
+
+    def test_preview_headers_from_nodes(self):
+        """Test headers and both mappings come from one node list."""
+        headers = make_headers("name", "opening_system")
+
+        assert headers.headers == ["id", "Name", "Opening System"]
+        assert headers.mapping == {"id": "id", "Name": "name", "Opening System": "opening_system"}
+        assert headers.reverse_mapping["opening_system"] == "Opening System"
+
+    def test_lru_bound(self):
+        """Test the least recently used entry is evicted first."""
+        registry = HeaderRegistry(maxsize=2)
+        headers = make_headers("name")
+        registry.put("1:profile", 0, headers)
+        registry.put("2:profile", 0, headers)
+        registry.get("1:profile", 0)
+
+        registry.put("3:profile", 0, headers)
+
+        assert "1:profile" in registry
+        assert "2:profile" not in registry
+        assert registry.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries are reloaded once their TTL runs out."""
+        clock = FakeClock()
+        registry = HeaderRegistry(ttl=60, clock=clock)
+        registry.put("1:profile", 0, make_headers("name"))
+
+        clock.now = 59
+        assert registry.get("1:profile", 0) is not None
+        clock.now = 60
+        assert registry.get("1:profile", 0) is None
+        assert registry.get_stats() | {"hit_rate": None} == {
+            "size": 0,
+            "maxsize": 512,
+            "ttl": 60,
+            "hits": 1,
+            "misses": 1,
+            "hit_rate": None,
+            "expired": 1,
+            "stale": 0,
+            "evictions": 0,
+        }
+
+    def test_stale_version_dropped(self):
+        """Test an entry built from an older tree version is not served."""
+        registry = HeaderRegistry()
+        registry.put("1:profile", 0, make_headers("name"))
+
+        assert registry.get("1:profile", 1) is None
+        assert "1:profile" not in registry
+        assert registry.stale == 1
+
+    def test_invalidate_by_type(self):
+        """Test invalidating a type drops all its pages and keeps other types."""
+        registry = HeaderRegistry()
+        headers = make_headers("name")
+        for key in ("1:profile", "1:glazing", "11:profile"):
+            registry.put(key, 0, headers)
+
+        registry.invalidate(1)
+
+        assert "11:profile" in registry
+        assert len(registry) == 1
+
+    def test_zero_maxsize_disables_registry(self):
+        """Test a registry sized zero keeps nothing."""
+        registry = HeaderRegistry(maxsize=0)
+        registry.put("1:profile", 0, make_headers("name"))
+
+        assert len(registry) == 0
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session on the SQLite stand-in seeded with ten configurations."""
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_dataset(session, generate_dataset(SCALES["10"]))
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(db) -> list[str]:
+    """Record statements executed on the session's engine, except tree version reads."""
+    recorded: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        if "attribute_tree_versions" not in statement:
+            recorded.append(statement)
+
+    event.listen(db.bind.sync_engine, "before_cursor_execute", record)
+    return recorded
+
+
+@pytest.mark.asyncio
+class TestEntryServiceHeaders:
+    """Test EntryService reading headers through the registry."""
+
+    async def test_headers_and_mappings_share_one_query(self, db, statements):
+        """Test all three header accessors are served by one load."""
+        service = EntryService(db)
+
+        headers = await service.generate_preview_headers(MANUFACTURING_TYPE_ID)
+        mapping = await service.generate_header_mapping(MANUFACTURING_TYPE_ID)
+        reverse = await service.get_reverse_header_mapping(MANUFACTURING_TYPE_ID)
+
+        assert len(statements) == 1
+        assert list(mapping) == headers
+        assert reverse == {field: header for header, field in mapping.items()}
+        assert get_header_registry().get_stats()["hits"] == 2
+
+    async def test_page_types_kept_apart(self, db):
+        """Test another page type of the same type does not reuse headers."""
+        service = EntryService(db)
+
+        profile = await service.generate_header_mapping(MANUFACTURING_TYPE_ID, "profile")
+        glazing = await service.generate_header_mapping(MANUFACTURING_TYPE_ID, "glazing")
+
+        assert len(profile) > 1
+        assert glazing == {"id": "id"}
+
+    async def test_committed_node_change_reloads_headers(self, db, statements):
+        """Test renaming a node is visible after commit without clearing caches."""
+        service = EntryService(db)
+        await service.generate_preview_headers(MANUFACTURING_TYPE_ID)
+        node = await db.scalar(select(AttributeNode).where(AttributeNode.name == "Frame Material"))
+
+        node.display_name = "Frame Finish"
+        await db.flush()
+        pending = await service.generate_preview_headers(MANUFACTURING_TYPE_ID)
+        await db.commit()
+        statements.clear()
+        committed = await service.generate_preview_headers(MANUFACTURING_TYPE_ID)
+
+        assert "Frame Finish" in pending
+        assert "Frame Finish" in committed
+        assert len(statements) == 1
+        assert get_header_registry().stale == 1
+
+    async def test_core_update_reloads_headers(self, db):
+        """Test a node change written with Core, bypassing the ORM, reloads headers."""
+        service = EntryService(db)
+        service._load_preview_headers = AsyncMock(
+            side_effect=[make_headers("name"), make_headers("name", "width")]
+        )
+
+        first = await service.get_preview_headers(MANUFACTURING_TYPE_ID)
+        await db.execute(
+            update(AttributeNode)
+            .where(AttributeNode.name == "Frame Material")
+            .values(display_name="Frame Finish")
+        )
+        await db.commit()
+        second = await service.get_preview_headers(MANUFACTURING_TYPE_ID)
+
+        assert first.headers == ["id", "Name"]
+        assert second.headers == ["id", "Name", "Width"]
+        assert get_header_registry().stale == 1
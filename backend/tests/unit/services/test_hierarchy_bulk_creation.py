@@ -0,0 +1,280 @@
+"""Unit tests for set-based hierarchy creation.
+
+Runs create_hierarchy_from_dict against the SQLite benchmark stand-in.
+
+Tests cover:
+- Paths, depths, parents and fields of bulk-created trees
+- Statements independent of the number of nodes
+- Large trees inserted in multi-row pages, not one INSERT per node
+- Whole-tree validation before anything is written
+- Duplicate siblings within the tree and at the insertion point
+- Tree version bumped for the inserted nodes
+- Cached pricing plans rebuilt with the inserted nodes
+"""
+
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ConflictException, InvalidFormulaException, ValidationException
+from app.models.attribute_node import AttributeNode
+from app.models.manufacturing_type import ManufacturingType
+from app.services.hierarchy_builder import HierarchyBuilderService
+from app.services.pricing import PricingService
+from app.services.tree_versions import get_tree_version, has_pending_changes
+from tests.benchmarks.database import create_benchmark_engine, create_schema
+
+TYPE_ID = 3
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session on the SQLite stand-in with one manufacturing type."""
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.execute(
+            insert(ManufacturingType),
+            [
+                {
+                    "id": TYPE_ID,
+                    "name": "Bulk Window",
+                    "base_category": "window",
+                    "base_price": Decimal("100.00"),
+                    "base_weight": Decimal("5.00"),
+                    "is_active": True,
+                }
+            ],
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(db) -> HierarchyBuilderService:
+    """Create hierarchy builder on the stand-in session."""
+    return HierarchyBuilderService(db)
+
+
+def wide_tree(name: str, attributes: int, options: int) -> dict:
+    """Create a category with attributes that each have options."""
+    return {
+        "name": name,
+        "node_type": "category",
+        "children": [
+            {
+                "name": f"Attribute {a}",
+                "node_type": "attribute",
+                "data_type": "selection",
+                "children": [
+                    {"name": f"Option {o}", "node_type": "option", "price_impact_value": o}
+                    for o in range(options)
+                ],
+            }
+            for a in range(attributes)
+        ],
+    }
+
+
+async def count_nodes(db: AsyncSession) -> int:
+    """Count stored attribute nodes."""
+    return await db.scalar(select(func.count()).select_from(AttributeNode))
+
+
+@pytest.mark.asyncio
+async def test_tree_stored_with_paths_and_depths(db, service):
+    """Test nodes get depth-first ids, parents, paths, depths and fields."""
+    root = await service.create_hierarchy_from_dict(
+        TYPE_ID,
+        {
+            "name": "Frame Options",
+            "node_type": "category",
+            "children": [
+                {
+                    "name": "Material Type",
+                    "node_type": "attribute",
+                    "display_condition": {"operator": "equals", "field": "type", "value": "frame"},
+                    "children": [
+                        {"name": "Aluminum & Steel", "node_type": "option", "weight_impact": 2.5},
+                        {"name": "Vinyl", "node_type": "option", "metadata_": {"color": "white"}},
+                    ],
+                },
+                {"name": "Finish", "node_type": "attribute", "page_type": "glazing"},
+            ],
+        },
+    )
+
+    nodes = (await db.execute(select(AttributeNode).order_by(AttributeNode.id))).scalars().all()
+    assert root.id == nodes[0].id
+    assert [(n.name, n.ltree_path, n.depth) for n in nodes] == [
+        ("Frame Options", "frame_options", 0),
+        ("Material Type", "frame_options.material_type", 1),
+        ("Aluminum & Steel", "frame_options.material_type.aluminum_and_steel", 2),
+        ("Vinyl", "frame_options.material_type.vinyl", 2),
+        ("Finish", "frame_options.finish", 1),
+    ]
+    assert [n.parent_node_id for n in nodes] == [None, *[nodes[i].id for i in (0, 1, 1, 0)]]
+    assert nodes[1].display_condition == {"operator": "equals", "field": "type", "value": "frame"}
+    assert nodes[2].weight_impact == Decimal("2.5")
+    assert nodes[3].metadata_ == {"color": "white"}
+    assert nodes[3].weight_impact == Decimal("0")
+    assert [n.page_type for n in nodes] == ["profile"] * 4 + ["glazing"]
+    assert all(n.price_impact_type == "fixed" and n.required is False for n in nodes)
+
+
+@pytest.mark.asyncio
+async def test_tree_under_existing_parent(db, service):
+    """Test a tree created under a stored node continues its path and depth."""
+    parent = await service.create_hierarchy_from_dict(
+        TYPE_ID, {"name": "Existing Parent", "node_type": "category"}
+    )
+
+    root = await service.create_hierarchy_from_dict(
+        TYPE_ID, wide_tree("Child Category", attributes=1, options=2), parent=parent
+    )
+
+    nodes = (await db.execute(select(AttributeNode).where(AttributeNode.id != parent.id))).scalars()
+    assert root.parent_node_id == parent.id
+    assert (root.ltree_path, root.depth) == ("existing_parent.child_category", 1)
+    assert sorted((n.ltree_path, n.depth) for n in nodes) == [
+        ("existing_parent.child_category", 1),
+        ("existing_parent.child_category.attribute_0", 2),
+        ("existing_parent.child_category.attribute_0.option_0", 3),
+        ("existing_parent.child_category.attribute_0.option_1", 3),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_statements_independent_of_tree_size(db, service):
+    """Test a 7-node tree and a 421-node tree cost the same statements."""
+    statements: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement.split("(")[0]),
+    )
+
+    counts = []
+    for name, attributes, options in (("Small", 2, 2), ("Large", 20, 20)):
+        statements.clear()
+        await service.create_hierarchy_from_dict(TYPE_ID, wide_tree(name, attributes, options))
+        counts.append(list(statements))
+
+    assert await count_nodes(db) == 7 + 421
+    assert counts[0] == counts[1]
+    assert counts[0].count("INSERT INTO attribute_nodes ") == 1
+
+
+@pytest.mark.asyncio
+async def test_large_tree_inserted_in_pages(db, service):
+    """Test thousands of nodes go out as a few multi-row INSERTs."""
+    inserts: list[tuple[int, bool]] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, context, executemany: (
+            inserts.append((statement.count("VALUES") + statement.count("), ("), executemany))
+            if statement.startswith("INSERT INTO attribute_nodes")
+            else None
+        ),
+    )
+
+    await service.create_hierarchy_from_dict(TYPE_ID, wide_tree("Root", 50, 50))
+
+    assert await count_nodes(db) == 2551
+    assert 1 < len(inserts) < 10
+    assert not any(executemany for _, executemany in inserts)
+    assert sum(rows for rows, _ in inserts) == 2551
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("invalid_child", "error"),
+    [
+        ({"name": "Bad", "node_type": "invalid_type"}, ValidationException),
+        ({"name": "Bad", "node_type": "option", "price_formula": "1 +"}, InvalidFormulaException),
+        ({"name": "Bad"}, ValueError),
+        ({"name": "!!!", "node_type": "option"}, ValueError),
+        ({"name": "Bad", "node_type": "option", "ltree_path": "x"}, ValueError),
+        ({"name": "Bad", "node_type": "option", "colour": "red"}, ValueError),
+        ("not a dict", ValueError),
+    ],
+)
+async def test_invalid_nodes_rejected_before_writing(db, service, invalid_child, error):
+    """Test an invalid node anywhere in the tree fails before any query."""
+    tree = wide_tree("Root", attributes=3, options=3)
+    tree["children"][2]["children"][1]["children"] = [invalid_child]
+    statements: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    with pytest.raises(error):
+        await service.create_hierarchy_from_dict(TYPE_ID, tree)
+
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_duplicate_siblings_in_tree_rejected(db, service):
+    """Test siblings sharing a name within the new tree are rejected."""
+    tree = wide_tree("Root", attributes=2, options=2)
+    tree["children"][1]["children"].append({"name": "Option 0", "node_type": "option"})
+
+    with pytest.raises(ConflictException, match="more than once under 'Attribute 1'"):
+        await service.create_hierarchy_from_dict(TYPE_ID, tree)
+
+    assert await count_nodes(db) == 0
+
+
+@pytest.mark.asyncio
+async def test_duplicate_of_stored_node_rejected(db, service):
+    """Test a root named like a stored sibling is rejected and nothing written."""
+    await service.create_hierarchy_from_dict(TYPE_ID, {"name": "Root", "node_type": "category"})
+
+    with pytest.raises(ConflictException, match="already exists at root level"):
+        await service.create_hierarchy_from_dict(TYPE_ID, wide_tree("Root", 2, 2))
+
+    assert await count_nodes(db) == 1
+
+
+@pytest.mark.asyncio
+async def test_committed_tree_bumps_tree_version(db, service):
+    """Test committing a bulk-created tree moves the type's tree version."""
+    before = await get_tree_version(db, TYPE_ID)
+
+    await service.create_hierarchy_from_dict(TYPE_ID, wide_tree("Root", attributes=1, options=1))
+
+    assert await get_tree_version(db, TYPE_ID) > before
+    assert not has_pending_changes(db)
+
+
+@pytest.mark.asyncio
+async def test_committed_tree_rebuilds_pricing_plan(db, service):
+    """Test the type's cached pricing plan picks up bulk-created priced nodes."""
+    pricing = PricingService(db)
+    await service.create_hierarchy_from_dict(TYPE_ID, {"name": "Frame", "node_type": "category"})
+    cached = (await pricing.get_pricing_plans({TYPE_ID}))[TYPE_ID]
+    assert (await pricing.get_pricing_plans({TYPE_ID}))[TYPE_ID] is cached
+
+    glass = await service.create_hierarchy_from_dict(
+        TYPE_ID,
+        {
+            "name": "Glass",
+            "node_type": "category",
+            "children": [{"name": "Triple", "node_type": "option", "price_impact_value": 40}],
+        },
+    )
+    triple = await db.scalar(
+        select(AttributeNode.id).where(AttributeNode.parent_node_id == glass.id)
+    )
+    rebuilt = (await pricing.get_pricing_plans({TYPE_ID}))[TYPE_ID]
+
+    assert triple not in cached
+    assert triple in rebuilt
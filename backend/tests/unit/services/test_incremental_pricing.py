@@ -0,0 +1,271 @@
+"""Unit tests for incremental (delta) pricing on single-selection edits.
+
+Tests cover:
+- Detection of percentage- and context-dependent rules
+- Delta application without re-pricing other selections
+- Fallback to full recalculation
+- ConfigurationService add/remove and EntryService preview edits
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundException
+from app.core.rbac import Role
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.models.user import User
+from app.schemas.configuration_selection import ConfigurationSelectionValue
+from app.services.configuration import ConfigurationService
+from app.services.entry import EntryService
+from app.services.pricing import PricingService
+
+
+def make_node(node_id: int = 10, **pricing) -> AttributeNode:
+    """Create an attribute node with the given pricing rule."""
+    return AttributeNode(
+        id=node_id,
+        name=f"Node {node_id}",
+        node_type="attribute",
+        data_type="number",
+        ltree_path=f"node_{node_id}",
+        **pricing,
+    )
+
+
+def impacts(price: str, weight: str) -> dict[str, Decimal]:
+    """Build an impacts dictionary."""
+    return {"price_impact": Decimal(price), "weight_impact": Decimal(weight)}
+
+
+@pytest.fixture
+def pricing_service() -> PricingService:
+    """Create pricing service with mocked repositories."""
+    db = MagicMock(spec=AsyncSession)
+    db.flush = AsyncMock()
+    service = PricingService(db)
+    service.selection_repo.has_running_price_rules = AsyncMock(return_value=False)
+    service.config_repo.apply_price_delta = AsyncMock(
+        return_value=(Decimal("260.00"), Decimal("18.00"))
+    )
+    service.config_repo.bulk_update_prices = AsyncMock(return_value=1)
+    service.calculate_configuration_price = AsyncMock(
+        return_value={"total_price": Decimal("300.00"), "total_weight": Decimal("20.00")}
+    )
+    return service
+
+
+class TestRequiresFullRecalculation:
+    """Test detection of rules that cannot be applied as a delta."""
+
+    @pytest.mark.parametrize(
+        ("pricing", "expected"),
+        [
+            ({"price_impact_type": "fixed", "price_impact_value": Decimal("5")}, False),
+            ({"price_impact_type": "formula", "price_formula": "width * 0.5"}, False),
+            ({"price_impact_type": "fixed", "weight_formula": "quantity * 2"}, False),
+            ({"price_impact_type": "percentage", "price_impact_value": Decimal("10")}, True),
+            ({"price_impact_type": "formula", "price_formula": "price_impact * 0.1"}, True),
+            ({"price_impact_type": "fixed", "weight_formula": "weight_impact + 1"}, True),
+            ({"price_impact_type": "formula", "price_formula": "width +"}, True),
+            # Price formulas are ignored unless the rule type is formula
+            ({"price_impact_type": "fixed", "price_formula": "price_impact * 2"}, False),
+        ],
+    )
+    def test_rule_detection(self, pricing_service: PricingService, pricing, expected):
+        """Test which rules force a full recalculation."""
+        assert pricing_service.requires_full_recalculation(make_node(**pricing)) is expected
+
+    def test_missing_node(self, pricing_service: PricingService):
+        """Test an unknown node forces a full recalculation."""
+        assert pricing_service.requires_full_recalculation(None) is True
+
+
+@pytest.mark.asyncio
+class TestApplySelectionChange:
+    """Test applying a single selection change to stored totals."""
+
+    async def test_applies_delta(self, pricing_service: PricingService):
+        """Test the impact difference is applied without re-pricing."""
+        node = make_node(price_impact_type="fixed", price_impact_value=Decimal("60"))
+
+        totals = await pricing_service.apply_selection_change(
+            1, node, old_impacts=impacts("50.00", "2.00"), new_impacts=impacts("60.00", "1.50")
+        )
+
+        pricing_service.config_repo.apply_price_delta.assert_awaited_once_with(
+            1, Decimal("10.00"), Decimal("-0.50")
+        )
+        pricing_service.calculate_configuration_price.assert_not_awaited()
+        assert totals == {"total_price": Decimal("260.00"), "total_weight": Decimal("18.00")}
+
+    async def test_added_and_removed_selections(self, pricing_service: PricingService):
+        """Test additions add the new impact and removals subtract the old one."""
+        node = make_node(price_impact_type="formula", price_formula="width * 0.5")
+
+        await pricing_service.apply_selection_change(
+            1, node, old_impacts=None, new_impacts=impacts("12.345", "0")
+        )
+        await pricing_service.apply_selection_change(
+            1, node, old_impacts=impacts("12.35", "0"), new_impacts=None
+        )
+
+        calls = pricing_service.config_repo.apply_price_delta.await_args_list
+        assert calls[0].args == (1, Decimal("12.35"), Decimal("0.00"))
+        assert calls[1].args == (1, Decimal("-12.35"), Decimal("0.00"))
+
+    @pytest.mark.parametrize(
+        "case",
+        ["percentage_node", "percentage_in_configuration", "unstored_impact", "disabled"],
+    )
+    async def test_falls_back_to_full_recalculation(self, pricing_service: PricingService, case):
+        """Test every fallback condition re-prices the whole configuration."""
+        node = make_node(price_impact_type="fixed", price_impact_value=Decimal("5"))
+        old = impacts("5", "0")
+        settings = MagicMock()
+        settings.windx.incremental_pricing = case != "disabled"
+        if case == "percentage_node":
+            node = make_node(price_impact_type="percentage", price_impact_value=Decimal("10"))
+        elif case == "percentage_in_configuration":
+            pricing_service.selection_repo.has_running_price_rules.return_value = True
+        elif case == "unstored_impact":
+            old = {"price_impact": None, "weight_impact": None}
+
+        with patch("app.services.pricing.get_settings", return_value=settings):
+            totals = await pricing_service.apply_selection_change(
+                1, node, old_impacts=old, new_impacts=impacts("7", "0")
+            )
+
+        pricing_service.config_repo.apply_price_delta.assert_not_awaited()
+        pricing_service.db.flush.assert_awaited_once()
+        pricing_service.config_repo.bulk_update_prices.assert_awaited_once_with(
+            [(1, Decimal("300.00"), Decimal("20.00"))]
+        )
+        assert totals["total_price"] == Decimal("300.00")
+
+    async def test_missing_configuration(self, pricing_service: PricingService):
+        """Test a delta for a missing configuration raises NotFound."""
+        pricing_service.config_repo.apply_price_delta.return_value = None
+
+        with pytest.raises(NotFoundException):
+            await pricing_service.apply_selection_change(
+                99, make_node(price_impact_type="fixed"), None, impacts("1", "0")
+            )
+
+
+@pytest.fixture
+def configuration_service() -> ConfigurationService:
+    """Create configuration service with mocked session and repositories."""
+    db = MagicMock(spec=AsyncSession)
+    db.commit = AsyncMock()
+    db.refresh = AsyncMock()
+    service = ConfigurationService(db)
+    service.get_configuration = AsyncMock(return_value=Configuration(id=1))
+    service.pricing_service.apply_selection_change = AsyncMock()
+    service.calculate_totals = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+class TestConfigurationServiceIncremental:
+    """Test ConfigurationService single-selection edits use deltas."""
+
+    async def test_add_selection(self, configuration_service: ConfigurationService):
+        """Test adding a selection applies its impact instead of recalculating."""
+        node = make_node(price_impact_type="fixed", price_impact_value=Decimal("25"))
+        configuration_service.attr_node_repo.get = AsyncMock(return_value=node)
+
+        selection = await configuration_service.add_selection(
+            1, ConfigurationSelectionValue(attribute_node_id=10, numeric_value=Decimal("3"))
+        )
+
+        configuration_service.pricing_service.apply_selection_change.assert_awaited_once_with(
+            1, node, old_impacts=None, new_impacts=impacts("25", "0")
+        )
+        configuration_service.calculate_totals.assert_not_awaited()
+        assert selection.calculated_price_impact == Decimal("25")
+
+    async def test_remove_selection(self, configuration_service: ConfigurationService):
+        """Test removing a selection subtracts its stored impact."""
+        node = make_node(price_impact_type="fixed", price_impact_value=Decimal("25"))
+        selection = ConfigurationSelection(
+            id=5,
+            configuration_id=1,
+            attribute_node_id=10,
+            calculated_price_impact=Decimal("25.00"),
+            calculated_weight_impact=Decimal("1.00"),
+        )
+        configuration_service.selection_repo.get = AsyncMock(return_value=selection)
+        configuration_service.selection_repo.delete = AsyncMock()
+        configuration_service.attr_node_repo.get = AsyncMock(return_value=node)
+
+        await configuration_service.remove_selection(1, 5)
+
+        configuration_service.selection_repo.delete.assert_awaited_once_with(5)
+        configuration_service.pricing_service.apply_selection_change.assert_awaited_once_with(
+            1, node, old_impacts=impacts("25.00", "1.00"), new_impacts=None
+        )
+        configuration_service.calculate_totals.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestEntryPreviewIncremental:
+    """Test preview grid cell edits re-price only the edited cell."""
+
+    async def test_update_preview_value_applies_delta(self):
+        """Test editing a priced cell stores the new impact and applies the delta."""
+        node = make_node(
+            price_impact_type="formula", price_formula="width * 0.5", weight_impact=Decimal("0")
+        )
+        node.manufacturing_type_id = 1
+        node.page_type = "profile"
+        selection = ConfigurationSelection(
+            id=5,
+            configuration_id=1,
+            attribute_node_id=10,
+            numeric_value=Decimal("100"),
+            calculated_price_impact=Decimal("50.00"),
+            calculated_weight_impact=Decimal("0.00"),
+        )
+        config = Configuration(id=1, manufacturing_type_id=1, name="Config 1")
+        config.selections = [selection]
+
+        db = MagicMock(spec=AsyncSession)
+        db.execute = AsyncMock(
+            side_effect=[
+                MagicMock(scalar_one_or_none=MagicMock(return_value=config)),
+                MagicMock(scalar_one_or_none=MagicMock(return_value=node)),
+            ]
+        )
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        service = EntryService(db)
+        service.generate_header_mapping = AsyncMock(return_value={"Width": "Node 10"})
+        service.pricing_service.apply_selection_change = AsyncMock()
+        user = User(
+            id=1,
+            email="admin@example.com",
+            username="admin",
+            role=Role.SUPERADMIN.value,
+            is_active=True,
+            is_superuser=True,
+        )
+
+        with patch(
+            "app.services.rbac.RBACService.check_resource_ownership", new_callable=AsyncMock
+        ) as mock_ownership:
+            mock_ownership.return_value = True
+            await service.update_preview_value(1, "Width", 120, user)
+
+        assert selection.numeric_value == Decimal("120")
+        assert selection.calculated_price_impact == Decimal("60.0")
+        service.pricing_service.apply_selection_change.assert_awaited_once_with(
+            1,
+            node,
+            old_impacts=impacts("50.00", "0.00"),
+            new_impacts={"price_impact": Decimal("60.0"), "weight_impact": Decimal("0")},
+        )
@@ -0,0 +1,130 @@
+"""Unit tests for quote and order number allocation.
+
+Runs the allocator against an in-memory SQLite database holding only the
+document counter table.
+
+Tests cover:
+- Q-YYYYMMDD-NNN formatting with daily restarts
+- Block pre-allocation per worker without overlapping numbers
+- Batches reserved with one counter update
+- Constant statement count regardless of the day's volume
+- Losing the race to create the day's counter
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.models.document_counter import DocumentCounter
+from app.repositories.document_counter import DocumentCounterRepository
+from app.services.number_allocator import NumberAllocator, format_number
+
+DAY = date(2026, 1, 5)
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session on an in-memory database with the counter table."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: DocumentCounter.metadata.create_all(
+                sync_conn, tables=[DocumentCounter.__table__]
+            )
+        )
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+def test_format_number():
+    """Test numbers keep the existing format and grow past three digits."""
+    assert format_number("Q", DAY, 7) == "Q-20260105-007"
+    assert format_number("O", DAY, 12345) == "O-20260105-12345"
+
+
+@pytest.mark.asyncio
+async def test_numbers_restart_daily(db):
+    """Test numbering is sequential per prefix and restarts every day."""
+    allocator = NumberAllocator()
+
+    assert await allocator.allocate(db, "Q", day=DAY) == ["Q-20260105-001"]
+    assert await allocator.allocate(db, "Q", 2, day=DAY) == ["Q-20260105-002", "Q-20260105-003"]
+    assert await allocator.allocate(db, "O", day=DAY) == ["O-20260105-001"]
+    assert await allocator.allocate(db, "Q", day=date(2026, 1, 6)) == ["Q-20260106-001"]
+    assert allocator.reservations == 4
+
+
+@pytest.mark.asyncio
+async def test_block_preallocation_per_worker(db):
+    """Test workers serve numbers from their own blocks without overlap."""
+    first, second = NumberAllocator(block_size=10), NumberAllocator(block_size=10)
+
+    numbers = []
+    for _ in range(12):
+        numbers += await first.allocate(db, "Q", day=DAY)
+        numbers += await second.allocate(db, "Q", day=DAY)
+
+    assert len(set(numbers)) == 24
+    assert first.reservations == second.reservations == 2
+    assert numbers[:2] == ["Q-20260105-001", "Q-20260105-011"]
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_block_then_one_update(db):
+    """Test a batch drains the block and reserves the rest in one update."""
+    allocator = NumberAllocator(block_size=5)
+    await allocator.allocate(db, "Q", day=DAY)
+
+    numbers = await allocator.allocate(db, "Q", 20, day=DAY)
+
+    assert numbers == [format_number("Q", DAY, value) for value in range(2, 22)]
+    assert allocator.reservations == 2
+
+
+@pytest.mark.asyncio
+async def test_constant_statements_at_daily_volume(db):
+    """Test the 10,000th number of a day costs the same statements as the second."""
+    allocator = NumberAllocator()
+    statements: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    # The first allocation of the day creates the counter
+    await allocator.allocate(db, "Q", day=DAY)
+    statements.clear()
+    await allocator.allocate(db, "Q", day=DAY)
+    early = len(statements)
+    await allocator.allocate(db, "Q", 9_997, day=DAY)
+    statements.clear()
+
+    assert await allocator.allocate(db, "Q", day=DAY) == ["Q-20260105-10000"]
+    assert len(statements) == early == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_counter_creation_race(db):
+    """Test a worker that loses the race to create the counter updates it instead."""
+    await DocumentCounterRepository(db).insert("Q", DAY, 3)
+    await db.commit()
+    increment = DocumentCounterRepository.increment
+    calls = 0
+
+    async def created_concurrently(self, prefix, day, count):
+        nonlocal calls
+        calls += 1
+        # The counter did not exist yet when this worker first looked
+        return None if calls == 1 else await increment(self, prefix, day, count)
+
+    with patch.object(DocumentCounterRepository, "increment", created_concurrently):
+        numbers = await NumberAllocator().allocate(db, "Q", day=DAY)
+
+    assert numbers == ["Q-20260105-004"]
@@ -0,0 +1,261 @@
+"""Unit tests for bulk preview table assembly.
+
+Runs preview generation against the SQLite benchmark stand-in seeded with
+generated configurations.
+
+Tests cover:
+- list_previews issuing a fixed number of queries for any row count
+- Pivoted selection rows matching rows built from loaded selections
+- Business rules hiding fields that don't apply to the row
+- Streaming previews by keyset with cursors, sorting and filters
+"""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.exceptions import ValidationException
+from app.core.rbac import Role
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.services.entry import EntryService, PreviewStream, _PreviewLayout
+from tests.benchmarks.data import MANUFACTURING_TYPE_ID, SCALES, generate_dataset
+from tests.benchmarks.database import create_benchmark_engine, create_schema, seed_dataset
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session on the SQLite stand-in seeded with ten configurations."""
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_dataset(session, generate_dataset(SCALES["10"]))
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(db) -> EntryService:
+    """Create entry service with cold header caches."""
+    service = EntryService(db)
+    service.clear_header_cache()
+    yield service
+    service.clear_header_cache()
+
+
+@pytest.fixture
+def superadmin() -> MagicMock:
+    """Create a superadmin user stub."""
+    return MagicMock(role=Role.SUPERADMIN.value)
+
+
+async def list_previews(service: EntryService, user) -> list[dict]:
+    """List previews without the RBAC decorators."""
+    table = await EntryService.list_previews._rbac_original_func(
+        service, MANUFACTURING_TYPE_ID, user
+    )
+    return table.rows
+
+
+@pytest.mark.asyncio
+async def test_list_previews_query_count_independent_of_rows(db, service, superadmin):
+    """Test listing costs the same few queries however many rows there are."""
+    statements: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    await list_previews(service, superadmin)
+    statements.clear()
+
+    rows = await list_previews(service, superadmin)
+
+    assert len(rows) == SCALES["10"].configurations
+    # Node names, configurations and pivoted selections, plus the tree
+    # version cached headers are checked against
+    assert len(statements) == 4
+
+
+@pytest.mark.asyncio
+async def test_pivoted_rows_match_loaded_selections(db, service, superadmin):
+    """Test rows from pivoted selection rows equal rows from ORM selections."""
+    result = await db.execute(
+        select(Configuration)
+        .options(selectinload(Configuration.selections))
+        .order_by(Configuration.id)
+    )
+    table = await service.generate_preview_table(
+        list(result.scalars().all()), MANUFACTURING_TYPE_ID
+    )
+
+    rows = await list_previews(service, superadmin)
+
+    assert {row["id"]: row for row in rows} == {row["id"]: row for row in table.rows}
+    assert all(set(row) >= set(table.headers) for row in rows)
+    assert any(value != "N/A" for row in rows for value in row.values())
+
+
+def test_business_rules_hide_fields():
+    """Test fields that don't apply to the row's type are shown as N/A."""
+    service = EntryService(MagicMock())
+    layout = _PreviewLayout(
+        headers=["id", "Name", "Type", "Renovation", "Width"],
+        header_mapping={
+            "id": "id",
+            "Name": "name",
+            "Type": "type",
+            "Renovation": "renovation",
+            "Width": "width",
+        },
+        field_headers={
+            "id": "id",
+            "name": "Name",
+            "type": "Type",
+            "renovation": "Renovation",
+            "width": "Width",
+        },
+        node_names={1: "name", 2: "type", 3: "renovation", 4: "width"},
+        name_header="Name",
+    )
+
+    sash = service._configuration_row(
+        layout, 7, "Sash A", {"type": "Sash", "renovation": True, "width": Decimal("40")}
+    )
+    frame = service._form_data_row(layout, {"name": "Frame A", "type": "Frame", "renovation": True})
+
+    assert sash == {"id": 7, "Name": "Sash A", "Type": "Sash", "Renovation": "N/A", "Width": "40"}
+    assert frame == {
+        "id": "N/A",
+        "Name": "Frame A",
+        "Type": "Frame",
+        "Renovation": "yes",
+        "Width": "N/A",
+    }
+
+
+async def stream_previews(service: EntryService, user, **kwargs) -> PreviewStream:
+    """Stream previews without the RBAC decorators."""
+    return await EntryService.stream_previews._rbac_original_func(
+        service, MANUFACTURING_TYPE_ID, user, **kwargs
+    )
+
+
+async def collect(stream: PreviewStream) -> list[dict]:
+    """Read every row of a stream."""
+    return [row async for row in stream]
+
+
+async def page_through(service: EntryService, user, limit: int, **kwargs) -> list[dict]:
+    """Read a stream in pages of ``limit`` rows by following cursors."""
+    rows: list[dict] = []
+    cursor = None
+    while True:
+        stream = await stream_previews(service, user, limit=limit, cursor=cursor, **kwargs)
+        rows += await collect(stream)
+        cursor = stream.next_cursor
+        if cursor is None:
+            return rows
+
+
+@pytest.mark.asyncio
+async def test_stream_matches_list_previews(service, superadmin):
+    """Test streaming in small pages yields the listed rows once each."""
+    listed = await list_previews(service, superadmin)
+
+    streamed = await collect(await stream_previews(service, superadmin, page_size=3))
+
+    assert sorted(streamed, key=lambda row: row["id"]) == sorted(listed, key=lambda row: row["id"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("descending", [True, False])
+async def test_cursor_pages_cover_sorted_table(service, superadmin, descending):
+    """Test following cursors over a sorted column visits every row in order."""
+    layout = await service._load_preview_layout(MANUFACTURING_TYPE_ID)
+    header = next(
+        header
+        for header, field_name in layout.header_mapping.items()
+        if field_name in layout.numeric_fields
+    )
+
+    rows = await page_through(service, superadmin, 4, sort=header, descending=descending)
+    full = await collect(await stream_previews(service, superadmin, sort=header))
+
+    assert sorted(row["id"] for row in rows) == sorted(row["id"] for row in full)
+    values = [Decimal(row[header]) for row in rows if row[header] != "N/A"]
+    assert values == sorted(values, reverse=descending)
+
+
+@pytest.mark.asyncio
+async def test_limit_sets_next_cursor(service, superadmin):
+    """Test a stream cut short by its limit returns a cursor to continue from."""
+    stream = await stream_previews(service, superadmin, limit=4, page_size=3)
+    first = await collect(stream)
+    rest = await collect(
+        await stream_previews(service, superadmin, cursor=stream.next_cursor, page_size=3)
+    )
+
+    assert len(first) == stream.count == 4
+    assert stream.next_cursor is not None
+    assert len(rest) == SCALES["10"].configurations - 4
+    assert not {row["id"] for row in first} & {row["id"] for row in rest}
+
+
+@pytest.mark.asyncio
+async def test_filter_on_header_columns(db, service, superadmin):
+    """Test header filters match stored values case-insensitively."""
+    layout = await service._load_preview_layout(MANUFACTURING_TYPE_ID)
+    header, field_name = next(
+        (header, field_name)
+        for header, field_name in layout.header_mapping.items()
+        if field_name not in layout.numeric_fields | {"id", "name"}
+    )
+    for config_id in (2, 5):
+        db.add(
+            ConfigurationSelection(
+                configuration_id=config_id,
+                attribute_node_id=layout.node_ids(field_name)[0],
+                string_value="Brushed Aluminum",
+                selection_path=field_name,
+            )
+        )
+    await db.commit()
+
+    by_value = await collect(
+        await stream_previews(service, superadmin, filters={header: "aluminum"})
+    )
+    by_name = await collect(
+        await stream_previews(service, superadmin, filters={layout.name_header: "CONFIGURATION 3"})
+    )
+
+    assert sorted(row["id"] for row in by_value) == [2, 5]
+    assert by_value[0][header] == "Brushed Aluminum"
+    assert [row["id"] for row in by_name] == [3]
+
+
+@pytest.mark.asyncio
+async def test_invalid_stream_requests(service, superadmin):
+    """Test unknown columns and foreign cursors are rejected."""
+    cursor = PreviewStream.encode_cursor("updated_at", None, 3)
+
+    with pytest.raises(ValidationException):
+        await stream_previews(service, superadmin, sort="Not A Column")
+    with pytest.raises(ValidationException):
+        await stream_previews(service, superadmin, filters={"Not A Column": "x"})
+    with pytest.raises(ValidationException):
+        await stream_previews(service, superadmin, sort="id", cursor=cursor)
+    with pytest.raises(ValidationException):
+        await stream_previews(service, superadmin, cursor="not-a-cursor")
+
+
+def test_cursor_round_trip():
+    """Test cursors keep typed sort values."""
+    cursor = PreviewStream.encode_cursor("Width", Decimal("40.50"), 12)
+
+    assert PreviewStream.decode_cursor(cursor, "Width", "numeric") == (Decimal("40.50"), 12)
@@ -0,0 +1,408 @@
+"""Unit tests for price quote memoization.
+
+Tests cover:
+- Canonical selection fingerprints
+- PricingService serving identical configurations from the cache
+- Shared Redis tier across workers
+- Invalidation from database tree versions, including Core writes
+- QuoteService pricing quotes through the cache
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.rbac import Role
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.models.manufacturing_type import ManufacturingType
+from app.models.quote import Quote
+from app.models.user import User
+from app.services import price_cache, tree_versions
+from app.services.hierarchy_builder import HierarchyBuilderService
+from app.services.price_cache import PriceQuoteCache, get_price_quote_cache
+from app.services.pricing import PricingService
+from app.services.pricing_plan import get_pricing_plan_cache
+from app.services.quote import QuoteService
+from app.services.tree_versions import TreeVersionRegistry
+from tests.benchmarks.database import create_benchmark_engine, create_schema
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the async Redis client."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Buffered pipeline for FakeRedis."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key, value))
+
+    async def execute(self):
+        for _, key, value in self.commands:
+            self.redis.store[key] = value
+        self.commands.clear()
+
+
+MFG_TYPE = ManufacturingType(
+    id=1, name="Casement Window", base_price=Decimal("200"), base_weight=Decimal("15")
+)
+
+NODES = {
+    10: AttributeNode(
+        id=10,
+        name="Aluminum",
+        node_type="option",
+        price_impact_type="fixed",
+        price_impact_value=Decimal("50.00"),
+        weight_impact=Decimal("2.00"),
+        ltree_path="frame.material.aluminum",
+    ),
+    11: AttributeNode(
+        id=11,
+        name="Width",
+        node_type="attribute",
+        price_impact_type="formula",
+        price_formula="width * 0.5",
+        ltree_path="dimensions.width",
+    ),
+}
+
+
+def make_config(config_id: int) -> Configuration:
+    """Create a configuration of the test manufacturing type."""
+    config = Configuration(
+        id=config_id,
+        manufacturing_type_id=MFG_TYPE.id,
+        name=f"Config {config_id}",
+        base_price=MFG_TYPE.base_price,
+    )
+    config.manufacturing_type = MFG_TYPE
+    return config
+
+
+def make_selections(config_id: int, width: str = "40") -> list[ConfigurationSelection]:
+    """Create the aluminum + width selections of a configuration."""
+    return [
+        ConfigurationSelection(
+            id=config_id * 100,
+            configuration_id=config_id,
+            attribute_node_id=10,
+            string_value="Aluminum",
+        ),
+        ConfigurationSelection(
+            id=config_id * 100 + 1,
+            configuration_id=config_id,
+            attribute_node_id=11,
+            numeric_value=Decimal(width),
+        ),
+    ]
+
+
+def make_pricing_service(
+    selections: dict[int, list[ConfigurationSelection]], tree_version: int = 1
+) -> PricingService:
+    """Create pricing service with mocked batch repositories and tree version."""
+    db = MagicMock(spec=AsyncSession)
+    db.info = {}
+    db.scalar = AsyncMock(return_value=tree_version)
+    service = PricingService(db)
+    configs = {config_id: make_config(config_id) for config_id in selections}
+    service.config_repo.get_many_with_manufacturing_type = AsyncMock(
+        side_effect=lambda ids: [configs[i] for i in ids if i in configs]
+    )
+    service.selection_repo.get_by_configurations = AsyncMock(
+        side_effect=lambda ids: {i: selections[i] for i in ids}
+    )
+    service.attr_node_repo.get_pricing_rules = AsyncMock(return_value=list(NODES.values()))
+    return service
+
+
+class TestFingerprint:
+    """Test canonical selection fingerprints."""
+
+    def test_order_and_scale_independent(self):
+        """Test selection order and Decimal scale do not change the hash."""
+        selections = make_selections(1)
+        reordered = list(reversed(make_selections(2, width="40.000")))
+
+        assert PriceQuoteCache.fingerprint(make_config(1), selections) == (
+            PriceQuoteCache.fingerprint(make_config(2), reordered)
+        )
+
+    def test_pricing_inputs_change_hash(self):
+        """Test values, impacts and base price all affect the hash."""
+        config = make_config(1)
+        baseline = PriceQuoteCache.fingerprint(config, make_selections(1))
+
+        changed_impact = make_selections(1)
+        changed_impact[1].calculated_price_impact = Decimal("20.00")
+        cheaper = make_config(1)
+        cheaper.base_price = Decimal("150")
+
+        assert PriceQuoteCache.fingerprint(config, make_selections(1, width="41")) != baseline
+        assert PriceQuoteCache.fingerprint(config, changed_impact) != baseline
+        assert PriceQuoteCache.fingerprint(cheaper, make_selections(1)) != baseline
+        assert PriceQuoteCache.fingerprint(config, make_selections(1)[:1]) != baseline
+
+
+@pytest.mark.asyncio
+class TestPricingServiceMemoization:
+    """Test PricingService consults the cache before pricing."""
+
+    async def test_identical_configurations_priced_once(self):
+        """Test configurations with the same selections share one result."""
+        service = make_pricing_service(
+            {1: make_selections(1), 2: make_selections(2), 3: make_selections(3, width="80")}
+        )
+
+        first = await service.calculate_prices_for_configurations([1, 3])
+        second = await service.calculate_prices_for_configurations([2])
+
+        assert (
+            first[1]
+            == second[2]
+            == {
+                "total_price": Decimal("270.0"),
+                "total_weight": Decimal("17.00"),
+            }
+        )
+        assert first[3]["total_price"] == Decimal("290.0")
+        # The second call did not need any pricing rules
+        assert service.attr_node_repo.get_pricing_rules.await_count == 1
+        stats = get_price_quote_cache().get_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+    async def test_invalidation_forces_repricing(self):
+        """Test a tree version bump makes cached prices unreachable."""
+        service = make_pricing_service({1: make_selections(1)})
+        await service.calculate_configuration_price(1)
+
+        service.db.scalar.return_value = 2
+        await service.calculate_configuration_price(1)
+
+        assert service.attr_node_repo.get_pricing_rules.await_count == 2
+        assert len(get_price_quote_cache()) == 2
+
+    async def test_pending_changes_not_cached(self):
+        """Test a session with uncommitted tree changes prices without the cache."""
+        service = make_pricing_service({1: make_selections(1)})
+        service.db.info[tree_versions._PENDING_KEY] = True
+
+        await service.calculate_configuration_price(1)
+        await service.calculate_configuration_price(1)
+
+        assert service.attr_node_repo.get_pricing_rules.await_count == 2
+        assert len(get_price_quote_cache()) == 0
+        assert len(get_pricing_plan_cache()) == 0
+
+    async def test_disabled(self):
+        """Test the cache is bypassed when disabled in settings."""
+        service = make_pricing_service({1: make_selections(1)})
+        settings = MagicMock()
+        settings.windx.price_cache_enabled = False
+
+        with patch("app.services.pricing.get_settings", return_value=settings):
+            await service.calculate_configuration_price(1)
+            await service.calculate_configuration_price(1)
+
+        assert get_price_quote_cache().get_stats()["misses"] == 0
+        assert len(get_price_quote_cache()) == 0
+
+
+@pytest.mark.asyncio
+class TestRedisTier:
+    """Test results shared through Redis."""
+
+    async def test_workers_share_results(self):
+        """Test one worker's results reach another worker until the version moves."""
+        redis = FakeRedis()
+        worker_a = PriceQuoteCache(use_redis=True)
+        worker_b = PriceQuoteCache(use_redis=True)
+        fingerprint = PriceQuoteCache.fingerprint(make_config(1), make_selections(1))
+        totals = {"total_price": Decimal("270.0"), "total_weight": Decimal("17.00")}
+
+        with patch.object(PriceQuoteCache, "_redis", return_value=redis):
+            key = worker_a.make_key(1, 1, fingerprint)
+            await worker_a.set_many({key: totals})
+
+            assert await worker_b.get_many([key]) == {key: totals}
+            assert worker_b.redis_hits == 1
+
+            assert await worker_b.get_many([worker_b.make_key(1, 2, fingerprint)]) == {}
+            assert worker_b.misses == 1
+
+    async def test_redis_failure_falls_back_to_local_tier(self):
+        """Test pricing still succeeds and caches locally when Redis is unreachable."""
+        broken = MagicMock()
+        broken.mget = AsyncMock(side_effect=ConnectionError("refused"))
+        broken.pipeline.side_effect = ConnectionError("refused")
+        service = make_pricing_service({1: make_selections(1)})
+        cache = PriceQuoteCache(use_redis=True)
+
+        with (
+            patch.object(price_cache, "_price_quote_cache", cache),
+            patch.object(PriceQuoteCache, "_redis", return_value=broken),
+        ):
+            totals = await service.calculate_configuration_price(1)
+            again = await service.calculate_configuration_price(1)
+
+        assert totals == again
+        assert totals["total_price"] == Decimal("270.0")
+        assert (len(cache), cache.hits) == (1, 1)
+
+
+def test_invalidate_drops_local_entries():
+    """Test tree version notifications drop the type's local entries."""
+    cache = PriceQuoteCache()
+    cache._store_local(cache.make_key(1, 1, "a"), (Decimal("1"), Decimal("0")))
+    cache._store_local(cache.make_key(2, 1, "b"), (Decimal("2"), Decimal("0")))
+
+    cache.invalidate(1)
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.invalidations == 2
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    """Create a session on the SQLite stand-in with a priced configuration."""
+    monkeypatch.setattr(tree_versions, "_tree_versions", TreeVersionRegistry())
+
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.execute(
+            insert(ManufacturingType),
+            [
+                {
+                    "id": MFG_TYPE.id,
+                    "name": MFG_TYPE.name,
+                    "base_category": "window",
+                    "base_price": MFG_TYPE.base_price,
+                    "base_weight": MFG_TYPE.base_weight,
+                    "is_active": True,
+                }
+            ],
+        )
+        await session.commit()
+        await HierarchyBuilderService(session).create_hierarchy_from_dict(
+            MFG_TYPE.id,
+            {
+                "name": "Frame",
+                "node_type": "category",
+                "children": [{"name": "Aluminum", "node_type": "option", "price_impact_value": 50}],
+            },
+        )
+        aluminum = await session.scalar(
+            select(AttributeNode).where(AttributeNode.name == "Aluminum")
+        )
+        await session.execute(
+            insert(Configuration),
+            [
+                {
+                    "id": 1,
+                    "manufacturing_type_id": MFG_TYPE.id,
+                    "name": "Config 1",
+                    "status": "draft",
+                    "base_price": MFG_TYPE.base_price,
+                    "total_price": MFG_TYPE.base_price,
+                    "calculated_weight": Decimal("0.00"),
+                }
+            ],
+        )
+        await session.execute(
+            insert(ConfigurationSelection),
+            [
+                {
+                    "id": 1,
+                    "configuration_id": 1,
+                    "attribute_node_id": aluminum.id,
+                    "string_value": aluminum.name,
+                    "selection_path": aluminum.ltree_path,
+                }
+            ],
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("price_cache_enabled", [True, False])
+async def test_core_update_invalidates_cached_prices(db, price_cache_enabled):
+    """Test a Core UPDATE of a price, bypassing the ORM, reprices configurations."""
+    settings = MagicMock()
+    settings.windx.price_cache_enabled = price_cache_enabled
+    service = PricingService(db)
+
+    with patch("app.services.pricing.get_settings", return_value=settings):
+        first = await service.calculate_configuration_price(1)
+        await db.execute(
+            update(AttributeNode)
+            .where(AttributeNode.name == "Aluminum")
+            .values(price_impact_value=Decimal("80.00"))
+        )
+        await db.commit()
+        second = await service.calculate_configuration_price(1)
+
+    assert (first["total_price"], second["total_price"]) == (Decimal("250.00"), Decimal("280.00"))
+    assert len(get_pricing_plan_cache()) == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_quote_uses_cached_price():
+    """Test quote subtotals come from the memoized configuration price."""
+    db = MagicMock(spec=AsyncSession)
+    db.commit = AsyncMock()
+    db.refresh = AsyncMock()
+    service = QuoteService(db)
+    service.config_repo.get = AsyncMock(return_value=Configuration(id=1, customer_id=7))
+    service.pricing_service = make_pricing_service({1: make_selections(1)})
+    service._generate_quote_number = AsyncMock(return_value="Q-20260101-001")
+    service.quote_repo.create = AsyncMock(side_effect=lambda data: Quote(**data.model_dump()))
+    user = User(
+        id=1,
+        email="admin@example.com",
+        username="admin",
+        role=Role.SUPERADMIN.value,
+        is_active=True,
+        is_superuser=True,
+    )
+
+    with patch(
+        "app.services.rbac.RBACService.check_resource_ownership", new_callable=AsyncMock
+    ) as mock_ownership:
+        mock_ownership.return_value = True
+        first = await service.generate_quote(1, user, tax_rate=Decimal("10.00"))
+        second = await service.generate_quote(1, user, tax_rate=Decimal("10.00"))
+
+    assert first.subtotal == second.subtotal == Decimal("270.0")
+    assert first.total_amount == Decimal("297.00")
+    assert service.pricing_service.attr_node_repo.get_pricing_rules.await_count == 1
+    assert get_price_quote_cache().hits == 1
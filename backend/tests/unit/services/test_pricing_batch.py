@@ -0,0 +1,193 @@
+"""Unit tests for batched configuration pricing.
+
+Tests cover:
+- Pricing many configurations with one attribute node lookup
+- No per-selection AttributeNode queries
+- Configuration context on formula errors
+- Missing configurations and attribute nodes
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import InvalidFormulaException, NotFoundException
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.models.manufacturing_type import ManufacturingType
+from app.services.pricing import PricingService
+
+
+@pytest.fixture
+def manufacturing_type() -> ManufacturingType:
+    """Create manufacturing type with base weight."""
+    return ManufacturingType(
+        id=1, name="Casement Window", base_price=Decimal("200"), base_weight=Decimal("15")
+    )
+
+
+@pytest.fixture
+def attr_nodes() -> dict[int, AttributeNode]:
+    """Create fixed and formula priced attribute nodes."""
+    return {
+        10: AttributeNode(
+            id=10,
+            name="Aluminum",
+            node_type="option",
+            price_impact_type="fixed",
+            price_impact_value=Decimal("50.00"),
+            weight_impact=Decimal("2.00"),
+            ltree_path="frame.material.aluminum",
+        ),
+        11: AttributeNode(
+            id=11,
+            name="Width",
+            node_type="attribute",
+            price_impact_type="formula",
+            price_formula="width * 0.5",
+            weight_formula="width * 0.1",
+            weight_impact=Decimal("0"),
+            ltree_path="dimensions.width",
+        ),
+    }
+
+
+def make_config(config_id: int, mfg_type: ManufacturingType) -> Configuration:
+    """Create a configuration bound to a manufacturing type."""
+    config = Configuration(
+        id=config_id,
+        manufacturing_type_id=mfg_type.id,
+        name=f"Config {config_id}",
+        base_price=mfg_type.base_price,
+    )
+    config.manufacturing_type = mfg_type
+    return config
+
+
+def make_selection(
+    selection_id: int, config_id: int, node_id: int, **values
+) -> ConfigurationSelection:
+    """Create a selection for a configuration."""
+    return ConfigurationSelection(
+        id=selection_id,
+        configuration_id=config_id,
+        attribute_node_id=node_id,
+        selection_path="test",
+        **values,
+    )
+
+
+@pytest.fixture
+def pricing_service(manufacturing_type, attr_nodes) -> PricingService:
+    """Create pricing service with mocked batch repositories."""
+    service = PricingService(MagicMock(spec=AsyncSession))
+    configs = [make_config(1, manufacturing_type), make_config(2, manufacturing_type)]
+    selections = {
+        1: [
+            make_selection(100, 1, 10, string_value="Aluminum"),
+            make_selection(101, 1, 11, numeric_value=Decimal("40")),
+        ],
+        2: [make_selection(200, 2, 10, string_value="Aluminum")],
+    }
+
+    service.config_repo.get_many_with_manufacturing_type = AsyncMock(
+        side_effect=lambda ids: [c for c in configs if c.id in ids]
+    )
+    service.selection_repo.get_by_configurations = AsyncMock(
+        side_effect=lambda ids: {config_id: selections.get(config_id, []) for config_id in ids}
+    )
+    service.attr_node_repo.get_pricing_rules = AsyncMock(
+        side_effect=lambda type_id: list(attr_nodes.values())
+    )
+    service.attr_node_repo.get_by_ids = AsyncMock(
+        side_effect=lambda ids: {
+            node_id: attr_nodes[node_id] for node_id in ids if node_id in attr_nodes
+        }
+    )
+    service.attr_node_repo.get = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+class TestBatchedPricing:
+    """Test batched configuration pricing."""
+
+    async def test_prices_many_configurations(self, pricing_service: PricingService):
+        """Test each configuration is priced from base values plus impacts."""
+        prices = await pricing_service.calculate_prices_for_configurations([1, 2, 1])
+
+        assert prices[1] == {
+            "total_price": Decimal("200") + Decimal("50.00") + Decimal("20.0"),
+            "total_weight": Decimal("15") + Decimal("2.00") + Decimal("4.0"),
+        }
+        assert prices[2] == {
+            "total_price": Decimal("250.00"),
+            "total_weight": Decimal("17.00"),
+        }
+
+    async def test_single_node_lookup_for_all_selections(self, pricing_service: PricingService):
+        """Test pricing rules are fetched once per type, never per selection."""
+        await pricing_service.calculate_prices_for_configurations([1, 2])
+
+        pricing_service.attr_node_repo.get_pricing_rules.assert_awaited_once_with(1)
+        pricing_service.attr_node_repo.get_by_ids.assert_not_awaited()
+        pricing_service.selection_repo.get_by_configurations.assert_awaited_once_with([1, 2])
+        pricing_service.attr_node_repo.get.assert_not_called()
+
+    async def test_missing_configurations_omitted(self, pricing_service: PricingService):
+        """Test unknown configuration IDs are left out of the result."""
+        prices = await pricing_service.calculate_prices_for_configurations([2, 999])
+
+        assert list(prices) == [2]
+
+    async def test_single_configuration_uses_batch_path(self, pricing_service: PricingService):
+        """Test calculate_configuration_price prices through the batch loader."""
+        totals = await pricing_service.calculate_configuration_price(2)
+
+        assert totals["total_price"] == Decimal("250.00")
+        pricing_service.attr_node_repo.get.assert_not_called()
+
+    async def test_single_configuration_not_found(self, pricing_service: PricingService):
+        """Test a missing configuration still raises NotFoundException."""
+        with pytest.raises(NotFoundException):
+            await pricing_service.calculate_configuration_price(999)
+
+    async def test_formula_error_includes_configuration_context(
+        self, pricing_service: PricingService, attr_nodes
+    ):
+        """Test formula errors carry configuration and selection IDs."""
+        attr_nodes[11].price_formula = "width / 0"
+
+        with pytest.raises(InvalidFormulaException) as exc_info:
+            await pricing_service.calculate_prices_for_configurations([1])
+
+        assert exc_info.value.details["configuration_id"] == 1
+        assert exc_info.value.details["selection_id"] == 101
+        assert exc_info.value.details["attribute_node_id"] == 11
+        assert exc_info.value.details["error_type"] == "division_by_zero"
+
+    async def test_missing_attribute_node_reported(
+        self, pricing_service: PricingService, attr_nodes
+    ):
+        """Test a selection pointing at a missing node fails with context."""
+        del attr_nodes[10]
+
+        with pytest.raises(InvalidFormulaException) as exc_info:
+            await pricing_service.calculate_prices_for_configurations([2])
+
+        assert exc_info.value.details["configuration_id"] == 2
+        assert exc_info.value.details["error_type"] == "NotFoundException"
+
+    async def test_selection_impact_reuses_loaded_node(
+        self, pricing_service: PricingService, attr_nodes
+    ):
+        """Test calculate_selection_impact skips the lookup when given the node."""
+        selection = make_selection(300, 1, 11, numeric_value=Decimal("10"))
+
+        impact = await pricing_service.calculate_selection_impact(selection, attr_nodes[11])
+
+        assert impact == {"price_impact": Decimal("5.0"), "weight_impact": Decimal("1.0")}
+        pricing_service.attr_node_repo.get.assert_not_called()
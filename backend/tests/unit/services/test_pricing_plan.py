@@ -0,0 +1,232 @@
+"""Unit tests for dependency-aware pricing plans.
+
+Tests cover:
+- Stage assignment (fixed → formula → running price)
+- ltree ancestry ordering within a stage
+- Percentage rules applied to the running subtotal
+- Formulas reading ``subtotal``
+- Plan caching per tree version
+- Stored formulas compiled when a plan is built
+- Incremental pricing fallback for running-price rules
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.models.manufacturing_type import ManufacturingType
+from app.services import formula_engine
+from app.services.formula_engine import FormulaCache
+from app.services.price_cache import get_price_quote_cache
+from app.services.pricing import PricingService
+from app.services.pricing_plan import (
+    STAGE_FIXED,
+    STAGE_FORMULA,
+    STAGE_RUNNING_PRICE,
+    PricingPlanCache,
+    build_pricing_plan,
+    get_pricing_plan_cache,
+    pricing_stage,
+)
+
+
+def make_node(node_id: int, path: str, **pricing) -> AttributeNode:
+    """Create an attribute node with a pricing rule."""
+    pricing.setdefault("price_impact_type", "fixed")
+    return AttributeNode(
+        id=node_id, name=f"Node {node_id}", node_type="option", ltree_path=path, **pricing
+    )
+
+
+def make_selection(selection_id: int, node_id: int, **values) -> ConfigurationSelection:
+    """Create a selection of configuration 1."""
+    return ConfigurationSelection(
+        id=selection_id, configuration_id=1, attribute_node_id=node_id, **values
+    )
+
+
+NODES = [
+    make_node(1, "frame", price_impact_type="percentage", price_impact_value=Decimal("10")),
+    make_node(2, "frame.premium", price_impact_type="percentage", price_impact_value=Decimal("5")),
+    make_node(3, "frame.material", price_impact_value=Decimal("50")),
+    make_node(4, "dimensions.width", price_impact_type="formula", price_formula="width * 0.5"),
+    make_node(
+        5, "glazing.finish", price_impact_type="formula", price_formula="subtotal * 0.02 + 1"
+    ),
+]
+
+
+class TestPlanOrdering:
+    """Test the evaluation order derived from the attribute tree."""
+
+    @pytest.mark.parametrize(
+        ("pricing", "stage"),
+        [
+            ({"price_impact_value": Decimal("5")}, STAGE_FIXED),
+            ({"price_impact_type": "formula", "price_formula": "width * 2"}, STAGE_FORMULA),
+            ({"price_impact_type": "percentage"}, STAGE_RUNNING_PRICE),
+            (
+                {"price_impact_type": "formula", "price_formula": "subtotal / 10"},
+                STAGE_RUNNING_PRICE,
+            ),
+            ({"weight_formula": "subtotal * 0.001"}, STAGE_RUNNING_PRICE),
+            # Formulas are only read for formula-typed rules
+            ({"price_formula": "subtotal * 2"}, STAGE_FIXED),
+            ({"price_impact_type": "formula", "price_formula": "width +"}, STAGE_FORMULA),
+        ],
+    )
+    def test_stage(self, pricing, stage):
+        """Test each rule lands in the expected stage."""
+        assert pricing_stage(make_node(1, "a", **pricing)) == stage
+
+    def test_stages_then_ancestry(self):
+        """Test stages come first, then ancestors before descendants."""
+        plan = build_pricing_plan(1, reversed(NODES))
+
+        assert sorted(plan.ranks, key=plan.ranks.get) == [3, 4, 1, 2, 5]
+        assert plan.has_running_price_rules is True
+
+    def test_order_selections(self):
+        """Test selections are sorted by rank with unknown nodes last."""
+        plan = build_pricing_plan(1, NODES)
+        selections = [make_selection(1, 404), make_selection(2, 1), make_selection(3, 3)]
+
+        assert [s.attribute_node_id for s in plan.order(selections)] == [3, 1, 404]
+
+    def test_stored_formulas_compiled_at_build(self, monkeypatch):
+        """Test a worker compiles the plan's evaluated formulas when building it."""
+        cache = FormulaCache()
+        monkeypatch.setattr(formula_engine, "_formula_cache", cache)
+        nodes = [
+            *NODES,
+            make_node(6, "frame.weight", price_impact_type="percentage", weight_formula="width"),
+            make_node(7, "frame.unused", price_formula="height * 2"),
+        ]
+
+        build_pricing_plan(1, nodes)
+
+        assert all(formula in cache for formula in ("width * 0.5", "subtotal * 0.02 + 1", "width"))
+        # Formulas of non-formula price rules are never evaluated
+        assert "height * 2" not in cache
+
+    def test_with_rules_extends_copy(self):
+        """Test foreign rules are merged into a new plan."""
+        plan = build_pricing_plan(1, NODES[:2])
+        extended = plan.with_rules([NODES[2]])
+
+        assert 3 in extended and 3 not in plan
+        assert extended.ranks[3] < extended.ranks[1]
+        assert plan.with_rules([NODES[0]]) is plan
+
+
+class TestPlanCache:
+    """Test plans cached per manufacturing type and tree version."""
+
+    def test_versions_replace_older_plans(self):
+        """Test a newer version evicts older plans of the same type."""
+        cache = PricingPlanCache(maxsize=4)
+        old, new, other = (build_pricing_plan(t, []) for t in (1, 1, 2))
+        cache.put(1, 0, old)
+        cache.put(2, 0, other)
+        cache.put(1, 1, new)
+
+        assert cache.get(1, 0) is None
+        assert cache.get(1, 1) is new
+        assert cache.get(2, 0) is other
+        assert cache.get_stats() == {"size": 2, "maxsize": 4, "hits": 2, "misses": 1}
+
+
+@pytest.fixture
+def pricing_service() -> PricingService:
+    """Create pricing service over configuration 1 with mocked repositories."""
+    mfg_type = ManufacturingType(
+        id=1, name="Window", base_price=Decimal("200"), base_weight=Decimal("10")
+    )
+    config = Configuration(
+        id=1, manufacturing_type_id=1, name="Config 1", base_price=Decimal("200")
+    )
+    config.manufacturing_type = mfg_type
+
+    db = MagicMock(spec=AsyncSession)
+    db.info = {}
+    db.scalar = AsyncMock(return_value=1)
+    service = PricingService(db)
+    service.config_repo.get_many_with_manufacturing_type = AsyncMock(return_value=[config])
+    service.selection_repo.get_by_configurations = AsyncMock()
+    service.attr_node_repo.get_pricing_rules = AsyncMock(return_value=NODES)
+    service.attr_node_repo.get_by_ids = AsyncMock(return_value={})
+    return service
+
+
+def select(service: PricingService, *selections: ConfigurationSelection) -> None:
+    """Set the selections of configuration 1."""
+    service.selection_repo.get_by_configurations.return_value = {1: list(selections)}
+
+
+@pytest.mark.asyncio
+class TestRunningSubtotal:
+    """Test single-pass pricing with a running subtotal."""
+
+    async def test_percentage_of_running_price(self, pricing_service: PricingService):
+        """Test percentages apply after fixed and formula rules, in tree order."""
+        # Selection order is irrelevant: 200 + 50 + 40 = 290, +10% = 319, +5% = 334.95
+        select(
+            pricing_service,
+            make_selection(1, 2),
+            make_selection(2, 1),
+            make_selection(3, 4, numeric_value=Decimal("80")),
+            make_selection(4, 3),
+        )
+
+        totals = await pricing_service.calculate_configuration_price(1)
+
+        assert totals["total_price"] == Decimal("334.95")
+
+    async def test_percentage_impacts_rounded(self, pricing_service: PricingService):
+        """Test each percentage impact is rounded to cents before it is added."""
+        select(
+            pricing_service,
+            make_selection(1, 1),
+            make_selection(2, 2),
+            make_selection(3, 4, numeric_value=Decimal("80.3")),
+        )
+
+        totals = await pricing_service.calculate_configuration_price(1)
+
+        # 240.15 +10% (24.015 → 24.02) = 264.17, +5% (13.2085 → 13.21) = 277.38
+        assert totals["total_price"] == Decimal("277.38")
+
+    async def test_subtotal_formula(self, pricing_service: PricingService):
+        """Test formulas reading subtotal see every earlier rule."""
+        select(pricing_service, make_selection(1, 5), make_selection(2, 3), make_selection(3, 1))
+
+        totals = await pricing_service.calculate_configuration_price(1)
+
+        # 250 +10% = 275, then 275 * 0.02 + 1 = 6.5
+        assert totals["total_price"] == Decimal("281.5")
+
+    async def test_plan_built_once_per_tree_version(self, pricing_service: PricingService):
+        """Test the plan is reused until the tree version changes."""
+        select(pricing_service, make_selection(1, 3))
+
+        await pricing_service.calculate_configuration_price(1)
+        get_price_quote_cache().clear()
+        await pricing_service.calculate_configuration_price(1)
+        assert pricing_service.attr_node_repo.get_pricing_rules.await_count == 1
+
+        pricing_service.db.scalar.return_value = 2
+        await pricing_service.calculate_configuration_price(1)
+        assert pricing_service.attr_node_repo.get_pricing_rules.await_count == 2
+        assert len(get_pricing_plan_cache()) == 1
+
+    async def test_standalone_impact_deferred(self, pricing_service: PricingService):
+        """Test running-price rules have no impact outside a configuration pass."""
+        impact = await pricing_service.calculate_selection_impact(make_selection(1, 1), NODES[0])
+
+        assert impact["price_impact"] == Decimal("0")
+        assert pricing_service.requires_full_recalculation(NODES[4]) is True
@@ -0,0 +1,194 @@
+"""Unit tests for streaming profile sheet exports.
+
+Runs exports against the SQLite benchmark stand-in seeded with generated
+configurations.
+
+Tests cover:
+- CSV exports holding the preview table rows in header order
+- Exports reading every configuration with one streamed query
+- XLSX exports being readable workbooks with numeric cells
+- Writers escaping text and encoding rows incrementally
+- Throughput metrics recorded and logged
+"""
+
+import csv
+import io
+import logging
+import xml.etree.ElementTree as ET
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.rbac import Role
+from app.services.entry import EntryService
+from app.services.profile_export import CsvSheetWriter, ProfileExport, XlsxSheetWriter
+from tests.benchmarks.data import MANUFACTURING_TYPE_ID, SCALES, generate_dataset
+from tests.benchmarks.database import create_benchmark_engine, create_schema, seed_dataset
+
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session on the SQLite stand-in seeded with ten configurations."""
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_dataset(session, generate_dataset(SCALES["10"]))
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(db) -> EntryService:
+    """Create entry service with cold header caches."""
+    service = EntryService(db)
+    service.clear_header_cache()
+    yield service
+    service.clear_header_cache()
+
+
+@pytest.fixture
+def superadmin() -> MagicMock:
+    """Create a superadmin user stub."""
+    return MagicMock(role=Role.SUPERADMIN.value)
+
+
+async def export_previews(service: EntryService, user, **kwargs) -> ProfileExport:
+    """Export previews without the RBAC decorators."""
+    return await EntryService.export_previews._rbac_original_func(
+        service, MANUFACTURING_TYPE_ID, user, **kwargs
+    )
+
+
+async def read(export: ProfileExport) -> bytes:
+    """Read a whole export."""
+    return b"".join([chunk async for chunk in export])
+
+
+def read_sheet(data: bytes) -> list[list[tuple[str | None, str]]]:
+    """Read the (type, text) cells of the worksheet in an XLSX file."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert {"[Content_Types].xml", "xl/workbook.xml"} <= set(archive.namelist())
+        root = ET.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    return [
+        [(cell.get("t"), "".join(cell.itertext())) for cell in row]
+        for row in root.iterfind("s:sheetData/s:row", SHEET_NS)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_export_matches_preview_table(service, superadmin):
+    """Test the CSV holds every preview row with the header mapping columns."""
+    table = await EntryService.list_previews._rbac_original_func(
+        service, MANUFACTURING_TYPE_ID, superadmin
+    )
+
+    export = await export_previews(service, superadmin)
+    lines = list(csv.reader(io.StringIO((await read(export)).decode())))
+
+    mapping = await service.generate_header_mapping(MANUFACTURING_TYPE_ID)
+    assert lines[0] == list(mapping)
+    expected = sorted(
+        ([str(row[header]) for header in lines[0]] for row in table.rows),
+        key=lambda row: int(row[0]),
+    )
+    assert lines[1:] == expected
+    assert export.media_type == "text/csv"
+    assert export.filename.endswith(".csv")
+
+
+@pytest.mark.asyncio
+async def test_export_streams_one_query(db, service, superadmin):
+    """Test configurations and selections are read with one streamed query."""
+    await export_previews(service, superadmin)
+    statements: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    export = await export_previews(service, superadmin, yield_per=7)
+    statements.clear()
+    await read(export)
+
+    assert len(statements) == 1
+    assert export.metrics.rows == SCALES["10"].configurations
+
+
+@pytest.mark.asyncio
+async def test_xlsx_export_is_readable_workbook(service, superadmin):
+    """Test the XLSX sheet has the CSV's rows with numeric cells for numbers."""
+    csv_lines = list(
+        csv.reader(io.StringIO((await read(await export_previews(service, superadmin))).decode()))
+    )
+    layout = await service._load_preview_layout(MANUFACTURING_TYPE_ID)
+
+    export = await export_previews(service, superadmin, format="xlsx")
+    rows = read_sheet(await read(export))
+
+    assert [[text for _, text in row] for row in rows] == csv_lines
+    numeric = [
+        index
+        for index, header in enumerate(csv_lines[0])
+        if layout.header_mapping[header] in layout.numeric_fields
+    ]
+    assert numeric
+    assert all(
+        row[index][0] is None or row[index] == ("inlineStr", "N/A")
+        for row in rows[1:]
+        for index in [0, *numeric]
+    )
+    assert export.filename.endswith(".xlsx")
+
+
+@pytest.mark.asyncio
+async def test_no_accessible_configurations_exports_headers(service):
+    """Test users without accessible configurations get only the header row."""
+    export = ProfileExport(service, await service._load_preview_layout(MANUFACTURING_TYPE_ID), None)
+
+    lines = (await read(export)).decode().splitlines()
+
+    assert len(lines) == 1
+    assert export.metrics.rows == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_logged(service, superadmin, caplog):
+    """Test finished exports record and log their throughput."""
+    export = await export_previews(service, superadmin)
+
+    with caplog.at_level(logging.INFO, logger="EntrySystem"):
+        data = await read(export)
+
+    assert export.metrics.bytes == len(data)
+    assert export.metrics.seconds > 0
+    assert export.metrics.as_dict()["rows"] == SCALES["10"].configurations
+    assert "Profile export finished: format=csv rows=10" in caplog.text
+
+
+def test_csv_writer_encodes_incrementally():
+    """Test rows written in several calls form one well-formed CSV file."""
+    rows = [["id", "Name"], [1, 'Frame "A", left'], [2, "Line\nbreak"]]
+    writer = CsvSheetWriter()
+
+    data = b"".join(writer.write_rows([row]) for row in rows) + writer.close()
+
+    assert list(csv.reader(io.StringIO(data.decode()))) == [[str(v) for v in r] for r in rows]
+
+
+def test_xlsx_writer_escapes_text():
+    """Test markup and control characters can't break the worksheet."""
+    writer = XlsxSheetWriter("Profiles: 1/2")
+
+    data = writer.write_rows([["<b>&</b>", "bell\x07", True, None, 2.5]]) + writer.close()
+
+    assert read_sheet(data) == [
+        [("inlineStr", "<b>&</b>"), ("inlineStr", "bell"), ("b", "1"), (None, ""), (None, "2.5")]
+    ]
@@ -0,0 +1,328 @@
+"""Unit tests for bulk profile sheet imports.
+
+Runs imports against the SQLite benchmark stand-in with a small profile
+page tree.
+
+Tests cover:
+- Valid rows stored like single saves and exported back unchanged
+- Invalid rows reported by row number without aborting the import
+- Statements per batch independent of the number of rows
+- Selections inserted as multi-row statements, not one INSERT per row
+- Rows the database rejects isolated within their batch
+- Worker process validation matching inline validation
+- Unknown columns and missing headers rejected up front
+"""
+
+import csv
+import io
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.core.rbac import Role
+from app.models.attribute_node import AttributeNode
+from app.models.configuration import Configuration
+from app.models.configuration_selection import ConfigurationSelection
+from app.models.manufacturing_type import ManufacturingType
+from app.services import profile_import
+from app.services.entry import EntryService
+from app.services.profile_import import ProfileImportService, _ValidationPool
+from tests.benchmarks.database import create_benchmark_engine, create_schema
+
+TYPE_ID = 7
+
+HEADER = [
+    "id",
+    "Name",
+    "Type",
+    "Material",
+    "Opening System",
+    "System Series",
+    "Width",
+    "Renovation",
+    "Frame Depth",
+]
+
+FIELDS = [
+    ("name", "string", {"required": True}),
+    ("type", "string", {}),
+    ("material", "string", {}),
+    ("opening_system", "string", {}),
+    ("system_series", "string", {}),
+    ("width", "number", {"validation_rules": {"min": 10}}),
+    ("renovation", "boolean", {}),
+    ("frame_depth", "number", {}),
+]
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session on the SQLite stand-in with a small profile page tree."""
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.execute(
+            insert(ManufacturingType),
+            [
+                {
+                    "id": TYPE_ID,
+                    "name": "Import Window",
+                    "base_category": "window",
+                    "base_price": Decimal("120.00"),
+                    "base_weight": Decimal("8.50"),
+                    "is_active": True,
+                }
+            ],
+        )
+        await session.execute(
+            insert(AttributeNode),
+            [
+                {
+                    "id": 100 + index,
+                    "manufacturing_type_id": TYPE_ID,
+                    "name": name,
+                    "node_type": "attribute",
+                    "data_type": data_type,
+                    "page_type": "profile",
+                    "ltree_path": f"basic.{name}",
+                    "depth": 1,
+                    "sort_order": index,
+                    "required": False,
+                    "validation_rules": None,
+                    **values,
+                }
+                for index, (name, data_type, values) in enumerate(FIELDS)
+            ],
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(db) -> ProfileImportService:
+    """Create import service whose user maps to no customer."""
+    service = ProfileImportService(db)
+    service.entry_service.clear_header_cache()
+    service.entry_service.rbac_service.get_or_create_customer_for_user = AsyncMock(
+        return_value=MagicMock(id=None)
+    )
+    yield service
+    service.entry_service.clear_header_cache()
+
+
+@pytest.fixture
+def superadmin() -> MagicMock:
+    """Create a superadmin user stub."""
+    return MagicMock(role=Role.SUPERADMIN.value)
+
+
+def sheet(*rows: list[str], header: list[str] = HEADER) -> list[str]:
+    """Write rows under a header as CSV lines."""
+    output = io.StringIO()
+    csv.writer(output).writerows([header, *rows])
+    return output.getvalue().splitlines(keepends=True)
+
+
+def profile_row(name: str, width: str = "55.5", **cells: str) -> list[str]:
+    """Create a valid sheet row."""
+    values = {
+        "id": "",
+        "Name": name,
+        "Type": "Frame",
+        "Material": "uPVC",
+        "Opening System": "Casement",
+        "System Series": "K700",
+        "Width": width,
+        "Renovation": "N/A",
+        "Frame Depth": "70",
+        **cells,
+    }
+    return [values[header] for header in HEADER]
+
+
+async def import_csv(service: ProfileImportService, user, lines: list[str], **kwargs):
+    """Import without the RBAC decorator, validating inline by default."""
+    kwargs.setdefault("workers", 0)
+    return await ProfileImportService.import_csv._rbac_original_func(
+        service, TYPE_ID, user, lines, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_rows_stored_like_single_saves(db, service, superadmin):
+    """Test imported rows have the columns and selections a save creates."""
+    rows = [profile_row("Frame A"), profile_row("Frame B", Renovation="yes", **{"Width": "60"})]
+
+    result = await import_csv(service, superadmin, sheet(*rows))
+
+    assert (result.rows, result.imported, result.failed) == (2, 2, 0)
+    configurations = (
+        (await db.execute(select(Configuration).order_by(Configuration.id))).scalars().all()
+    )
+    assert [c.id for c in configurations] == result.configuration_ids
+    assert [c.name for c in configurations] == ["Frame A", "Frame B"]
+    assert all(c.description == "Profile entry for Frame" for c in configurations)
+    assert all(c.total_price == Decimal("120.00") for c in configurations)
+
+    selections = (
+        await db.execute(
+            select(ConfigurationSelection).where(
+                ConfigurationSelection.configuration_id == result.configuration_ids[1]
+            )
+        )
+    ).scalars()
+    stored = {s.selection_path: EntryService._selection_value(s) for s in selections}
+    assert stored == {
+        "basic.type": "Frame",
+        "basic.material": "uPVC",
+        "basic.opening_system": "Casement",
+        "basic.system_series": "K700",
+        "basic.width": 60,
+        "basic.renovation": True,
+        "basic.frame_depth": 70,
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_round_trips_through_export(db, service, superadmin):
+    """Test an exported sheet lists imported rows with the imported values."""
+    rows = [profile_row("Frame A"), profile_row("Frame B", width="80")]
+    await import_csv(service, superadmin, sheet(*rows))
+
+    export = await EntryService.export_previews._rbac_original_func(
+        service.entry_service, TYPE_ID, superadmin
+    )
+    exported = list(csv.reader(io.StringIO(b"".join([c async for c in export]).decode())))
+
+    assert exported[0] == HEADER
+    assert [row[1:6] + [row[7]] for row in exported[1:]] == [
+        ["Frame A", "Frame", "uPVC", "Casement", "K700", "N/A"],
+        ["Frame B", "Frame", "uPVC", "Casement", "K700", "N/A"],
+    ]
+    assert [(Decimal(row[6]), Decimal(row[8])) for row in exported[1:]] == [
+        (Decimal("55.5"), Decimal("70")),
+        (Decimal("80"), Decimal("70")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalid_rows_reported_without_aborting(db, service, superadmin):
+    """Test each rejected row is reported and the other rows still imported."""
+    lines = sheet(
+        profile_row("Good 1"),
+        profile_row("Too narrow", width="5"),
+        profile_row("", Type="Frame"),
+        [],
+        profile_row("Deep", **{"Frame Depth": "deep"}),
+        profile_row("Sash", Type="Sash", Renovation="yes"),
+        profile_row("Good 2"),
+    )
+
+    result = await import_csv(service, superadmin, lines, batch_size=3)
+
+    assert (result.rows, result.imported, result.failed) == (6, 2, 4)
+    assert {error.row: set(error.errors) for error in result.errors} == {
+        3: {"width"},
+        4: {"name"},
+        6: {"frame_depth"},
+        7: {"renovation"},
+    }
+    assert result.errors[0].name == "Too narrow"
+    count = await db.scalar(select(func.count()).select_from(Configuration))
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_statements_per_batch_independent_of_rows(db, service, superadmin):
+    """Test a batch costs the same statements whether it has 2 or 40 rows."""
+    statements: list[str] = []
+    executemany_statements: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, context, executemany: (
+            statements.append(statement),
+            executemany and executemany_statements.append(statement),
+        ),
+    )
+
+    await import_csv(service, superadmin, sheet(profile_row("Warm-up")))
+
+    counts = []
+    for size in (2, 40):
+        statements.clear()
+        await import_csv(service, superadmin, sheet(*(profile_row(f"F{i}") for i in range(size))))
+        # SQLite can't return ids in parameter order from one INSERT, so
+        # configurations go one statement each here; PostgreSQL batches them
+        counts.append(
+            [
+                statement.split("(")[0]
+                for statement in statements
+                if not statement.startswith("INSERT INTO configurations ")
+            ]
+        )
+
+    assert counts[0] == counts[1]
+    assert counts[0].count("INSERT INTO configuration_selections ") == 1
+    # One multi-row statement, not an executemany of one INSERT per selection
+    assert not any(
+        statement.startswith("INSERT INTO configuration_selections ")
+        for statement in executemany_statements
+    )
+
+
+@pytest.mark.asyncio
+async def test_database_rejections_isolated(db, service, superadmin):
+    """Test a row the database rejects fails alone; its batch is kept."""
+    await db.execute(
+        text(
+            "CREATE TRIGGER reject_boom BEFORE INSERT ON configurations "
+            "WHEN NEW.name = 'Boom' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+    )
+    await db.commit()
+
+    result = await import_csv(
+        service, superadmin, sheet(profile_row("A"), profile_row("Boom"), profile_row("C"))
+    )
+
+    assert (result.imported, result.failed) == (2, 1)
+    assert result.errors[0].row == 3
+    assert "rejected" in result.errors[0].errors["row"]
+    names = (await db.execute(select(Configuration.name).order_by(Configuration.id))).scalars()
+    assert list(names) == ["A", "C"]
+
+
+@pytest.mark.asyncio
+async def test_worker_validation_matches_inline(service, monkeypatch):
+    """Test rows validated in worker processes give the inline results."""
+    validator = await service.compile_validator(TYPE_ID, HEADER)
+    rows = [
+        (row, cells)
+        for row, cells in enumerate(
+            [profile_row(f"F{i}", width=str(5 + i)) for i in range(12)], start=2
+        )
+    ]
+    monkeypatch.setattr(profile_import, "POOL_MIN_ROWS", 1)
+
+    with _ValidationPool(validator, workers=2) as pool:
+        validated = await pool.validate(rows)
+
+    assert validated == validator.validate_rows(rows)
+
+
+@pytest.mark.asyncio
+async def test_unknown_columns_and_empty_files_rejected(service, superadmin):
+    """Test sheets with foreign columns or no header fail before any row."""
+    with pytest.raises(ValidationException) as exc_info:
+        await import_csv(service, superadmin, sheet(header=[*HEADER, "Colour"]))
+    with pytest.raises(ValidationException):
+        await import_csv(service, superadmin, [])
+
+    assert exc_info.value.field_errors == {"Colour": "Unknown column"}
@@ -0,0 +1,132 @@
+"""Unit tests for batch quote generation.
+
+Tests cover:
+- Pricing, number allocation and insertion in one call each
+- Quote number formatting from the reserved counter values
+- Duplicate configuration IDs quoted once
+- Missing and inaccessible configurations rejected before any write
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import AuthorizationException, NotFoundException
+from app.core.rbac import Role
+from app.models.configuration import Configuration
+from app.models.quote import Quote
+from app.models.user import User
+from app.schemas.quote import QuoteBatchCreateRequest
+from app.services.number_allocator import NumberAllocator
+from app.services.quote import QuoteService
+
+
+def make_service(configs: list[Configuration]) -> QuoteService:
+    """Create a quote service with mocked repositories and pricing."""
+    db = MagicMock(spec=AsyncSession)
+    db.commit = AsyncMock()
+    service = QuoteService(db)
+    service.config_repo.get_many_with_manufacturing_type = AsyncMock(
+        side_effect=lambda ids: [config for config in configs if config.id in ids]
+    )
+    service.pricing_service.calculate_prices_for_configurations = AsyncMock(
+        side_effect=lambda ids: {
+            config_id: {"total_price": Decimal("100.00") * config_id, "total_weight": Decimal("1")}
+            for config_id in ids
+        }
+    )
+    # Counter of the day already at 40
+    service.number_allocator = NumberAllocator()
+    service.number_allocator._reserve = AsyncMock(
+        side_effect=lambda db, prefix, day, count: 40 + count
+    )
+    service.quote_repo.create_many = AsyncMock(
+        side_effect=lambda rows: [Quote(**row.model_dump()) for row in rows]
+    )
+    return service
+
+
+def make_user(role: Role) -> User:
+    """Create a user with the given role."""
+    return User(
+        id=1,
+        email="user@example.com",
+        username="user",
+        role=role.value,
+        is_active=True,
+        is_superuser=role == Role.SUPERADMIN,
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_prices_allocates_and_inserts_once():
+    """Test a batch issues one pricing, allocation and insert call."""
+    configs = [Configuration(id=i, customer_id=7) for i in (1, 2, 3)]
+    service = make_service(configs)
+    request = QuoteBatchCreateRequest(configuration_ids=[1, 2, 3], tax_rate=Decimal("10.00"))
+
+    quotes = await service.create_quotes_with_auth(request, make_user(Role.SUPERADMIN))
+
+    service.pricing_service.calculate_prices_for_configurations.assert_awaited_once_with([1, 2, 3])
+    service.number_allocator._reserve.assert_awaited_once()
+    assert service.number_allocator._reserve.await_args.args[1:] == ("Q", date.today(), 3)
+    service.quote_repo.create_many.assert_awaited_once()
+    service.db.commit.assert_awaited_once()
+
+    today = date.today().strftime("%Y%m%d")
+    assert [quote.quote_number for quote in quotes] == [
+        f"Q-{today}-041",
+        f"Q-{today}-042",
+        f"Q-{today}-043",
+    ]
+    assert [quote.configuration_id for quote in quotes] == [1, 2, 3]
+    assert [quote.total_amount for quote in quotes] == [
+        Decimal("110.00"),
+        Decimal("220.00"),
+        Decimal("330.00"),
+    ]
+    assert all(quote.customer_id == 7 for quote in quotes)
+    assert all(quote.valid_until == date.today() + timedelta(days=30) for quote in quotes)
+
+
+@pytest.mark.asyncio
+async def test_batch_deduplicates_configuration_ids():
+    """Test repeated configuration IDs are quoted once."""
+    service = make_service([Configuration(id=i, customer_id=7) for i in (1, 2)])
+    request = QuoteBatchCreateRequest(configuration_ids=[2, 1, 2])
+
+    quotes = await service.create_quotes_with_auth(request, make_user(Role.SUPERADMIN))
+
+    assert [quote.configuration_id for quote in quotes] == [1, 2]
+    assert service.number_allocator._reserve.await_args.args[3] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_missing_configurations():
+    """Test missing configurations are reported before anything is written."""
+    service = make_service([Configuration(id=1, customer_id=7)])
+    request = QuoteBatchCreateRequest(configuration_ids=[1, 5, 4])
+
+    with pytest.raises(NotFoundException) as exc_info:
+        await service.create_quotes_with_auth(request, make_user(Role.SUPERADMIN))
+
+    assert exc_info.value.details == {"configuration_ids": [4, 5]}
+    service.number_allocator._reserve.assert_not_awaited()
+    service.quote_repo.create_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_inaccessible_configurations():
+    """Test one inaccessible configuration fails the whole batch."""
+    service = make_service([Configuration(id=1, customer_id=7), Configuration(id=2, customer_id=8)])
+    service.rbac_service.get_accessible_customers = AsyncMock(return_value=[7])
+    request = QuoteBatchCreateRequest(configuration_ids=[1, 2])
+
+    with pytest.raises(AuthorizationException):
+        await service.create_quotes_with_auth(request, make_user(Role.SALESMAN))
+
+    service.pricing_service.calculate_prices_for_configurations.assert_not_awaited()
+    service.quote_repo.create_many.assert_not_awaited()
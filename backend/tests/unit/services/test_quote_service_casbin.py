@@ -374,7 +374,7 @@ class TestQuoteServiceCasbin:
             name="Test Configuration",
             manufacturing_type_id=mfg_type.id,
             customer_id=customer_id,
-            base_price=mfg_type.base_price,
+            base_price=Decimal("250.00"),
             total_price=Decimal("250.00"),  # Specific total for calculation test
             status="draft",
         )
@@ -0,0 +1,247 @@
+"""Unit tests for compiled entry page form schemas.
+
+Tests cover:
+- ETags and If-None-Match matching
+- EntryService compiling each schema once per tree version
+- Sessions with uncommitted node changes bypassing the cache
+- Shared Redis tier across workers
+- Invalidation from database tree versions, including Core writes of
+  definition nodes without a manufacturing type
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attribute_node import AttributeNode
+from app.schemas.entry import FieldDefinition, FormSection, ProfileSchema
+from app.services import schema_cache, tree_versions
+from app.services.entry import EntryService
+from app.services.schema_cache import CompiledSchema, ProfileSchemaCache, get_profile_schema_cache
+from app.services.tree_versions import TreeVersionRegistry
+from tests.benchmarks.data import MANUFACTURING_TYPE_ID, SCALES, generate_dataset
+from tests.benchmarks.database import create_benchmark_engine, create_schema, seed_dataset
+from tests.unit.services.test_form_schema_options import add_relations_field
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the async Redis client."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, str | bytes] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+def make_schema(label: str = "Width") -> ProfileSchema:
+    """Create a one-field form schema."""
+    field = FieldDefinition(name="width", label=label, data_type="number", sort_order=0)
+    return ProfileSchema(
+        manufacturing_type_id=1,
+        sections=[FormSection(title="Dimensions", fields=[field], sort_order=0)],
+    )
+
+
+def make_entry_service(*schemas: ProfileSchema) -> EntryService:
+    """Create entry service whose schema builds return the given schemas."""
+    service = EntryService(MagicMock(info={}, scalar=AsyncMock(return_value=1)))
+    service._build_profile_schema = AsyncMock(side_effect=list(schemas))
+    return service
+
+
+class TestCompiledSchema:
+    """Test serialized schemas and their ETags."""
+
+    def test_round_trip_keeps_etag(self):
+        """Test a schema loaded from its body has the same ETag."""
+        compiled = CompiledSchema.compile(make_schema())
+
+        loaded = CompiledSchema.from_body(compiled.body)
+
+        assert loaded.etag == compiled.etag
+        assert loaded.schema == compiled.schema
+        assert compiled.etag.startswith('"') and compiled.etag.endswith('"')
+
+    def test_etag_follows_content(self):
+        """Test different schemas get different ETags."""
+        assert (
+            CompiledSchema.compile(make_schema()).etag
+            != CompiledSchema.compile(make_schema("Width (mm)")).etag
+        )
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            (None, False),
+            ("", False),
+            ("{etag}", True),
+            ("W/{etag}", True),
+            ('"stale", {etag}', True),
+            ("*", True),
+            ('"stale"', False),
+        ],
+    )
+    def test_if_none_match(self, header, expected):
+        """Test If-None-Match values are matched per RFC 9110 weak comparison."""
+        compiled = CompiledSchema.compile(make_schema())
+        header = header.format(etag=compiled.etag) if header else header
+
+        assert compiled.matches(header) is expected
+
+
+@pytest.mark.asyncio
+class TestEntryServiceCaching:
+    """Test EntryService compiles schemas once per tree version."""
+
+    async def test_schema_compiled_once(self):
+        """Test repeated requests are served without rebuilding the schema."""
+        service = make_entry_service(make_schema())
+
+        first = await service.get_compiled_profile_schema(1, "profile")
+        second = await service.get_compiled_profile_schema(1, "profile")
+
+        assert second is first
+        assert service._build_profile_schema.await_count == 1
+        assert get_profile_schema_cache().get_stats()["hits"] == 1
+
+    async def test_tree_change_rebuilds_with_new_etag(self):
+        """Test a version bump rebuilds the schema and changes its ETag."""
+        service = make_entry_service(make_schema(), make_schema("Width (mm)"))
+        first = await service.get_compiled_profile_schema(1, "profile")
+
+        service.db.scalar.return_value = 2
+        second = await service.get_compiled_profile_schema(1, "profile")
+
+        assert second.etag != first.etag
+        assert service._build_profile_schema.await_count == 2
+
+    async def test_page_types_cached_separately(self):
+        """Test each page type gets its own schema."""
+        service = make_entry_service(make_schema(), make_schema("Frame"))
+
+        profile = await service.get_compiled_profile_schema(1, "profile")
+        glazing = await service.get_compiled_profile_schema(1, "glazing")
+
+        assert profile.etag != glazing.etag
+        assert len(get_profile_schema_cache()) == 2
+
+    async def test_pending_changes_bypass_cache(self):
+        """Test a session with uncommitted node changes builds its own schema."""
+        service = make_entry_service(make_schema(), make_schema("Width (mm)"))
+        await service.get_compiled_profile_schema(1, "profile")
+        service.db.info[tree_versions._PENDING_KEY] = True
+
+        compiled = await service.get_compiled_profile_schema(1, "profile")
+
+        assert compiled.schema.sections[0].fields[0].label == "Width (mm)"
+        assert len(get_profile_schema_cache()) == 1
+
+    async def test_get_profile_schema_returns_parsed_schema(self):
+        """Test the uncompiled accessor still returns a ProfileSchema."""
+        service = make_entry_service(make_schema())
+
+        assert await service.get_profile_schema(1) == make_schema()
+
+
+@pytest.mark.asyncio
+class TestRedisTier:
+    """Test schemas shared through Redis."""
+
+    async def test_workers_share_schemas(self):
+        """Test one worker's schemas reach another worker under the same version."""
+        redis = FakeRedis()
+        worker_a = ProfileSchemaCache(use_redis=True)
+        worker_b = ProfileSchemaCache(use_redis=True)
+        worker_a._redis = worker_b._redis = lambda: redis
+        compiled = CompiledSchema.compile(make_schema())
+
+        await worker_a.set(worker_a.make_key(1, "profile", "1.1"), compiled)
+        shared = await worker_b.get(worker_b.make_key(1, "profile", "1.1"))
+
+        assert shared.etag == compiled.etag
+        assert worker_b.redis_hits == 1
+        assert await worker_b.get(worker_b.make_key(1, "profile", "1.2")) is None
+
+    async def test_redis_failure_falls_back_to_local_tier(self):
+        """Test schemas are still built and cached locally when Redis is unreachable."""
+        broken = MagicMock()
+        broken.get = AsyncMock(side_effect=ConnectionError("refused"))
+        broken.set = AsyncMock(side_effect=ConnectionError("refused"))
+        cache = ProfileSchemaCache(use_redis=True)
+        cache._redis = lambda: broken
+        schema_cache._profile_schema_cache = cache
+        service = make_entry_service(make_schema(), make_schema())
+
+        await service.get_compiled_profile_schema(1, "profile")
+        await service.get_compiled_profile_schema(1, "profile")
+
+        assert service._build_profile_schema.await_count == 1
+        assert (len(cache), cache.hits) == (1, 1)
+
+
+def test_invalidate_drops_local_entries():
+    """Test notifications drop a type's schemas, and untyped changes drop all."""
+    cache = ProfileSchemaCache()
+    compiled = CompiledSchema.compile(make_schema())
+    for type_id in (1, 2, 3):
+        cache._store_local(cache.make_key(type_id, "profile", "1.1"), compiled)
+
+    cache.invalidate(1)
+    assert len(cache) == 2
+    cache.invalidate(tree_versions.UNTYPED_TREE_ID)
+    assert len(cache) == 0
+    assert cache.invalidations == 2
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    """Create a session on the SQLite stand-in seeded with a small tree."""
+    monkeypatch.setattr(tree_versions, "_tree_versions", TreeVersionRegistry())
+
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_dataset(session, generate_dataset(SCALES["10"]))
+        await add_relations_field(session)
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_core_insert_of_definition_node_rebuilds_schema(db):
+    """Test a relation entity inserted with Core, bypassing the ORM, reaches the schema."""
+    service = EntryService(db)
+    first = await service.get_compiled_profile_schema(MANUFACTURING_TYPE_ID, "profile")
+    assert await service.get_compiled_profile_schema(MANUFACTURING_TYPE_ID, "profile") is first
+
+    await db.execute(
+        insert(AttributeNode.__table__),
+        [
+            {
+                "id": 9200,
+                "name": "Veka",
+                "node_type": "company",
+                "page_type": "profile",
+                "ltree_path": "definitions.profile.company.c9200",
+                "depth": 3,
+            }
+        ],
+    )
+    await db.commit()
+    second = await service.get_compiled_profile_schema(MANUFACTURING_TYPE_ID, "profile")
+
+    company = next(
+        field
+        for section in second.schema.sections
+        for field in section.fields
+        if field.name == "company"
+    )
+    assert "Veka" in company.options
+    assert second.etag != first.etag
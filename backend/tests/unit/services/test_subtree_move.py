@@ -0,0 +1,282 @@
+"""Unit tests for single-statement subtree moves.
+
+Runs move_node and would_create_cycle against the SQLite benchmark
+stand-in, which emulates the LTREE operators and functions.
+
+Tests cover:
+- Paths, depths and parents of moved subtrees
+- One UPDATE regardless of the subtree size
+- LTREE trigger bypass enabled for the move statement only
+- Cycle checks with one query
+- Nodes loaded in the session kept current
+- Tree version bumped for the moved nodes
+- Cached pricing plans reordered by the move
+"""
+
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.models.attribute_node import AttributeNode
+from app.models.manufacturing_type import ManufacturingType
+from app.repositories.attribute_node import AttributeNodeRepository
+from app.services.hierarchy_builder import HierarchyBuilderService
+from app.services.pricing import PricingService
+from app.services.tree_versions import get_tree_version, has_pending_changes
+from tests.benchmarks.database import create_benchmark_engine, create_schema
+
+TYPE_ID = 3
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Create a session on the SQLite stand-in with two manufacturing types."""
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.execute(
+            insert(ManufacturingType),
+            [
+                {
+                    "id": type_id,
+                    "name": f"Move Window {type_id}",
+                    "base_category": "window",
+                    "base_price": Decimal("100.00"),
+                    "base_weight": Decimal("5.00"),
+                    "is_active": True,
+                }
+                for type_id in (TYPE_ID, TYPE_ID + 1)
+            ],
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(db) -> HierarchyBuilderService:
+    """Create hierarchy builder on the stand-in session."""
+    return HierarchyBuilderService(db)
+
+
+def deep_tree(name: str, depth: int) -> dict:
+    """Create a chain of categories with one option per level."""
+    tree: dict = {"name": f"{name} {depth}", "node_type": "option"}
+    for level in reversed(range(depth)):
+        tree = {
+            "name": f"{name} {level}",
+            "node_type": "category",
+            "children": [tree, {"name": f"Option {level}", "node_type": "option"}],
+        }
+    return tree
+
+
+def category(name: str) -> dict:
+    """Create a category without children."""
+    return {"name": name, "node_type": "category"}
+
+
+async def load_tree(db: AsyncSession, manufacturing_type_id: int = TYPE_ID) -> dict[str, tuple]:
+    """Get path, depth and parent name of every node keyed by name."""
+    nodes = (
+        (
+            await db.execute(
+                select(AttributeNode).where(
+                    AttributeNode.manufacturing_type_id == manufacturing_type_id
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    names = {node.id: node.name for node in nodes}
+    return {
+        node.name: (node.ltree_path, node.depth, names.get(node.parent_node_id)) for node in nodes
+    }
+
+
+@pytest.mark.asyncio
+async def test_subtree_paths_and_depths_rewritten(db, service):
+    """Test the node and every descendant get the new prefix and depth."""
+    source = await service.create_hierarchy_from_dict(TYPE_ID, deep_tree("Source", 2))
+    target = await service.create_hierarchy_from_dict(TYPE_ID, category("Target"))
+    moved = await db.scalar(select(AttributeNode).where(AttributeNode.name == "Source 1"))
+
+    node = await service.move_node(moved.id, target.id)
+
+    assert (node.parent_node_id, node.ltree_path, node.depth) == (target.id, "target.source_1", 1)
+    assert await load_tree(db) == {
+        "Source 0": ("source_0", 0, None),
+        "Option 0": ("source_0.option_0", 1, "Source 0"),
+        "Target": ("target", 0, None),
+        "Source 1": ("target.source_1", 1, "Target"),
+        "Source 2": ("target.source_1.source_2", 2, "Source 1"),
+        "Option 1": ("target.source_1.option_1", 2, "Source 1"),
+    }
+    assert source.ltree_path == "source_0"
+
+
+@pytest.mark.asyncio
+async def test_subtree_moved_to_root_and_back(db, service):
+    """Test moving to root level and back restores the original tree."""
+    await service.create_hierarchy_from_dict(TYPE_ID, deep_tree("Chain", 4))
+    before = await load_tree(db)
+    moved = await db.scalar(select(AttributeNode).where(AttributeNode.name == "Chain 2"))
+    parent_id = moved.parent_node_id
+
+    node = await service.move_node(moved.id, None)
+
+    assert (node.parent_node_id, node.ltree_path, node.depth) == (None, "chain_2", 0)
+    assert (await load_tree(db))["Chain 4"] == ("chain_2.chain_3.chain_4", 2, "Chain 3")
+
+    await service.move_node(moved.id, parent_id)
+
+    assert await load_tree(db) == before
+
+
+@pytest.mark.asyncio
+async def test_one_update_regardless_of_subtree_size(db, service):
+    """Test moving a 5-node and a 121-node subtree costs the same statements."""
+    target = await service.create_hierarchy_from_dict(TYPE_ID, category("Target"))
+    statements: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement.split(" SET")[0]),
+    )
+
+    counts = []
+    for name, depth in (("Small", 2), ("Large", 60)):
+        root = await service.create_hierarchy_from_dict(TYPE_ID, deep_tree(name, depth))
+        statements.clear()
+        await service.move_node(root.id, target.id)
+        counts.append(list(statements))
+
+    assert counts[0] == counts[1]
+    assert counts[0].count("UPDATE attribute_nodes") == 1
+    assert (await load_tree(db))["Large 60"][1] == 61
+
+
+@pytest.mark.asyncio
+async def test_ltree_rewrite_enabled_for_move_only(db, service):
+    """Test the trigger bypass is switched on around the move UPDATE and off after it."""
+    source = await service.create_hierarchy_from_dict(TYPE_ID, deep_tree("Source", 2))
+    target = await service.create_hierarchy_from_dict(TYPE_ID, category("Target"))
+    statements: list[tuple[str, tuple]] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, *args: statements.append(
+            (statement.split(" SET")[0], tuple(parameters))
+        ),
+    )
+
+    await service.move_node(source.id, target.id)
+
+    position = [statement for statement, _ in statements].index("UPDATE attribute_nodes")
+    assert statements[position - 1] == (
+        "SELECT set_config(?, ?, true)",
+        ("windx.ltree_rewrite", "on"),
+    )
+    assert statements[position + 1] == (
+        "SELECT set_config(?, ?, true)",
+        ("windx.ltree_rewrite", "off"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_other_manufacturing_types_untouched(db, service):
+    """Test nodes of another type sharing the subtree's paths are not moved."""
+    await service.create_hierarchy_from_dict(TYPE_ID + 1, deep_tree("Source", 2))
+    other_before = await load_tree(db, TYPE_ID + 1)
+    source = await service.create_hierarchy_from_dict(TYPE_ID, deep_tree("Source", 2))
+    target = await service.create_hierarchy_from_dict(TYPE_ID, category("Target"))
+
+    await service.move_node(source.id, target.id)
+
+    assert await load_tree(db, TYPE_ID + 1) == other_before
+    assert (await load_tree(db))["Source 2"][0] == "target.source_0.source_1.source_2"
+
+
+@pytest.mark.asyncio
+async def test_move_under_descendant_rejected(db, service):
+    """Test moving a node under itself or its descendant is rejected."""
+    root = await service.create_hierarchy_from_dict(TYPE_ID, deep_tree("Chain", 3))
+    descendant = await db.scalar(select(AttributeNode).where(AttributeNode.name == "Chain 3"))
+
+    for parent_id in (root.id, descendant.id):
+        with pytest.raises(ValidationException, match="circular reference"):
+            await service.move_node(root.id, parent_id)
+
+
+@pytest.mark.asyncio
+async def test_cycle_check_is_one_query(db, service):
+    """Test would_create_cycle answers with one query and handles missing nodes."""
+    root = await service.create_hierarchy_from_dict(TYPE_ID, deep_tree("Chain", 2))
+    other = await service.create_hierarchy_from_dict(TYPE_ID, category("Other"))
+    leaf = await db.scalar(select(AttributeNode).where(AttributeNode.name == "Chain 2"))
+    repo = AttributeNodeRepository(db)
+    statements: list[str] = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    assert await repo.would_create_cycle(root.id, leaf.id) is True
+    assert await repo.would_create_cycle(leaf.id, root.id) is False
+    assert await repo.would_create_cycle(root.id, other.id) is False
+    assert await repo.would_create_cycle(root.id, 999) is False
+    assert await repo.would_create_cycle(root.id, root.id) is True
+    assert len(statements) == 4
+
+
+@pytest.mark.asyncio
+async def test_loaded_descendants_kept_current(db, service):
+    """Test descendants loaded in the session see their new paths."""
+    root = await service.create_hierarchy_from_dict(TYPE_ID, deep_tree("Chain", 2))
+    target = await service.create_hierarchy_from_dict(TYPE_ID, category("Target"))
+    leaf = await db.scalar(select(AttributeNode).where(AttributeNode.name == "Chain 2"))
+
+    await service.move_node(root.id, target.id)
+
+    assert (leaf.ltree_path, leaf.depth) == ("target.chain_0.chain_1.chain_2", 3)
+
+
+@pytest.mark.asyncio
+async def test_committed_move_bumps_tree_version(db, service):
+    """Test committing a move moves the type's tree version."""
+    root = await service.create_hierarchy_from_dict(TYPE_ID, deep_tree("Chain", 1))
+    target = await service.create_hierarchy_from_dict(TYPE_ID, category("Target"))
+    before = await get_tree_version(db, TYPE_ID)
+
+    await service.move_node(root.id, target.id)
+
+    assert await get_tree_version(db, TYPE_ID) > before
+    assert not has_pending_changes(db)
+
+
+@pytest.mark.asyncio
+async def test_committed_move_reorders_pricing_plan(db, service):
+    """Test a cached pricing plan follows a move that changes rule ancestry."""
+    surcharges = [
+        await service.create_hierarchy_from_dict(
+            TYPE_ID,
+            category(name) | {"price_impact_type": "percentage", "price_impact_value": value},
+        )
+        for name, value in (("Zeta", 10), ("Addon", 5))
+    ]
+    zeta, addon = (node.id for node in surcharges)
+    pricing = PricingService(db)
+    cached = (await pricing.get_pricing_plans({TYPE_ID}))[TYPE_ID]
+
+    await service.move_node(addon, zeta)
+    rebuilt = (await pricing.get_pricing_plans({TYPE_ID}))[TYPE_ID]
+
+    # Percentages of ancestors apply before those of their descendants
+    assert cached.ranks[addon] < cached.ranks[zeta]
+    assert rebuilt.ranks[zeta] < rebuilt.ranks[addon]
@@ -0,0 +1,229 @@
+"""Unit tests for precomputed attribute tree exports.
+
+Exports are built on the SQLite benchmark stand-in.
+
+Tests cover:
+- JSON identical to the AttributeNodeTree response model
+- Exports shared until the tree changes
+- Sessions with uncommitted changes never sharing exports
+- Subtrees of nodes without a manufacturing type
+- Content negotiation, compression and ETags
+- Bounded cache invalidated per manufacturing type
+"""
+
+import gzip
+from decimal import Decimal
+
+import orjson
+import pytest
+import pytest_asyncio
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attribute_node import AttributeNode
+from app.models.manufacturing_type import ManufacturingType
+from app.repositories.attribute_node import AttributeNodeRepository
+from app.schemas.attribute_node import AttributeNodeTree
+from app.services import schema_cache, tree_export, tree_snapshot, tree_versions
+from app.services.hierarchy_builder import HierarchyBuilderService
+from app.services.schema_cache import ProfileSchemaCache
+from app.services.tree_export import (
+    TreeExport,
+    TreeExportCache,
+    get_tree_export,
+    get_tree_export_cache,
+)
+from app.services.tree_snapshot import TreeSnapshot, TreeSnapshotCache
+from app.services.tree_versions import TreeVersionRegistry
+from tests.benchmarks.database import create_benchmark_engine, create_schema
+
+TYPE_ID = 3
+
+TREE = {
+    "name": "Frame",
+    "node_type": "category",
+    "children": [
+        {
+            "name": "Material",
+            "node_type": "attribute",
+            "children": [
+                {"name": "Vinyl", "node_type": "option", "price_impact_value": 20},
+                {"name": "Aluminum", "node_type": "option", "price_impact_value": 50.5},
+            ],
+        },
+        {"name": "Color", "node_type": "attribute", "validation_rules": {"min": 1}},
+    ],
+}
+
+TREE_ADAPTER = TypeAdapter(list[AttributeNodeTree])
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    """Create a session on the SQLite stand-in with fresh caches."""
+    schemas = ProfileSchemaCache(use_redis=False)
+    monkeypatch.setattr(schema_cache, "get_profile_schema_cache", lambda: schemas)
+    monkeypatch.setattr(tree_versions, "_tree_versions", TreeVersionRegistry())
+    monkeypatch.setattr(tree_snapshot, "_tree_snapshot_cache", TreeSnapshotCache())
+    monkeypatch.setattr(tree_export, "_tree_export_cache", None)
+
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.execute(
+            insert(ManufacturingType),
+            [
+                {
+                    "id": TYPE_ID,
+                    "name": "Export Window",
+                    "base_category": "window",
+                    "base_price": Decimal("100.00"),
+                    "base_weight": Decimal("5.00"),
+                    "is_active": True,
+                }
+            ],
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def root(db) -> AttributeNode:
+    """Create the test tree and return its root."""
+    return await HierarchyBuilderService(db).create_hierarchy_from_dict(TYPE_ID, TREE)
+
+
+async def model_json(db: AsyncSession, node: AttributeNode) -> bytes:
+    """Serialize a subtree through the response model."""
+    repo = AttributeNodeRepository(db)
+    tree = repo.build_tree([node, *await repo.get_descendants(node.id)])
+    return TREE_ADAPTER.dump_json(tree)
+
+
+@pytest.mark.asyncio
+async def test_export_matches_response_model(db, root):
+    """Test exports serialize exactly like list[AttributeNodeTree]."""
+    material = await db.scalar(select(AttributeNode).where(AttributeNode.name == "Material"))
+
+    export = await get_tree_export(db, root)
+    subtree = await get_tree_export(db, material)
+
+    assert export.body == await model_json(db, root)
+    # Subtrees of inner nodes are rooted at the node, as pydantify builds them
+    service = HierarchyBuilderService(db)
+    assert subtree.body == TREE_ADAPTER.dump_json(
+        await service.pydantify(TYPE_ID, root_node_id=material.id)
+    )
+    tree = orjson.loads(export.body)
+    assert [child["name"] for child in tree[0]["children"]] == ["Color", "Material"]
+    assert tree[0]["children"][1]["children"][0]["price_impact_value"] == "50.50"
+
+
+@pytest.mark.asyncio
+async def test_export_shared_until_tree_changes(db, root):
+    """Test an export is serialized once per tree version."""
+    export = await get_tree_export(db, root)
+    assert await get_tree_export(db, root) is export
+
+    await HierarchyBuilderService(db).create_node(
+        TYPE_ID, "Sash", "category", parent_node_id=root.id
+    )
+    changed = await get_tree_export(db, root)
+
+    assert changed is not export
+    assert "Sash" in [child["name"] for child in orjson.loads(changed.body)[0]["children"]]
+    stats = get_tree_export_cache().get_stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["stale"]) == (1, 1, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_changes_not_shared(db, root):
+    """Test a session with pending tree changes neither reads nor replaces shared exports."""
+    shared = await get_tree_export(db, root)
+
+    db.add(
+        AttributeNode(
+            manufacturing_type_id=TYPE_ID,
+            parent_node_id=root.id,
+            name="Draft",
+            node_type="category",
+            ltree_path=f"{root.ltree_path}.draft",
+            depth=1,
+        )
+    )
+    await db.flush()
+    private = await get_tree_export(db, root)
+
+    assert b'"Draft"' in private.body
+    assert private is not shared
+    await db.rollback()
+    await db.refresh(root)
+    assert await get_tree_export(db, root) is shared
+
+
+@pytest.mark.asyncio
+async def test_untyped_subtree_loaded_per_call(db):
+    """Test subtrees without a manufacturing type are serialized from the database."""
+    scope = AttributeNode(name="Scope", node_type="category", ltree_path="scope", depth=0)
+    db.add(scope)
+    await db.flush()
+    db.add(
+        AttributeNode(
+            parent_node_id=scope.id,
+            name="Entity",
+            node_type="option",
+            ltree_path="scope.entity",
+            depth=1,
+        )
+    )
+    await db.commit()
+
+    export = await get_tree_export(db, scope)
+
+    assert export.body == await model_json(db, scope)
+    assert len(get_tree_export_cache()) == 0
+
+
+def test_encodings_negotiated():
+    """Test the smallest accepted encoding is served and small bodies stay plain."""
+    body = orjson.dumps([{"name": "Frame", "children": []}] * 50)
+    export = TreeExport.from_body(body)
+
+    assert gzip.decompress(export.gzip) == body
+    assert export.etag.startswith('W/"') and export.etag == TreeExport.from_body(body).etag
+    assert export.encode("gzip, deflate") == (export.gzip, "gzip")
+    assert export.encode("*") == (export.gzip, "gzip")
+    assert export.encode("gzip;q=0, identity") == (body, None)
+    assert export.encode("") == (body, None)
+    if export.brotli is not None:
+        assert export.encode("gzip, br") == (export.brotli, "br")
+    else:
+        assert export.encode("br") == (body, None)
+
+    small = TreeExport.from_body(b"[]")
+    assert (small.gzip, small.brotli) == (None, None)
+    assert small.encode("gzip, br") == (b"[]", None)
+
+
+def test_cache_invalidated_per_type():
+    """Test exports are dropped per manufacturing type and the cache stays bounded."""
+    cache = TreeExportCache(maxsize=2)
+    snapshots = {type_id: TreeSnapshot.build(type_id, []) for type_id in (1, 2)}
+    export = TreeExport.from_body(b"[]")
+    cache.put(snapshots[1], 10, export)
+    cache.put(snapshots[1], 11, export)
+    cache.put(snapshots[2], 20, export)
+
+    assert cache.get(snapshots[1], 10) is None
+    assert cache.get(snapshots[1], 11) is export
+    assert cache.get(TreeSnapshot.build(1, []), 11) is None
+
+    cache.put(snapshots[1], 11, export)
+    cache.invalidate(1)
+    assert cache.get(snapshots[2], 20) is export
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.evictions == 1 and cache.stale == 1
@@ -0,0 +1,285 @@
+"""Unit tests for immutable attribute tree snapshots.
+
+Snapshot loading runs against the SQLite benchmark stand-in.
+
+Tests cover:
+- Preorder layout, sibling order and orphaned nodes
+- Children, subtrees, ancestors and descendant checks
+- Read-only node views
+- Versioned, bounded snapshot cache
+- Snapshots shared until a change bumps the database tree version
+- Sessions with uncommitted changes never sharing snapshots
+- Hierarchy views built from snapshots
+"""
+
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundException
+from app.models.attribute_node import AttributeNode
+from app.models.manufacturing_type import ManufacturingType
+from app.services import schema_cache, tree_snapshot, tree_versions
+from app.services.hierarchy_builder import HierarchyBuilderService
+from app.services.schema_cache import ProfileSchemaCache
+from app.services.tree_snapshot import TreeSnapshot, TreeSnapshotCache, get_tree_snapshot
+from app.services.tree_versions import TreeVersionRegistry
+from tests.benchmarks.database import create_benchmark_engine, create_schema
+
+TYPE_ID = 3
+
+
+def row(node_id: int, parent_id: int | None, name: str, sort_order: int = 0) -> dict:
+    """Create a node row."""
+    return {
+        "id": node_id,
+        "parent_node_id": parent_id,
+        "name": name,
+        "sort_order": sort_order,
+        "ltree_path": name.lower(),
+    }
+
+
+# Shuffled rows of:
+#   1 Frame          (sort 0)
+#     4 Color        (sort 0)
+#       6 White
+#     2 Material     (sort 1)
+#       3 Aluminum
+#       5 Vinyl
+#   7 Glass          (sort 1)
+#   9 Orphan         (parent 99 is not in the tree)
+ROWS = [
+    row(5, 2, "Vinyl"),
+    row(7, None, "Glass", 1),
+    row(2, 1, "Material", 1),
+    row(9, 99, "Orphan", 2),
+    row(3, 2, "Aluminum"),
+    row(1, None, "Frame"),
+    row(6, 4, "White"),
+    row(4, 1, "Color"),
+]
+
+
+def ids(nodes) -> list[int]:
+    """Get the IDs of node views."""
+    return [node.id for node in nodes]
+
+
+def test_nodes_numbered_in_preorder():
+    """Test nodes are laid out depth first with siblings in sort order."""
+    snapshot = TreeSnapshot.build(TYPE_ID, ROWS)
+
+    assert list(snapshot.ids) == [1, 4, 6, 2, 3, 5, 7, 9]
+    assert list(snapshot.parents) == [-1, 0, 1, 0, 3, 3, -1, -1]
+    assert list(snapshot.ends) == [6, 3, 3, 6, 5, 6, 7, 8]
+    assert ids(snapshot.children()) == [1, 7, 9]
+    assert snapshot.columns["name"][:3] == ("Frame", "Color", "White")
+    assert len(snapshot) == 8
+
+
+def test_tree_navigation():
+    """Test children, subtrees, ancestors and descendant checks."""
+    snapshot = TreeSnapshot.build(TYPE_ID, ROWS)
+
+    assert ids(snapshot.children(1)) == [4, 2]
+    assert ids(snapshot.children(6)) == []
+    assert ids(snapshot.subtree(2)) == [2, 3, 5]
+    assert ids(snapshot.descendants(1)) == [4, 6, 2, 3, 5]
+    assert ids(snapshot.ancestors(5)) == [1, 2]
+    assert ids(snapshot.ancestors(9)) == []
+    assert snapshot.is_descendant(6, 1) is True
+    assert snapshot.is_descendant(6, 2) is False
+    assert snapshot.is_descendant(1, 1) is False
+    assert snapshot.is_descendant(7, 1) is False
+    for node_id in (99, 100):
+        assert snapshot.get(node_id) is None
+        assert snapshot.subtree(node_id) == snapshot.children(node_id) == []
+
+
+def test_node_views_are_read_only():
+    """Test views expose the row columns and reject writes."""
+    snapshot = TreeSnapshot.build(TYPE_ID, ROWS)
+    node = snapshot.get(3)
+
+    assert (node.name, node.parent_node_id, node.ltree_path) == ("Aluminum", 2, "aluminum")
+    assert node == snapshot.get(3) and node != snapshot.get(5)
+    with pytest.raises(AttributeError, match="read-only"):
+        node.name = "Steel"
+    with pytest.raises(AttributeError):
+        _ = node.price_formula
+    with pytest.raises(TypeError):
+        snapshot.columns["name"] = ()
+
+
+def test_cache_drops_stale_and_least_recent_snapshots():
+    """Test snapshots are served for their version only and the cache stays bounded."""
+    cache = TreeSnapshotCache(maxsize=2)
+    snapshots = {type_id: TreeSnapshot.build(type_id, ROWS) for type_id in (1, 2, 3)}
+    for type_id in (1, 2):
+        cache.put(type_id, "1.0", snapshots[type_id])
+
+    assert cache.get(1, "1.0") is snapshots[1]
+    assert cache.get(2, "2.0") is None
+    cache.put(2, "2.0", snapshots[2])
+    cache.put(3, "1.0", snapshots[3])
+
+    assert cache.get(1, "1.0") is None
+    assert cache.get(2, "2.0") is snapshots[2]
+    assert cache.get_stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "nodes": 16,
+        "hits": 2,
+        "misses": 2,
+        "hit_rate": 0.5,
+        "stale": 1,
+        "evictions": 1,
+    }
+
+    disabled = TreeSnapshotCache(maxsize=0)
+    disabled.put(1, "1.0", snapshots[1])
+    assert len(disabled) == 0
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    """Create a session on the SQLite stand-in with fresh version registries."""
+    schemas = ProfileSchemaCache(use_redis=False)
+    monkeypatch.setattr(schema_cache, "get_profile_schema_cache", lambda: schemas)
+    monkeypatch.setattr(tree_versions, "_tree_versions", TreeVersionRegistry())
+    monkeypatch.setattr(tree_snapshot, "_tree_snapshot_cache", TreeSnapshotCache())
+
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.execute(
+            insert(ManufacturingType),
+            [
+                {
+                    "id": type_id,
+                    "name": f"Snapshot Window {type_id}",
+                    "base_category": "window",
+                    "base_price": Decimal("100.00"),
+                    "base_weight": Decimal("5.00"),
+                    "is_active": True,
+                }
+                for type_id in (TYPE_ID, TYPE_ID + 1)
+            ],
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def service(db) -> HierarchyBuilderService:
+    """Create hierarchy builder on the stand-in session."""
+    return HierarchyBuilderService(db)
+
+
+TREE = {
+    "name": "Frame",
+    "node_type": "category",
+    "children": [
+        {
+            "name": "Material",
+            "node_type": "attribute",
+            "children": [
+                {"name": "Vinyl", "node_type": "option", "price_impact_value": 20},
+                {"name": "Aluminum", "node_type": "option", "price_impact_value": 50},
+            ],
+        },
+        {"name": "Color", "node_type": "attribute"},
+    ],
+}
+
+
+def record_node_loads(db: AsyncSession) -> list[str]:
+    """Record the attribute node queries executed on the session's engine."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        if "FROM attribute_nodes" in statement:
+            statements.append(statement)
+
+    event.listen(db.bind.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_snapshot_shared_until_tree_changes(db, service):
+    """Test one node query builds a snapshot reused until the tree changes."""
+    await service.create_hierarchy_from_dict(TYPE_ID, TREE)
+    await service.create_hierarchy_from_dict(
+        TYPE_ID + 1, {"name": "Other", "node_type": "category"}
+    )
+    node_loads = record_node_loads(db)
+
+    snapshot = await get_tree_snapshot(db, TYPE_ID)
+
+    assert await get_tree_snapshot(db, TYPE_ID) is snapshot
+    assert len(node_loads) == 1
+    assert [node.name for node in snapshot] == ["Frame", "Color", "Material", "Aluminum", "Vinyl"]
+    assert snapshot.get(snapshot.ids[3]).price_impact_value == Decimal("50")
+
+    other = await get_tree_snapshot(db, TYPE_ID + 1)
+    await service.create_node(TYPE_ID, "Glass", "category")
+
+    changed = await get_tree_snapshot(db, TYPE_ID)
+    assert changed is not snapshot
+    assert len(changed) == 6
+    assert await get_tree_snapshot(db, TYPE_ID + 1) is other
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_changes_not_shared(db, service):
+    """Test a session with pending tree changes gets a private snapshot."""
+    await service.create_hierarchy_from_dict(TYPE_ID, TREE)
+    shared = await get_tree_snapshot(db, TYPE_ID)
+
+    db.add(
+        AttributeNode(
+            manufacturing_type_id=TYPE_ID,
+            name="Draft",
+            node_type="category",
+            ltree_path="draft",
+            depth=0,
+        )
+    )
+    await db.flush()
+    private = await get_tree_snapshot(db, TYPE_ID)
+
+    assert "Draft" in private.columns["name"]
+    assert private is not shared
+    assert await get_tree_snapshot(db, TYPE_ID) is not private
+
+    await db.rollback()
+    assert await get_tree_snapshot(db, TYPE_ID) is shared
+
+
+@pytest.mark.asyncio
+async def test_pydantify_reads_snapshot(db, service):
+    """Test hierarchy views are nested from the snapshot in path order."""
+    root = await service.create_hierarchy_from_dict(TYPE_ID, TREE)
+    material = await db.scalar(select(AttributeNode).where(AttributeNode.name == "Material"))
+
+    tree = await service.pydantify(TYPE_ID)
+    subtree = await service.pydantify(TYPE_ID, root_node_id=material.id)
+
+    assert [node.id for node in tree] == [root.id]
+    assert [child.name for child in tree[0].children] == ["Color", "Material"]
+    assert [child.name for child in tree[0].children[1].children] == ["Aluminum", "Vinyl"]
+    assert [node.name for node in subtree] == ["Material"]
+    assert [child.price_impact_value for child in subtree[0].children] == [
+        Decimal("50"),
+        Decimal("20"),
+    ]
+
+    with pytest.raises(ValueError, match="belongs to manufacturing type"):
+        await service.pydantify(TYPE_ID + 1, root_node_id=material.id)
+    with pytest.raises(NotFoundException):
+        await service.pydantify(TYPE_ID, root_node_id=999)
@@ -0,0 +1,355 @@
+"""Unit tests for database-maintained attribute tree versions.
+
+Trigger behaviour runs against the SQLite benchmark stand-in, whose
+row-level triggers mirror the statement-level PostgreSQL ones.
+
+Tests cover:
+- Versions bumped per manufacturing type by inserts, updates and deletes
+- Nodes without a manufacturing type counted under UNTYPED_TREE_ID
+- Database reads while not listening, memory reads while listening
+- Notifications applied in order, per schema, and published to subscribers
+- Sessions with uncommitted tree changes never storing their versions
+- ORM flushes and Core statements on attribute nodes marking sessions pending
+- Reads racing a reconnect not storing stale versions
+- Listener connection lifecycle and reconnects
+- Header registry and snapshot cache invalidated by notifications
+"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, insert, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attribute_node import AttributeNode
+from app.models.manufacturing_type import ManufacturingType
+from app.services import header_registry, schema_cache, tree_snapshot, tree_versions
+from app.services.header_registry import PreviewHeaders, get_header_registry
+from app.services.schema_cache import ProfileSchemaCache
+from app.services.tree_snapshot import TreeSnapshotCache, get_tree_snapshot
+from app.services.tree_versions import (
+    TREE_VERSION_CHANNEL,
+    UNTYPED_TREE_ID,
+    TreeVersionRegistry,
+    get_tree_version,
+    get_tree_versions,
+    has_pending_changes,
+)
+from tests.benchmarks.database import create_benchmark_engine, create_schema
+
+TYPE_ID = 3
+
+
+def node(name: str, manufacturing_type_id: int | None = TYPE_ID) -> AttributeNode:
+    """Create a root attribute node."""
+    return AttributeNode(
+        manufacturing_type_id=manufacturing_type_id,
+        name=name,
+        node_type="category",
+        ltree_path=name.lower(),
+        depth=0,
+    )
+
+
+def node_row(name: str) -> dict:
+    """Create the column values of a root attribute node."""
+    return {
+        "manufacturing_type_id": TYPE_ID,
+        "name": name,
+        "node_type": "category",
+        "ltree_path": name.lower(),
+    }
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    """Create a session on the SQLite stand-in with a fresh version registry."""
+    schemas = ProfileSchemaCache(use_redis=False)
+    monkeypatch.setattr(schema_cache, "get_profile_schema_cache", lambda: schemas)
+    monkeypatch.setattr(tree_versions, "_tree_versions", TreeVersionRegistry())
+
+    engine = create_benchmark_engine()
+    await create_schema(engine)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.execute(
+            insert(ManufacturingType),
+            [
+                {
+                    "id": type_id,
+                    "name": f"Versioned Window {type_id}",
+                    "base_category": "window",
+                    "base_price": Decimal("100.00"),
+                    "base_weight": Decimal("5.00"),
+                    "is_active": True,
+                }
+                for type_id in (TYPE_ID, TYPE_ID + 1)
+            ],
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_writes_bump_versions_per_type(db):
+    """Test every node write bumps the version of its own tree only."""
+    assert await get_tree_version(db, TYPE_ID) == 0
+
+    db.add(node("Frame"))
+    await db.commit()
+    first = await get_tree_version(db, TYPE_ID)
+    assert first > 0
+    assert await get_tree_version(db, TYPE_ID + 1) == 0
+
+    # Raw statements bypass the ORM; the trigger still sees them
+    await db.execute(text("UPDATE attribute_nodes SET description = 'Outer frame'"))
+    await db.commit()
+    second = await get_tree_version(db, TYPE_ID)
+    assert second > first
+
+    # Moving nodes to another type changes both trees
+    await db.execute(update(AttributeNode).values(manufacturing_type_id=TYPE_ID + 1))
+    await db.commit()
+    third = await get_tree_version(db, TYPE_ID)
+    assert third > second
+    assert await get_tree_version(db, TYPE_ID + 1) > 0
+
+    moved = await get_tree_version(db, TYPE_ID + 1)
+    await db.execute(delete(AttributeNode))
+    await db.commit()
+    assert await get_tree_version(db, TYPE_ID) == third
+    assert await get_tree_version(db, TYPE_ID + 1) > moved
+
+
+@pytest.mark.asyncio
+async def test_untyped_nodes_counted_under_untyped_tree(db):
+    """Test product definition nodes bump the untyped tree."""
+    db.add(node("Scope", manufacturing_type_id=None))
+    await db.commit()
+
+    assert await get_tree_version(db, UNTYPED_TREE_ID) > 0
+    assert await get_tree_version(db, TYPE_ID) == 0
+
+
+@pytest.mark.asyncio
+async def test_versions_read_from_database_unless_listening(db):
+    """Test versions are only remembered while notifications keep them current."""
+    registry = get_tree_versions()
+    db.add(node("Frame"))
+    await db.commit()
+
+    version = await get_tree_version(db, TYPE_ID)
+    assert await get_tree_version(db, TYPE_ID) == version
+    assert (registry.hits, registry.misses, len(registry._versions)) == (0, 2, 0)
+
+    registry.listening = True
+    assert await get_tree_version(db, TYPE_ID) == version
+    assert await get_tree_version(db, TYPE_ID) == version
+    assert (registry.hits, registry.misses) == (1, 3)
+
+    # Without a notification the remembered version is served as is
+    db.add(node("Glass"))
+    await db.commit()
+    assert await get_tree_version(db, TYPE_ID) == version
+    assert registry.apply(TYPE_ID, version + 1) is True
+    assert await get_tree_version(db, TYPE_ID) == version + 1
+
+
+@pytest.mark.asyncio
+async def test_pending_changes_never_stored(db):
+    """Test a session with uncommitted tree changes reads and keeps its own version."""
+    registry = get_tree_versions()
+    registry.listening = True
+    committed = await get_tree_version(db, TYPE_ID)
+
+    db.add(node("Draft"))
+    await db.flush()
+    assert has_pending_changes(db)
+    assert await get_tree_version(db, TYPE_ID) > committed
+    assert registry._versions == {TYPE_ID: committed}
+
+    await db.rollback()
+    assert await get_tree_version(db, TYPE_ID) == committed
+
+
+@pytest.mark.asyncio
+async def test_pending_changes_tracked_until_transaction_ends(db):
+    """Test ORM flushes and Core statements mark a session until commit or rollback."""
+    frame = node("Frame")
+    db.add(frame)
+    await db.commit()
+    assert not has_pending_changes(db)
+
+    # Loading and flushing unchanged nodes writes nothing
+    frame.name = frame.name
+    await db.flush()
+    assert not has_pending_changes(db)
+
+    await db.execute(update(AttributeNode.__table__).values(description="Outer frame"))
+    assert has_pending_changes(db)
+    await db.rollback()
+    assert not has_pending_changes(db)
+
+    await db.execute(insert(AttributeNode), [{**node_row("Glass"), "depth": 0}])
+    assert has_pending_changes(db)
+    await db.commit()
+    assert not has_pending_changes(db)
+
+    await db.delete(frame)
+    await db.flush()
+    assert has_pending_changes(db)
+    await db.rollback()
+
+
+@pytest.mark.asyncio
+async def test_read_racing_reset_not_stored(db, monkeypatch):
+    """Test a version read across a reconnect is returned but not remembered."""
+    registry = get_tree_versions()
+    registry.listening = True
+    scalar = db.scalar
+
+    async def scalar_then_reset(*args, **kwargs):
+        result = await scalar(*args, **kwargs)
+        registry.reset()
+        return result
+
+    monkeypatch.setattr(db, "scalar", scalar_then_reset)
+
+    assert await get_tree_version(db, TYPE_ID) == 0
+    assert registry._versions == {}
+
+
+def test_notifications_applied_in_order():
+    """Test newer versions of the worker's schema are applied and published."""
+    registry = TreeVersionRegistry(schema="windx")
+    published: list[int | None] = []
+    registry.subscribe(published.append)
+
+    assert registry.handle_notification("windx:3:2") is True
+    assert registry.handle_notification("windx:3:1") is False
+    assert registry.handle_notification("windx:3:2") is False
+    assert registry.handle_notification("public:4:7") is False
+    assert registry.handle_notification("windx:four:7") is False
+    assert registry.handle_notification("garbage") is False
+    assert registry.handle_notification("windx:4:1") is True
+
+    assert registry._versions == {3: 2, 4: 1}
+    assert published == [3, 4]
+
+    registry.reset()
+    assert registry._versions == {}
+    assert published == [3, 4, None]
+    assert registry.get_stats() == {
+        "listening": False,
+        "known": 0,
+        "hits": 0,
+        "misses": 0,
+        "hit_rate": 0.0,
+        "notifications": 2,
+        "resets": 1,
+    }
+
+
+def test_failing_subscriber_isolated():
+    """Test one failing subscriber does not keep others from being called."""
+    registry = TreeVersionRegistry()
+    published: list[int | None] = []
+
+    def fail(manufacturing_type_id):
+        raise RuntimeError("subscriber failed")
+
+    registry.subscribe(fail)
+    registry.subscribe(published.append)
+
+    assert registry.apply(TYPE_ID, 1) is True
+    assert published == [TYPE_ID]
+
+
+class FakeConnection:
+    """asyncpg connection double recording listeners."""
+
+    def __init__(self) -> None:
+        self.listeners: dict = {}
+        self.on_terminate = None
+        self.closed = False
+
+    def add_termination_listener(self, callback) -> None:
+        self.on_terminate = callback
+
+    async def add_listener(self, channel, callback) -> None:
+        self.listeners[channel] = callback
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def notify(self, payload: str) -> None:
+        self.listeners[TREE_VERSION_CHANNEL](self, 1, TREE_VERSION_CHANNEL, payload)
+
+    def terminate(self) -> None:
+        self.closed = True
+        self.on_terminate(self)
+
+
+async def wait_until(condition) -> None:
+    """Let the listener task run until a condition holds."""
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_with_versions_forgotten():
+    """Test the listener applies notifications and starts over after a disconnect."""
+    registry = TreeVersionRegistry(retry_delay=0)
+    published: list[int | None] = []
+    registry.subscribe(published.append)
+    connections: list[FakeConnection] = []
+
+    async def connect():
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    registry.start(connect)
+    await wait_until(lambda: registry.listening)
+    connections[0].notify(f"public:{TYPE_ID}:5")
+    assert registry._versions == {TYPE_ID: 5}
+
+    connections[0].terminate()
+    await wait_until(lambda: len(connections) == 2 and registry.listening)
+    assert registry._versions == {}
+    assert published == [None, TYPE_ID, None, None]
+
+    await registry.stop()
+    assert registry.listening is False
+    assert connections[1].closed is True
+
+
+@pytest.mark.asyncio
+async def test_notifications_invalidate_subscribed_caches(db, monkeypatch):
+    """Test header sets and snapshots of a changed tree are dropped on notification."""
+    monkeypatch.setattr(header_registry, "_header_registry", None)
+    monkeypatch.setattr(tree_snapshot, "_tree_snapshot_cache", None)
+    registry = get_tree_versions()
+    headers = get_header_registry()
+    snapshots = tree_snapshot.get_tree_snapshot_cache()
+
+    db.add(node("Frame"))
+    await db.commit()
+    snapshot = await get_tree_snapshot(db, TYPE_ID)
+    for type_id in (TYPE_ID, TYPE_ID + 1):
+        headers.put(headers.make_key(type_id, "profile"), "1", PreviewHeaders(["id"], {}, {}))
+
+    registry.apply(TYPE_ID, 99)
+
+    assert headers.make_key(TYPE_ID, "profile") not in headers
+    assert headers.make_key(TYPE_ID + 1, "profile") in headers
+    assert len(snapshots) == 0
+    assert isinstance(snapshots, TreeSnapshotCache)
+    assert await get_tree_snapshot(db, TYPE_ID) is not snapshot
@@ -19,6 +19,7 @@ export class ConditionEvaluator {
         // Comparison operators
         equals: (a, b) => a == b,
         not_equals: (a, b) => a != b,
+        equals_ignore_case: (a, b) => String(a || '').toLowerCase() === String(b).toLowerCase(),
         greater_than: (a, b) => (a || 0) > (b || 0),
         less_than: (a, b) => (a || 0) < (b || 0),
         greater_equal: (a, b) => (a || 0) >= (b || 0),
@@ -19,6 +19,8 @@ Commands:
     delete_factory_mfg           Delete factory-generated manufacturing data
     create_factory_customers     Create factory-generated customer data
     delete_factory_customers     Delete factory-generated customer data
+    reprice                      Recalculate prices of all configurations of a manufacturing type
+    import_profiles <username>   Import profile configurations from a profile sheet CSV
     check_db                     Check database connection and schema
     tables                       Display table information with pandas
     start                        Start the server (auto-detects gunicorn/uvicorn)
@@ -45,6 +47,10 @@ Examples:
     python manage.py delete_factory_mfg --force
     python manage.py create_factory_customers --count 20
     python manage.py delete_factory_customers --force
+    python manage.py reprice --type-id 1
+    python manage.py reprice --type-id 1 --dry-run
+    python manage.py import_profiles admin --type-id 1 --file profiles.csv
+    python manage.py import_profiles admin --type-id 1 --file profiles.csv --workers 4
     python manage.py check_db
     python manage.py tables --schema public
     python manage.py start
@@ -1560,6 +1566,150 @@ async def delete_factory_customers_command(args: argparse.Namespace):
         await engine.dispose()
 
 
+async def reprice_command(args: argparse.Namespace):
+    """Recalculate total price and weight of every configuration of a manufacturing type."""
+    from app.services.repricing import BulkRepricingService
+
+    console.print(Panel.fit("[bold cyan]Bulk Repricing[/bold cyan]", border_style="cyan"))
+    console.print()
+
+    if not args.type_id:
+        console.print("[red]✗ Error: --type-id is required for the reprice command[/red]")
+        sys.exit(1)
+
+    engine = get_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        with Progress(
+            SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console
+        ) as progress:
+            task = progress.add_task(
+                f"[cyan]Repricing manufacturing type {args.type_id}...", total=None
+            )
+
+            async with session_maker() as session:
+                result = await BulkRepricingService(session).reprice_manufacturing_type(
+                    args.type_id, dry_run=args.dry_run
+                )
+
+            progress.update(task, description="[green]✓ Repricing complete")
+
+        title = "Dry Run Complete" if result.dry_run else "Repricing Complete"
+        summary_table = Table(title=f"[bold green]✓ {title}[/bold green]", box=box.ROUNDED)
+        summary_table.add_column("Metric", style="cyan")
+        summary_table.add_column("Value", justify="right", style="yellow")
+
+        summary_table.add_row("Manufacturing Type", str(result.manufacturing_type_id))
+        summary_table.add_row("Configurations", f"{result.configurations:,}")
+        summary_table.add_row("Selections", f"{result.selections:,}")
+        summary_table.add_row(
+            "Would Update" if result.dry_run else "Updated", f"{result.updated:,}"
+        )
+        summary_table.add_row("Unchanged", f"{result.unchanged:,}")
+        summary_table.add_row("Failed", f"{result.failed:,}")
+        summary_table.add_row("Duration", f"{result.duration_seconds:.3f}s")
+        summary_table.add_row("Throughput", f"{result.configs_per_second:,.0f} configs/sec")
+
+        console.print()
+        console.print(summary_table)
+
+        if result.errors:
+            console.print()
+            for error in result.errors:
+                console.print(f"[red]•[/red] {error}")
+
+    except Exception as e:
+        console.print(f"\n[bold red]✗ Error:[/bold red] {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
+async def import_profiles_command(args: argparse.Namespace):
+    """Import profile configurations of a manufacturing type from a profile sheet CSV."""
+    from app.services.profile_import import ProfileImportService
+
+    console.print(Panel.fit("[bold cyan]Profile Sheet Import[/bold cyan]", border_style="cyan"))
+    console.print()
+
+    if not args.type_id or not args.file:
+        console.print("[red]✗ Error: --type-id and --file are required for import_profiles[/red]")
+        sys.exit(1)
+
+    path = Path(args.file)
+    if not path.is_file():
+        console.print(f"[red]✗ Error: File not found: {path}[/red]")
+        sys.exit(1)
+
+    engine = get_engine()
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        with Progress(
+            SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console
+        ) as progress:
+            task = progress.add_task(
+                f"[cyan]Importing {path.name} into manufacturing type {args.type_id}...",
+                total=None,
+            )
+
+            async with session_maker() as session:
+                user = (
+                    await session.execute(select(User).where(User.username == args.username))
+                ).scalar_one_or_none()
+                if not user:
+                    console.print(f"[red]✗ Error: User '{args.username}' not found[/red]")
+                    sys.exit(1)
+
+                with path.open(encoding="utf-8-sig", newline="") as lines:
+                    result = await ProfileImportService(session).import_csv(
+                        args.type_id,
+                        user,
+                        lines,
+                        batch_size=args.batch_size,
+                        workers=args.workers,
+                    )
+
+            progress.update(task, description="[green]✓ Import complete")
+
+        summary_table = Table(title="[bold green]✓ Import Complete[/bold green]", box=box.ROUNDED)
+        summary_table.add_column("Metric", style="cyan")
+        summary_table.add_column("Value", justify="right", style="yellow")
+
+        summary_table.add_row("Manufacturing Type", str(result.manufacturing_type_id))
+        summary_table.add_row("Rows", f"{result.rows:,}")
+        summary_table.add_row("Imported", f"{result.imported:,}")
+        summary_table.add_row("Failed", f"{result.failed:,}")
+        summary_table.add_row("Duration", f"{result.duration_seconds:.3f}s")
+        summary_table.add_row("Throughput", f"{result.rows_per_second:,.0f} rows/sec")
+
+        console.print()
+        console.print(summary_table)
+
+        if result.errors:
+            console.print()
+            for error in result.errors:
+                messages = "; ".join(
+                    f"{field}: {message}" for field, message in error.errors.items()
+                )
+                console.print(
+                    f"[red]•[/red] Row {error.row} ({error.name or 'unnamed'}): {messages}"
+                )
+
+    except Exception as e:
+        console.print(f"\n[bold red]✗ Error:[/bold red] {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+
 async def check_db_command(args: argparse.Namespace):
     """Check database connection and schema."""
     console.print(
@@ -2848,6 +2998,8 @@ COMMAND_REGISTRY: dict[str, Callable[[argparse.Namespace], None]] = {
     "delete_factory_mfg": lambda args: asyncio.run(delete_factory_mfg_command(args)),
     "create_factory_customers": lambda args: asyncio.run(create_factory_customers_command(args)),
     "delete_factory_customers": lambda args: asyncio.run(delete_factory_customers_command(args)),
+    "reprice": lambda args: asyncio.run(reprice_command(args)),
+    "import_profiles": lambda args: asyncio.run(import_profiles_command(args)),
     "check_db": lambda args: asyncio.run(check_db_command(args)),
     "tables": lambda args: asyncio.run(tables_command(args)),
     "start": lambda args: start_server_command(args),
@@ -2877,7 +3029,7 @@ def main():
     parser.add_argument(
         "username",
         nargs="?",
-        help="Username (for promote and reset_password commands)",
+        help="Username (for promote, reset_password and import_profiles commands)",
     )
 
     parser.add_argument(
@@ -2907,6 +3059,30 @@ def main():
         help="Number of items to create (for factory customers, default: 10)",
     )
 
+    parser.add_argument(
+        "--type-id",
+        type=int,
+        help="Manufacturing type ID (for reprice and import_profiles commands)",
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Calculate without writing changes (for reprice command)",
+    )
+
+    parser.add_argument(
+        "--file",
+        type=str,
+        help="Profile sheet CSV to import (for import_profiles command)",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Rows validated and inserted per batch (for import_profiles command)",
+    )
+
     parser.add_argument(
         "--schema",
         type=str,
@@ -2939,7 +3115,10 @@ def main():
     parser.add_argument(
         "--workers",
         type=int,
-        help="Number of worker processes (gunicorn only, default: 4)",
+        help=(
+            "Number of worker processes (gunicorn default: 4; "
+            "import_profiles validation workers, default: from settings)"
+        ),
     )
 
     parser.add_argument(
@@ -2997,7 +3176,7 @@ def main():
         sys.exit(1)
 
     # Validate username for commands that require it
-    if args.command in ["promote", "reset_password"] and not args.username:
+    if args.command in ["promote", "reset_password", "import_profiles"] and not args.username:
         print(f"❌ Error: Username required for '{args.command}' command!")
         print(f"Usage: python manage.py {args.command} <username>")
         sys.exit(1)